@@ -2,12 +2,16 @@
 
 from typing import Dict, Any
 from app.agents.llm_config import RESUME_LLM
+from app.services.prompt_compaction import PromptSlot, compact_slots
 from .state import ColdEmailState
 import logging
 import re
 
 logger = logging.getLogger(__name__)
 
+# Estimated-token budget for the resume, projects, experience and JD blocks.
+COLD_EMAIL_CONTEXT_TOKENS = 1800
+
 
 def _sanitize_contact_details(text: Any) -> str:
     if not text:
@@ -201,6 +205,22 @@ BODY:
 {template_body or '[No template body provided]'}
 """
 
+    context = compact_slots(
+        [
+            PromptSlot("projects", str(projects_section or ""), priority=0, min_tokens=250),
+            PromptSlot("experience", str(experience or ""), priority=1, min_tokens=200),
+            PromptSlot("job_description", str(job_desc or ""), priority=1, min_tokens=200),
+            PromptSlot("resume", str(resume_text or ""), priority=2, min_tokens=300),
+        ],
+        budget=COLD_EMAIL_CONTEXT_TOKENS,
+        site="cold_email.writer",
+        focus=[target_role, str(job_desc or ""), *skills[:10]],
+    )
+    experience = context["experience"]
+    resume_text = context["resume"]
+    projects_section = context["projects"]
+    job_desc = context["job_description"]
+
     prompt = f"""
 Write a personalized cold {"email" if format_type == "email" else "message"} using ONLY the information provided from the candidate's actual resume. DO NOT generate, invent, or create any fake projects, experiences, or details.
 
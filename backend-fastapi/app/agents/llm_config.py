@@ -9,6 +9,7 @@ from langchain_groq import ChatGroq
 from groq import Groq
 from google import genai
 import os
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -19,6 +20,13 @@ load_dotenv()
 # ──────────────────────────────────────────────
 GROQ_CLIENT = Groq(api_key=os.getenv("GROQ_API_KEY"))
 
+# Groq calls in flight at once across the process. Resume scoring, RAG
+# suggestions, section parsing and skill-gap analysis all hold a slot per
+# call, so an upload's parallel phases (and concurrent uploads) share one
+# budget instead of each phase exhausting the rate limit on its own.
+GROQ_CONCURRENCY = int(os.getenv("GROQ_CONCURRENCY", "4"))
+LLM_SLOTS = threading.BoundedSemaphore(max(1, GROQ_CONCURRENCY))
+
 # ──────────────────────────────────────────────
 # Gemini client (used by study planner for
 # Google Search grounding)
@@ -56,6 +64,7 @@ GEMINI_MODEL = "gemini-2.0-flash"
 # Export active objects
 __all__ = [
     "GROQ_CLIENT",
+    "LLM_SLOTS",
     "GEMINI_CLIENT",
     "RESUME_LLM",
     "INTERVIEW_LLM",
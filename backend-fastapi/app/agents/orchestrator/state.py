@@ -196,6 +196,8 @@ class CareerLMState(TypedDict, total=False):
     
     waiting_for_user: bool  # True if paused for human input
     waiting_for_input_type: Optional[str]  # "bullet_answers" | etc
+    defer_bullet_rewrites: bool  # Caller streams late bullet rewrites as a follow-up event
+    pending_rewrites_id: Optional[str]  # Late bullet rewrites, collected by the caller
     
     # ===== METADATA =====
     thread_id: str  # Session identifier for checkpointing
@@ -3,7 +3,7 @@
 Resume Module - 3-agent system for resume analysis
 """
 
-from app.agents.resume.graph import resume_workflow
+from app.agents.resume.graph import resume_workflow, run_resume_workflow
 from app.agents.resume.state import ResumeState
 
-__all__ = ["resume_workflow", "ResumeState"]
+__all__ = ["resume_workflow", "run_resume_workflow", "ResumeState"]
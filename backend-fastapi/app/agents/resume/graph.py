@@ -1,24 +1,42 @@
 # app/agents/resume/graph.py
 """
-Linear Resume Workflow — Career Advisor Framework
-Flow: Structure & Completeness → Relevance & Keywords → Impact & Specificity
+Resume Workflow — Career Advisor Framework
+
+Parallel (default):
+          ┌→ Structure & Completeness ─┐
+    START ┼→ Relevance & Keywords ─────┼→ Score Join → END
+          └→ Impact & Specificity ─────┘
+
+Linear (RESUME_GRAPH_MODE=linear):
+    Structure & Completeness → Relevance & Keywords → Impact & Specificity
+
+Relevance and impact are deterministic and don't read the structure node's
+LLM output, so in parallel mode wall time is bounded by the single LLM call.
 """
 
-from langgraph.graph import StateGraph, END
+import inspect
+import os
+from typing import Any, Dict, Optional
+
+from langgraph.graph import StateGraph, START, END
 from app.agents.resume.state import ResumeState
 from app.agents.resume.nodes import (
     structure_completeness_agent,
     relevance_agent,
     impact_advisor_agent,
+    structure_completeness_branch,
+    relevance_branch,
+    impact_branch,
+    score_join_node,
 )
 
+RESUME_GRAPH_MODE = os.getenv("RESUME_GRAPH_MODE", "parallel").strip().lower()
+if RESUME_GRAPH_MODE not in ("parallel", "linear"):
+    print(f"Unknown RESUME_GRAPH_MODE '{RESUME_GRAPH_MODE}', using parallel")
+    RESUME_GRAPH_MODE = "parallel"
 
-def create_resume_workflow():
-    """Creates a simple linear 3-agent workflow."""
-    print("Building Resume workflow (career advisor framework)...")
-
-    workflow = StateGraph(ResumeState)
 
+def _add_linear_topology(workflow: StateGraph) -> None:
     workflow.add_node("structure_completeness", structure_completeness_agent)
     workflow.add_node("relevance", relevance_agent)
     workflow.add_node("impact_advisor", impact_advisor_agent)
@@ -27,7 +45,33 @@ def create_resume_workflow():
     workflow.add_edge("structure_completeness", "relevance")
     workflow.add_edge("relevance", "impact_advisor")
     workflow.add_edge("impact_advisor", END)
-    
+
+
+def _add_parallel_topology(workflow: StateGraph) -> None:
+    # Branches return disjoint keys, so they can share one superstep.
+    workflow.add_node("structure_completeness", structure_completeness_branch)
+    workflow.add_node("relevance", relevance_branch)
+    workflow.add_node("impact_advisor", impact_branch)
+    workflow.add_node("score_join", score_join_node)
+
+    branches = ["structure_completeness", "relevance", "impact_advisor"]
+    for branch in branches:
+        workflow.add_edge(START, branch)
+    workflow.add_edge(branches, "score_join")
+    workflow.add_edge("score_join", END)
+
+
+def create_resume_workflow(mode: Optional[str] = None):
+    """Creates the 3-agent workflow in parallel (fan-out/join) or linear mode."""
+    mode = mode or RESUME_GRAPH_MODE
+    print(f"Building Resume workflow (career advisor framework, {mode})...")
+
+    workflow = StateGraph(ResumeState)
+    if mode == "linear":
+        _add_linear_topology(workflow)
+    else:
+        _add_parallel_topology(workflow)
+
     # ===== COMPILE =====
     print("  → Compiling graph...")
     checkpointer = None
@@ -38,12 +82,24 @@ def create_resume_workflow():
     except Exception as _cp_err:
         print(f"  → Checkpointer unavailable, running without persistence: {_cp_err}")
     app = workflow.compile(checkpointer=checkpointer)
-    print("Resume workflow ready! (3 agents, linear flow)")
+    print(f"Resume workflow ready! (3 agents, {mode} flow)")
 
     return app
 
 
+def run_resume_workflow(resume_input: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Invoke resume_workflow. In parallel mode the checkpoint is written once,
+    after the join, instead of after every superstep; older langgraph
+    releases without the ``durability`` option fall back to per-step saves.
+    """
+    if RESUME_GRAPH_MODE == "parallel" and _SUPPORTS_DURABILITY:
+        return resume_workflow.invoke(resume_input, config=config, durability="exit")
+    return resume_workflow.invoke(resume_input, config=config)
+
+
 # Create singleton
 print("Creating resume_workflow singleton...")
 resume_workflow = create_resume_workflow()
-print("resume_workflow ready!")
\ No newline at end of file
+_SUPPORTS_DURABILITY = "durability" in inspect.signature(resume_workflow.invoke).parameters
+print("resume_workflow ready!")
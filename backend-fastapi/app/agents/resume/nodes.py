@@ -22,7 +22,7 @@ import json
 import re
 from typing import Any, Dict, List, Set
 
-from app.agents.llm_config import GROQ_CLIENT, GROQ_DEFAULT_MODEL
+from app.agents.llm_config import GROQ_CLIENT, GROQ_DEFAULT_MODEL, LLM_SLOTS
 from app.agents.resume.state import ResumeState
 
 
@@ -205,12 +205,13 @@ def _extract_json(text: str) -> Dict[str, Any]:
 
 
 def _llm_json(prompt: str, max_tokens: int = 1500) -> Dict[str, Any]:
-    response = GROQ_CLIENT.chat.completions.create(
-        model=GROQ_DEFAULT_MODEL,
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.2,
-        max_tokens=max_tokens,
-    )
+    with LLM_SLOTS:
+        response = GROQ_CLIENT.chat.completions.create(
+            model=GROQ_DEFAULT_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.2,
+            max_tokens=max_tokens,
+        )
     return _extract_json(response.choices[0].message.content.strip())
 
 
@@ -447,16 +448,84 @@ def _compute_final_score(
     )
 
 
-# ─── Agent 1: Structure & Completeness ───────────────────────────────────────
+def _score_relevance(resume_text: str, job_description: str, role_type: str) -> Dict:
+    """
+    Dimension 3 — Keyword & Relevance (deterministic).
+    Mode A (JD provided): JD keyword overlap. Mode B (no JD): role-archetype keywords.
+    """
+    has_jd = bool(job_description and len(job_description.strip()) > 50)
+    if has_jd:
+        source_keywords = _extract_keywords(job_description, limit=40)
+    else:
+        source_keywords = _get_archetype(role_type)["keywords"]
+    overlap = _keyword_overlap(source_keywords, resume_text)
+    return {
+        "score": overlap["score"],
+        "critical_gaps": overlap["missing"][:10],
+        "has_jd": has_jd,
+    }
 
-def structure_completeness_agent(state: ResumeState) -> ResumeState:
+
+def _impact_score(impact_det: Dict, clarity: float = 0.5) -> int:
+    """Blend deterministic verb/metric ratios with a clarity estimate (0-1)."""
+    return _clamp(
+        impact_det["action_verb_ratio"] * 40
+        + impact_det["metric_ratio"] * 40
+        + clarity * 20
+    )
+
+
+def score_resume_deterministic(
+    resume_text: str,
+    resume_sections: Dict[str, str],
+    role_type: str = "",
+    job_description: str = "",
+) -> Dict[str, Any]:
     """
-    Dimension 1 (Structure & Formatting) + Dimension 2 (Section Completeness).
-    Deterministic scoring first; LLM adds nuanced structure observations only.
+    Score all four dimensions without any LLM call.
+
+    Produces the same numbers as the 3-agent graph (the LLM in Agent 1 only
+    adds structure observations, never scores), so batch callers can score
+    resumes in worker processes and stay consistent with the interactive flow.
     """
-    messages = state.get("messages", [])
-    completed = state.get("completed_steps", [])
+    role_type = role_type or ""
+    struct_result = _score_structure_formatting(resume_text)
+    comp_result = _score_section_completeness(resume_sections or {}, role_type)
+    relevance = _score_relevance(resume_text, job_description, role_type)
+    impact_det = _score_impact_deterministic(_extract_bullets(resume_text))
+    impact_score = _impact_score(impact_det)
 
+    overall_score = _compute_final_score(
+        structure_score=struct_result["score"],
+        completeness_score=comp_result["score"],
+        relevance_score=relevance["score"],
+        impact_score=impact_score,
+        has_jd=relevance["has_jd"],
+    )
+    return {
+        "structure_score": struct_result["score"],
+        "completeness_score": comp_result["score"],
+        "relevance_score": relevance["score"],
+        "impact_score": impact_score,
+        "ats_score": overall_score,
+        "score_zone": _score_zone(overall_score),
+        "has_job_description": relevance["has_jd"],
+        "critical_gaps": relevance["critical_gaps"],
+        "missing_sections": comp_result["missing_sections"],
+        "structure_issues": [i["title"] for i in struct_result["issues"]],
+        "action_verb_ratio": impact_det["action_verb_ratio"],
+        "metric_ratio": impact_det["metric_ratio"],
+    }
+
+
+# ─── Agent 1: Structure & Completeness ───────────────────────────────────────
+#
+# Each dimension is split into a *branch* (returns only the keys it owns, so
+# branches can run in the same LangGraph superstep without write conflicts)
+# and a linear *agent* wrapper that threads messages/completed_steps.
+
+def structure_completeness_branch(state: ResumeState) -> Dict[str, Any]:
+    """Dimensions 1 + 2: deterministic scores plus LLM structure observations."""
     resume_text = state.get("resume_text", "")
     resume_sections = state.get("resume_sections", {})
     role_type = state.get("role_type") or ""
@@ -476,18 +545,32 @@ Return: {{"issues": ["issue 1", "issue 2", "issue 3"]}}"""
 
     llm_result = _llm_json(prompt, max_tokens=200)
     llm_issues = [{"issue": issue} for issue in llm_result.get("issues", [])[:3]]
-    all_structure_issues = struct_result["issues"] + llm_issues
+
+    return {
+        "structure_score": struct_result["score"],
+        "completeness_score": comp_result["score"],
+        "structure_suggestions": struct_result["issues"] + llm_issues,  # Minimal: [{"issue": "..."}]
+    }
+
+
+def structure_completeness_agent(state: ResumeState) -> ResumeState:
+    """
+    Dimension 1 (Structure & Formatting) + Dimension 2 (Section Completeness).
+    Deterministic scoring first; LLM adds nuanced structure observations only.
+    """
+    messages = state.get("messages", [])
+    completed = state.get("completed_steps", [])
+
+    result = structure_completeness_branch(state)
 
     messages.append(
-        f"Agent 1 — Structure: {struct_result['score']}/100 | Completeness: {comp_result['score']}/100"
+        f"Agent 1 — Structure: {result['structure_score']}/100 | Completeness: {result['completeness_score']}/100"
     )
     completed.append("structure_completeness")
 
     return {
         **state,
-        "structure_score": struct_result["score"],
-        "completeness_score": comp_result["score"],
-        "structure_suggestions": all_structure_issues,  # Minimal: [{"issue": "..."}]
+        **result,
         "completed_steps": completed,
         "messages": messages,
         "_status": "processing",
@@ -496,6 +579,20 @@ Return: {{"issues": ["issue 1", "issue 2", "issue 3"]}}"""
 
 # ─── Agent 2: Relevance & Keyword Alignment ──────────────────────────────────
 
+def relevance_branch(state: ResumeState) -> Dict[str, Any]:
+    """Dimension 3: JD or archetype keyword overlap."""
+    relevance = _score_relevance(
+        state.get("resume_text", ""),
+        state.get("job_description", ""),
+        state.get("role_type") or "",
+    )
+    return {
+        "relevance_score": relevance["score"],
+        "critical_gaps": relevance["critical_gaps"],  # Used by profile_update as skill_gaps
+        "has_job_description": relevance["has_jd"],
+    }
+
+
 def relevance_agent(state: ResumeState) -> ResumeState:
     """
     Dimension 3 — Keyword & Relevance Alignment.
@@ -505,36 +602,16 @@ def relevance_agent(state: ResumeState) -> ResumeState:
     messages = state.get("messages", [])
     completed = state.get("completed_steps", [])
 
-    resume_text = state.get("resume_text", "")
-    resume_sections = state.get("resume_sections", {})
-    job_description = state.get("job_description", "")
-    role_type = state.get("role_type") or ""
-    archetype = _get_archetype(role_type)
-
-    has_jd = bool(job_description and len(job_description.strip()) > 50)
-    resume_context = _build_resume_context(resume_sections, max_chars=7000)
-
-    if has_jd:
-        jd_kws = _extract_keywords(job_description, limit=40)
-        overlap = _keyword_overlap(jd_kws, resume_text)
-        relevance_score = overlap["score"]
-        critical_gaps = overlap["missing"][:10]  # Top 10 missing JD keywords
-    else:
-        archetype_kws = archetype["keywords"]
-        overlap = _keyword_overlap(archetype_kws, resume_text)
-        relevance_score = overlap["score"]
-        critical_gaps = overlap["missing"][:10]  # Top 10 missing archetype keywords
+    result = relevance_branch(state)
 
     messages.append(
-        f"Agent 2 — Relevance: {relevance_score}/100 | has_jd={has_jd}"
+        f"Agent 2 — Relevance: {result['relevance_score']}/100 | has_jd={result['has_job_description']}"
     )
     completed.append("relevance")
 
     return {
         **state,
-        "relevance_score": relevance_score,
-        "critical_gaps": critical_gaps,  # Used by profile_update as skill_gaps
-        "has_job_description": has_jd,
+        **result,
         "completed_steps": completed,
         "messages": messages,
         "_status": "processing",
@@ -543,6 +620,24 @@ def relevance_agent(state: ResumeState) -> ResumeState:
 
 # ─── Agent 3: Impact & Specificity Advisor ───────────────────────────────────
 
+def impact_branch(state: ResumeState) -> Dict[str, Any]:
+    """Dimension 4: deterministic verb/metric ratios (no LLM call)."""
+    impact_det = _score_impact_deterministic(_extract_bullets(state.get("resume_text", "")))
+    return {"impact_score": _impact_score(impact_det)}
+
+
+def _final_score_fields(state: ResumeState) -> Dict[str, Any]:
+    """Weighted composite + zone from the four dimension scores in state."""
+    overall_score = _compute_final_score(
+        structure_score=state.get("structure_score", 70),
+        completeness_score=state.get("completeness_score", 70),
+        relevance_score=state.get("relevance_score", 70),
+        impact_score=state.get("impact_score", 70),
+        has_jd=state.get("has_job_description", False),
+    )
+    return {"ats_score": overall_score, "score_zone": _score_zone(overall_score)}
+
+
 def impact_advisor_agent(state: ResumeState) -> ResumeState:
     """
     Dimension 4 — Impact & Specificity + Redundancy & Noise.
@@ -552,48 +647,51 @@ def impact_advisor_agent(state: ResumeState) -> ResumeState:
     messages = state.get("messages", [])
     completed = state.get("completed_steps", [])
 
-    resume_text = state.get("resume_text", "")
-    resume_sections = state.get("resume_sections", {})
-    role_type = state.get("role_type") or ""
-    has_jd = state.get("has_job_description", False)
-    structure_score = state.get("structure_score", 70)
-    completeness_score = state.get("completeness_score", 70)
-    relevance_score = state.get("relevance_score", 70)
-    archetype = _get_archetype(role_type)
+    result = impact_branch(state)
+    final = _final_score_fields({**state, **result})
 
-    resume_context = _build_resume_context(resume_sections, max_chars=7000)
-    bullets = _extract_bullets(resume_text)
-    impact_det = _score_impact_deterministic(bullets)
-    
-    # Use deterministic scoring only - no expensive LLM call
-    clarity = 0.5  # Default middle score
-    impact_score = _clamp(
-        impact_det["action_verb_ratio"] * 40
-        + impact_det["metric_ratio"] * 40
-        + clarity * 20
+    messages.append(
+        f"Agent 3 — Impact: {result['impact_score']}/100 | Overall: {final['ats_score']}/100 | Zone: '{final['score_zone']}'"
     )
+    completed.append("impact_advice")
 
-    overall_score = _compute_final_score(
-        structure_score=structure_score,
-        completeness_score=completeness_score,
-        relevance_score=relevance_score,
-        impact_score=impact_score,
-        has_jd=has_jd,
-    )
-    zone = _score_zone(overall_score)
+    return {
+        **state,
+        **result,
+        **final,
+        "completed_steps": completed,
+        "messages": messages,
+        "_status": "completed",
+    }
+
+
+# ─── Join: merge parallel branches ───────────────────────────────────────────
+
+def score_join_node(state: ResumeState) -> ResumeState:
+    """
+    Fan-in for the parallel topology. Runs once all three branches have
+    written their dimension scores and computes the final weighted score.
+    """
+    messages = state.get("messages", [])
+    completed = state.get("completed_steps", [])
+
+    final = _final_score_fields(state)
 
     messages.append(
-        f"Agent 3 — Impact: {impact_score}/100 | Overall: {overall_score}/100 | Zone: '{zone}'"
+        f"Agent 1 — Structure: {state.get('structure_score')}/100 | Completeness: {state.get('completeness_score')}/100"
     )
-    completed.append("impact_advice")
+    messages.append(
+        f"Agent 2 — Relevance: {state.get('relevance_score')}/100 | has_jd={state.get('has_job_description')}"
+    )
+    messages.append(
+        f"Agent 3 — Impact: {state.get('impact_score')}/100 | Overall: {final['ats_score']}/100 | Zone: '{final['score_zone']}'"
+    )
+    completed.extend(["structure_completeness", "relevance", "impact_advice"])
 
     return {
         **state,
-        "impact_score": impact_score,
-        "ats_score": overall_score,
-        "score_zone": zone,
+        **final,
         "completed_steps": completed,
         "messages": messages,
         "_status": "completed",
     }
-
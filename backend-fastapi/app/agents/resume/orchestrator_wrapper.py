@@ -8,7 +8,7 @@ from datetime import datetime
 import json
 from supabase_client import supabase
 
-from app.agents.resume.graph import resume_workflow
+from app.agents.resume.graph import run_resume_workflow
 from app.agents.orchestrator.state import CareerLMState
 from app.services.rag_suggestions import get_resume_rag_evaluation
 from app.services.resume_parser import get_parser
@@ -119,7 +119,7 @@ def resume_analysis_wrapper_node(state: CareerLMState) -> CareerLMState:
 
     try:
         config = {"configurable": {"thread_id": "orchestrator_resume_subgraph"}}
-        resume_result = resume_workflow.invoke(resume_input, config=config)
+        resume_result = run_resume_workflow(resume_input, config=config)
 
         messages.append("[RESUME_WRAPPER] Resume workflow completed")
         print("[RESUME_WRAPPER] Resume workflow completed")
@@ -136,11 +136,16 @@ def resume_analysis_wrapper_node(state: CareerLMState) -> CareerLMState:
 
     # ===== MAP RESUME RESULTS INTO ORCHESTRATOR STATE =====
 
+    # One-shot: only the run that asked for deferral collects the follow-up.
+    defer_rewrites = bool(state.get("defer_bullet_rewrites"))
+    state["defer_bullet_rewrites"] = False
     rag_eval = get_resume_rag_evaluation(
         resume_text=resume_text,
         job_description=job_description,
         category="resume",
         parsed_sections=parsed_sections,
+        role_type=role_type,
+        defer_rewrites=defer_rewrites,
     )
 
     # Resume sections were parsed before workflow and should be in result
@@ -171,6 +176,9 @@ def resume_analysis_wrapper_node(state: CareerLMState) -> CareerLMState:
         "weaknesses": rag_eval.get("weaknesses", []),
         "suggestions": rag_eval.get("suggestions", []),
     }
+    # Set when bullet rewrites missed the inline deadline (sent as a follow-up SSE
+    # event); kept out of resume_analysis so it is never stored with the analysis.
+    state["pending_rewrites_id"] = rag_eval.get("pending_rewrites_id")
 
     state["resume_analysis_complete"] = True
     state["resume_analysis_failed"] = False
@@ -6,11 +6,15 @@ based on career cluster matching using TF-IDF and cosine similarity.
 Uses LangGraph for workflow orchestration.
 """
 
-from .graph import analyze_skill_gap, skill_gap_workflow
+from .cache import invalidate_skill_gap_cache, skill_gap_fingerprint
+from .graph import analyze_skill_gap, skill_gap_workflow, stream_skill_gap
 from .state import SkillGapState
 
 __all__ = [
     "analyze_skill_gap",
+    "invalidate_skill_gap_cache",
+    "skill_gap_fingerprint",
     "skill_gap_workflow",
+    "stream_skill_gap",
     "SkillGapState"
 ]
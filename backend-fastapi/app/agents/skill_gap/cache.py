@@ -0,0 +1,154 @@
+"""
+Result cache for analyze_skill_gap.
+
+Two Groq 70B calls (career probabilities + AI recommendations) run for every
+analysis, even when the resume and preferences haven't changed. Results are
+cached (memory LRU → SQLite) under a fingerprint of:
+
+  - the normalized resume text and the sections the extractor reads
+  - the questionnaire fields that affect scoring (SCORING_FIELDS)
+
+The SQLite namespace is versioned by ONTOLOGY_VERSION (a hash of the skill
+ontology, career clusters, tech stacks and model), so editing any of them
+invalidates every stored result on the next startup.
+invalidate_skill_gap_cache() drops one fingerprint or everything.
+
+Results produced while the LLM was unavailable (fallback matches or
+recommendations) are not cached.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from app.services.cache import LRUCache, SQLiteKV, normalize_text
+
+from . import nodes
+
+logger = logging.getLogger(__name__)
+
+SKILL_GAP_CACHE_VERSION = os.getenv("SKILL_GAP_CACHE_VERSION", "1")
+SKILL_GAP_CACHE_TTL_S = float(os.getenv("SKILL_GAP_CACHE_TTL_S", str(30 * 24 * 3600)))
+SKILL_GAP_CACHE_ENABLED = os.getenv("SKILL_GAP_CACHE", "1") != "0"
+
+SECTION_KEYS = ("skills", "projects", "experience", "work_experience")
+SCORING_FIELDS = (
+    "target_role",
+    "target_roles",
+    "timeline_weeks",
+    "timeline",
+    "readiness_timeline",
+    "preferred_tech_stack",
+    "skill_self_ratings",
+    "user_profile",
+)
+
+_DEGRADED_MARKERS = (
+    ("ai_recommendations", "AI recommendations unavailable"),
+    ("timeline_note", "LLM unavailable during matching"),
+)
+
+
+def _ontology_version() -> str:
+    payload = json.dumps(
+        {
+            "ontology": nodes._SKILL_ONTOLOGY,
+            "aliases": nodes._SKILL_ALIAS_MAP,
+            "clusters": nodes.CAREER_CLUSTERS,
+            "stacks": nodes.TECH_STACKS,
+            "learning_time": nodes.SKILL_LEARNING_TIME,
+            "model": nodes.GROQ_SKILLGAP_MODEL,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+ONTOLOGY_VERSION = _ontology_version()
+
+_memory = LRUCache("skill_gap_results", max_entries=256, ttl_seconds=SKILL_GAP_CACHE_TTL_S)
+_store: Optional[SQLiteKV] = None
+try:
+    _store = SQLiteKV(
+        "skill_gap_results",
+        version=f"{ONTOLOGY_VERSION}:v{SKILL_GAP_CACHE_VERSION}",
+        ttl_seconds=SKILL_GAP_CACHE_TTL_S,
+    )
+except Exception as exc:
+    logger.warning("[SKILL_GAP_CACHE] SQLite tier disabled: %s", exc)
+
+
+def skill_gap_fingerprint(
+    resume_text: str,
+    sections: Optional[dict] = None,
+    questionnaire_answers: Optional[dict] = None,
+) -> str:
+    """Stable key for the inputs that determine an analysis result."""
+    qa = questionnaire_answers if isinstance(questionnaire_answers, dict) else {}
+    payload = json.dumps(
+        {
+            "resume": normalize_text(resume_text),
+            "sections": {
+                k: normalize_text(str((sections or {}).get(k) or ""))
+                for k in SECTION_KEYS
+            },
+            "qa": {k: qa.get(k) for k in SCORING_FIELDS if qa.get(k) not in (None, "", [], {})},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_cacheable(result: Dict[str, Any]) -> bool:
+    if not result or "error" in result:
+        return False
+    return not any(
+        str(result.get(field) or "").startswith(marker) for field, marker in _DEGRADED_MARKERS
+    )
+
+
+def get_cached_result(fingerprint: str) -> Optional[Dict[str, Any]]:
+    """A copy of the cached result (callers mutate it), or None."""
+    if not SKILL_GAP_CACHE_ENABLED:
+        return None
+    result = _memory.get(fingerprint)
+    if result is None and _store is not None:
+        try:
+            raw = _store.get(fingerprint)
+        except Exception as exc:
+            logger.warning("[SKILL_GAP_CACHE] SQLite read failed: %s", exc)
+            raw = None
+        if raw is not None:
+            result = json.loads(raw)
+            _memory.set(fingerprint, result)
+    return copy.deepcopy(result) if result is not None else None
+
+
+def store_result(fingerprint: str, result: Dict[str, Any]) -> None:
+    if not SKILL_GAP_CACHE_ENABLED or not is_cacheable(result):
+        return
+    result = copy.deepcopy(result)
+    _memory.set(fingerprint, result)
+    if _store is not None:
+        try:
+            _store.set(fingerprint, json.dumps(result, default=str))
+        except Exception as exc:
+            logger.warning("[SKILL_GAP_CACHE] SQLite write failed: %s", exc)
+
+
+def invalidate_skill_gap_cache(fingerprint: Optional[str] = None) -> None:
+    """Drop one cached analysis, or all of them when no fingerprint is given."""
+    if fingerprint is None:
+        _memory.clear()
+        if _store is not None:
+            _store.clear()
+        logger.info("[SKILL_GAP_CACHE] Cleared all cached analyses")
+        return
+    _memory.delete(fingerprint)
+    if _store is not None:
+        _store.delete(fingerprint)
@@ -0,0 +1,163 @@
+"""
+Deterministic, vectorized career matching.
+
+The career clusters are compiled once into a weighted career × skill matrix
+(one per tech stack, using the stack-filtered skill lists). A required
+skill's weight grows with its learning time (log1p(days), see
+SKILL_LEARNING_TIME), so hard-to-acquire core skills count more than quick
+fixes; each row sums to 1.
+
+A user is a vector over the same skill vocabulary holding their
+confidence / proficiency weight per skill, so scoring every career is one
+matrix-vector product:
+
+    coverage    = W @ u                       weighted share of the role's skills
+    probability = 100 * sigmoid(k * (coverage - m))
+
+Clusters list ~25 skills and a solid candidate for a role typically shows
+a quarter of them, so raw coverage reads far too low next to the LLM
+matcher's scale. The logistic calibration (CALIBRATION_SLOPE k,
+CALIBRATION_MIDPOINT m) puts ~15% weighted coverage at a 50% fit, ~25% at
+~80%, and keeps zero coverage under 10%.
+"""
+
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+CALIBRATION_SLOPE = 15.0
+CALIBRATION_MIDPOINT = 0.15
+DEFAULT_LEARNING_DAYS = 30
+DEFAULT_SKILL_WEIGHT = 0.75
+PROFICIENCY_WEIGHTS = {1: 0.5, 2: 0.75, 3: 1.0}
+MAX_MISSING_SKILLS = 7
+
+
+class CareerMatcher:
+    """Precomputed career × skill matrices with confidence-weighted scoring."""
+
+    def __init__(
+        self,
+        clusters: Mapping[str, Mapping[str, list]],
+        learning_days: Optional[Mapping[str, int]] = None,
+        normalize: Callable[[str], str] = lambda s: (s or "").strip().lower(),
+        stack_skills: Optional[Callable[[str, str], List[str]]] = None,
+    ):
+        self.careers = list(clusters)
+        self._clusters = clusters
+        self._normalize = normalize
+        self._stack_skills = stack_skills
+        self._days = {normalize(k): v for k, v in (learning_days or {}).items()}
+        self._uniform = learning_days is None
+        self._vocab: Dict[str, int] = {}
+        self._display: Dict[str, str] = {}
+        self._matrices: Dict[Optional[str], tuple] = {}
+        self._lock = threading.Lock()
+        self._compile(None)
+
+    def _skills_for(self, career: str, stack: Optional[str]) -> List[str]:
+        if stack and self._stack_skills is not None:
+            filtered = self._stack_skills(career, stack)
+            if filtered:
+                return filtered
+        return list(self._clusters[career].get("skills", []))
+
+    def _weight(self, norm: str) -> float:
+        if self._uniform:
+            return 1.0
+        return math.log1p(self._days.get(norm, DEFAULT_LEARNING_DAYS))
+
+    def _compile(self, stack: Optional[str]) -> tuple:
+        """(W, required-mask, per-career ordered skill lists) for one stack."""
+        with self._lock:
+            compiled = self._matrices.get(stack)
+            if compiled is not None:
+                return compiled
+            rows: List[List[str]] = []
+            for career in self.careers:
+                seen, ordered = set(), []
+                for skill in self._skills_for(career, stack):
+                    norm = self._normalize(skill)
+                    if not norm or norm in seen:
+                        continue
+                    seen.add(norm)
+                    ordered.append(norm)
+                    self._display.setdefault(norm, skill)
+                    self._vocab.setdefault(norm, len(self._vocab))
+                rows.append(ordered)
+
+            weights = np.zeros((len(self.careers), len(self._vocab)), dtype=np.float64)
+            for i, ordered in enumerate(rows):
+                for norm in ordered:
+                    weights[i, self._vocab[norm]] = self._weight(norm)
+            totals = weights.sum(axis=1, keepdims=True)
+            weights = np.divide(weights, totals, out=np.zeros_like(weights), where=totals > 0)
+            compiled = (weights, weights > 0, rows)
+            self._matrices[stack] = compiled
+            return compiled
+
+    def user_vector(
+        self,
+        user_skills: Iterable[str],
+        proficiency: Optional[Mapping[str, int]] = None,
+        size: Optional[int] = None,
+    ) -> np.ndarray:
+        """Confidence weight per vocabulary skill (0 where the user lacks it)."""
+        vector = np.zeros(size if size is not None else len(self._vocab), dtype=np.float64)
+        levels = {self._normalize(k): v for k, v in (proficiency or {}).items()}
+        for skill in user_skills:
+            norm = self._normalize(skill)
+            col = self._vocab.get(norm)
+            if col is None or col >= len(vector):
+                continue
+            level = levels.get(norm)
+            vector[col] = PROFICIENCY_WEIGHTS.get(level, DEFAULT_SKILL_WEIGHT) if level else DEFAULT_SKILL_WEIGHT
+        return vector
+
+    @staticmethod
+    def calibrate(coverage: np.ndarray) -> np.ndarray:
+        return 100.0 / (1.0 + np.exp(-CALIBRATION_SLOPE * (coverage - CALIBRATION_MIDPOINT)))
+
+    def score(
+        self,
+        user_skills: Iterable[str],
+        proficiency: Optional[Mapping[str, int]] = None,
+        stack: Optional[str] = None,
+        low_proficiency: int = 1,
+        max_missing: int = MAX_MISSING_SKILLS,
+    ) -> List[dict]:
+        """CareerMatch-shaped dicts for every career, best first."""
+        user_skills = [s for s in user_skills if isinstance(s, str)]
+        weights, required, rows = self._compile(stack)
+        u = self.user_vector(user_skills, proficiency, size=weights.shape[1])
+        coverage = weights @ u
+        has_skill = u > 0
+        matched_counts = (required & has_skill).sum(axis=1)
+        totals = required.sum(axis=1)
+        skill_match = np.divide(matched_counts, totals, out=np.zeros(len(totals)), where=totals > 0) * 100
+        probability = self.calibrate(coverage)
+
+        levels = {self._normalize(k): v for k, v in (proficiency or {}).items()}
+        results = []
+        for i in np.argsort(-probability, kind="stable"):
+            row = rows[i]
+            col_weights = weights[i]
+            matched = [n for n in row if has_skill[self._vocab[n]]]
+            missing = sorted(
+                (n for n in row if not has_skill[self._vocab[n]]),
+                key=lambda n: -col_weights[self._vocab[n]],
+            )[:max_missing]
+            improve = [n for n in matched if levels.get(n, low_proficiency + 1) <= low_proficiency]
+            results.append({
+                "career": self.careers[i],
+                "probability": round(float(probability[i]), 2),
+                "skill_match_percentage": round(float(skill_match[i]), 2),
+                "matched_skills": [self._display[n] for n in matched],
+                "missing_skills": [self._display[n] for n in missing],
+                "needs_improvement_skills": [self._display[n] for n in improve],
+                "total_required_skills": int(totals[i]),
+                "matched_skills_count": int(matched_counts[i]),
+            })
+        return results
@@ -0,0 +1,160 @@
+"""
+Memoized career-reference contexts for the career-matching prompt.
+
+calculate_career_probabilities_node grounds the 70B matcher with a listing of
+every career cluster and its (stack-filtered) skills. The text depends only on
+the static tables and the user's stacks, so each variant is rendered once and
+reused, keyed by:
+
+    (effective stack, detected stack set, compact, target career)
+
+Every entry carries its token estimate (chunking.estimate_tokens) so callers
+can log and budget prompt size. Keys are namespaced by a hash of the clusters,
+stack table and overrides, so editing any of them never serves a stale text.
+
+Compact mode keeps only the clusters relevant to the detected stacks — a
+cluster listing one of the stacks' technologies, or one with a stack-specific
+override — plus the target career. Stacks that select fewer than
+MIN_COMPACT_CLUSTERS are padded with the clusters sharing the most skills, so
+the model still has enough roles to rank; with no detected stacks the full
+reference is used.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from app.services.cache import LRUCache
+from app.services.chunking import estimate_tokens
+
+MIN_COMPACT_CLUSTERS = 4
+
+
+@dataclass(frozen=True)
+class CareerReference:
+    text: str
+    tokens: int
+    careers: Tuple[str, ...]
+    stacks: Tuple[str, ...]
+    compact: bool
+    version: str
+
+
+class CareerReferenceStore:
+    """Versioned, memoized renderings of the career clusters for prompts."""
+
+    def __init__(
+        self,
+        clusters: Mapping[str, Mapping[str, list]],
+        tech_stacks: Mapping[str, List[str]],
+        stack_skills: Callable[[str, str], List[str]],
+        normalize: Callable[[str], str] = lambda s: (s or "").strip().lower(),
+        overrides: Optional[Mapping[str, Mapping[str, list]]] = None,
+        name: str = "career_reference",
+        max_entries: int = 256,
+    ):
+        self._clusters = clusters
+        self._tech_stacks = tech_stacks
+        self._stack_skills = stack_skills
+        self._overrides = overrides or {}
+        self.version = hashlib.sha1(
+            json.dumps(
+                {"clusters": clusters, "stacks": tech_stacks, "overrides": self._overrides},
+                sort_keys=True,
+                default=str,
+            ).encode("utf-8")
+        ).hexdigest()[:12]
+        self._cache = LRUCache(name, max_entries=max_entries)
+
+        self._cluster_skills: Dict[str, Set[str]] = {
+            career: {normalize(s) for s in data.get("skills", [])} for career, data in clusters.items()
+        }
+        # Careers relevant to each stack, computed once.
+        self._stack_careers: Dict[str, Set[str]] = {}
+        for stack, techs in tech_stacks.items():
+            tech_norm = {normalize(t) for t in techs}
+            self._stack_careers[stack] = {
+                career
+                for career in clusters
+                if stack in self._overrides.get(career, {})
+                or self._cluster_skills[career] & tech_norm
+            }
+
+    def _careers_for(
+        self, stacks: Tuple[str, ...], compact: bool, target_career: Optional[str]
+    ) -> Tuple[List[str], bool]:
+        if not compact or not stacks:
+            return list(self._clusters), False
+        relevant: Set[str] = set()
+        for stack in stacks:
+            relevant |= self._stack_careers.get(stack, set())
+        if target_career in self._clusters:
+            relevant.add(target_career)
+        if not relevant:
+            return list(self._clusters), False
+        if len(relevant) < MIN_COMPACT_CLUSTERS:
+            # Narrow stacks (e.g. only Software Engineer and Full Stack list
+            # JavaScript): pad with the clusters sharing the most skills.
+            anchor = set().union(*(self._cluster_skills[c] for c in relevant))
+            others = sorted(
+                (c for c in self._clusters if c not in relevant),
+                key=lambda c: -len(self._cluster_skills[c] & anchor),
+            )
+            relevant.update(others[: MIN_COMPACT_CLUSTERS - len(relevant)])
+        # Keep the cluster table's order so renderings are stable.
+        return [c for c in self._clusters if c in relevant], True
+
+    def _render(self, careers: Iterable[str], stack: Optional[str]) -> str:
+        lines = []
+        for career in careers:
+            skills = self._stack_skills(career, stack) if stack else []
+            if not skills:
+                skills = self._clusters[career]["skills"]
+            lines.append(f"- {career}: {', '.join(skills)}")
+        return "\n".join(lines)
+
+    def get(
+        self,
+        stack: Optional[str] = None,
+        detected_stacks: Iterable[str] = (),
+        compact: bool = False,
+        target_career: Optional[str] = None,
+    ) -> CareerReference:
+        """The reference for *stack*, compacted to *detected_stacks* if asked."""
+        if stack == "no_preference":
+            stack = None
+        stacks = tuple(sorted({s for s in detected_stacks if s in self._tech_stacks}))
+        if not compact:
+            stacks, target_career = (), None
+        elif target_career not in self._clusters:
+            target_career = None
+
+        key = (self.version, stack, stacks, compact, target_career)
+        reference = self._cache.get(key)
+        if reference is not None:
+            return reference
+
+        careers, compacted = self._careers_for(stacks, compact, target_career)
+        text = self._render(careers, stack)
+        reference = CareerReference(
+            text=text,
+            tokens=estimate_tokens(text),
+            careers=tuple(careers),
+            stacks=stacks,
+            compact=compacted,
+            version=self.version,
+        )
+        self._cache.set(key, reference)
+        return reference
+
+    def warm(self) -> int:
+        """Precompute the full reference per stack and the single-stack compact ones."""
+        self.get(None)
+        for stack in self._tech_stacks:
+            self.get(stack)
+            self.get(stack, detected_stacks=(stack,), compact=True)
+        return 1 + 2 * len(self._tech_stacks)
+
+    def clear(self) -> None:
+        self._cache.clear()
@@ -2,15 +2,30 @@
 LangGraph workflow for skill gap analysis.
 """
 
+import logging
+import re
+from typing import Callable, Iterator
+
 from langgraph.graph import StateGraph, START, END
+from .cache import get_cached_result, skill_gap_fingerprint, store_result
 from .state import SkillGapState
 from .nodes import (
     extract_skills_node,
     calculate_career_probabilities_node,
     get_ai_recommendations_node,
-    compile_results_node
+    compile_results_node,
+    stream_ai_recommendations,
+    deterministic_career_probabilities,
+    deterministic_skills,
 )
 
+logger = logging.getLogger(__name__)
+
+# Cached recommendation text is replayed in chunks of about this many
+# characters, so clients render it the same way as a live stream.
+REPLAY_CHUNK_CHARS = 120
+_REPLAY_WORD = re.compile(r"\S+\s*|\s+")
+
 
 def build_skill_gap_graph() -> StateGraph:
     """
@@ -41,11 +56,66 @@ def build_skill_gap_graph() -> StateGraph:
 skill_gap_workflow = build_skill_gap_graph().compile()
 
 
+def _initial_state(
+    resume_text: str,
+    filename: str | None,
+    sections: dict | None,
+    questionnaire_answers: dict | None,
+) -> SkillGapState:
+    initial_state: SkillGapState = {
+        "resume_text": resume_text,
+        "filename": filename,
+        "questionnaire_answers": questionnaire_answers,
+    }
+
+    # Feed structured sections when available
+    if sections:
+        initial_state["skills_text"] = sections.get("skills") or None
+        initial_state["projects_text"] = sections.get("projects") or None
+        initial_state["experience_text"] = (
+            sections.get("experience")
+            or sections.get("work_experience")
+            or None
+        )
+    return initial_state
+
+
+def _to_result(result: SkillGapState) -> dict:
+    """Public result shape shared by analyze_skill_gap and stream_skill_gap."""
+    return {
+        "user_skills": result.get("user_skills", []),
+        "normalized_skills": result.get("normalized_skills", []),
+        "total_skills_found": result.get("total_skills_found", 0),
+        "target_role": result.get("target_role"),
+        "selected_cluster_source": result.get("selected_cluster_source"),
+        "selected_cluster_confidence": result.get("selected_cluster_confidence"),
+        "timeline_weeks": result.get("timeline_weeks"),
+        "skill_proficiency": result.get("skill_proficiency", {}),
+        "skill_confidence_levels": result.get("skill_confidence_levels", {
+            "high_confidence": [],
+            "medium_confidence": [],
+            "low_confidence": [],
+        }),
+        "skill_confidence_details": result.get("skill_confidence_details", []),
+        "gap_buckets": result.get("gap_buckets", {}),
+        "resume_optimizer_skills": result.get("resume_optimizer_skills", []),
+        "study_planner_skills": result.get("study_planner_skills", []),
+        "out_of_scope_skills": result.get("out_of_scope_skills", []),
+        "timeline_note": result.get("timeline_note"),
+        "selected_target_career_match": result.get("selected_target_career_match"),
+        "career_matches": result.get("career_matches", []),
+        "top_3_careers": result.get("top_3_careers", []),
+        "ai_recommendations": result.get("ai_recommendations", ""),
+        "analysis_summary": result.get("analysis_summary", {})
+    }
+
+
 def analyze_skill_gap(
     resume_text: str,
     filename: str | None = None,
     sections: dict | None = None,
     questionnaire_answers: dict | None = None,
+    use_cache: bool = True,
 ) -> dict:
     """
     Main function to analyze skill gaps and recommend careers based on clustering.
@@ -58,60 +128,154 @@ def analyze_skill_gap(
                   skill-extractor focuses on skills + project tech-stacks
                   instead of the full resume text.
         questionnaire_answers: Optional dict with user preferences including preferred_tech_stack.
+        use_cache: Reuse a stored result for identical resume / questionnaire
+                   inputs (see cache.py); False forces a fresh analysis.
 
     Returns:
         Dictionary containing skill analysis, career matches, and recommendations.
     """
     try:
-        # Prepare initial state
-        initial_state: SkillGapState = {
-            "resume_text": resume_text,
-            "filename": filename,
-            "questionnaire_answers": questionnaire_answers,
-        }
+        fingerprint = skill_gap_fingerprint(resume_text, sections, questionnaire_answers)
+        if use_cache:
+            cached = get_cached_result(fingerprint)
+            if cached is not None:
+                logger.info(f"Skill gap cache hit for {filename or 'resume'}")
+                return cached
+
+        result = skill_gap_workflow.invoke(_initial_state(resume_text, filename, sections, questionnaire_answers))
 
-        # Feed structured sections when available
-        if sections:
-            initial_state["skills_text"] = sections.get("skills") or None
-            initial_state["projects_text"] = sections.get("projects") or None
-            initial_state["experience_text"] = (
-                sections.get("experience")
-                or sections.get("work_experience")
-                or None
-            )
-        
-        # Run the workflow
-        result = skill_gap_workflow.invoke(initial_state)
-        
         # Always return results, even if there's an error flag (for graceful degradation)
-        return {
-            "user_skills": result.get("user_skills", []),
-            "normalized_skills": result.get("normalized_skills", []),
-            "total_skills_found": result.get("total_skills_found", 0),
-            "target_role": result.get("target_role"),
-            "selected_cluster_source": result.get("selected_cluster_source"),
-            "selected_cluster_confidence": result.get("selected_cluster_confidence"),
-            "timeline_weeks": result.get("timeline_weeks"),
-            "skill_proficiency": result.get("skill_proficiency", {}),
-            "skill_confidence_levels": result.get("skill_confidence_levels", {
-                "high_confidence": [],
-                "medium_confidence": [],
-                "low_confidence": [],
-            }),
-            "skill_confidence_details": result.get("skill_confidence_details", []),
-            "gap_buckets": result.get("gap_buckets", {}),
-            "resume_optimizer_skills": result.get("resume_optimizer_skills", []),
-            "study_planner_skills": result.get("study_planner_skills", []),
-            "out_of_scope_skills": result.get("out_of_scope_skills", []),
-            "timeline_note": result.get("timeline_note"),
-            "selected_target_career_match": result.get("selected_target_career_match"),
-            "career_matches": result.get("career_matches", []),
-            "top_3_careers": result.get("top_3_careers", []),
-            "ai_recommendations": result.get("ai_recommendations", ""),
-            "analysis_summary": result.get("analysis_summary", {})
-        }
+        analysis = _to_result(result)
+        if not result.get("error"):
+            store_result(fingerprint, analysis)
+        return analysis
     
     except Exception as e:
         return {
             "error": f"Analysis failed: {str(e)}"
         }
+
+
+def _skills_payload(result: dict, provisional: bool = False) -> dict:
+    return {
+        "provisional": provisional,
+        "user_skills": result.get("user_skills", []),
+        "normalized_skills": result.get("normalized_skills", []),
+        "total_skills_found": result.get("total_skills_found", 0),
+        "skill_confidence_levels": result.get("skill_confidence_levels", {}),
+        "skill_confidence_details": result.get("skill_confidence_details", []),
+    }
+
+
+def _careers_payload(result: dict, provisional: bool) -> dict:
+    return {
+        "provisional": provisional,
+        "target_role": result.get("target_role"),
+        "selected_cluster_source": result.get("selected_cluster_source"),
+        "career_matches": result.get("career_matches", []),
+        "top_3_careers": result.get("top_3_careers", []),
+        "selected_target_career_match": result.get("selected_target_career_match"),
+        "timeline_note": result.get("timeline_note"),
+    }
+
+
+def _gaps_payload(result: dict) -> dict:
+    return {
+        "gap_buckets": result.get("gap_buckets", {}),
+        "skill_proficiency": result.get("skill_proficiency", {}),
+        "study_planner_skills": result.get("study_planner_skills", []),
+        "resume_optimizer_skills": result.get("resume_optimizer_skills", []),
+        "out_of_scope_skills": result.get("out_of_scope_skills", []),
+        "timeline_weeks": result.get("timeline_weeks"),
+    }
+
+
+def _text_chunks(text: str, size: int = REPLAY_CHUNK_CHARS) -> Iterator[str]:
+    """``text`` in pieces of about ``size`` characters, split after whitespace."""
+    chunk = ""
+    for word in _REPLAY_WORD.findall(text or ""):
+        chunk += word
+        if len(chunk) >= size:
+            yield chunk
+            chunk = ""
+    if chunk:
+        yield chunk
+
+
+def _quick_events(state: SkillGapState) -> Iterator[tuple[str, dict]]:
+    """Regex skills and matrix career scores; no LLM call."""
+    quick = deterministic_skills(state)
+    yield "skills", _skills_payload(quick, provisional=True)
+    yield "career_probabilities", _careers_payload(deterministic_career_probabilities(quick), provisional=True)
+
+
+def stream_skill_gap(
+    resume_text: str,
+    filename: str | None = None,
+    sections: dict | None = None,
+    questionnaire_answers: dict | None = None,
+    use_cache: bool = True,
+    load_sections: Callable[[], dict | None] | None = None,
+) -> Iterator[tuple[str, dict]]:
+    """
+    Progressive analyze_skill_gap: runs the same nodes in order and yields
+    ``(event, payload)`` as each piece is ready:
+
+      skills                 extracted skills with confidence: first the
+                             regex pass (provisional=True), then the LLM's
+      career_probabilities   deterministic matrix scores (provisional=True)
+                             for each skill set, then the LLM matches
+      gap_buckets            gaps for the selected career
+      recommendations_token  AI recommendation text chunks
+      complete               the same dict analyze_skill_gap returns
+      error                  {"error": ...}; the stream ends
+
+    The provisional events go out before any LLM call. ``load_sections``
+    (used when ``sections`` is None) defers section parsing until after
+    them. A cache hit replays the final events at once, with the
+    recommendation text in chunks.
+    """
+    try:
+        quick_sent = False
+        if sections is None and load_sections is not None:
+            yield from _quick_events(_initial_state(resume_text, filename, None, questionnaire_answers))
+            quick_sent = True
+            sections = load_sections()
+
+        fingerprint = skill_gap_fingerprint(resume_text, sections, questionnaire_answers)
+        cached = get_cached_result(fingerprint) if use_cache else None
+        if cached is not None:
+            logger.info(f"Skill gap cache hit for {filename or 'resume'}")
+            yield "skills", _skills_payload(cached)
+            yield "career_probabilities", _careers_payload(cached, provisional=False)
+            yield "gap_buckets", _gaps_payload(cached)
+            for token in _text_chunks(cached.get("ai_recommendations", "")):
+                yield "recommendations_token", {"token": token}
+            yield "complete", cached
+            return
+
+        state = _initial_state(resume_text, filename, sections, questionnaire_answers)
+        if not quick_sent:
+            yield from _quick_events(state)
+        state = extract_skills_node(state)
+        yield "skills", _skills_payload(state)
+
+        yield "career_probabilities", _careers_payload(deterministic_career_probabilities(state), provisional=True)
+        state = calculate_career_probabilities_node(state)
+        yield "career_probabilities", _careers_payload(state, provisional=False)
+        yield "gap_buckets", _gaps_payload(state)
+
+        chunks = []
+        for token in stream_ai_recommendations(state):
+            chunks.append(token)
+            yield "recommendations_token", {"token": token}
+        state = compile_results_node({**state, "ai_recommendations": "".join(chunks)})
+
+        result = _to_result(state)
+        if not state.get("error"):
+            store_result(fingerprint, result)
+        yield "complete", result
+
+    except Exception as e:
+        logger.error(f"Streaming skill gap analysis failed: {e}")
+        yield "error", {"error": f"Analysis failed: {str(e)}"}
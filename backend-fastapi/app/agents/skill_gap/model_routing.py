@@ -0,0 +1,188 @@
+"""
+Adaptive model tiering for the skill-gap LLM calls.
+
+Career matching and the recommendations text used to always run on the 70B
+model. Most inputs — a short resume with one clear stack — are handled just
+as well by the 8B model at a fraction of the latency, so each call is routed:
+
+  1. estimate_difficulty() scores the input in [0, 1] from
+       - size:        estimated prompt tokens / SIZE_SCALE_TOKENS
+       - spread:      dispersion of the per-skill evidence scores (mixed
+                      strong/weak evidence needs more judgement)
+       - ambiguity:   how close the runner-up detected stack is to the top one
+                      (1.0 when no stack is detected)
+  2. Below ROUTING_THRESHOLD the small model is tried first, otherwise the
+     large one.
+  3. The caller's validator parses the output against its schema and returns
+     a confidence in [0, 1]. An invalid output, an API error, or a confidence
+     below MIN_CONFIDENCE escalates to the large model; a large-model failure
+     propagates to the caller's existing fallback.
+
+Every decision is logged. Setting SKILL_GAP_ROUTING_LOG also appends it as
+one JSON line to that file (features, first model, outcome, escalation
+reason, latencies) for offline evaluation of the threshold; the file is
+rotated to "<path>.1" once it reaches ROUTING_LOG_MAX_BYTES.
+SKILL_GAP_MODEL_ROUTING=0 sends everything to the large model.
+"""
+
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Iterable, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SKILL_GAP_MODEL_ROUTING = os.getenv("SKILL_GAP_MODEL_ROUTING", "1") != "0"
+ROUTING_THRESHOLD = float(os.getenv("SKILL_GAP_ROUTING_THRESHOLD", "0.45"))
+MIN_CONFIDENCE = float(os.getenv("SKILL_GAP_ROUTING_MIN_CONFIDENCE", "0.5"))
+# Opt-in decision log, e.g. SKILL_GAP_ROUTING_LOG=.cache/skill_gap_routing.jsonl
+ROUTING_LOG_PATH = os.getenv("SKILL_GAP_ROUTING_LOG", "")
+ROUTING_LOG_MAX_BYTES = int(os.getenv("SKILL_GAP_ROUTING_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+
+SIZE_SCALE_TOKENS = 2500
+SPREAD_SCALE = 3.0
+WEIGHTS = {"size": 0.4, "spread": 0.3, "ambiguity": 0.3}
+
+
+@dataclass(frozen=True)
+class Difficulty:
+    score: float
+    input_tokens: int
+    spread: float
+    ambiguity: float
+
+
+def estimate_difficulty(
+    input_tokens: int,
+    confidence_details: Iterable[Mapping[str, Any]] = (),
+    detected_stacks: Iterable[Mapping[str, Any]] = (),
+) -> Difficulty:
+    """Difficulty in [0, 1] from prompt size, evidence spread and stack ambiguity."""
+    size = min(1.0, input_tokens / SIZE_SCALE_TOKENS)
+
+    scores = [float(d.get("score") or 0) for d in confidence_details if isinstance(d, Mapping)]
+    spread = min(1.0, statistics.pstdev(scores) / SPREAD_SCALE) if len(scores) > 1 else 0.5
+
+    stack_conf = sorted((float(s.get("confidence") or 0) for s in detected_stacks), reverse=True)
+    if not stack_conf or stack_conf[0] <= 0:
+        ambiguity = 1.0
+    elif len(stack_conf) == 1:
+        ambiguity = 0.0
+    else:
+        ambiguity = stack_conf[1] / stack_conf[0]
+
+    score = WEIGHTS["size"] * size + WEIGHTS["spread"] * spread + WEIGHTS["ambiguity"] * ambiguity
+    return Difficulty(
+        score=round(score, 3),
+        input_tokens=int(input_tokens),
+        spread=round(spread, 3),
+        ambiguity=round(ambiguity, 3),
+    )
+
+
+class ModelRouter:
+    """Cheapest-adequate-model routing with validation-driven escalation."""
+
+    def __init__(
+        self,
+        small_model: str,
+        large_model: str,
+        threshold: float = ROUTING_THRESHOLD,
+        min_confidence: float = MIN_CONFIDENCE,
+        log_path: Optional[str] = ROUTING_LOG_PATH,
+        enabled: bool = SKILL_GAP_MODEL_ROUTING,
+        log_max_bytes: int = ROUTING_LOG_MAX_BYTES,
+    ):
+        self.small_model = small_model
+        self.large_model = large_model
+        self.threshold = threshold
+        self.min_confidence = min_confidence
+        self.log_path = log_path
+        self.log_max_bytes = log_max_bytes
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+    def choose(self, difficulty: Difficulty) -> str:
+        if self.enabled and difficulty.score < self.threshold:
+            return self.small_model
+        return self.large_model
+
+    def run(
+        self,
+        task: str,
+        difficulty: Difficulty,
+        call: Callable[[str], Any],
+        validate: Callable[[Any], Tuple[Any, float]],
+    ) -> Any:
+        """
+        ``call(model)`` returns the raw output; ``validate(raw)`` returns
+        ``(parsed, confidence)`` or raises on a schema violation.
+        """
+        model = self.choose(difficulty)
+        started = time.perf_counter()
+        reason = None
+        confidence = None
+        try:
+            parsed, confidence = validate(call(model))
+            if model == self.large_model or confidence >= self.min_confidence:
+                self.record(task, difficulty, model, model, None, confidence, started, first_latency=None)
+                return parsed
+            reason = "low_confidence"
+        except Exception as exc:
+            if model == self.large_model:
+                self.record(task, difficulty, model, None, f"error: {exc}", None, started, first_latency=None)
+                raise
+            reason = f"invalid: {exc}"
+
+        first_latency = time.perf_counter() - started
+        try:
+            parsed, final_confidence = validate(call(self.large_model))
+        except Exception:
+            self.record(task, difficulty, model, None, reason, confidence, started, first_latency)
+            raise
+        self.record(task, difficulty, model, self.large_model, reason, final_confidence, started, first_latency)
+        return parsed
+
+    def record(
+        self,
+        task: str,
+        difficulty: Difficulty,
+        first_model: str,
+        final_model: Optional[str],
+        escalation: Optional[str],
+        confidence: Optional[float],
+        started: float,
+        first_latency: Optional[float],
+    ) -> None:
+        """Log one routing decision and append it to the JSONL log, if enabled."""
+        entry = {
+            "ts": time.time(),
+            "task": task,
+            **asdict(difficulty),
+            "threshold": self.threshold,
+            "first_model": first_model,
+            "final_model": final_model,
+            "escalation": escalation,
+            "confidence": None if confidence is None else round(float(confidence), 3),
+            "first_latency_s": None if first_latency is None else round(first_latency, 3),
+            "latency_s": round(time.perf_counter() - started, 3),
+        }
+        logger.info(
+            f"[MODEL_ROUTING] {task}: difficulty={difficulty.score} first={first_model} "
+            f"final={final_model} escalation={escalation}"
+        )
+        if not self.log_path:
+            return
+        try:
+            with self._lock:
+                os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                if os.path.exists(self.log_path) and os.path.getsize(self.log_path) >= self.log_max_bytes:
+                    os.replace(self.log_path, self.log_path + ".1")
+                with open(self.log_path, "a", encoding="utf-8") as fh:
+                    fh.write(json.dumps(entry) + "\n")
+        except OSError as exc:
+            logger.warning(f"[MODEL_ROUTING] Could not write routing log: {exc}")
@@ -8,17 +8,29 @@ import re
 import json
 import os
 import logging
+import time
 from enum import Enum
 from datetime import datetime
+from typing import Iterator
 from dotenv import load_dotenv
+from .career_matching import CareerMatcher
+from .career_reference import CareerReferenceStore
+from .model_routing import ModelRouter, estimate_difficulty
 from .state import SkillGapState, CareerMatch, SkillConfidenceItem, AnalysisSummary
-from app.agents.llm_config import GROQ_CLIENT as client, GROQ_SKILLGAP_MODEL
+from app.agents.llm_config import GROQ_CLIENT as client, GROQ_DEFAULT_MODEL, GROQ_SKILLGAP_MODEL, LLM_SLOTS
+from app.services.chunking import estimate_tokens
+from app.services.prompt_compaction import PromptSlot, compact_slots
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+# "0" skips the LLM career matcher and serves the deterministic matrix scores.
+SKILL_GAP_LLM_MATCHING = os.getenv("SKILL_GAP_LLM_MATCHING", "1") != "0"
+# "0" sends every career cluster to the matcher instead of the stack-relevant ones.
+SKILL_GAP_COMPACT_REFERENCE = os.getenv("SKILL_GAP_COMPACT_REFERENCE", "1") != "0"
+
 CLUSTER_CONFIDENCE_THRESHOLD = 0.65
 LOW_PROFICIENCY_THRESHOLD = 1
 
@@ -454,21 +466,26 @@ def _resolve_target_role(questionnaire_answers: dict | None) -> str | None:
 
 def _get_reference_skills_for_career(career_name: str) -> list[str]:
     """Return canonical skills for a career using normalized-name matching."""
-    if not career_name:
+    canonical_name = _canonical_career_name(career_name)
+    if not canonical_name:
         return []
+    skills = CAREER_CLUSTERS[canonical_name].get("skills")
+    if isinstance(skills, list):
+        return [s for s in skills if isinstance(s, str)]
+    return []
 
-    direct = CAREER_CLUSTERS.get(career_name, {}).get("skills")
-    if isinstance(direct, list) and direct:
-        return [s for s in direct if isinstance(s, str)]
 
+def _canonical_career_name(career_name: str | None) -> str | None:
+    """The CAREER_CLUSTERS key matching *career_name* by normalized name."""
+    if not career_name:
+        return None
+    if career_name in CAREER_CLUSTERS:
+        return career_name
     target_norm = _normalize_role(career_name)
-    for canonical_name, data in CAREER_CLUSTERS.items():
+    for canonical_name in CAREER_CLUSTERS:
         if _normalize_role(canonical_name) == target_norm:
-            skills = data.get("skills")
-            if isinstance(skills, list):
-                return [s for s in skills if isinstance(s, str)]
-            return []
-    return []
+            return canonical_name
+    return None
 
 
 _PRIMARY_LANGUAGE_SKILLS = {
@@ -1083,6 +1100,86 @@ def get_career_skills_for_stack(career: str, stack: str) -> list[str]:
     return filtered
 
 
+# Deterministic matcher over the tables above (see career_matching.py).
+_career_matcher = CareerMatcher(
+    CAREER_CLUSTERS,
+    learning_days=SKILL_LEARNING_TIME,
+    normalize=_normalize_skill,
+    stack_skills=get_career_skills_for_stack,
+)
+
+# Prompt renderings of the same tables (see career_reference.py).
+_career_references = CareerReferenceStore(
+    CAREER_CLUSTERS,
+    TECH_STACKS,
+    stack_skills=get_career_skills_for_stack,
+    normalize=_normalize_skill,
+    overrides=CAREER_STACK_OVERRIDES,
+)
+_career_references.warm()
+
+# 8B first for easy inputs, 70B for hard ones or on escalation (see model_routing.py).
+_model_router = ModelRouter(GROQ_DEFAULT_MODEL, GROQ_SKILLGAP_MODEL)
+MIN_VALID_CAREERS = 3
+MIN_RECOMMENDATION_CHARS = 300
+
+
+def _routing_difficulty(state: SkillGapState, input_tokens: int):
+    return estimate_difficulty(
+        input_tokens,
+        confidence_details=state.get("skill_confidence_details", []) or [],
+        detected_stacks=detect_primary_stacks(state.get("user_skills", [])),
+    )
+
+
+def _validate_career_payload(raw: str, expected_careers: list[str]) -> tuple[list, float]:
+    """
+    Schema check for the matcher output. Confidence is the share of the
+    model's top 3 careers that the deterministic matcher also ranks highly
+    (careers outside CAREER_CLUSTERS count half).
+    """
+    parsed = _extract_json_payload(raw)
+    if not isinstance(parsed, list) or not parsed:
+        raise ValueError("LLM returned empty or invalid career_matches payload")
+
+    def _probability(item: dict) -> float | None:
+        try:
+            return float(item.get("probability", item.get("skill_match_percentage")))
+        except (TypeError, ValueError):
+            return None
+
+    valid = [
+        item for item in parsed
+        if isinstance(item, dict)
+        and str(item.get("career") or "").strip()
+        and _probability(item) is not None
+        and all(
+            isinstance(item.get(field, []), list)
+            for field in ("matched_skills", "missing_skills", "needs_improvement_skills")
+        )
+    ]
+    if len(valid) < min(MIN_VALID_CAREERS, len(parsed)) or len(valid) * 2 < len(parsed):
+        raise ValueError(f"Only {len(valid)} of {len(parsed)} career matches follow the schema")
+
+    expected = set(expected_careers)
+    top = sorted(valid, key=lambda item: -_probability(item))[:3]
+    agreement = []
+    for item in top:
+        canonical = _canonical_career_name(str(item["career"]).strip())
+        agreement.append(0.5 if canonical is None else float(canonical in expected))
+    return parsed, sum(agreement) / len(agreement)
+
+
+def _validate_ai_recommendations(text: str, top_career: str | None) -> tuple[str, float]:
+    """Recommendations must be substantive; confidence drops if the top career isn't addressed."""
+    text = text or ""
+    if len(text.strip()) < MIN_RECOMMENDATION_CHARS:
+        raise ValueError(f"Recommendations too short ({len(text.strip())} chars)")
+    if top_career and top_career.lower() not in text.lower():
+        return text, 0.4
+    return text, 1.0
+
+
 _NON_SKILL_MARKERS = {
     "leadership",
     "extracurricular",
@@ -1472,20 +1569,21 @@ def extract_skills_from_resume(
             f"{input_block}"
         )
 
-        completion = client.chat.completions.create(
-            model=GROQ_SKILLGAP_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a precise resume-skill extractor. "
-                        "Respond ONLY with a JSON array of strings. No commentary."
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.0,
-        )
+        with LLM_SLOTS:
+            completion = client.chat.completions.create(
+                model=GROQ_SKILLGAP_MODEL,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": (
+                            "You are a precise resume-skill extractor. "
+                            "Respond ONLY with a JSON array of strings. No commentary."
+                        ),
+                    },
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.0,
+            )
 
         raw = (completion.choices[0].message.content or "").strip()
         if not raw:
@@ -1518,13 +1616,34 @@ def extract_skills_from_resume(
     except Exception as e:
         logger.warning(f"LLM skill extraction failed, falling back to regex: {e}")
 
-    # ── Fallback: regex matching against CAREER_CLUSTERS ──
+    return extract_skills_deterministic(
+        skills_text=skills_text,
+        projects_text=projects_text,
+        experience_text=experience_text,
+        resume_text=resume_text,
+        profile_context=profile_context,
+    )
+
+
+def extract_skills_deterministic(
+    skills_text: str | None = None,
+    projects_text: str | None = None,
+    experience_text: str | None = None,
+    resume_text: str | None = None,
+    profile_context: dict | None = None,
+) -> list[str]:
+    """
+    Regex matching against CAREER_CLUSTERS skills, grounded like the LLM
+    output. The LLM extractor's fallback, and the instant first pass of
+    stream_skill_gap.
+    """
+    profile_blocks = _skills_from_profile(profile_context)
     fallback_text = skills_text or projects_text or resume_text or ""
     fallback = _regex_extract_skills(fallback_text)
     if profile_blocks.get("skills"):
         fallback = _normalize_extracted_skill_tokens(fallback + [str(s) for s in profile_blocks.get("skills", [])])
 
-    validated_fallback = _validate_and_ground_skills(
+    return _validate_and_ground_skills(
         candidates=fallback,
         skills_text=skills_text,
         projects_text=projects_text,
@@ -1532,7 +1651,6 @@ def extract_skills_from_resume(
         resume_text=resume_text,
         profile_blocks=profile_blocks,
     )
-    return validated_fallback
 
 
 # Short skill names (≤2 chars) that need stricter matching context
@@ -1587,19 +1705,7 @@ def _build_career_reference(preferred_tech_stack: str | None = None) -> str:
     Build a compact text summary of CAREER_CLUSTERS for the LLM prompt.
     If preferred_tech_stack is provided, filters skills to match the stack.
     """
-    lines = []
-    for career, data in CAREER_CLUSTERS.items():
-        # Filter skills by tech stack if preference is provided
-        if preferred_tech_stack and preferred_tech_stack != "no_preference":
-            skills = get_career_skills_for_stack(career, preferred_tech_stack)
-            if not skills:  # No specific override, use default filter
-                skills = data["skills"]
-        else:
-            skills = data["skills"]
-        
-        skills_str = ", ".join(skills)
-        lines.append(f"- {career}: {skills_str}")
-    return "\n".join(lines)
+    return _career_references.get(preferred_tech_stack).text
 
 
 def _contains_skill(text: str, skill: str) -> bool:
@@ -1756,52 +1862,67 @@ def _classify_skill_confidence(
     return levels, details
 
 
+def _with_skills(state: SkillGapState, user_skills: list[str]) -> SkillGapState:
+    """State with ``user_skills`` and their confidence / normalized forms."""
+    confidence_levels, confidence_details = _classify_skill_confidence(
+        user_skills=user_skills,
+        skills_text=state.get("skills_text"),
+        projects_text=state.get("projects_text"),
+        experience_text=state.get("experience_text"),
+        resume_text=state.get("resume_text"),
+    )
+    normalized_skills = []
+    for item in confidence_details:
+        level = item.get("level")
+        proficiency = 3 if level == "high_confidence" else (2 if level == "medium_confidence" else 1)
+        normalized_skills.append(
+            {
+                "skill": item.get("skill", ""),
+                "normalized": _normalize_role(item.get("skill", "")),
+                "proficiency": proficiency,
+                "confidence_level": level,
+                "competency_type": item.get("competency_type", "technical_skill"),
+            }
+        )
+    return {
+        **state,
+        "user_skills": user_skills,
+        "normalized_skills": normalized_skills,
+        "total_skills_found": len(user_skills),
+        "skill_confidence_levels": confidence_levels,
+        "skill_confidence_details": confidence_details,
+    }
+
+
+def _skill_sources(state: SkillGapState) -> dict:
+    questionnaire_answers = state.get("questionnaire_answers") or {}
+    user_profile = questionnaire_answers.get("user_profile") if isinstance(questionnaire_answers, dict) else None
+    return {
+        "skills_text": state.get("skills_text"),
+        "projects_text": state.get("projects_text"),
+        "experience_text": state.get("experience_text"),
+        "resume_text": state.get("resume_text"),
+        "profile_context": user_profile,
+    }
+
+
+def deterministic_skills(state: SkillGapState) -> SkillGapState:
+    """
+    Instant skill extraction (regex over the cluster skills, no LLM call) for
+    stream_skill_gap's provisional first events.
+    """
+    return _with_skills(state, extract_skills_deterministic(**_skill_sources(state)))
+
+
 def extract_skills_node(state: SkillGapState) -> SkillGapState:
     """
     Node: Extract skills from the skills section + project stack.
     Falls back to full resume text when sections aren't available.
     """
     try:
-        questionnaire_answers = state.get("questionnaire_answers") or {}
-        user_profile = questionnaire_answers.get("user_profile") if isinstance(questionnaire_answers, dict) else None
-
-        user_skills = extract_skills_from_resume(
-            skills_text=state.get("skills_text"),
-            projects_text=state.get("projects_text"),
-            experience_text=state.get("experience_text"),
-            resume_text=state.get("resume_text"),
-            profile_context=user_profile,
-        )
-        confidence_levels, confidence_details = _classify_skill_confidence(
-            user_skills=user_skills,
-            skills_text=state.get("skills_text"),
-            projects_text=state.get("projects_text"),
-            experience_text=state.get("experience_text"),
-            resume_text=state.get("resume_text"),
-        )
-        normalized_skills = []
-        for item in confidence_details:
-            level = item.get("level")
-            proficiency = 3 if level == "high_confidence" else (2 if level == "medium_confidence" else 1)
-            normalized_skills.append(
-                {
-                    "skill": item.get("skill", ""),
-                    "normalized": _normalize_role(item.get("skill", "")),
-                    "proficiency": proficiency,
-                    "confidence_level": level,
-                    "competency_type": item.get("competency_type", "technical_skill"),
-                }
-            )
+        user_skills = extract_skills_from_resume(**_skill_sources(state))
         logger.info(f"Extracted {len(user_skills)} skills from resume")
-
-        return {
-            **state,
-            "user_skills": user_skills,
-            "normalized_skills": normalized_skills,
-            "total_skills_found": len(user_skills),
-            "skill_confidence_levels": confidence_levels,
-            "skill_confidence_details": confidence_details,
-        }
+        return _with_skills(state, user_skills)
     except Exception as e:
         logger.error(f"Error extracting skills: {str(e)}")
         return {
@@ -1819,13 +1940,128 @@ def extract_skills_node(state: SkillGapState) -> SkillGapState:
         }
 
 
+def _missing_skills_metadata(
+    career_name: str,
+    matched: list[str],
+    missing: list[str],
+    improve: list[str],
+    proficiency_map: dict[str, int],
+    confidence_by_skill: dict[str, SkillConfidenceItem],
+) -> list[dict]:
+    metadata = []
+    for bucket, skills in (
+        (GapBucket.CRITICAL_BLOCKER.value, missing),
+        (GapBucket.PARTIAL_GAP.value, improve),
+    ):
+        for skill in skills:
+            detail = confidence_by_skill.get(_normalize_skill(skill))
+            metadata.append(
+                {
+                    "skill": skill,
+                    "bucket": bucket,
+                    "required": True,
+                    "proficiency": int(proficiency_map.get(_normalize_skill(skill), 0)),
+                    **get_skill_learning_metadata(skill),
+                    "reason": _build_gap_reason(
+                        career_name=career_name,
+                        skill=skill,
+                        bucket=bucket,
+                        matched_skills=matched,
+                        required=True,
+                        evidence_item=detail,
+                    ),
+                }
+            )
+    return metadata
+
+
+def _finalize_career_matches(
+    state: SkillGapState,
+    career_matches: list[CareerMatch],
+    target_role: str,
+    proficiency_map: dict[str, int],
+    timeline_weeks: int | None,
+    source: str,
+    confidence: float,
+    timeline_note: str | None = None,
+) -> SkillGapState:
+    """Sort matches, pick the target career and derive gap buckets / planner skills."""
+    career_matches.sort(key=lambda x: x.get("probability", 0), reverse=True)
+
+    selected_match = next(
+        (cm for cm in career_matches if _normalize_role(cm.get("career", "")) == _normalize_role(target_role)),
+        None,
+    )
+    if not selected_match:
+        # Target role is not one of the clusters (e.g. the default role):
+        # report the best match as the target so the two stay consistent.
+        selected_match = career_matches[0]
+        target_role = selected_match.get("career", target_role)
+
+    critical_bucket = []
+    partial_bucket = []
+    for skill in selected_match.get("missing_skills", []):
+        critical_bucket.append(
+            {
+                "skill": skill,
+                "required": True,
+                "proficiency": int(proficiency_map.get(_normalize_skill(skill), 0)),
+                **get_skill_learning_metadata(skill),
+            }
+        )
+    for skill in selected_match.get("needs_improvement_skills", []):
+        partial_bucket.append(
+            {
+                "skill": skill,
+                "required": True,
+                "proficiency": int(proficiency_map.get(_normalize_skill(skill), 0)),
+                **get_skill_learning_metadata(skill),
+            }
+        )
+
+    gap_buckets = {
+        GapBucket.CRITICAL_BLOCKER.value: critical_bucket,
+        GapBucket.PARTIAL_GAP.value: partial_bucket,
+        GapBucket.OPPORTUNITY.value: [],
+        GapBucket.RESUME_GAP.value: [],
+    }
+
+    study_planner_skills = []
+    seen_planner = set()
+    for skill in (selected_match.get("missing_skills", []) + selected_match.get("needs_improvement_skills", [])):
+        norm = _normalize_skill(skill)
+        if norm and norm not in seen_planner:
+            seen_planner.add(norm)
+            study_planner_skills.append(skill)
+
+    return {
+        **state,
+        "career_matches": career_matches,
+        "top_3_careers": career_matches[:3],
+        "target_role": target_role,
+        "selected_cluster_source": source,
+        "selected_cluster_confidence": confidence,
+        "timeline_weeks": timeline_weeks,
+        "skill_proficiency": proficiency_map,
+        "gap_buckets": gap_buckets,
+        "resume_optimizer_skills": [],
+        "study_planner_skills": study_planner_skills,
+        "out_of_scope_skills": [],
+        "timeline_note": timeline_note,
+        "selected_target_career_match": selected_match,
+    }
+
+
 def calculate_career_probabilities_node(state: SkillGapState) -> SkillGapState:
     """
     Node: LLM-only career matching based on extracted skills + user preferences.
 
     This intentionally avoids strict hardcoded cluster scoring so recommendations
-    are generated directly by the model from the user's context.
+    are generated directly by the model from the user's context. With
+    SKILL_GAP_LLM_MATCHING=0 the deterministic matrix scores are served instead.
     """
+    if not SKILL_GAP_LLM_MATCHING:
+        return deterministic_career_probabilities(state)
     try:
         user_skills = state.get("user_skills", [])
         questionnaire_answers = state.get("questionnaire_answers", {})
@@ -1833,7 +2069,6 @@ def calculate_career_probabilities_node(state: SkillGapState) -> SkillGapState:
         if isinstance(questionnaire_answers, dict):
             preferred_tech_stack = questionnaire_answers.get("preferred_tech_stack")
         effective_stack, _ = _resolve_effective_tech_stack(preferred_tech_stack, user_skills)
-        career_reference = _build_career_reference(effective_stack)
         timeline_weeks = _extract_timeline_weeks(questionnaire_answers)
         proficiency_map = _build_proficiency_map(state, questionnaire_answers)
         confidence_by_skill: dict[str, SkillConfidenceItem] = {}
@@ -1846,6 +2081,26 @@ def calculate_career_probabilities_node(state: SkillGapState) -> SkillGapState:
         if not target_role:
             target_role = "General Software Engineer"
 
+        reference = _career_references.get(
+            effective_stack,
+            detected_stacks=[d["stack"] for d in detect_primary_stacks(user_skills)],
+            compact=SKILL_GAP_COMPACT_REFERENCE,
+            target_career=_canonical_career_name(target_role),
+        )
+        career_reference = reference.text
+        logger.info(
+            f"Career reference: {len(reference.careers)} clusters, ~{reference.tokens} tokens"
+            f"{' (compact)' if reference.compact else ''}"
+        )
+        expected_careers = [
+            match["career"]
+            for match in _career_matcher.score(
+                user_skills,
+                proficiency=proficiency_map,
+                stack=effective_stack if effective_stack in TECH_STACKS else None,
+            )[:5]
+        ]
+
         prompt = f"""You are a career-matching expert.
 
 User skills: {user_skills}
@@ -1874,28 +2129,31 @@ Rules:
 - Be practical and less strict with scoring (do not under-score partially matching profiles).
 """
 
-        completion = client.chat.completions.create(
-            model=GROQ_SKILLGAP_MODEL,
-            messages=[
-                {"role": "system", "content": "Return only JSON. No markdown."},
-                {
-                    "role": "system",
-                    "content": (
-                        "Use this canonical career-skill reference for role grounding. "
-                        "These clusters are authoritative context, not mandatory exact output names.\n"
-                        f"{career_reference}"
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,
+        messages = [
+            {"role": "system", "content": "Return only JSON. No markdown."},
+            {
+                "role": "system",
+                "content": (
+                    "Use this canonical career-skill reference for role grounding. "
+                    "These clusters are authoritative context, not mandatory exact output names.\n"
+                    f"{career_reference}"
+                ),
+            },
+            {"role": "user", "content": prompt},
+        ]
+
+        def _complete(model: str) -> str:
+            with LLM_SLOTS:
+                completion = client.chat.completions.create(model=model, messages=messages, temperature=0.2)
+            return (completion.choices[0].message.content or "").strip()
+
+        parsed = _model_router.run(
+            "career_matching",
+            _routing_difficulty(state, estimate_tokens(prompt) + reference.tokens),
+            call=_complete,
+            validate=lambda raw: _validate_career_payload(raw, expected_careers),
         )
 
-        raw = (completion.choices[0].message.content or "").strip()
-        parsed = _extract_json_payload(raw)
-        if not isinstance(parsed, list) or not parsed:
-            raise ValueError("LLM returned empty or invalid career_matches payload")
-
         user_norm = {_normalize_skill(s) for s in user_skills}
 
         def _dedupe(values: list[str]) -> list[str]:
@@ -1964,45 +2222,9 @@ Rules:
                 skill_match = prob
             skill_match = max(0.0, min(100.0, round(skill_match, 2)))
 
-            missing_metadata = []
-            for skill in missing:
-                detail = confidence_by_skill.get(_normalize_skill(skill))
-                missing_metadata.append(
-                    {
-                        "skill": skill,
-                        "bucket": GapBucket.CRITICAL_BLOCKER.value,
-                        "required": True,
-                        "proficiency": int(proficiency_map.get(_normalize_skill(skill), 0)),
-                        **get_skill_learning_metadata(skill),
-                        "reason": _build_gap_reason(
-                            career_name=career_name,
-                            skill=skill,
-                            bucket=GapBucket.CRITICAL_BLOCKER.value,
-                            matched_skills=matched,
-                            required=True,
-                            evidence_item=detail,
-                        ),
-                    }
-                )
-            for skill in improve:
-                detail = confidence_by_skill.get(_normalize_skill(skill))
-                missing_metadata.append(
-                    {
-                        "skill": skill,
-                        "bucket": GapBucket.PARTIAL_GAP.value,
-                        "required": True,
-                        "proficiency": int(proficiency_map.get(_normalize_skill(skill), 0)),
-                        **get_skill_learning_metadata(skill),
-                        "reason": _build_gap_reason(
-                            career_name=career_name,
-                            skill=skill,
-                            bucket=GapBucket.PARTIAL_GAP.value,
-                            matched_skills=matched,
-                            required=True,
-                            evidence_item=detail,
-                        ),
-                    }
-                )
+            missing_metadata = _missing_skills_metadata(
+                career_name, matched, missing, improve, proficiency_map, confidence_by_skill
+            )
 
             if reference_skills:
                 total_required = len({_normalize_skill(s) for s in reference_skills if _normalize_skill(s)})
@@ -2065,170 +2287,134 @@ Rules:
         if not career_matches:
             raise ValueError("No valid career matches after LLM normalization")
 
-        career_matches.sort(key=lambda x: x.get("probability", 0), reverse=True)
-
-        selected_match = next(
-            (cm for cm in career_matches if _normalize_role(cm.get("career", "")) == _normalize_role(target_role)),
-            None,
+        return _finalize_career_matches(
+            state,
+            career_matches,
+            target_role=target_role,
+            proficiency_map=proficiency_map,
+            timeline_weeks=timeline_weeks,
+            source="llm_direct",
+            confidence=1.0,
         )
-        if not selected_match:
-            selected_match = career_matches[0]
-
-        critical_bucket = []
-        partial_bucket = []
-        for skill in selected_match.get("missing_skills", []):
-            critical_bucket.append(
-                {
-                    "skill": skill,
-                    "required": True,
-                    "proficiency": int(proficiency_map.get(_normalize_skill(skill), 0)),
-                    **get_skill_learning_metadata(skill),
-                }
-            )
-        for skill in selected_match.get("needs_improvement_skills", []):
-            partial_bucket.append(
-                {
-                    "skill": skill,
-                    "required": True,
-                    "proficiency": int(proficiency_map.get(_normalize_skill(skill), 0)),
-                    **get_skill_learning_metadata(skill),
-                }
-            )
-
-        gap_buckets = {
-            GapBucket.CRITICAL_BLOCKER.value: critical_bucket,
-            GapBucket.PARTIAL_GAP.value: partial_bucket,
-            GapBucket.OPPORTUNITY.value: [],
-            GapBucket.RESUME_GAP.value: [],
-        }
-
-        study_planner_skills = []
-        seen_planner = set()
-        for skill in (selected_match.get("missing_skills", []) + selected_match.get("needs_improvement_skills", [])):
-            norm = _normalize_skill(skill)
-            if norm and norm not in seen_planner:
-                seen_planner.add(norm)
-                study_planner_skills.append(skill)
-
-        return {
-            **state,
-            "career_matches": career_matches,
-            "top_3_careers": career_matches[:3],
-            "target_role": target_role,
-            "selected_cluster_source": "llm_direct",
-            "selected_cluster_confidence": 1.0,
-            "timeline_weeks": timeline_weeks,
-            "skill_proficiency": proficiency_map,
-            "gap_buckets": gap_buckets,
-            "resume_optimizer_skills": [],
-            "study_planner_skills": study_planner_skills,
-            "out_of_scope_skills": [],
-            "timeline_note": None,
-            "selected_target_career_match": selected_match,
-        }
 
     except Exception as e:
         logger.warning(f"LLM career matching failed, falling back: {e}")
         return _fallback_career_probabilities(state)
 
 
-def _fallback_career_probabilities(state: SkillGapState) -> SkillGapState:
-    """Fallback: minimal non-strict response if LLM matching is unavailable."""
+def deterministic_career_probabilities(state: SkillGapState) -> SkillGapState:
+    """
+    Instant career matching: one matrix-vector product over the precomputed
+    career × skill weights (see career_matching.py), using the effective tech
+    stack and the user's confidence / self-rated proficiency per skill.
+    """
     user_skills = state.get("user_skills", [])
     questionnaire_answers = state.get("questionnaire_answers", {})
+    preferred_tech_stack = None
+    if isinstance(questionnaire_answers, dict):
+        preferred_tech_stack = questionnaire_answers.get("preferred_tech_stack")
+    effective_stack, _ = _resolve_effective_tech_stack(preferred_tech_stack, user_skills)
     timeline_weeks = _extract_timeline_weeks(questionnaire_answers)
-    target_role = _resolve_target_role(questionnaire_answers)
-
-    if not target_role:
-        target_role = "General Software Engineer"
-
+    target_role = _resolve_target_role(questionnaire_answers) or "General Software Engineer"
     proficiency_map = _build_proficiency_map(state, questionnaire_answers)
-    matched = user_skills[: min(10, len(user_skills))]
-    selected_match: CareerMatch = {
-        "career": target_role,
-        "probability": 55.0,
-        "skill_match_percentage": 55.0,
-        "matched_skills": matched,
-        "missing_skills": [],
-        "needs_improvement_skills": [],
-        "missing_skills_metadata": [],
-        "total_required_skills": max(1, len(matched)),
-        "matched_skills_count": len(matched),
-        "score_summary": "Fallback estimate generated because the LLM career matcher was unavailable. Re-run analysis for a detailed role-by-role explanation.",
-    }
+    confidence_by_skill: dict[str, SkillConfidenceItem] = {}
+    for item in state.get("skill_confidence_details", []) or []:
+        skill_key = _normalize_skill(item.get("skill"))
+        if skill_key:
+            confidence_by_skill[skill_key] = item
+
+    career_matches: list[CareerMatch] = []
+    for match in _career_matcher.score(
+        user_skills,
+        proficiency=proficiency_map,
+        stack=effective_stack if effective_stack in TECH_STACKS else None,
+        low_proficiency=LOW_PROFICIENCY_THRESHOLD,
+    ):
+        match["missing_skills_metadata"] = _missing_skills_metadata(
+            match["career"],
+            match["matched_skills"],
+            match["missing_skills"],
+            match["needs_improvement_skills"],
+            proficiency_map,
+            confidence_by_skill,
+        )
+        match["score_summary"] = _default_score_summary(match)
+        career_matches.append(match)
+
+    top_probability = career_matches[0]["probability"] if career_matches else 0.0
+    return _finalize_career_matches(
+        state,
+        career_matches,
+        target_role=target_role,
+        proficiency_map=proficiency_map,
+        timeline_weeks=timeline_weeks,
+        source="deterministic",
+        confidence=round(top_probability / 100.0, 2),
+    )
 
-    buckets = {
-        GapBucket.CRITICAL_BLOCKER.value: [],
-        GapBucket.PARTIAL_GAP.value: [],
-        GapBucket.OPPORTUNITY.value: [],
-        GapBucket.RESUME_GAP.value: [],
-    }
 
+def _fallback_career_probabilities(state: SkillGapState) -> SkillGapState:
+    """Fallback when the LLM matcher is unavailable: deterministic matrix scores."""
     return {
-        **state,
-        "career_matches": [selected_match],
-        "top_3_careers": [selected_match],
-        "target_role": target_role,
+        **deterministic_career_probabilities(state),
         "selected_cluster_source": "llm_fallback",
         "selected_cluster_confidence": 0.0,
-        "timeline_weeks": timeline_weeks,
-        "skill_proficiency": proficiency_map,
-        "gap_buckets": buckets,
-        "resume_optimizer_skills": [],
-        "study_planner_skills": [],
-        "out_of_scope_skills": [],
         "timeline_note": "LLM unavailable during matching. Results are a temporary fallback.",
-        "selected_target_career_match": selected_match,
     }
 
 
-def get_ai_recommendations_node(state: SkillGapState) -> SkillGapState:
-    """
-    Node: Get AI-powered career recommendations and learning paths.
-    
-    Args:
-        state: The skill gap state.
-        
-    Returns:
-        Updated state with AI recommendations.
-    """
-    try:
-        user_skills = state.get("user_skills", [])
-        top_careers = state.get("career_matches", [])
-        resume_text = state["resume_text"]
-        gap_buckets = state.get("gap_buckets", {})
-        timeline_weeks = state.get("timeline_weeks")
-        timeline_note = state.get("timeline_note")
-        
-        if not top_careers:
-            logger.warning("No career matches to generate recommendations for")
-            return {
-                **state,
-                "ai_recommendations": "Unable to generate recommendations - no career matches found."
-            }
-        
-        top_3_careers = top_careers[:3]
-        careers_summary = "\n".join([
-            f"{i+1}. {career['career']} ({career['probability']}% match) - Missing: {', '.join(career['missing_skills'][:5])}"
-            for i, career in enumerate(top_3_careers)
-        ])
-        critical = [item.get("skill") for item in gap_buckets.get(GapBucket.CRITICAL_BLOCKER.value, [])]
-        partial = [item.get("skill") for item in gap_buckets.get(GapBucket.PARTIAL_GAP.value, [])]
-        opportunity = [item.get("skill") for item in gap_buckets.get(GapBucket.OPPORTUNITY.value, [])]
-        resume_gap = [item.get("skill") for item in gap_buckets.get(GapBucket.RESUME_GAP.value, [])]
-        
-        prompt = f"""Based on this resume analysis:
+_AI_RECOMMENDATIONS_SYSTEM = "You are an expert career counselor and skill development advisor."
+# Estimated-token budget for the skills / careers / gap-bucket context.
+AI_RECOMMENDATIONS_CONTEXT_TOKENS = 700
+NO_CAREER_MATCHES_MESSAGE = "Unable to generate recommendations - no career matches found."
+
+
+def _build_ai_recommendations_prompt(state: SkillGapState) -> str | None:
+    """User prompt for the recommendations call; None when there are no career matches."""
+    user_skills = state.get("user_skills", [])
+    top_careers = state.get("career_matches", [])
+    gap_buckets = state.get("gap_buckets", {})
+    timeline_weeks = state.get("timeline_weeks")
+    timeline_note = state.get("timeline_note")
+
+    if not top_careers:
+        return None
+
+    top_3_careers = top_careers[:3]
+    careers_summary = "\n".join([
+        f"{i+1}. {career['career']} ({career['probability']}% match) - Missing: {', '.join(career['missing_skills'][:5])}"
+        for i, career in enumerate(top_3_careers)
+    ])
+    critical = [item.get("skill") for item in gap_buckets.get(GapBucket.CRITICAL_BLOCKER.value, [])]
+    partial = [item.get("skill") for item in gap_buckets.get(GapBucket.PARTIAL_GAP.value, [])]
+    opportunity = [item.get("skill") for item in gap_buckets.get(GapBucket.OPPORTUNITY.value, [])]
+    resume_gap = [item.get("skill") for item in gap_buckets.get(GapBucket.RESUME_GAP.value, [])]
+
+    gaps_summary = "\n".join([
+        f"- critical_blocker: {critical}",
+        f"- partial_gap: {partial}",
+        f"- opportunity: {opportunity}",
+        f"- resume_gap: {resume_gap}",
+    ])
+    context = compact_slots(
+        [
+            PromptSlot("careers", careers_summary, priority=0),
+            PromptSlot("gaps", gaps_summary, priority=1, min_tokens=120),
+            PromptSlot("skills", ", ".join(user_skills), priority=2, min_tokens=80),
+        ],
+        budget=AI_RECOMMENDATIONS_CONTEXT_TOKENS,
+        site="skill_gap.ai_recommendations",
+    )
+
+    return f"""Based on this resume analysis:
 
-User's Current Skills: {', '.join(user_skills) if user_skills else 'No explicit skills detected'}
+User's Current Skills: {context['skills'] or 'No explicit skills detected'}
 
 Top Career Matches:
-{careers_summary}
+{context['careers']}
 
 Gap Buckets:
-- critical_blocker: {critical}
-- partial_gap: {partial}
-- opportunity: {opportunity}
-- resume_gap: {resume_gap}
+{context['gaps']}
 
 Timeline target: {timeline_weeks or 'not specified'} weeks
 Timeline note: {timeline_note or 'N/A'}
@@ -2242,16 +2428,48 @@ Provide:
 
 Keep the response structured and practical."""
 
+
+def _ai_recommendations_messages(prompt: str) -> list[dict]:
+    return [
+        {"role": "system", "content": _AI_RECOMMENDATIONS_SYSTEM},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def get_ai_recommendations_node(state: SkillGapState) -> SkillGapState:
+    """
+    Node: Get AI-powered career recommendations and learning paths.
+    
+    Args:
+        state: The skill gap state.
+        
+    Returns:
+        Updated state with AI recommendations.
+    """
+    try:
+        prompt = _build_ai_recommendations_prompt(state)
+        if prompt is None:
+            logger.warning("No career matches to generate recommendations for")
+            return {
+                **state,
+                "ai_recommendations": NO_CAREER_MATCHES_MESSAGE
+            }
+
         logger.info("Generating AI recommendations")
-        completion = client.chat.completions.create(
-            model=GROQ_SKILLGAP_MODEL,
-            messages=[
-                {"role": "system", "content": "You are an expert career counselor and skill development advisor."},
-                {"role": "user", "content": prompt},
-            ],
+        messages = _ai_recommendations_messages(prompt)
+        top_career = state["career_matches"][0].get("career")
+
+        def _complete(model: str) -> str:
+            with LLM_SLOTS:
+                completion = client.chat.completions.create(model=model, messages=messages)
+            return completion.choices[0].message.content or ""
+
+        ai_recommendations = _model_router.run(
+            "ai_recommendations",
+            _routing_difficulty(state, estimate_tokens(prompt)),
+            call=_complete,
+            validate=lambda text: _validate_ai_recommendations(text, top_career),
         )
-
-        ai_recommendations = completion.choices[0].message.content or ""
         logger.info("AI recommendations generated successfully")
         
         return {
@@ -2267,6 +2485,61 @@ Keep the response structured and practical."""
         }
 
 
+def stream_ai_recommendations(state: SkillGapState) -> Iterator[str]:
+    """
+    Streaming variant of get_ai_recommendations_node: yields text chunks as
+    the model produces them. A failure before the first chunk is yielded as
+    the same "AI recommendations unavailable" text the node returns; a
+    failure mid-stream is re-raised so the partial text isn't mistaken for a
+    complete answer.
+
+    The model is routed by difficulty like the node, but tokens are already
+    on the wire before the output could be validated, so the only escalation
+    is to the large model when the small one fails before its first chunk.
+    """
+    prompt = _build_ai_recommendations_prompt(state)
+    if prompt is None:
+        yield NO_CAREER_MATCHES_MESSAGE
+        return
+    difficulty = _routing_difficulty(state, estimate_tokens(prompt))
+    first_model = _model_router.choose(difficulty)
+    model = first_model
+    escalation = None
+    started = time.perf_counter()
+    produced = False
+    while True:
+        try:
+            # The slot is held until the stream is drained (or the consumer closes it).
+            with LLM_SLOTS:
+                stream = client.chat.completions.create(
+                    model=model,
+                    messages=_ai_recommendations_messages(prompt),
+                    stream=True,
+                )
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        produced = True
+                        yield delta
+            _model_router.record(
+                "ai_recommendations_stream", difficulty, first_model, model, escalation, None, started, None
+            )
+            return
+        except Exception as e:
+            if not produced and model != _model_router.large_model:
+                escalation = f"error: {e}"
+                model = _model_router.large_model
+                continue
+            logger.error(f"Error streaming AI recommendations: {str(e)}")
+            _model_router.record(
+                "ai_recommendations_stream", difficulty, first_model, None, f"error: {e}", None, started, None
+            )
+            if produced:
+                raise
+            yield f"AI recommendations unavailable: {str(e)}"
+            return
+
+
 def compile_results_node(state: SkillGapState) -> SkillGapState:
     """
     Node: Compile final results and summary.
@@ -13,9 +13,9 @@ Improvements:
 import json
 import logging
 import math
+import os
 import re as _re
 import traceback
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from typing import Optional
 
@@ -23,19 +23,19 @@ import requests
 
 from .state import StudyPlannerState
 from app.agents.llm_config import GEMINI_CLIENT, GEMINI_MODEL, GROQ_CLIENT, GROQ_DEFAULT_MODEL
+from app.services.roadmap_data import ROADMAP_SH_BASE, RoadmapDirectory
+from app.services.study_resource_cache import (
+    FALLBACK_SOURCE,
+    STUDY_RESOURCE_PREWARM_TOP_N,
+    StudyResourceCache,
+    UrlStatusCache,
+)
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-# ────────────────────────────────────────────────────────
-# Roadmap.sh API Integration
-# ────────────────────────────────────────────────────────
-ROADMAP_SH_API = "https://roadmap.sh/api/v1"
-ROADMAP_SH_BASE = "https://roadmap.sh"
-ROADMAP_API_TIMEOUT = 10
-
 # ────────────────────────────────────────────────────────
 # Comprehensive skill → roadmap.sh path mapping
 # Source: https://roadmap.sh (all verified live paths as of 2026)
@@ -249,6 +249,9 @@ SKILL_TO_ROADMAP_ID: dict[str, str] = {
 URL_CHECK_TIMEOUT = 5
 URL_CHECK_MAX_WORKERS = 10
 
+# Serve learning paths from the shared cross-user resource cache
+STUDY_RESOURCE_CACHE_ENABLED = os.getenv("STUDY_RESOURCE_CACHE", "1") != "0"
+
 
 def _get_roadmap_sh_id(skill: str) -> Optional[str]:
     """Get the roadmap.sh roadmap ID for a skill.
@@ -298,36 +301,21 @@ def _get_roadmap_sh_id(skill: str) -> Optional[str]:
 
 def _fetch_roadmap_sh_data(skill: str) -> Optional[dict]:
     """
-    Fetch the JSON roadmap structure from roadmap.sh API.
-    Returns the roadmap data or None if not found.
+    Roadmap metadata (title, url, description, topics) for a skill from the
+    bundled roadmap.sh snapshot. Returns None if the skill has no roadmap.
     """
-    roadmap_id = _get_roadmap_sh_id(skill)
-    if not roadmap_id:
-        return None
-    
-    try:
-        url = f"{ROADMAP_SH_API}/roadmaps/{roadmap_id}.json"
-        response = requests.get(url, timeout=ROADMAP_API_TIMEOUT)
-        if response.status_code == 200:
-            data = response.json()
-            logger.info(f"[Roadmap.sh] Fetched roadmap for {skill} (ID: {roadmap_id})")
-            return data
-    except Exception as e:
-        logger.warning(f"[Roadmap.sh] Failed to fetch roadmap for {skill}: {e}")
-    
-    return None
+    return _roadmaps.get(_roadmaps.resolve_id(skill))
 
 
-def _resolve_roadmap_id_via_llm(skill: str) -> str | None:
+def _resolve_roadmap_id_via_llm(skill: str, slug_options: list[str]) -> str | None:
     """
     Use a lightweight GROQ call to fuzzy-match a skill to the closest
     roadmap.sh path from the authoritative list.
 
-    Only called when the static SKILL_TO_ROADMAP_ID lookup fails.
+    Only called by the roadmap directory on a static-map and cache miss;
+    API errors propagate so they aren't cached as "no roadmap".
     Returns the raw path slug (e.g. 'computer-science') or None.
     """
-    # Flat list of all known slugs derived from SKILL_TO_ROADMAP_ID values
-    slug_options = sorted(set(SKILL_TO_ROADMAP_ID.values()))
     slugs_str = ", ".join(slug_options)
 
     prompt = (
@@ -338,40 +326,37 @@ def _resolve_roadmap_id_via_llm(skill: str) -> str | None:
         "- If no slug is a reasonable match, output: none\n"
         "- Do NOT invent slugs not in the list."
     )
-    try:
-        response = GROQ_CLIENT.chat.completions.create(
-            model=GROQ_DEFAULT_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.0,
-            max_tokens=20,
-        )
-        raw = (response.choices[0].message.content or "").strip().lower()
-        # Validate the returned slug is actually in our known set
-        if raw and raw != "none" and raw in slug_options:
-            logger.info(f"[Roadmap.sh] LLM resolved '{skill}' → slug '{raw}'")
-            return raw
-        logger.info(f"[Roadmap.sh] LLM could not resolve '{skill}' (returned: '{raw}')")
-    except Exception as exc:
-        logger.warning(f"[Roadmap.sh] LLM slug resolution failed for '{skill}': {exc}")
+    response = GROQ_CLIENT.chat.completions.create(
+        model=GROQ_DEFAULT_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.0,
+        max_tokens=20,
+    )
+    raw = (response.choices[0].message.content or "").strip().lower()
+    # Validate the returned slug is actually in our known set
+    if raw and raw != "none" and raw in slug_options:
+        logger.info(f"[Roadmap.sh] LLM resolved '{skill}' → slug '{raw}'")
+        return raw
+    logger.info(f"[Roadmap.sh] LLM could not resolve '{skill}' (returned: '{raw}')")
     return None
 
 
+# Snapshot metadata + persistent skill → roadmap id cache (see roadmap_data.py).
+_roadmaps = RoadmapDirectory(static_lookup=_get_roadmap_sh_id, resolver=_resolve_roadmap_id_via_llm)
+
+
 def _get_roadmap_sh_url(skill: str) -> str:
     """Get the roadmap.sh URL for a skill.
 
     Resolution order:
     1. Static SKILL_TO_ROADMAP_ID map (instant, zero latency)
-    2. LLM fuzzy-match against all known slugs (one fast GROQ call)
-    3. Fallback to /computer-science as a universally useful page
+    2. Cached earlier resolutions, including "no roadmap" answers
+    3. LLM fuzzy-match against the snapshot's slugs (one fast GROQ call, cached)
+    4. Fallback to /computer-science as a universally useful page
     """
-    roadmap_id = _get_roadmap_sh_id(skill)
+    roadmap_id = _roadmaps.resolve_id(skill)
     if roadmap_id:
-        return f"{ROADMAP_SH_BASE}/{roadmap_id}"
-
-    # LLM-powered fuzzy resolution for skills not in the static map
-    llm_id = _resolve_roadmap_id_via_llm(skill)
-    if llm_id:
-        return f"{ROADMAP_SH_BASE}/{llm_id}"
+        return _roadmaps.url_for(roadmap_id)
 
     # Final fallback: computer-science is the most broadly useful roadmap
     logger.info(f"[Roadmap.sh] No roadmap found for '{skill}', using /computer-science fallback")
@@ -748,6 +733,180 @@ def _get_curated_skill_entry(skill: str) -> dict:
     }
 
 
+def _build_skill_learning_path(
+    skill: str,
+    target_career: str,
+    learning_style: str,
+    skill_level: str,
+) -> tuple[list[dict], str]:
+    """
+    Build one skill's ranked learning path (Learn + Practice + Revise).
+
+    Curated high-value resources first, docs links for uncovered steps, and
+    Gemini search-grounded retrieval when nothing curated matched. The
+    result is shared across users (see _study_resources), so the Gemini
+    prompt is personalised by learning style only.
+
+    Returns (learning_path, source) with source "curated", "gemini" or "docs".
+    """
+    from app.services.resource_discovery import (
+        extract_learning_objective,
+        find_high_value_resources,
+        get_learning_stack_template,
+        get_platform_credibility,
+        calculate_overall_rank,
+        resource_metadata_to_dict,
+        ResourceMetadata,
+    )
+
+    objective = extract_learning_objective(
+        skill=skill,
+        career_goal=target_career,
+        user_goal="learn_technology",
+        user_skill_levels={skill: skill_level},
+    )
+
+    # Ideal learning stack template for this skill level + learning style
+    learning_stack_template = get_learning_stack_template(objective, learning_style)  # type: ignore[arg-type]
+
+    # Search for high-value curated resources
+    resource_types = [step["type"] for step in learning_stack_template]
+    curated_resources = find_high_value_resources(skill, resource_types, count_per_type=2)
+
+    learning_path = []
+    used_curated = False
+
+    # Build learning stack from curated resources
+    for stack_step in learning_stack_template:
+        step_num = stack_step["step"]
+        step_label = stack_step["label"]
+        target_type = stack_step["type"]
+
+        # Find the best resource of this type
+        candidates = curated_resources.get(target_type, [])
+
+        if candidates:
+            # Use first candidate (already prioritized in curated DB)
+            title, url, platform, est_time, difficulty = candidates[0]
+            used_curated = True
+
+            # Calculate ranking scores
+            credibility, usability = get_platform_credibility(platform)
+            relevance = 0.95 if target_type == "tutorial_video" and learning_style == "video_tutorials" else 0.90
+            depth = 0.88 if difficulty == "beginner" else 0.92
+            time_fit = 0.85  # User can customize, so default moderate fit
+
+            overall_rank = calculate_overall_rank(relevance, depth, credibility, usability, time_fit)
+
+            resource_meta = ResourceMetadata(
+                step=step_num,
+                label=step_label,
+                type=target_type,
+                title=title,
+                url=url,
+                platform=platform,
+                est_time=est_time,
+                cost="Free",
+                difficulty=difficulty,
+                relevance_score=relevance,
+                depth_score=depth,
+                credibility_score=credibility,
+                usability_score=usability,
+                overall_rank=overall_rank,
+                alt_platforms=[],
+                feedback_signals={"clicks": 0, "completions": 0, "avg_rating": 0.0},
+            )
+
+            learning_path.append(resource_metadata_to_dict(resource_meta))
+            logger.info(
+                f"[Resource Discovery] Skill '{skill}' step {step_num}: "
+                f"'{title}' (platform={platform}, rank={overall_rank:.3f})"
+            )
+        else:
+            logger.warning(
+                f"[Resource Discovery] No curated resource found for {skill} "
+                f"type {target_type}, will use generic fallback"
+            )
+            # Fallback to direct docs link (avoid generic roadmap directory pages)
+            docs_url = _get_doc_url(skill)
+            resource_meta = ResourceMetadata(
+                step=step_num,
+                label=step_label,
+                type="documentation",
+                title=f"Official {skill} Documentation",
+                url=docs_url,
+                platform="Official Docs",
+                est_time="2-3 hours",
+                cost="Free",
+                difficulty="beginner",
+                relevance_score=0.70,
+                depth_score=0.80,
+                credibility_score=0.85,
+                usability_score=0.75,
+                overall_rank=0.77,
+            )
+            learning_path.append(resource_metadata_to_dict(resource_meta))
+
+    if used_curated:
+        return learning_path, "curated"
+    if not GEMINI_CLIENT:
+        return learning_path, FALLBACK_SOURCE
+
+    # Dynamic fallback: use Gemini search-grounded retrieval for uncovered skills
+    from google.genai import types
+
+    gemini_result = _fetch_single_skill(
+        skill,
+        target_career,
+        _build_personalisation_block({"learning_preference": [learning_style]}),
+        _get_roadmap_sh_url(skill),
+        GEMINI_CLIENT,
+        types,
+    )
+    if not gemini_result or not gemini_result.get("learning_path"):
+        return learning_path, FALLBACK_SOURCE
+
+    learning_path = []
+    for step in gemini_result.get("learning_path", []):
+        platform = step.get("platform") or step.get("type") or "General"
+        credibility, usability = get_platform_credibility(platform)
+        relevance = 0.86
+        depth = 0.84
+        overall_rank = calculate_overall_rank(relevance, depth, credibility, usability, 0.82)
+        resource_meta = ResourceMetadata(
+            step=step.get("step") or 1,
+            label=step.get("label") or "Learn",
+            type="documentation",
+            title=step.get("title") or f"{skill} Resource",
+            url=step.get("url") or _get_doc_url(skill),
+            platform=platform,
+            est_time=step.get("est_time") or "2-3 hours",
+            cost=step.get("cost") or "Free",
+            difficulty="beginner",
+            relevance_score=relevance,
+            depth_score=depth,
+            credibility_score=credibility,
+            usability_score=usability,
+            overall_rank=overall_rank,
+            alt_platforms=step.get("alt_platforms") or [],
+            feedback_signals={"clicks": 0, "completions": 0, "avg_rating": 0.0},
+        )
+        learning_path.append(resource_metadata_to_dict(resource_meta))
+    return learning_path, "gemini"
+
+
+# Learning paths depend only on (skill, career bucket, learning style, level),
+# so they are shared across users and refreshed in the background.
+_study_resources = StudyResourceCache(builder=_build_skill_learning_path)
+
+
+def prewarm_study_resources(top_n: int = STUDY_RESOURCE_PREWARM_TOP_N) -> int:
+    """Rebuild the most-requested resource plans that are missing or stale, in the background."""
+    if not STUDY_RESOURCE_CACHE_ENABLED:
+        return 0
+    return _study_resources.prewarm(top_n)
+
+
 def fetch_live_resources_node(state: StudyPlannerState) -> dict:
     """
     Intent-driven resource discovery and ranking pipeline.
@@ -759,6 +918,9 @@ def fetch_live_resources_node(state: StudyPlannerState) -> dict:
     4. Ranks resources by relevance, depth, credibility, usability, and time fit
     5. Creates a curated learning stack (Learn + Practice + Revise)
     6. Falls back to Gemini only for skills not in the curated database
+
+    Steps 2-6 depend only on the skill, career bucket and learning style, so
+    their result comes from the shared study resource cache when available.
     
     This approach eliminates generic topic linking (e.g., roadmap.sh directories)
     in favor of specific, actionable, immediately usable resources.
@@ -795,22 +957,13 @@ def fetch_live_resources_node(state: StudyPlannerState) -> dict:
     if state.get("error"):
         return {}
 
-    from app.services.resource_discovery import (
-        extract_learning_objective,
-        find_high_value_resources,
-        get_learning_stack_template,
-        get_platform_credibility,
-        calculate_overall_rank,
-        resource_metadata_to_dict,
-        ResourceMetadata,
-    )
+    from app.services.resource_discovery import extract_learning_objective
 
     missing_skills = state["missing_skills"]
     target_career = state["target_career"]
     
     # Extract user's learning style and profile from questionnaire
     qa = state.get("questionnaire_answers") or {}
-    personalisation = _build_personalisation_block(qa)
     learning_style_val = (qa.get("learning_preference") or ["mixed"])[0]  # First preference or default
     allowed_learning_styles = ["video_tutorials", "hands_on", "reading", "interactive", "mentor", "mixed"]
     if learning_style_val not in allowed_learning_styles:
@@ -829,16 +982,10 @@ def fetch_live_resources_node(state: StudyPlannerState) -> dict:
         f"user goal: {primary_user_goal}"
     )
 
-    # Build skill recommendations using intent-driven pipeline
-    skill_gap_report: list[dict] = []
-    curated_count = 0
-    gemini_count = 0
-    docs_fallback_count = 0
-
+    # Step 1: Extract each skill's learning objective
+    objectives = {}
     for skill in missing_skills:
         logger.info(f"[Resource Discovery] Processing skill: {skill}")
-        
-        # Step 1: Extract learning objective
         objective = extract_learning_objective(
             skill=skill,
             career_goal=target_career,
@@ -850,135 +997,37 @@ def fetch_live_resources_node(state: StudyPlannerState) -> dict:
             f"[Resource Discovery] Objective: {objective.specific_objective} "
             f"(Level: {objective.skill_level})"
         )
-        
-        # Step 2: Get ideal learning stack template for this skill level + learning style
-        learning_stack_template = get_learning_stack_template(objective, learning_style)  # type: ignore[arg-type]
-        
-        # Step 3: Search for high-value curated resources
-        resource_types = [step["type"] for step in learning_stack_template]
-        curated_resources = find_high_value_resources(skill, resource_types, count_per_type=2)
-        
-        learning_path = []
-        used_curated = False
-        
-        # Step 4: Build learning stack from curated resources
-        for stack_step in learning_stack_template:
-            step_num = stack_step["step"]
-            step_label = stack_step["label"]
-            target_type = stack_step["type"]
-            
-            # Find the best resource of this type
-            candidates = curated_resources.get(target_type, [])
-            
-            if candidates:
-                # Use first candidate (already prioritized in curated DB)
-                title, url, platform, est_time, difficulty = candidates[0]
-                used_curated = True
-                
-                # Calculate ranking scores
-                credibility, usability = get_platform_credibility(platform)
-                relevance = 0.95 if target_type == "tutorial_video" and learning_style == "video_tutorials" else 0.90
-                depth = 0.88 if difficulty == "beginner" else 0.92
-                time_fit = 0.85  # User can customize, so default moderate fit
-                
-                overall_rank = calculate_overall_rank(relevance, depth, credibility, usability, time_fit)
-                
-                resource_meta = ResourceMetadata(
-                    step=step_num,
-                    label=step_label,
-                    type=target_type,
-                    title=title,
-                    url=url,
-                    platform=platform,
-                    est_time=est_time,
-                    cost="Free",
-                    difficulty=difficulty,
-                    relevance_score=relevance,
-                    depth_score=depth,
-                    credibility_score=credibility,
-                    usability_score=usability,
-                    overall_rank=overall_rank,
-                    alt_platforms=[],
-                    feedback_signals={"clicks": 0, "completions": 0, "avg_rating": 0.0},
-                )
-                
-                learning_path.append(resource_metadata_to_dict(resource_meta))
-                logger.info(
-                    f"[Resource Discovery] Skill '{skill}' step {step_num}: "
-                    f"'{title}' (platform={platform}, rank={overall_rank:.3f})"
-                )
-            else:
-                logger.warning(
-                    f"[Resource Discovery] No curated resource found for {skill} "
-                    f"type {target_type}, will use generic fallback"
-                )
-                # Fallback to direct docs link (avoid generic roadmap directory pages)
-                docs_url = _get_doc_url(skill)
-                resource_meta = ResourceMetadata(
-                    step=step_num,
-                    label=step_label,
-                    type="documentation",
-                    title=f"Official {skill} Documentation",
-                    url=docs_url,
-                    platform="Official Docs",
-                    est_time="2-3 hours",
-                    cost="Free",
-                    difficulty="beginner",
-                    relevance_score=0.70,
-                    depth_score=0.80,
-                    credibility_score=0.85,
-                    usability_score=0.75,
-                    overall_rank=0.77,
-                )
-                learning_path.append(resource_metadata_to_dict(resource_meta))
-        
-        if not used_curated and GEMINI_CLIENT:
-            # Dynamic fallback: use Gemini search-grounded retrieval for uncovered skills
-            from google.genai import types
-
-            roadmap_url = _get_roadmap_sh_url(skill)
-            gemini_result = _fetch_single_skill(
-                skill,
-                target_career,
-                personalisation,
-                roadmap_url,
-                GEMINI_CLIENT,
-                types,
-            )
-            if gemini_result and gemini_result.get("learning_path"):
-                learning_path = []
-                for step in gemini_result.get("learning_path", []):
-                    platform = step.get("platform") or step.get("type") or "General"
-                    credibility, usability = get_platform_credibility(platform)
-                    relevance = 0.86
-                    depth = 0.84
-                    overall_rank = calculate_overall_rank(relevance, depth, credibility, usability, 0.82)
-                    resource_meta = ResourceMetadata(
-                        step=step.get("step") or 1,
-                        label=step.get("label") or "Learn",
-                        type="documentation",
-                        title=step.get("title") or f"{skill} Resource",
-                        url=step.get("url") or _get_doc_url(skill),
-                        platform=platform,
-                        est_time=step.get("est_time") or "2-3 hours",
-                        cost=step.get("cost") or "Free",
-                        difficulty="beginner",
-                        relevance_score=relevance,
-                        depth_score=depth,
-                        credibility_score=credibility,
-                        usability_score=usability,
-                        overall_rank=overall_rank,
-                        alt_platforms=step.get("alt_platforms") or [],
-                        feedback_signals={"clicks": 0, "completions": 0, "avg_rating": 0.0},
-                    )
-                    learning_path.append(resource_metadata_to_dict(resource_meta))
-                gemini_count += 1
-            else:
-                docs_fallback_count += 1
-        elif used_curated:
-            curated_count += 1
+        objectives[skill] = objective
+
+    # Only builders need roadmap URLs (for the Gemini prompt), so resolve the
+    # skills the shared cache can't serve, concurrently, before building.
+    if GEMINI_CLIENT:
+        to_build = [
+            skill for skill in missing_skills
+            if not STUDY_RESOURCE_CACHE_ENABLED
+            or not _study_resources.contains(skill, target_career, learning_style, objectives[skill].skill_level)
+        ]
+        if to_build:
+            _roadmaps.resolve_many(to_build)
+
+    # Build skill recommendations using intent-driven pipeline
+    skill_gap_report: list[dict] = []
+    source_counts = {"curated": 0, "gemini": 0, FALLBACK_SOURCE: 0}
+    cached_count = 0
+
+    for skill in missing_skills:
+        objective = objectives[skill]
+
+        # Steps 2-6: shared learning path for this skill / career / style / level
+        if STUDY_RESOURCE_CACHE_ENABLED:
+            plan = _study_resources.get(skill, target_career, learning_style, objective.skill_level)
+            learning_path, source = plan.learning_path, plan.source
+            cached_count += int(plan.cached)
         else:
-            docs_fallback_count += 1
+            learning_path, source = _build_skill_learning_path(
+                skill, target_career, learning_style, objective.skill_level,
+            )
+        source_counts[source] = source_counts.get(source, 0) + 1
 
         # Build the skill gap report entry
         skill_entry = {
@@ -994,8 +1043,9 @@ def fetch_live_resources_node(state: StudyPlannerState) -> dict:
         skill_gap_report.append(skill_entry)
 
     logger.info(
-        f"[Resource Discovery] Completed: {curated_count} curated, "
-        f"{gemini_count} Gemini-dynamic, {docs_fallback_count} docs fallback"
+        f"[Resource Discovery] Completed: {source_counts['curated']} curated, "
+        f"{source_counts['gemini']} Gemini-dynamic, {source_counts[FALLBACK_SOURCE]} docs fallback "
+        f"({cached_count}/{len(missing_skills)} from shared cache)"
     )
 
     if skill_gap_report:
@@ -1280,6 +1330,9 @@ def _check_url(url: str) -> tuple[str, bool]:
         return url, False
 
 
+_url_status = UrlStatusCache()
+
+
 def _get_curated_fallback_url(skill: str, step_index: int) -> dict | None:
     """
     Get a curated fallback resource for a specific skill and step.
@@ -1321,13 +1374,10 @@ def validate_urls_node(state: StudyPlannerState) -> dict:
     if not urls_to_check:
         return {"urls_validated": True}
 
-    # Check all URLs in parallel
-    url_status: dict[str, bool] = {}
-    with ThreadPoolExecutor(max_workers=URL_CHECK_MAX_WORKERS) as executor:
-        futures = {executor.submit(_check_url, url): url for url in set(urls_to_check)}
-        for future in as_completed(futures):
-            url, is_alive = future.result()
-            url_status[url] = is_alive
+    # Check URLs in parallel; recently checked ones come from the shared status cache
+    url_status = _url_status.check_many(
+        urls_to_check, lambda url: _check_url(url)[1], max_workers=URL_CHECK_MAX_WORKERS,
+    )
 
     dead_count = sum(1 for alive in url_status.values() if not alive)
     total = len(url_status)
@@ -1478,6 +1528,8 @@ def fallback_resources_node(state: StudyPlannerState) -> dict:
 
     missing_skills = state.get("missing_skills", [])
     skill_gap_report = []
+    # Every fallback entry links its roadmap; resolve them concurrently.
+    _roadmaps.resolve_many(missing_skills)
 
     for skill in missing_skills:
         key = skill.strip().lower()
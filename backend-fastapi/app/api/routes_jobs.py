@@ -1,17 +1,19 @@
 # app/api/routes_jobs.py
 """
 Job Market Matcher API routes.
-  POST /search   — match user skills against stored jobs (pgvector)
-  POST /refresh  — fetch new jobs from JSearch, embed & store
+  POST /search          — materialized job matches for the user's skills (pgvector)
+  POST /refresh         — queue a background fetch from JSearch (embed & store)
+  GET  /refresh/{id}    — status and per-stage counts of a queued refresh
 """
 
-import json
 import logging
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Query
 
-from app.services.job_search import ingest_jobs, match_jobs_for_user
+from app.services.job_ingest_queue import get_job_ingestion_queue
+from app.services.job_recommendations import get_recommendations
+from app.services.job_search import ensure_job_source_configured
 from supabase_client import supabase
 
 router = APIRouter()
@@ -68,57 +70,29 @@ async def search_jobs(
     Match the authenticated user's skills (from latest resume skill_gap)
     against stored job postings using pgvector cosine similarity.
 
-    Returns top-10 jobs with matching / missing skill breakdown.
+    Served from the materialized recommendations (recomputed when a new
+    resume version is saved or new jobs are ingested); ``stale`` is true
+    while a refresh is running in the background.
     """
     try:
-        # 1. Get latest resume
-        resume_result = (
-            supabase.table("resumes")
-            .select("resume_id")
-            .eq("user_id", user.id)
-            .order("latest_update", desc=True)
-            .limit(1)
-            .execute()
-        )
-        if not resume_result.data:
-            raise HTTPException(
-                status_code=404,
-                detail="No resume found. Upload a resume first.",
-            )
+        try:
+            recs = get_recommendations(user.id, role_query)
+        except LookupError as e:
+            raise HTTPException(status_code=404, detail=str(e))
 
-        # 2. Get skill_gap from latest version
-        version_result = (
-            supabase.table("resume_versions")
-            .select("skill_gap")
-            .eq("resume_id", resume_result.data[0]["resume_id"])
-            .order("version_number", desc=True)
-            .limit(1)
-            .execute()
-        )
-        if not version_result.data:
-            raise HTTPException(
-                status_code=404, detail="No resume version found."
-            )
-
-        skill_gap = version_result.data[0].get("skill_gap", {})
-        if isinstance(skill_gap, str):
-            skill_gap = json.loads(skill_gap)
-
-        user_skills: list[str] = skill_gap.get("user_skills", [])
-        if not user_skills:
+        if not recs["user_skills"]:
             raise HTTPException(
                 status_code=400,
                 detail="No skills found in your resume. Run skill gap analysis first.",
             )
 
-        # 3. Vector search (biased toward role_query if provided)
-        matched_jobs = match_jobs_for_user(user_skills, role_query=role_query)
-
         return {
             "success": True,
-            "user_skills": user_skills,
-            "matched_jobs": matched_jobs,
-            "total": len(matched_jobs),
+            "user_skills": recs["user_skills"],
+            "matched_jobs": recs["matched_jobs"],
+            "total": len(recs["matched_jobs"]),
+            "computed_at": recs["computed_at"],
+            "stale": recs["stale"],
         }
 
     except HTTPException:
@@ -128,25 +102,53 @@ async def search_jobs(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/refresh")
+@router.post("/refresh", status_code=202)
 async def refresh_jobs(
     query: str = Query(..., description="Career / role to search for"),
     location: str = Query(default="", description="Optional location filter"),
     user=Depends(get_current_user),
 ):
     """
-    Fetch latest jobs from JSearch API for the given query,
-    extract skills, embed, and store in Supabase.
+    Queue a background fetch of the latest jobs from JSearch for the given
+    query (extract skills, embed, store). Returns immediately with a task id;
+    identical (query, location) refreshes share one run.
     """
     try:
-        count = ingest_jobs(query, location)
+        ensure_job_source_configured()
+        task, coalesced = get_job_ingestion_queue().submit(query, location, user_id=user.id)
         return {
             "success": True,
-            "ingested": count,
-            "message": f"Fetched and stored {count} new job postings",
+            "task_id": task["id"],
+            "status": task["status"],
+            "coalesced": coalesced,
+            "message": (
+                "Joined an in-progress refresh for this search"
+                if coalesced else "Job refresh queued"
+            ),
         }
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Job refresh error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/refresh/{task_id}")
+async def refresh_status(task_id: str, user=Depends(get_current_user)):
+    """Status of a queued refresh with per-stage counts."""
+    task = get_job_ingestion_queue().get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Refresh task not found")
+    return {
+        "success": True,
+        "task_id": task["id"],
+        "status": task["status"],
+        "query": task["query"],
+        "location": task["location"],
+        "counts": task["counts"],
+        "ingested": task["ingested"],
+        "error": task["error"],
+        "created_at": task["created_at"],
+        "started_at": task["started_at"],
+        "finished_at": task["finished_at"],
+    }
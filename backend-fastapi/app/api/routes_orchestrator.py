@@ -8,8 +8,10 @@ Frontend calls these to trigger analysis flows.
 from fastapi import APIRouter, UploadFile, File, Form, Header, HTTPException, Body, Query, Response
 from fastapi.responses import StreamingResponse
 from typing import Optional, Dict, Any
+import asyncio
 import json
 import logging
+import os
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -21,7 +23,9 @@ from app.agents.orchestrator import (
 )
 from app.agents.orchestrator.graph import orchestrator_graph
 from app.services.resume_parser import get_parser
-from app.agents.resume.graph import resume_workflow
+from app.agents.resume.graph import run_resume_workflow
+from app.services.rag_suggestions import collect_pending_bullet_rewrites
+from app.services.job_recommendations import on_resume_version_saved
 from supabase_client import supabase
 
 logger = logging.getLogger(__name__)
@@ -239,6 +243,44 @@ def initialize_state_from_user(user_id: str) -> CareerLMState:
     return state
 
 
+def _load_skill_gap_preferences(user_id: str) -> Optional[dict]:
+    """questionnaire_answers with user_profile merged in, as the skill-gap analyzer expects."""
+    try:
+        user_pref = (
+            supabase.table("user")
+            .select("questionnaire_answers, user_profile")
+            .eq("id", user_id)
+            .limit(1)
+            .execute()
+        )
+        if user_pref.data:
+            row = user_pref.data[0]
+            questionnaire_answers = row.get("questionnaire_answers") or {}
+            if isinstance(questionnaire_answers, dict) and row.get("user_profile"):
+                questionnaire_answers["user_profile"] = row.get("user_profile")
+            return questionnaire_answers
+    except Exception as pref_err:
+        logger.warning(f"[ANALYZE_RESUME] Could not load user preferences for skill-gap: {pref_err}")
+    return None
+
+
+async def _run_skill_gap(user_id: str, resume_text: str, filename: Optional[str], sections: dict) -> dict:
+    """
+    Skill-gap analysis off the event loop. Its Groq calls hold LLM_SLOTS
+    (llm_config), the same budget the resume-scoring graph draws from.
+    """
+    from app.agents.skill_gap import analyze_skill_gap
+
+    questionnaire_answers = await asyncio.to_thread(_load_skill_gap_preferences, user_id)
+    return await asyncio.to_thread(
+        analyze_skill_gap,
+        resume_text,
+        filename=filename,
+        sections=sections,
+        questionnaire_answers=questionnaire_answers,
+    )
+
+
 @router.post("/analyze-resume")
 async def analyze_resume(
     user_id: str = Form(...),
@@ -258,6 +300,10 @@ async def analyze_resume(
     4. Supervisor re-evaluates next steps
     5. Graph pauses at next decision point or human-in-loop pause
     6. State is checkpointed to Supabase
+
+    Skill-gap analysis runs concurrently with the graph; ``skill_gap`` and
+    ``resume_scored`` SSE events are sent as each finishes, and the version
+    is stored once both are done.
     
     Returns the final state (may be paused waiting for user input).
     """
@@ -297,6 +343,9 @@ async def analyze_resume(
         state["resume_analysis_runs"] = 0
         state["resume_analysis_complete"] = False
         state["resume_analysis_failed"] = False
+        # Slow bullet rewrites are streamed as a follow-up `bullet_rewrites` event.
+        state["defer_bullet_rewrites"] = True
+        state["pending_rewrites_id"] = None
         
         if job_description:
             state["active_job"]["job_description"] = job_description
@@ -345,53 +394,70 @@ async def analyze_resume(
                     return "Analyzing resume..."
 
                 result_state = None
-                
-                # Stream updates from the orchestrator graph
-                async for current_state in orchestrator_graph.astream(
-                    state,
-                    config={
-                        "configurable": {"thread_id": user_id},
-                        "recursion_limit": 25,
-                    },
-                    stream_mode="values"
-                ):
-                    phase = current_state.get('current_phase') or "Analyzing..."
-                    msg = current_state.get('messages', [])
-                    last_msg = msg[-1] if msg else ""
-                    phase_label = _phase_label(phase, last_msg)
-                    yield f"data: {json.dumps({'event': 'update', 'phase': phase, 'phase_label': phase_label, 'message': last_msg})}\n\n"
-                    result_state = current_state
+                skill_gap_result = None
+
+                # Skill-gap analysis only needs the parsed text and sections, so it
+                # runs alongside the resume-scoring graph; whichever finishes first
+                # is streamed first and both are joined before persistence.
+                events: asyncio.Queue = asyncio.Queue()
+
+                async def _pump_graph():
+                    try:
+                        async for current_state in orchestrator_graph.astream(
+                            state,
+                            config={
+                                "configurable": {"thread_id": user_id},
+                                "recursion_limit": 25,
+                            },
+                            stream_mode="values"
+                        ):
+                            await events.put(("update", current_state))
+                        await events.put(("graph_done", None))
+                    except Exception as graph_err:
+                        await events.put(("graph_error", graph_err))
+
+                skill_gap_task = asyncio.create_task(
+                    _run_skill_gap(user_id, resume_text, resume.filename, sections)
+                )
+                skill_gap_task.add_done_callback(lambda _t: events.put_nowait(("skill_gap_done", None)))
+                graph_task = asyncio.create_task(_pump_graph())
+
+                try:
+                    remaining = 2
+                    while remaining:
+                        kind, payload = await events.get()
+                        if kind == "update":
+                            phase = payload.get('current_phase') or "Analyzing..."
+                            msg = payload.get('messages', [])
+                            last_msg = msg[-1] if msg else ""
+                            phase_label = _phase_label(phase, last_msg)
+                            yield f"data: {json.dumps({'event': 'update', 'phase': phase, 'phase_label': phase_label, 'message': last_msg})}\n\n"
+                            result_state = payload
+                        elif kind == "graph_error":
+                            raise payload
+                        elif kind == "graph_done":
+                            remaining -= 1
+                            resume_score = ((result_state or {}).get("resume_analysis") or {}).get("overall_score")
+                            yield f"data: {json.dumps({'event': 'resume_scored', 'resume_score': resume_score})}\n\n"
+                        elif kind == "skill_gap_done":
+                            remaining -= 1
+                            try:
+                                skill_gap_result = skill_gap_task.result()
+                            except Exception as sg_err:
+                                logger.error(f"[ANALYZE_RESUME] Skill-gap analysis failed: {sg_err}")
+                                skill_gap_result = {"error": f"Analysis failed: {sg_err}"}
+                            yield f"data: {json.dumps({'event': 'skill_gap', 'result': skill_gap_result}, default=str)}\n\n"
+                finally:
+                    for task in (graph_task, skill_gap_task):
+                        if not task.done():
+                            task.cancel()
 
                 # Graph completed
                 result = result_state
                 logger.info(f"[ANALYZE_RESUME] Graph completed. Phase: {result.get('current_phase')}")
-                
-                # ===== SKILL GAP ANALYSIS =====
-                from app.agents.skill_gap import analyze_skill_gap
-        
-                questionnaire_answers = None
-                try:
-                    user_pref = (
-                        supabase.table("user")
-                        .select("questionnaire_answers, user_profile")
-                        .eq("id", user_id)
-                        .limit(1)
-                        .execute()
-                    )
-                    if user_pref.data:
-                        row = user_pref.data[0]
-                        questionnaire_answers = row.get("questionnaire_answers") or {}
-                        if isinstance(questionnaire_answers, dict) and row.get("user_profile"):
-                            questionnaire_answers["user_profile"] = row.get("user_profile")
-                except Exception as pref_err:
-                    logger.warning(f"[ANALYZE_RESUME] Could not load user preferences for skill-gap: {pref_err}")
-        
-                skill_gap_result = analyze_skill_gap(resume_text,
-                    filename=resume.filename,
-                    sections=sections,
-                    questionnaire_answers=questionnaire_answers,)
         
                 # ===== STORE RESUME VERSION (LEAN) =====
+                inserted_version_id = None
                 try:
                     ensure_user_row(user_id)
                     
@@ -459,11 +525,18 @@ async def analyze_resume(
                         new_version_number,
                         len(insert_result.data) if insert_result and insert_result.data else 0,
                     )
+                    if insert_result and insert_result.data:
+                        inserted_version_id = insert_result.data[0].get("version_id")
                 except Exception as db_err:
                     logger.error(f"Failed to store resume version: {db_err}")
                     error_msg = f"Resume analysis completed but failed to save: {str(db_err)}"
                     yield f"data: {json.dumps({'event': 'error', 'error': error_msg})}\n\n"
                     return
+
+                try:
+                    on_resume_version_saved(user_id, (skill_gap_result or {}).get("user_skills"))
+                except Exception as recs_err:
+                    logger.warning(f"[ANALYZE_RESUME] Could not refresh job recommendations: {recs_err}")
         
                 # ===== RETURN STATE FOR FRONTEND =====
                 score_history = (result.get("profile") or {}).get("score_history", [])
@@ -487,6 +560,25 @@ async def analyze_resume(
 
                 yield f"data: {json.dumps({'event': 'complete', 'result': final_payload})}\n\n"
 
+                # ===== LATE BULLET REWRITES (FOLLOW-UP) =====
+                pending_rewrites_id = result.get("pending_rewrites_id")
+                if pending_rewrites_id:
+                    late_suggestions = await asyncio.to_thread(
+                        collect_pending_bullet_rewrites, pending_rewrites_id
+                    )
+                    if late_suggestions:
+                        yield f"data: {json.dumps({'event': 'bullet_rewrites', 'suggestions': late_suggestions})}\n\n"
+                        if inserted_version_id is not None:
+                            try:
+                                analysis_payload["suggestions"] = (
+                                    analysis_payload.get("suggestions", []) + late_suggestions
+                                )
+                                supabase.table("resume_versions").update({
+                                    "resume_analysis": _dump_compact_json(analysis_payload),
+                                }).eq("version_id", inserted_version_id).execute()
+                            except Exception as upd_err:
+                                logger.warning(f"[ANALYZE_RESUME] Could not persist late bullet rewrites: {upd_err}")
+
             except Exception as e:
                 logger.error(f"[ANALYZE_RESUME] STREAM Error: {e}", exc_info=True)
                 yield f"data: {json.dumps({'event': 'error', 'error': str(e)})}\n\n"
@@ -499,6 +591,62 @@ async def analyze_resume(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/bulk-analyze")
+async def bulk_analyze(
+    resumes: UploadFile = File(...),
+    target_role: str = Form(...),
+    job_description: Optional[str] = Form(None),
+    workers: Optional[int] = Form(None),
+    llm_concurrency: Optional[int] = Form(None),
+):
+    """
+    Cohort scoring: upload a .zip of resumes and score each against one role.
+
+    Uses the deterministic scorers only (no checkpoints, RAG or profile writes)
+    and streams one NDJSON line per resume followed by a summary line with
+    aggregate scores and resumes/minute throughput.
+    """
+    from app.services.bulk_analysis import (
+        UPLOAD_CHUNK_BYTES,
+        clamp_llm_concurrency,
+        clamp_workers,
+        count_zip_resumes,
+        iter_spooled_zip,
+        run_bulk_analysis,
+        spool_upload,
+        to_ndjson,
+    )
+
+    async def upload_chunks():
+        while chunk := await resumes.read(UPLOAD_CHUNK_BYTES):
+            yield chunk
+
+    try:
+        archive_path = await spool_upload(upload_chunks())
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    try:
+        file_count = count_zip_resumes(archive_path)
+    except ValueError as e:
+        os.unlink(archive_path)
+        raise HTTPException(status_code=400, detail=str(e))
+    if not file_count:
+        os.unlink(archive_path)
+        raise HTTPException(status_code=400, detail="No .pdf or .txt resumes found in archive.")
+
+    logger.info(f"[BULK_ANALYZE] {file_count} resumes for role '{target_role}'")
+
+    records = run_bulk_analysis(
+        iter_spooled_zip(archive_path),
+        target_role=target_role,
+        job_description=job_description or "",
+        workers=clamp_workers(workers),
+        llm_concurrency=clamp_llm_concurrency(llm_concurrency),
+    )
+    return StreamingResponse(to_ndjson(records), media_type="application/x-ndjson")
+
+
 @router.get("/state")
 async def get_current_user_state(authorization: str = Header(None)):
     """
@@ -925,7 +1073,7 @@ async def rescore_resume_version(version_id: int):
         }
 
         config = {"configurable": {"thread_id": f"rescore_{version_id}"}}
-        resume_result = resume_workflow.invoke(resume_input, config=config)
+        resume_result = run_resume_workflow(resume_input, config=config)
         new_score = resume_result.get("ats_score")
 
         parent_score = None
@@ -1,10 +1,12 @@
 # app/routes/resume.py (or wherever your router is)
+import asyncio
 import io
 import json
 import logging
 from datetime import date, datetime, timedelta, timezone
 from fastapi import APIRouter, UploadFile, File, Form, Depends, Header, Query
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import Any, Optional
 
 # Setup logging
@@ -58,10 +60,94 @@ async def get_current_user_optional(authorization: Optional[str] = Header(None))
         return None
 
 
+def _load_questionnaire_answers(user_id: Optional[str]) -> Optional[dict]:
+    """questionnaire_answers merged with user_profile, or None."""
+    if not user_id:
+        return None
+    try:
+        profile = (
+            supabase.table("user")
+            .select("questionnaire_answers,user_profile")
+            .eq("id", user_id)
+            .limit(1)
+            .execute()
+        )
+        if profile.data:
+            row = profile.data[0] if isinstance(profile.data[0], dict) else {}
+            qa_raw = row.get("questionnaire_answers")
+            up_raw = row.get("user_profile")
+            qa: dict[str, Any] = qa_raw if isinstance(qa_raw, dict) else {}
+            up: dict[str, Any] | None = up_raw if isinstance(up_raw, dict) else None
+
+            merged: dict[str, Any] = {**qa}
+            if up:
+                merged["user_profile"] = up
+
+            if merged:
+                logger.info("Using user preferences/profile for skill gap analysis")
+                return merged
+    except Exception as e:
+        logger.warning(f"Could not fetch user questionnaire: {e}")
+    return None
+
+
+def _interested_roles(questionnaire_answers: Optional[dict]) -> list[str]:
+    """Questionnaire can contain either target_role or target_roles."""
+    if not isinstance(questionnaire_answers, dict):
+        return []
+    raw_roles = questionnaire_answers.get("target_roles") or questionnaire_answers.get("target_role") or []
+    if isinstance(raw_roles, str):
+        return [raw_roles]
+    if isinstance(raw_roles, list):
+        return [r for r in raw_roles if isinstance(r, str) and r.strip()]
+    return []
+
+
+def _normalize_role(role: str) -> str:
+    return (role or "").strip().lower().replace("_", " ").replace("-", " ")
+
+
+def _role_matches(career_name: str, interested: list[str]) -> bool:
+    career_norm = _normalize_role(career_name)
+    for role in interested:
+        role_norm = _normalize_role(role)
+        if not role_norm:
+            continue
+        if role_norm == career_norm:
+            return True
+        # Tolerate small naming differences like "software engineer" vs "software engineering"
+        if role_norm in career_norm or career_norm in role_norm:
+            return True
+    return False
+
+
+def _filter_to_interested_roles(analysis_result: dict, interested_roles: list[str]) -> None:
+    """Narrow career_matches / top_3_careers / summary in place to the user's roles."""
+    if not interested_roles:
+        return
+    filtered_careers = [
+        c for c in analysis_result.get("career_matches", [])
+        if _role_matches(c.get("career", ""), interested_roles)
+    ]
+
+    # Only override when we can match at least one interested role.
+    if filtered_careers:
+        analysis_result["career_matches"] = filtered_careers
+        analysis_result["top_3_careers"] = filtered_careers[:3]
+
+        # Keep summary consistent with filtered results.
+        best = filtered_careers[0]
+        summary = analysis_result.get("analysis_summary") or {}
+        summary["best_match"] = best.get("career")
+        summary["best_match_probability"] = best.get("probability", 0)
+        analysis_result["analysis_summary"] = summary
+
+
 @router.post("/skill-gap-analysis")
 async def skill_gap_analysis(
     resume: UploadFile = File(...),
-    user_id: Optional[str] = Form(None)
+    user_id: Optional[str] = Form(None),
+    refresh: bool = Form(False),
 ):
     """
     Analyze career matches based on skills clustering.
@@ -71,6 +157,7 @@ async def skill_gap_analysis(
     Args:
         resume: The uploaded resume file (PDF).
         user_id: Optional user ID to personalize recommendations based on preferences.
+        refresh: Ignore the cached result for identical inputs and re-run the analysis.
         
     Returns:
         JSON response with skill analysis and career recommendations.
@@ -112,82 +199,21 @@ async def skill_gap_analysis(
         sections = parser.parse_sections(resume_text)
         
         # Fetch questionnaire answers + user_profile if user_id is provided
-        questionnaire_answers = None
-        if user_id:
-            try:
-                profile = (
-                    supabase.table("user")
-                    .select("questionnaire_answers,user_profile")
-                    .eq("id", user_id)
-                    .limit(1)
-                    .execute()
-                )
-                if profile.data:
-                    row = profile.data[0] if isinstance(profile.data[0], dict) else {}
-                    qa_raw = row.get("questionnaire_answers")
-                    up_raw = row.get("user_profile")
-                    qa: dict[str, Any] = qa_raw if isinstance(qa_raw, dict) else {}
-                    up: dict[str, Any] | None = up_raw if isinstance(up_raw, dict) else None
-
-                    merged: dict[str, Any] = {**qa}
-                    if up:
-                        merged["user_profile"] = up
-
-                    questionnaire_answers = merged if merged else None
-                    if questionnaire_answers:
-                        logger.info("Using user preferences/profile for skill gap analysis")
-            except Exception as e:
-                logger.warning(f"Could not fetch user questionnaire: {e}")
+        questionnaire_answers = _load_questionnaire_answers(user_id)
         
         # Analyze skill gaps using LangGraph workflow
         logger.info("Running skill gap analysis workflow")
         analysis_result = analyze_skill_gap(
-            resume_text, filename=resume.filename, sections=sections, questionnaire_answers=questionnaire_answers
+            resume_text,
+            filename=resume.filename,
+            sections=sections,
+            questionnaire_answers=questionnaire_answers,
+            use_cache=not refresh,
         )
 
         # Filter to user's interested role(s) when available.
-        # Questionnaire can contain either target_role or target_roles.
-        interested_roles: list[str] = []
-        if isinstance(questionnaire_answers, dict):
-            raw_roles = questionnaire_answers.get("target_roles") or questionnaire_answers.get("target_role") or []
-            if isinstance(raw_roles, str):
-                interested_roles = [raw_roles]
-            elif isinstance(raw_roles, list):
-                interested_roles = [r for r in raw_roles if isinstance(r, str) and r.strip()]
-
-        def _normalize_role(role: str) -> str:
-            return (role or "").strip().lower().replace("_", " ").replace("-", " ")
-
-        def _role_matches(career_name: str, interested: list[str]) -> bool:
-            career_norm = _normalize_role(career_name)
-            for role in interested:
-                role_norm = _normalize_role(role)
-                if not role_norm:
-                    continue
-                if role_norm == career_norm:
-                    return True
-                # Tolerate small naming differences like "software engineer" vs "software engineering"
-                if role_norm in career_norm or career_norm in role_norm:
-                    return True
-            return False
-
-        if interested_roles:
-            filtered_careers = [
-                c for c in analysis_result.get("career_matches", [])
-                if _role_matches(c.get("career", ""), interested_roles)
-            ]
-
-            # Only override when we can match at least one interested role.
-            if filtered_careers:
-                analysis_result["career_matches"] = filtered_careers
-                analysis_result["top_3_careers"] = filtered_careers[:3]
-
-                # Keep summary consistent with filtered results.
-                best = filtered_careers[0]
-                summary = analysis_result.get("analysis_summary") or {}
-                summary["best_match"] = best.get("career")
-                summary["best_match_probability"] = best.get("probability", 0)
-                analysis_result["analysis_summary"] = summary
+        interested_roles = _interested_roles(questionnaire_answers)
+        _filter_to_interested_roles(analysis_result, interested_roles)
 
         if "error" in analysis_result:
             logger.warning(f"Analysis error: {analysis_result['error']}")
@@ -237,6 +263,69 @@ async def skill_gap_analysis(
         )
 
 
+@router.post("/skill-gap-analysis/stream")
+async def skill_gap_analysis_stream(
+    resume: UploadFile = File(...),
+    user_id: Optional[str] = Form(None),
+    refresh: bool = Form(False),
+):
+    """
+    Streaming version of /skill-gap-analysis (Server-Sent Events).
+
+    Events, in order: ``skills`` (extracted skills with confidence),
+    ``career_probabilities`` (a deterministic provisional estimate first,
+    then the LLM matches), ``gap_buckets``, ``recommendations_token`` (AI
+    recommendation text as it streams) and ``complete`` with the same
+    fields /skill-gap-analysis returns. ``error`` ends the stream.
+
+    Text extraction and the preferences lookup run in the threadpool; section
+    parsing (an LLM call) runs inside the stream, after the provisional
+    ``skills`` / ``career_probabilities`` events.
+    """
+    resume_bytes = await resume.read()
+    if not resume_bytes:
+        return JSONResponse(status_code=400, content={"success": False, "error": "Resume file is empty"})
+
+    from app.agents.skill_gap import stream_skill_gap
+
+    parser = get_parser()
+    resume_text, questionnaire_answers = await asyncio.gather(
+        run_in_threadpool(parser.extract_text_from_pdf, resume_bytes),
+        run_in_threadpool(_load_questionnaire_answers, user_id),
+    )
+    if not resume_text or len(resume_text.strip()) < 10:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "success": False,
+                "error": "Could not extract text from resume. Please ensure it's a valid PDF."
+            }
+        )
+    interested_roles = _interested_roles(questionnaire_answers)
+
+    # A sync generator: StreamingResponse iterates it in the threadpool.
+    def event_stream():
+        for event, payload in stream_skill_gap(
+            resume_text,
+            filename=resume.filename,
+            questionnaire_answers=questionnaire_answers,
+            use_cache=not refresh,
+            load_sections=lambda: parser.parse_sections(resume_text),
+        ):
+            if event in ("career_probabilities", "complete"):
+                _filter_to_interested_roles(payload, interested_roles)
+            if event == "complete":
+                payload = {
+                    "success": True,
+                    "filename": resume.filename,
+                    "interested_roles": interested_roles,
+                    **payload,
+                }
+            yield f"data: {json.dumps({'event': event, **payload}, default=str)}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.get("/study-materials-cache")
 async def get_study_materials_cache(
     user=Depends(get_current_user_optional),
@@ -1,6 +1,9 @@
 from fastapi import FastAPI
 from app.api import routes_user, routes_onboarding, routes_cold_email, routes_interview, routes_jobs, routes_orchestrator, routes_resume, routes_resume_builder
 from fastapi.middleware.cors import CORSMiddleware
+from app.services.cache import cache_metrics
+from app.services.job_ingest_queue import get_job_ingestion_queue
+from app.services.vector_index import get_rag_index
 
 
 app = FastAPI(title="CareerLM Backend")
@@ -38,6 +41,33 @@ app.include_router(routes_jobs.router, prefix="/api/v1/jobs", tags=["Jobs"])
 # Include Resume Builder routes
 app.include_router(routes_resume_builder.router, prefix="/api/v1/resume", tags=["Resume Builder"])
 
+@app.on_event("startup")
+async def start_rag_index():
+    # Load the rag_chunks replica in the background; queries use the RPC until it's ready.
+    index = get_rag_index()
+    if index is not None:
+        index.start_background_refresh()
+
+
+@app.on_event("startup")
+async def resume_job_ingestion():
+    # Re-queues refreshes that were interrupted by the last shutdown.
+    get_job_ingestion_queue()
+
+
+@app.on_event("startup")
+async def prewarm_study_resources():
+    # Rebuilds popular shared study resource plans that are missing or stale, in the background.
+    from app.agents.study_planner.nodes import prewarm_study_resources as prewarm
+    prewarm()
+
+
 @app.get("/")
 async def root():
     return {"message": "CareerLM Backend running with Groq LLaMA-3"}
+
+
+@app.get("/metrics/cache")
+async def get_cache_metrics():
+    """Hit/miss counters for in-process caches (e.g. bullet_rewrites)."""
+    return cache_metrics()
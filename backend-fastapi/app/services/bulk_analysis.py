@@ -0,0 +1,306 @@
+"""
+Bulk resume analysis for cohorts (career centers, bootcamps).
+
+Scores a directory or zip of resumes against one target role without the
+per-file SSE, checkpoint and profile-write overhead of /analyze-resume:
+
+  1. Resume files are read lazily from a directory or zip archive
+  2. A process pool parses each file with ResumeParser and scores it with the
+     deterministic scorers from app/agents/resume/nodes.py
+  3. Workers are warmed once (parser singleton, compiled regexes) and reused
+  4. The only LLM call (ambiguous section classification) is bounded by a
+     semaphore shared across all workers
+  5. Results are yielded in completion order, followed by an aggregate summary
+
+Each yielded dict is one NDJSON line; throughput is reported in resumes/minute.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from app.agents.resume.nodes import score_resume_deterministic
+from app.services.resume_parser import get_parser
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = (".pdf", ".txt")
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+DEFAULT_LLM_CONCURRENCY = int(os.getenv("BULK_LLM_CONCURRENCY", "2"))
+MAX_LLM_CONCURRENCY = 8
+MAX_FILE_BYTES = 5 * 1024 * 1024
+MAX_ARCHIVE_BYTES = int(os.getenv("BULK_MAX_ARCHIVE_BYTES", str(200 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+# Set per worker process by _init_worker.
+_WORKER_USE_LLM = True
+
+
+# ─── Input discovery ─────────────────────────────────────────────────────────
+
+def iter_resume_files(source: str) -> Iterator[Tuple[str, bytes]]:
+    """Yield (filename, bytes) for every supported resume in a directory or zip."""
+    if os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if not name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    continue
+                path = os.path.join(root, name)
+                with open(path, "rb") as f:
+                    yield os.path.relpath(path, source), f.read()
+        return
+
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            yield from iter_zip_members(archive)
+        return
+
+    raise ValueError(f"Bulk source must be a directory or .zip archive: {source}")
+
+
+def _is_resume_member(info: zipfile.ZipInfo) -> bool:
+    name = info.filename
+    return (
+        not info.is_dir()
+        and not name.startswith("__MACOSX/")
+        and name.lower().endswith(SUPPORTED_EXTENSIONS)
+    )
+
+
+def iter_zip_members(archive: zipfile.ZipFile) -> Iterator[Tuple[str, bytes]]:
+    for info in archive.infolist():
+        if not _is_resume_member(info):
+            continue
+        if info.file_size > MAX_FILE_BYTES:
+            logger.warning("[BULK] Skipping %s: larger than 5MB", info.filename)
+            continue
+        yield info.filename, archive.read(info)
+
+
+async def spool_upload(chunks: AsyncIterator[bytes], max_bytes: Optional[int] = None) -> str:
+    """
+    Write an uploaded archive to a temp file chunk by chunk and return its
+    path, so the upload is never held in memory. Raises ValueError (and
+    removes the file) once more than ``max_bytes`` (default
+    MAX_ARCHIVE_BYTES) arrive.
+    """
+    max_bytes = MAX_ARCHIVE_BYTES if max_bytes is None else max_bytes
+    fd, path = tempfile.mkstemp(prefix="bulk-", suffix=".zip")
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValueError(f"Archive larger than {max_bytes // (1024 * 1024)}MB")
+                out.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+def count_zip_resumes(path: str) -> int:
+    """Supported resumes in the archive at ``path`` (central directory only)."""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return sum(1 for info in archive.infolist() if _is_resume_member(info))
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Invalid zip archive: {e}")
+
+
+def iter_spooled_zip(path: str) -> Iterator[Tuple[str, bytes]]:
+    """iter_resume_files over a spooled upload; deletes the file when done."""
+    try:
+        yield from iter_resume_files(path)
+    finally:
+        os.unlink(path)
+
+
+def clamp_workers(requested: Optional[int]) -> int:
+    """Client-requested pool size, capped at DEFAULT_WORKERS."""
+    limit = DEFAULT_WORKERS or os.cpu_count() or 1
+    return max(1, min(requested or limit, limit))
+
+
+def clamp_llm_concurrency(requested: Optional[int]) -> int:
+    if requested is None:
+        return DEFAULT_LLM_CONCURRENCY
+    return max(0, min(requested, MAX_LLM_CONCURRENCY))
+
+
+# ─── Worker ──────────────────────────────────────────────────────────────────
+
+def _init_worker(llm_semaphore, use_llm: bool) -> None:
+    """Warm the per-process parser once and attach the shared LLM semaphore."""
+    global _WORKER_USE_LLM
+    _WORKER_USE_LLM = use_llm
+    parser = get_parser()
+    if llm_semaphore is not None:
+        parser.llm_gate = llm_semaphore
+
+
+def score_resume_file(
+    filename: str,
+    file_bytes: bytes,
+    target_role: str = "",
+    job_description: str = "",
+) -> Dict[str, Any]:
+    """Parse and deterministically score one resume. Never raises."""
+    started = time.perf_counter()
+    role_type = target_role.strip().lower().replace(" ", "_") if target_role else ""
+    try:
+        parser = get_parser()
+        resume_text = parser.extract_text(file_bytes, filename=filename)
+        if not resume_text or len(resume_text.strip()) < 10:
+            raise ValueError("Could not extract text from resume")
+        sections = parser.parse_sections(resume_text, use_llm=_WORKER_USE_LLM)
+        sections = parser.sanitize_sections_for_storage(sections)
+        scores = score_resume_deterministic(
+            resume_text=resume_text,
+            resume_sections=sections,
+            role_type=role_type,
+            job_description=job_description,
+        )
+        return {
+            "event": "result",
+            "filename": filename,
+            "success": True,
+            "target_role": target_role or None,
+            "sections_found": sorted(k for k, v in sections.items() if v),
+            **scores,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+    except Exception as e:
+        return {
+            "event": "result",
+            "filename": filename,
+            "success": False,
+            "error": str(e),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+
+# ─── Aggregation ─────────────────────────────────────────────────────────────
+
+def summarize_results(results: List[Dict[str, Any]], elapsed_seconds: float) -> Dict[str, Any]:
+    """Aggregate per-resume results into a cohort summary."""
+    scored = [r for r in results if r.get("success")]
+    scores = [r["ats_score"] for r in scored if r.get("ats_score") is not None]
+
+    def _mean(key: str) -> Optional[float]:
+        values = [r[key] for r in scored if r.get(key) is not None]
+        return round(statistics.mean(values), 1) if values else None
+
+    gap_counts = Counter(g for r in scored for g in r.get("critical_gaps", []))
+    missing_section_counts = Counter(s for r in scored for s in r.get("missing_sections", []))
+    zone_counts = Counter(r.get("score_zone") for r in scored if r.get("score_zone"))
+    minutes = elapsed_seconds / 60 if elapsed_seconds > 0 else 0
+
+    return {
+        "event": "summary",
+        "total": len(results),
+        "succeeded": len(scored),
+        "failed": len(results) - len(scored),
+        "mean_score": round(statistics.mean(scores), 1) if scores else None,
+        "median_score": statistics.median(scores) if scores else None,
+        "min_score": min(scores) if scores else None,
+        "max_score": max(scores) if scores else None,
+        "dimension_means": {
+            "structure": _mean("structure_score"),
+            "completeness": _mean("completeness_score"),
+            "relevance": _mean("relevance_score"),
+            "impact": _mean("impact_score"),
+        },
+        "score_zones": dict(zone_counts),
+        "top_keyword_gaps": [{"keyword": k, "count": c} for k, c in gap_counts.most_common(15)],
+        "missing_sections": dict(missing_section_counts),
+        "elapsed_seconds": round(elapsed_seconds, 2),
+        "resumes_per_minute": round(len(results) / minutes, 1) if minutes else None,
+    }
+
+
+# ─── Driver ──────────────────────────────────────────────────────────────────
+
+def run_bulk_analysis(
+    files: Iterator[Tuple[str, bytes]],
+    target_role: str = "",
+    job_description: str = "",
+    workers: int = DEFAULT_WORKERS,
+    llm_concurrency: int = DEFAULT_LLM_CONCURRENCY,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Score resumes across a process pool, yielding each result as it finishes
+    and a final ``{"event": "summary", ...}`` record.
+
+    ``llm_concurrency=0`` disables LLM section classification entirely
+    (keyword-only parsing). In-flight submissions are capped so memory stays
+    flat for large archives.
+    """
+    started = time.perf_counter()
+    results: List[Dict[str, Any]] = []
+    use_llm = llm_concurrency > 0
+    # Warm the parent before workers fork so they inherit compiled state.
+    get_parser()
+
+    if workers <= 1:
+        _init_worker(None, use_llm)
+        for filename, data in files:
+            result = score_resume_file(filename, data, target_role, job_description)
+            results.append(result)
+            yield result
+        yield summarize_results(results, time.perf_counter() - started)
+        return
+
+    llm_semaphore = multiprocessing.BoundedSemaphore(llm_concurrency) if use_llm else None
+    max_in_flight = workers * 4
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(llm_semaphore, use_llm),
+    ) as executor:
+        pending = set()
+        file_iter = iter(files)
+        exhausted = False
+
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_in_flight:
+                try:
+                    filename, data = next(file_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(
+                    executor.submit(score_resume_file, filename, data, target_role, job_description)
+                )
+
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                results.append(result)
+                yield result
+
+    summary = summarize_results(results, time.perf_counter() - started)
+    logger.info(
+        "[BULK] Scored %d resumes (%d failed) at %s resumes/min",
+        summary["total"], summary["failed"], summary["resumes_per_minute"],
+    )
+    yield summary
+
+
+def to_ndjson(records: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """Serialize records as newline-delimited JSON."""
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + "\n"
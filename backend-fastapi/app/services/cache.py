@@ -0,0 +1,279 @@
+"""
+Local caches with hit/miss accounting.
+
+  - LRUCache: thread-safe in-memory LRU with optional TTL
+  - SQLiteKV: persistent key/value table under CACHE_DIR, tagged with a
+    version so a schema/model change drops stale rows on startup
+
+Caches register themselves by name so their hit rates can be reported
+together (see cache_metrics / GET /metrics/cache).
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Union
+
+CACHE_DIR = os.getenv(
+    "CAREERLM_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".cache"),
+)
+
+_REGISTRY: Dict[str, Callable[[], Dict[str, Any]]] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def register_metrics(name: str, stats_fn: Callable[[], Dict[str, Any]]) -> None:
+    with _REGISTRY_LOCK:
+        _REGISTRY[name] = stats_fn
+
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, collapse whitespace, strip leading bullet glyphs."""
+    text = (text or "").strip().lstrip("-•–*▪ ").strip()
+    return _WS_RE.sub(" ", text).lower()
+
+
+def text_hash(text: str) -> str:
+    """Stable SHA-1 of normalized text (cache keys, dedupe)."""
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe LRU with optional TTL and hit/miss counters."""
+
+    def __init__(self, name: str, max_entries: int = 1024, ttl_seconds: Optional[float] = None):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        register_metrics(name, self.stats)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            stored_at, value = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+        }
+
+
+class SQLiteKV:
+    """
+    Persistent key/value store: one table per namespace in CACHE_DIR/cache.sqlite.
+    Rows written under a different ``version`` are deleted on open, so bumping
+    the version (or changing what it encodes, e.g. the embedding model)
+    invalidates the whole namespace.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        version: str = "1",
+        path: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        if not re.fullmatch(r"[a-z0-9_]+", namespace):
+            raise ValueError(f"Invalid cache namespace: {namespace}")
+        self.namespace = namespace
+        self.version = version
+        self.ttl_seconds = ttl_seconds
+        self.path = path or os.path.join(CACHE_DIR, "cache.sqlite")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS kv_{namespace} ("
+                "key TEXT PRIMARY KEY, version TEXT NOT NULL, value BLOB, updated_at REAL NOT NULL)"
+            )
+            self._conn.execute(f"DELETE FROM kv_{namespace} WHERE version != ?", (version,))
+        register_metrics(f"{namespace}_sqlite", self.stats)
+
+    def get(self, key: str) -> Optional[Union[bytes, str]]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, updated_at FROM kv_{self.namespace} WHERE key = ? AND version = ?",
+                (key, self.version),
+            ).fetchone()
+        if row is None or (
+            self.ttl_seconds is not None and time.time() - row[1] > self.ttl_seconds
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def get_with_age(self, key: str) -> Optional[tuple]:
+        """(value, age_seconds) ignoring TTL, for stale-while-revalidate callers."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, updated_at FROM kv_{self.namespace} WHERE key = ? AND version = ?",
+                (key, self.version),
+            ).fetchone()
+        return (row[0], time.time() - row[1]) if row else None
+
+    def set(self, key: str, value: Union[bytes, str]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO kv_{self.namespace} (key, version, value, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, self.version, value, time.time()),
+            )
+
+    def update_many(self, updates: Dict[str, Callable[[Optional[Union[bytes, str]]], Union[bytes, str]]]) -> None:
+        """
+        Atomic read-modify-write: each ``fn(current_value_or_None)`` returns the
+        new value. One write transaction, so concurrent processes can't lose
+        each other's updates.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            for key, fn in updates.items():
+                row = self._conn.execute(
+                    f"SELECT value FROM kv_{self.namespace} WHERE key = ? AND version = ?",
+                    (key, self.version),
+                ).fetchone()
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO kv_{self.namespace} (key, version, value, updated_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, self.version, fn(row[0] if row else None), now),
+                )
+
+    def claim(self, key: str, owner: str, ttl_seconds: float) -> bool:
+        """
+        Lease ``key`` for ``owner``: succeeds if it is unclaimed, already held
+        by ``owner``, or the previous claim is older than ``ttl_seconds``.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                f"SELECT value, updated_at FROM kv_{self.namespace} WHERE key = ? AND version = ?",
+                (key, self.version),
+            ).fetchone()
+            now = time.time()
+            if row is not None and row[0] != owner and now - row[1] <= ttl_seconds:
+                return False
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO kv_{self.namespace} (key, version, value, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, self.version, owner, now),
+            )
+            return True
+
+    def prune(self, max_age_seconds: float) -> int:
+        """Delete rows not written for ``max_age_seconds``; returns how many."""
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                f"DELETE FROM kv_{self.namespace} WHERE updated_at < ?",
+                (time.time() - max_age_seconds,),
+            )
+            return cur.rowcount
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM kv_{self.namespace} WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix: str) -> int:
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                f"DELETE FROM kv_{self.namespace} WHERE substr(key, 1, ?) = ?",
+                (len(prefix), prefix),
+            )
+            return cur.rowcount
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM kv_{self.namespace}")
+
+    def keys(self, prefix: str = "") -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key FROM kv_{self.namespace} WHERE version = ? AND substr(key, 1, ?) = ?",
+                (self.version, len(prefix), prefix),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def items(self) -> List[tuple]:
+        """All unexpired (key, value) pairs of the current version."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, value, updated_at FROM kv_{self.namespace} WHERE version = ?",
+                (self.version,),
+            ).fetchall()
+        now = time.time()
+        return [
+            (key, value) for key, value, updated_at in rows
+            if self.ttl_seconds is None or now - updated_at <= self.ttl_seconds
+        ]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM kv_{self.namespace}").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+        }
+
+
+def cache_metrics() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss stats for every registered cache."""
+    with _REGISTRY_LOCK:
+        providers = dict(_REGISTRY)
+    return {name: stats_fn() for name, stats_fn in providers.items()}
@@ -0,0 +1,136 @@
+"""
+Token estimation and sentence-aware chunking for the RAG corpus.
+
+estimate_tokens() approximates BPE token counts (Llama / MiniLM tokenizers)
+without loading a tokenizer: words cost ~1 token per 4 letters, digit runs
+~1 per 3 digits, and punctuation 1 each. It is within ~10% on English prose,
+which is enough for budgeting chunks and prompts.
+
+chunk_by_tokens() packs whole paragraphs, then whole sentences, into chunks
+of at most ``max_tokens``. Overlap is only added where a chunk boundary cuts
+through a paragraph (the tail sentences are carried forward); chunks that
+end on a paragraph break start clean.
+"""
+
+import math
+import re
+from typing import List
+
+_TOKEN_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+# Split after . ! ? (optionally followed by a closing quote/bracket) before
+# whitespace + an uppercase letter, digit, bullet or quote.
+_SENTENCE_RE = re.compile(
+    r"(?:(?<=[.!?])|(?<=[.!?][\"')\]]))\s+(?=[A-Z0-9\"'(•\-*])"
+    r"|\n(?=\s*[•\-*]\s)"
+)
+
+DEFAULT_MAX_TOKENS = 400
+DEFAULT_OVERLAP_TOKENS = 40
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count of ``text``."""
+    if not text:
+        return 0
+    total = 0
+    for piece in _TOKEN_RE.findall(text):
+        if piece[0].isalpha():
+            total += max(1, math.ceil(len(piece) / 4))
+        elif piece[0].isdigit():
+            total += max(1, math.ceil(len(piece) / 3))
+        else:
+            total += 1
+    return total
+
+
+def split_paragraphs(text: str) -> List[str]:
+    return [p.strip() for p in _PARAGRAPH_RE.split(text or "") if p.strip()]
+
+
+def split_sentences(paragraph: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_RE.split(paragraph) if s and s.strip()]
+
+
+def _split_long_sentence(sentence: str, max_tokens: int) -> List[str]:
+    # Last resort for run-ons / tables: pack whole words.
+    pieces, current, current_tokens = [], [], 0
+    for word in sentence.split():
+        cost = estimate_tokens(word)
+        if current and current_tokens + cost > max_tokens:
+            pieces.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(word)
+        current_tokens += cost
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def _tail(sentences: List[str], budget: int) -> List[str]:
+    tail, used = [], 0
+    for sentence in reversed(sentences):
+        cost = estimate_tokens(sentence)
+        if used + cost > budget:
+            break
+        tail.insert(0, sentence)
+        used += cost
+    return tail
+
+
+def chunk_by_tokens(
+    text: str,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+) -> List[str]:
+    """Pack paragraphs/sentences into chunks of at most ``max_tokens``."""
+    if not text or not text.strip():
+        return []
+
+    chunks: List[str] = []
+    current: List[str] = []      # paragraphs (or sentence runs) in the open chunk
+    current_tokens = 0
+
+    def close() -> None:
+        nonlocal current, current_tokens
+        if current:
+            chunks.append("\n\n".join(current))
+        current, current_tokens = [], 0
+
+    for paragraph in split_paragraphs(text):
+        para_tokens = estimate_tokens(paragraph)
+        if current_tokens + para_tokens <= max_tokens:
+            current.append(paragraph)
+            current_tokens += para_tokens
+            continue
+        if para_tokens <= max_tokens:
+            # Boundary on a paragraph break: no overlap needed.
+            close()
+            current, current_tokens = [paragraph], para_tokens
+            continue
+
+        # Paragraph larger than the budget: pack its sentences (continuing the
+        # open chunk), carrying the tail of each closed chunk into the next one.
+        sentences: List[str] = []
+        for sentence in split_sentences(paragraph):
+            if estimate_tokens(sentence) > max_tokens:
+                sentences.extend(_split_long_sentence(sentence, max_tokens))
+            else:
+                sentences.append(sentence)
+
+        run: List[str] = ["\n\n".join(current)] if current else []
+        run_tokens = current_tokens
+        current, current_tokens = [], 0
+        for sentence in sentences:
+            cost = estimate_tokens(sentence)
+            if run and run_tokens + cost > max_tokens:
+                chunks.append(" ".join(run))
+                run = _tail(run, min(overlap_tokens, max_tokens - cost))
+                run_tokens = sum(estimate_tokens(s) for s in run)
+            run.append(sentence)
+            run_tokens += cost
+        if run:
+            current, current_tokens = [" ".join(run)], run_tokens
+
+    close()
+    return chunks
@@ -11,6 +11,9 @@ import os
 from google import genai
 from dotenv import load_dotenv
 
+from app.services.embedding_batcher import MicroBatcher
+from app.services.embedding_cache import EmbeddingCache
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -34,17 +37,44 @@ def _get_client() -> genai.Client:
 _OUTPUT_DIMS = 768
 
 
-def embed_text(text: str) -> list[float]:
-    """Embed a single text string via Gemini gemini-embedding-001 (768-dim)."""
+def embed_texts(texts: list[str]) -> list[list[float]]:
+    """Embed several texts in one Gemini embed_content call (768-dim each)."""
+    if not texts:
+        return []
     client = _get_client()
     result = client.models.embed_content(
         model=_EMBEDDING_MODEL,
-        contents=text,
+        contents=texts,
         config={"output_dimensionality": _OUTPUT_DIMS},
     )
-    return list(result.embeddings[0].values)
+    return [list(e.values) for e in result.embeddings]
+
+
+# Concurrent embed_text callers (job searches, ingestion threads) share one
+# multi-content request per window instead of one round trip each.
+_batcher = MicroBatcher(
+    "gemini",
+    embed_texts,
+    max_batch_size=int(os.getenv("GEMINI_EMBED_MAX_BATCH", "64")),
+    max_wait_ms=float(os.getenv("GEMINI_EMBED_MAX_WAIT_MS", "10")),
+)
+
+
+# Skill sets and role queries repeat across searches; repeat texts skip the API.
+_cache = EmbeddingCache("gemini", _EMBEDDING_MODEL, _OUTPUT_DIMS)
+
+
+def embed_text(text: str) -> list[float]:
+    """Embed a single text string via Gemini gemini-embedding-001 (768-dim)."""
+    return _cache.get_or_compute(text, _batcher.embed)
+
+
+def skills_text(skills: list[str]) -> str:
+    """Canonical (deduped, sorted) skill string so equal sets share a cache key."""
+    unique = {s.strip().lower(): s.strip() for s in skills if s and s.strip()}
+    return ", ".join(unique[k] for k in sorted(unique))
 
 
 def embed_skills(skills: list[str]) -> list[float]:
     """Embed a list of skill names into a single vector."""
-    return embed_text(", ".join(skills))
+    return embed_text(skills_text(skills))
@@ -0,0 +1,109 @@
+"""
+Micro-batching for embedding calls.
+
+Concurrent request threads each embed one short text. Running those one at a
+time wastes the model's vectorization (SentenceTransformer) or a network round
+trip per text (Gemini). MicroBatcher queues individual texts, waits up to
+``max_wait_ms`` for more to arrive (or until ``max_batch_size``), runs one
+batched call and hands each caller its own vector.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BatchFn = Callable[[List[str]], List[List[float]]]
+
+
+class MicroBatcher:
+    """Coalesce single-text embed calls into batched calls on a worker thread."""
+
+    def __init__(
+        self,
+        name: str,
+        batch_fn: BatchFn,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self._last_batch_size = 0
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"embed-batch-{self.name}", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str, timeout: Optional[float] = 30.0) -> List[float]:
+        """Blocking single-text embed routed through the batcher."""
+        return self.submit(text).result(timeout=timeout)
+
+    def _collect(self) -> List[Tuple[str, Future]]:
+        batch = [self._queue.get()]
+        # A lone caller with no recent concurrency shouldn't pay max_wait.
+        if self._last_batch_size <= 1 and self._queue.empty():
+            return batch
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # Still drain anything already queued without waiting.
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except queue.Empty:
+                    break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            texts = [text for text, _ in batch]
+            try:
+                vectors = self.batch_fn(texts)
+                if len(vectors) != len(texts):
+                    raise ValueError(f"batch_fn returned {len(vectors)} vectors for {len(texts)} texts")
+            except Exception as exc:
+                logger.warning("[EMBED_BATCH] %s batch of %d failed: %s", self.name, len(texts), exc)
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.items += len(texts)
+            self._last_batch_size = len(texts)
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else None,
+        }
@@ -0,0 +1,79 @@
+"""
+Two-tier embedding cache (memory LRU → SQLite) keyed by normalized text.
+
+Each EmbeddingCache is bound to one (model, dims). The SQLite rows are
+tagged with "<model>:<dims>:v<EMBEDDING_CACHE_VERSION>", so switching models,
+changing output dimensionality or bumping the version invalidates every
+stored vector for that cache on the next startup.
+"""
+
+import logging
+import os
+from array import array
+from typing import Callable, List, Optional
+
+from app.services.cache import LRUCache, SQLiteKV, text_hash
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CACHE_VERSION = os.getenv("EMBEDDING_CACHE_VERSION", "1")
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "5000"))
+EMBEDDING_CACHE_PERSIST = os.getenv("EMBEDDING_CACHE_PERSIST", "1") != "0"
+
+
+class EmbeddingCache:
+    """Memory + persistent cache of vectors for one embedding model."""
+
+    def __init__(self, name: str, model: str, dims: int):
+        self.model = model
+        self.dims = dims
+        self.memory = LRUCache(f"{name}_embeddings", max_entries=EMBEDDING_CACHE_SIZE)
+        self.store: Optional[SQLiteKV] = None
+        if EMBEDDING_CACHE_PERSIST:
+            try:
+                self.store = SQLiteKV(
+                    f"{name}_embeddings",
+                    version=f"{model}:{dims}:v{EMBEDDING_CACHE_VERSION}",
+                )
+            except Exception as exc:
+                logger.warning("[EMBED_CACHE] SQLite tier disabled for %s: %s", name, exc)
+
+    def _key(self, text: str) -> str:
+        return text_hash(text)
+
+    def get(self, text: str) -> Optional[List[float]]:
+        key = self._key(text)
+        vector = self.memory.get(key)
+        if vector is not None:
+            return vector
+        if self.store is None:
+            return None
+        try:
+            blob = self.store.get(key)
+        except Exception as exc:
+            logger.warning("[EMBED_CACHE] SQLite read failed: %s", exc)
+            return None
+        if blob is None:
+            return None
+        vector = array("f", blob).tolist()
+        if len(vector) != self.dims:
+            return None
+        self.memory.set(key, vector)
+        return vector
+
+    def put(self, text: str, vector: List[float]) -> None:
+        key = self._key(text)
+        self.memory.set(key, vector)
+        if self.store is not None:
+            try:
+                self.store.set(key, array("f", vector).tobytes())
+            except Exception as exc:
+                logger.warning("[EMBED_CACHE] SQLite write failed: %s", exc)
+
+    def get_or_compute(self, text: str, compute: Callable[[str], List[float]]) -> List[float]:
+        vector = self.get(text)
+        if vector is None:
+            vector = compute(text)
+            if vector:
+                self.put(text, vector)
+        return vector
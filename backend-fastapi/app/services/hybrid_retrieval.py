@@ -0,0 +1,150 @@
+"""
+Hybrid lexical + vector retrieval over the local rag_chunks replica.
+
+  1. BM25 over an in-process inverted index (exact skill/tool terms such as
+     "kubernetes" or "c++" that embeddings blur)
+  2. Dense dot-product candidates from RagChunkIndex
+  3. Reciprocal rank fusion of both candidate lists
+  4. Local re-rank: walk fused order, drop near-duplicate chunks (embedding
+     cosine above a threshold) and stop at ``limit`` chunks or when the
+     snippets would exceed ``token_budget``
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.services.chunking import estimate_tokens
+
+RRF_K = 60
+BM25_K1 = 1.2
+BM25_B = 0.75
+DUPLICATE_COSINE = 0.92
+
+_TERM_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this "
+    "to was were will with you your we our they their i my me he she his her them "
+    "not no but if so do does did can could should would than then there these those "
+    "what when where which who why how all any each more most other some such into "
+    "about over under also only very just".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    terms = []
+    for term in _TERM_RE.findall((text or "").lower()):
+        term = term.rstrip(".")
+        # Keep one-letter language names; drop other single characters.
+        if (len(term) > 1 and term not in _STOPWORDS) or term in ("c", "r"):
+            terms.append(term)
+    return terms
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of documents."""
+
+    def __init__(self, documents: Sequence[str]):
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.doc_len: List[int] = []
+        for doc_id, text in enumerate(documents):
+            counts = Counter(tokenize(text))
+            self.doc_len.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self.postings[term].append((doc_id, tf))
+        self.n_docs = len(self.doc_len)
+        self.avg_len = (sum(self.doc_len) / self.n_docs) if self.n_docs else 0.0
+        self.idf = {
+            term: math.log(1 + (self.n_docs - len(p) + 0.5) / (len(p) + 0.5))
+            for term, p in self.postings.items()
+        }
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        allowed: Optional[Iterable[int]] = None,
+    ) -> List[Tuple[int, float]]:
+        """Top ``limit`` (doc_id, score), optionally restricted to ``allowed`` ids."""
+        if not self.n_docs:
+            return []
+        allowed_set = set(int(i) for i in allowed) if allowed is not None else None
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf[term]
+            for doc_id, tf in postings:
+                if allowed_set is not None and doc_id not in allowed_set:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_len[doc_id] / (self.avg_len or 1))
+                scores[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+
+
+def reciprocal_rank_fusion(ranked_lists: Iterable[Sequence[int]], k: int = RRF_K) -> List[Tuple[int, float]]:
+    """Fuse ranked id lists: score(d) = Σ 1 / (k + rank(d))."""
+    fused: Dict[int, float] = defaultdict(float)
+    for ranked in ranked_lists:
+        for rank, doc_id in enumerate(ranked, start=1):
+            fused[doc_id] += 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda kv: kv[1], reverse=True)
+
+
+def hybrid_search(
+    index,
+    query_text: str,
+    query_embedding: List[float],
+    category: Optional[str],
+    limit: int,
+    token_budget: int,
+    snippet_chars: int,
+    candidate_k: int = 40,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Hybrid top-k over a RagChunkIndex. Returns None when the replica can't
+    answer, so the caller falls back to vector-only RPC retrieval.
+    """
+    state = index.snapshot()
+    matrix, meta, bm25, by_category = state
+    if matrix is None or bm25 is None:
+        return None
+    dense = []
+    if query_embedding:
+        dense = index.search(query_embedding, category, candidate_k, with_rows=True, state=state)
+        if dense is None:
+            return None
+
+    allowed = by_category.get(category) if category else None
+    if category and allowed is None:
+        return []
+    lexical = bm25.search(query_text, candidate_k, allowed=allowed)
+
+    fused = reciprocal_rank_fusion([[row for row, _ in dense], [doc for doc, _ in lexical]])
+    dense_scores = dict(dense)
+    lexical_scores = dict(lexical)
+
+    selected: List[int] = []
+    results: List[Dict[str, Any]] = []
+    used_tokens = 0
+    for row, fused_score in fused:
+        if len(results) >= limit:
+            break
+        vec = matrix[row]
+        if any(float(vec @ matrix[other]) >= DUPLICATE_COSINE for other in selected):
+            continue
+        content = meta[row].get("content") or ""
+        cost = estimate_tokens(content[:snippet_chars])
+        if results and used_tokens + cost > token_budget:
+            continue
+        used_tokens += cost
+        selected.append(row)
+        results.append({
+            **meta[row],
+            "similarity": dense_scores.get(row),
+            "bm25": round(lexical_scores[row], 4) if row in lexical_scores else None,
+            "rrf": round(fused_score, 6),
+        })
+    return results
@@ -1,6 +1,8 @@
 import json
 from typing import Dict, List
 
+from app.services.prompt_compaction import PromptSlot, compact_slots
+
 
 DIFFICULTY_DEPTH = {
     "easy": "surface-level: confirm what they did, single layer of depth",
@@ -8,6 +10,9 @@ DIFFICULTY_DEPTH = {
     "hard": "system thinking: failure modes, scale challenges, edge cases, and decision rationale",
 }
 
+# Estimated-token budget for the already-asked / previous-session question lists.
+QUESTION_HISTORY_TOKENS = 900
+
 
 def _serialize_anchors(anchors: Dict[str, List[str]]) -> str:
     compact = {
@@ -53,8 +58,16 @@ def build_section_generation_prompt(
     ]
     prior = [f"- {q}" for q in (previous_questions or []) if isinstance(q, str) and q.strip()]
 
-    existing_text = "\n".join(existing[:30]) or "- none"
-    prior_text = "\n".join(prior[:30]) or "- none"
+    history = compact_slots(
+        [
+            PromptSlot("existing", "\n".join(existing[:30]), priority=0, min_tokens=300),
+            PromptSlot("prior", "\n".join(prior[:30]), priority=1, min_tokens=150),
+        ],
+        budget=QUESTION_HISTORY_TOKENS,
+        site="interview.generate_questions",
+    )
+    existing_text = history["existing"] or "- none"
+    prior_text = history["prior"] or "- none"
 
     return f"""Generate EXACTLY {required_count} interview questions for section '{section_key}'.
 
@@ -0,0 +1,314 @@
+"""
+Deterministic skill extraction for job descriptions.
+
+Replaces the per-posting LLM call in job ingestion with a single compiled
+regex built from the skill-gap ontology (SKILL_LEARNING_TIME, CAREER_CLUSTERS,
+TECH_STACKS and _SKILL_ALIAS_MAP in app/agents/skill_gap/nodes.py):
+
+  - Every ontology skill contributes its surface forms ("Node.js", "nodejs",
+    "node js", "REST APIs", ...) to one longest-first alternation
+  - Common English words that are also skills ("Go", "Swift", "Spring") only
+    match capitalized; "R" / "C" / "Go" additionally need language context
+  - Mentions are weighted by the section they appear in: requirements and
+    qualifications count fully, "nice to have" / "preferred" less, company
+    blurbs and benefits barely; skills below MIN_SKILL_WEIGHT are dropped
+  - Descriptions with too few hits (low coverage) can be handed to an LLM
+    fallback, whose answers are mapped back onto the ontology
+"""
+
+import logging
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MIN_SKILL_WEIGHT = 0.5
+REPEAT_BONUS = 0.1
+MAX_REPEAT_BONUS = 0.3
+LOW_COVERAGE_MIN_SKILLS = 3
+LOW_COVERAGE_MIN_CHARS = 400
+
+SECTION_WEIGHTS = {
+    "required": 1.0,
+    "responsibilities": 0.8,
+    "intro": 0.6,
+    "preferred": 0.5,
+    "other": 0.2,
+}
+
+# Checked in order: "preferred qualifications" must resolve before "qualifications".
+_SECTION_PATTERNS: List[Tuple[str, re.Pattern]] = [
+    ("preferred", re.compile(r"\b(preferred|nice[\s-]to[\s-]haves?|bonus|desired|pluses|additional)\b")),
+    ("other", re.compile(r"\b(about (us|the (company|team))|benefits|perks|what we offer|compensation|salary|equal opportunity|eeo|why join)\b")),
+    ("required", re.compile(r"\b(requirements?|qualifications?|must[\s-]haves?|what you('ll)? (need|bring)|you have|who you are|skills|experience|minimum)\b")),
+    ("responsibilities", re.compile(r"\b(responsibilit(y|ies)|what you('ll)? do|the role|duties|day[\s-]to[\s-]day|your impact)\b")),
+]
+_INLINE_PREFERRED = re.compile(r"\b(a plus|nice to have|preferred|bonus|is desirable)\b", re.IGNORECASE)
+
+# Skills that are soft competencies; the LLM extractor was asked for
+# "technical skills, tools, and frameworks" and job matching embeds these.
+_NON_TECHNICAL = {
+    "communication", "leadership", "problem solving", "stakeholder management",
+    "prioritization", "documentation", "mathematics", "reporting",
+}
+# Ordinary words that are also skills: only match the capitalized form.
+_CASE_SENSITIVE = {
+    "go", "less", "spring", "lambda", "slack", "swift", "excel", "spark",
+    "unity", "sketch", "apache", "ruby", "rust", "security", "testing",
+    "monitoring", "networking", "debugging", "analytics", "compliance",
+    "forecasting", "encryption", "serverless", "ai", "json", "yaml",
+}
+# Forms that need surrounding language context.
+_CONTEXT_PATTERNS = {
+    "r": [
+        r"\br\s+(programming|language|studio|script|markdown|package|cran|tidyverse|ggplot|dplyr|shiny)",
+        r"(programming|language|statistical|statistics|data\s+analysis|analysis|modeling|visualization)\s+(in|with|using)\s+r\b",
+        r"\br\s*[,;/|]\s*(python|julia|matlab|sas|spss|stata|sql)",
+        r"(python|julia|matlab|sas|spss|stata|sql)\s*[,;/|]\s*(or\s+|and\s+)?r\b",
+        r"\brstudio\b",
+    ],
+    "go": [
+        r"\bgo\s*[,;/|]\s*(python|java|rust|c\+\+|kotlin|node|ruby|scala)",
+        r"(python|java|rust|c\+\+|kotlin|node\.?js|ruby|scala|typescript)\s*[,;/|]\s*(or\s+|and\s+)?go\b",
+        r"\bgo\s+(programming|language|developer|engineer|services|microservices|backend)",
+        r"(in|with|using|written in)\s+go\b(?!\s+(to|through|beyond|above|live))",
+    ],
+}
+# Extra surface forms common in postings but absent from the ontology.
+_EXTRA_ALIASES = {
+    "k8s": "Kubernetes",
+    "postgres": "PostgreSQL",
+    "vue": "Vue.js",
+    "vuejs": "Vue.js",
+    "expressjs": "Express.js",
+    "tailwind": "Tailwind CSS",
+    "sklearn": "Scikit-learn",
+    "amazon web services": "AWS",
+    "microsoft azure": "Azure",
+    "restful": "REST API",
+    "rest api": "REST API",
+}
+# _SKILL_ALIAS_MAP entries that are too ambiguous in free text.
+_SKIP_ALIASES = {"next", "js", "ts", "node"}
+
+_HEADING_MAX_CHARS = 60
+# Words a heading may add around its section phrase ("Key Responsibilities", "Benefits & Perks").
+_HEADING_FILLER = {"a", "an", "and", "&", "+", "/", "the", "to", "of", "for", "in", "our", "your", "key", "core", "job"}
+# Lower-case words allowed inside a title-case heading.
+_TITLE_MINOR = {"a", "an", "and", "as", "at", "but", "by", "for", "in", "of", "on", "or", "the", "to", "with"}
+_WORD = re.compile(r"[A-Za-z][\w'’]*")
+_SURFACE_SEP = re.compile(r"[\s\-]+")
+
+
+def _surface_key(text: str) -> str:
+    return _SURFACE_SEP.sub(" ", text.lower()).strip()
+
+
+def _surface_pattern(surface: str) -> str:
+    return r"[\s\-]+".join(re.escape(word) for word in surface.split())
+
+
+class JDSkillExtractor:
+    """Compiled ontology matcher with section-weighted scoring."""
+
+    def __init__(
+        self,
+        ontology: Dict[str, str],
+        aliases: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            ontology: normalized skill -> canonical display name.
+            aliases: extra surface form -> normalized skill or canonical name.
+        """
+        self.canonical: Dict[str, str] = {}          # surface key -> canonical
+        case_sensitive: Dict[str, str] = {}          # exact surface -> canonical
+        self.context: Dict[str, List[re.Pattern]] = {}
+
+        canonical_by_key = {_surface_key(c): c for c in ontology.values()}
+
+        def add(surface: str, canonical: str) -> None:
+            key = _surface_key(surface)
+            if not key or _surface_key(canonical) in _NON_TECHNICAL:
+                return
+            if key in _CONTEXT_PATTERNS:
+                self.context[canonical] = [re.compile(p) for p in _CONTEXT_PATTERNS[key]]
+            elif key in _CASE_SENSITIVE:
+                case_sensitive[surface if surface[:1].isupper() else canonical] = canonical
+            elif len(key) > 1:
+                self.canonical.setdefault(key, canonical)
+
+        for norm, canonical in ontology.items():
+            add(canonical, canonical)
+            add(norm, canonical)
+        for alias, target in {**(aliases or {}), **_EXTRA_ALIASES}.items():
+            if alias in _SKIP_ALIASES:
+                continue
+            canonical = ontology.get(target) or canonical_by_key.get(_surface_key(target))
+            if canonical:
+                add(alias, canonical)
+
+        self._ontology = ontology
+        self._canonical_by_key = canonical_by_key
+        self._pattern = self._compile(self.canonical)
+        self._case_map = {_surface_key(s): c for s, c in case_sensitive.items()}
+        self._case_pattern = self._compile(case_sensitive) if case_sensitive else None
+
+    @staticmethod
+    def _compile(surfaces: Iterable[str]) -> re.Pattern:
+        # Longest first so "spring boot" wins over "spring", "asp.net" over ".net".
+        ordered = sorted(set(surfaces), key=len, reverse=True)
+        body = "|".join(_surface_pattern(s) for s in ordered)
+        return re.compile(r"(?<![A-Za-z0-9])(?:" + body + r")(?![A-Za-z0-9])")
+
+    # ── Sections ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _is_title_case(text: str) -> bool:
+        words = _WORD.findall(text)
+        return bool(words) and words[0][0].isupper() and all(
+            w[0].isupper() or w.lower() in _TITLE_MINOR for w in words
+        )
+
+    @staticmethod
+    def _only_heading_words(lowered: str) -> bool:
+        """True if nothing but section phrases and filler words remain."""
+        for _, pattern in _SECTION_PATTERNS:
+            lowered = pattern.sub(" ", lowered)
+        return all(word in _HEADING_FILLER for word in lowered.split())
+
+    def _mentions_skill(self, text: str) -> bool:
+        return bool(
+            self._pattern.search(text.lower())
+            or (self._case_pattern is not None and self._case_pattern.search(text))
+        )
+
+    def _heading_section(self, line: str) -> Optional[str]:
+        """
+        Section a heading line starts, or None. A line is a heading only if it
+        looks like one (ends in ":", starts with "#", all caps, title case, or
+        is nothing but a section phrase) and names no skill itself, so
+        "Kafka experience preferred" stays a requirement line.
+        """
+        raw = line.strip()
+        if raw[:2] in ("- ", "• ", "* "):
+            return None
+        head = raw.split(":", 1)[0] if ":" in raw else raw
+        stripped = head.strip("#*•-_ ").strip()
+        if not stripped or len(stripped) > _HEADING_MAX_CHARS:
+            return None
+        lowered = stripped.lower()
+        section = next((name for name, pattern in _SECTION_PATTERNS if pattern.search(lowered)), None)
+        if section is None or self._mentions_skill(stripped):
+            return None
+        looks_like_heading = (
+            raw.endswith(":")
+            or raw.startswith("#")
+            or stripped.isupper()
+            or self._is_title_case(stripped)
+            or self._only_heading_words(lowered)
+        )
+        return section if looks_like_heading else None
+
+    def _weighted_lines(self, description: str) -> Iterable[Tuple[str, float]]:
+        section = "intro"
+        for line in description.splitlines():
+            heading = self._heading_section(line)
+            if heading:
+                section = heading
+            # Heading lines are scanned too ("Requirements: Python, SQL").
+            weight = SECTION_WEIGHTS[section]
+            if _INLINE_PREFERRED.search(line):
+                weight = min(weight, SECTION_WEIGHTS["preferred"])
+            yield line, weight
+
+    # ── Extraction ────────────────────────────────────────────────────────────
+
+    def score(self, description: str) -> Dict[str, float]:
+        """canonical skill -> weight (max section weight + repeat bonus)."""
+        best: Dict[str, float] = {}
+        mentions: Dict[str, int] = {}
+        order: Dict[str, int] = {}
+
+        def hit(canonical: str, weight: float) -> None:
+            order.setdefault(canonical, len(order))
+            mentions[canonical] = mentions.get(canonical, 0) + 1
+            best[canonical] = max(best.get(canonical, 0.0), weight)
+
+        for line, weight in self._weighted_lines(description or ""):
+            lowered = line.lower()
+            spans = []
+            for match in self._pattern.finditer(lowered):
+                spans.append(match.span())
+                hit(self.canonical[_surface_key(match.group(0))], weight)
+            if self._case_pattern is not None:
+                for match in self._case_pattern.finditer(line):
+                    # "Spring" inside an already matched "Spring Boot"
+                    if any(start <= match.start() < end for start, end in spans):
+                        continue
+                    hit(self._case_map[_surface_key(match.group(0))], weight)
+            for canonical, patterns in self.context.items():
+                if any(p.search(lowered) for p in patterns):
+                    hit(canonical, weight)
+
+        scores = {
+            skill: round(weight + min(MAX_REPEAT_BONUS, REPEAT_BONUS * (mentions[skill] - 1)), 3)
+            for skill, weight in best.items()
+        }
+        return dict(sorted(scores.items(), key=lambda kv: (-kv[1], order[kv[0]])))
+
+    def extract(self, description: str) -> List[str]:
+        return [skill for skill, weight in self.score(description).items() if weight >= MIN_SKILL_WEIGHT]
+
+    def is_low_coverage(self, description: str, skills: List[str]) -> bool:
+        return len(skills) < LOW_COVERAGE_MIN_SKILLS and len(description or "") >= LOW_COVERAGE_MIN_CHARS
+
+    def known_skills(self) -> set:
+        """Lower-cased canonical names the matcher can produce."""
+        names = set(self.canonical.values()) | set(self._case_map.values()) | set(self.context)
+        return {name.lower() for name in names}
+
+    def to_canonical(self, skill: str) -> str:
+        """Map a free-form skill (e.g. from the LLM) onto the ontology when possible."""
+        key = _surface_key(skill)
+        return (
+            self.canonical.get(key)
+            or self._case_map.get(key)
+            or self._canonical_by_key.get(key)
+            or skill.strip()
+        )
+
+    def extract_with_fallback(
+        self,
+        description: str,
+        llm_extract: Optional[Callable[[str], List[str]]] = None,
+    ) -> Tuple[List[str], bool]:
+        """
+        Local extraction, topped up by ``llm_extract`` for low-coverage
+        descriptions. Returns (skills, used_llm).
+        """
+        skills = self.extract(description)
+        if llm_extract is None or not self.is_low_coverage(description, skills):
+            return skills, False
+        seen = {_surface_key(s) for s in skills}
+        for raw in llm_extract(description) or []:
+            canonical = self.to_canonical(raw)
+            key = _surface_key(canonical)
+            if key and key not in seen:
+                seen.add(key)
+                skills.append(canonical)
+        return skills, True
+
+
+_extractor: Optional[JDSkillExtractor] = None
+
+
+def get_jd_skill_extractor() -> JDSkillExtractor:
+    """Process-wide extractor built from the skill-gap ontology (compiled once)."""
+    global _extractor
+    if _extractor is None:
+        from app.agents.skill_gap.nodes import _SKILL_ALIAS_MAP, _SKILL_ONTOLOGY
+
+        _extractor = JDSkillExtractor(_SKILL_ONTOLOGY, aliases=_SKILL_ALIAS_MAP)
+        logger.info("[JD_SKILLS] Compiled matcher for %d surface forms", len(_extractor.canonical))
+    return _extractor
@@ -0,0 +1,223 @@
+"""
+Near-duplicate detection for job postings.
+
+The same posting is often syndicated by several JSearch publishers with small
+text differences (tracking footers, reordered benefits, "Apply on X"), so the
+external_id check in ingest_jobs misses it. Each posting gets a 64-bit
+SimHash over its normalized title, company, location and description:
+
+  - features are word 3-shingles of the description plus title / company /
+    location tokens (weighted higher so different roles at one company, or
+    one role in several cities, stay apart)
+  - two postings are near-duplicates when their signatures differ in at most
+    JOB_DEDUPE_MAX_DISTANCE bits and their normalized locations are equal
+  - the index splits signatures into MAX_DISTANCE + 1 bands; by pigeonhole,
+    any pair within the distance agrees exactly on at least one band, so a
+    lookup only compares against postings sharing a band
+
+Signatures are stored in job_postings.simhash and the in-process index is
+loaded from there on first use, so the check runs before skill extraction
+and embedding. Schema:
+
+    alter table job_postings add column if not exists simhash bigint;
+
+Without the column, set JOB_DEDUPE_STORE_SIMHASH=0. If an insert fails
+because the column is missing, storage is switched off for the rest of the
+process and the row is retried without it; dedupe then only covers postings
+ingested since startup.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.services.cache import normalize_text, register_metrics
+
+logger = logging.getLogger(__name__)
+
+JOB_DEDUPE_MAX_DISTANCE = int(os.getenv("JOB_DEDUPE_MAX_DISTANCE", "3"))
+JOB_DEDUPE_STORE_SIMHASH = os.getenv("JOB_DEDUPE_STORE_SIMHASH", "1") != "0"
+SHINGLE_SIZE = 3
+TITLE_WEIGHT = 8
+COMPANY_WEIGHT = 4
+LOCATION_WEIGHT = 4
+LOAD_PAGE_SIZE = 1000
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+_BIT_WEIGHTS = 1 << np.arange(64, dtype=np.uint64)
+
+
+def _feature_hashes(features: List[str]) -> np.ndarray:
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "little") for f in features],
+        dtype=np.uint64,
+    )
+
+
+def simhash(title: str, company: str = "", description: str = "", location: str = "") -> int:
+    """Unsigned 64-bit SimHash of a posting; 0 when there is no text at all."""
+    words = _TOKEN_RE.findall(normalize_text(description))
+    features = [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(max(1, len(words) - SHINGLE_SIZE + 1))]
+    weights = [1] * len(features)
+    for prefix, text, weight in (
+        ("t:", title, TITLE_WEIGHT),
+        ("c:", company, COMPANY_WEIGHT),
+        ("l:", location, LOCATION_WEIGHT),
+    ):
+        for token in _TOKEN_RE.findall(normalize_text(text)):
+            features.append(prefix + token)
+            weights.append(weight)
+    keep = [i for i, f in enumerate(features) if f]
+    if not keep:
+        return 0
+
+    hashes = _feature_hashes([features[i] for i in keep])
+    bits = ((hashes[:, None] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)).astype(np.int64)
+    votes = (np.array([weights[i] for i in keep], dtype=np.int64)[:, None] * (2 * bits - 1)).sum(axis=0)
+    return int(_BIT_WEIGHTS[votes > 0].sum(dtype=np.uint64))
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def to_signed(signature: int) -> int:
+    """Postgres bigint is signed; store the same 64 bits as a signed value."""
+    return signature - (1 << 64) if signature >= (1 << 63) else signature
+
+
+def from_signed(value: int) -> int:
+    return value & ((1 << 64) - 1)
+
+
+def location_key(location: Optional[str]) -> str:
+    return " ".join(_TOKEN_RE.findall(normalize_text(location or "")))
+
+
+_store_simhash = JOB_DEDUPE_STORE_SIMHASH
+
+
+def simhash_storage_enabled() -> bool:
+    """Whether job_postings.simhash should be written (and read)."""
+    return _store_simhash
+
+
+def disable_simhash_storage_if_missing(exc: Exception) -> bool:
+    """
+    Switch off simhash storage when ``exc`` says the column doesn't exist.
+    Returns True if the caller should retry its insert without the column.
+    """
+    global _store_simhash
+    if not _store_simhash or "simhash" not in str(exc).lower():
+        return False
+    _store_simhash = False
+    logger.warning(
+        "[JOB_DEDUPE] job_postings.simhash is missing; storing postings without it "
+        "(add the column or set JOB_DEDUPE_STORE_SIMHASH=0): %s", exc,
+    )
+    return True
+
+
+class SimHashIndex:
+    """Banded SimHash index: signature -> posting id, thread-safe."""
+
+    def __init__(self, max_distance: int = JOB_DEDUPE_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.n_bands = max_distance + 1
+        self._band_bits = 64 // self.n_bands
+        self._bands: List[Dict[int, List[int]]] = [{} for _ in range(self.n_bands)]
+        self._signatures: List[int] = []
+        self._locations: List[str] = []
+        self._ids: List[Any] = []
+        self._lock = threading.Lock()
+        self.counters = {"lookups": 0, "near_duplicates": 0}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _band_keys(self, signature: int):
+        mask = (1 << self._band_bits) - 1
+        for band in range(self.n_bands):
+            # The last band takes the leftover high bits.
+            if band == self.n_bands - 1:
+                yield band, signature >> (band * self._band_bits)
+            else:
+                yield band, (signature >> (band * self._band_bits)) & mask
+
+    def add(self, posting_id: Any, signature: int, location: str = "") -> None:
+        with self._lock:
+            slot = len(self._ids)
+            self._ids.append(posting_id)
+            self._signatures.append(signature)
+            self._locations.append(location_key(location))
+            for band, key in self._band_keys(signature):
+                self._bands[band].setdefault(key, []).append(slot)
+
+    def find(self, signature: int, location: str = "") -> Optional[Any]:
+        """Id of a stored posting in the same location within max_distance bits, or None."""
+        location = location_key(location)
+        with self._lock:
+            self.counters["lookups"] += 1
+            seen = set()
+            for band, key in self._band_keys(signature):
+                for slot in self._bands[band].get(key, ()):
+                    if slot in seen:
+                        continue
+                    seen.add(slot)
+                    if (
+                        self._locations[slot] == location
+                        and hamming(signature, self._signatures[slot]) <= self.max_distance
+                    ):
+                        self.counters["near_duplicates"] += 1
+                        return self._ids[slot]
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.counters, "size": len(self._ids)}
+
+
+def _load_from_db(index: SimHashIndex) -> None:
+    from supabase_client import supabase
+
+    if not simhash_storage_enabled():
+        return
+    start = 0
+    while True:
+        rows = (
+            supabase.table("job_postings")
+            .select("id, simhash, location")
+            .not_.is_("simhash", "null")
+            .range(start, start + LOAD_PAGE_SIZE - 1)
+            .execute()
+        ).data or []
+        for row in rows:
+            index.add(row["id"], from_signed(int(row["simhash"])), row.get("location") or "")
+        if len(rows) < LOAD_PAGE_SIZE:
+            break
+        start += LOAD_PAGE_SIZE
+
+
+_index: Optional[SimHashIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_job_dedupe_index() -> SimHashIndex:
+    """Process-wide index, loaded from job_postings.simhash on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            index = SimHashIndex()
+            try:
+                _load_from_db(index)
+                logger.info("[JOB_DEDUPE] Loaded %d posting signatures", len(index))
+            except Exception as exc:
+                logger.warning("[JOB_DEDUPE] Could not load signatures, starting empty: %s", exc)
+            _index = index
+            register_metrics("job_dedupe", index.stats)
+        return _index
@@ -0,0 +1,238 @@
+"""
+Background job-ingestion queue for /jobs/refresh.
+
+  - submit() returns a task immediately; ingest_jobs runs on a bounded
+    thread pool (JOB_INGEST_WORKERS)
+  - Refreshes for the same normalized (query, location) coalesce: while a run
+    is queued/running, or finished successfully within JOB_INGEST_COALESCE_S,
+    new requests attach to that task instead of starting another one
+  - Each task tracks per-stage counts reported by ingest_jobs (fetched,
+    duplicate, near_duplicate, extracted, embedded, stored, failed)
+  - Task state is persisted to the local SQLite cache; on restart, tasks that
+    were queued or running are re-queued (ingest_jobs skips postings that
+    were already stored, so a rerun is safe)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.services.cache import SQLiteKV, normalize_text, register_metrics
+
+logger = logging.getLogger(__name__)
+
+JOB_INGEST_WORKERS = int(os.getenv("JOB_INGEST_WORKERS", "2"))
+JOB_INGEST_COALESCE_S = float(os.getenv("JOB_INGEST_COALESCE_S", "600"))
+TASK_RETENTION_S = 7 * 24 * 3600
+MAX_TASKS_IN_MEMORY = 1000
+PERSIST_INTERVAL_S = 1.0
+
+STAGES = ("fetched", "duplicate", "near_duplicate", "extracted", "embedded", "stored", "failed")
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def task_key(query: str, location: str = "") -> str:
+    return f"{normalize_text(query)}|{normalize_text(location)}"
+
+
+class JobIngestionQueue:
+    """Coalescing, persistent queue of ingest_jobs runs."""
+
+    def __init__(
+        self,
+        runner: Optional[Callable[..., int]] = None,
+        workers: int = JOB_INGEST_WORKERS,
+        store: Optional[SQLiteKV] = None,
+        coalesce_seconds: float = JOB_INGEST_COALESCE_S,
+    ):
+        self._runner = runner
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job-ingest")
+        self._store = store if store is not None else SQLiteKV(
+            "job_ingest_tasks", version="1", ttl_seconds=TASK_RETENTION_S
+        )
+        self.coalesce_seconds = coalesce_seconds
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._by_key: Dict[str, str] = {}
+        self._last_persist: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+        self._recover()
+        register_metrics("job_ingest_queue", self.stats)
+
+    # ── Public API ────────────────────────────────────────────────────────────
+
+    def submit(self, query: str, location: str = "", user_id: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        """Queue a refresh, or join an equivalent one. Returns (task, coalesced)."""
+        key = task_key(query, location)
+        with self._lock:
+            existing = self._tasks.get(self._by_key.get(key, ""))
+            if existing is not None and self._reusable(existing):
+                if user_id and user_id not in existing["requested_by"]:
+                    existing["requested_by"].append(user_id)
+                existing["coalesced_requests"] += 1
+                self.coalesced += 1
+                self._persist(existing, force=True)
+                return self._public(existing), True
+
+            task = {
+                "id": uuid.uuid4().hex,
+                "key": key,
+                "query": query,
+                "location": location,
+                "status": "queued",
+                "requested_by": [user_id] if user_id else [],
+                "coalesced_requests": 0,
+                "counts": {stage: 0 for stage in STAGES},
+                "ingested": None,
+                "error": None,
+                "created_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+            }
+            self._tasks[task["id"]] = task
+            self._by_key[key] = task["id"]
+            self._persist(task, force=True)
+            self._prune()
+        self._executor.submit(self._run, task["id"])
+        return self._public(task), False
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is not None:
+                return self._public(task)
+        raw = self._store.get(task_id)
+        return json.loads(raw) if raw else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            statuses = [t["status"] for t in self._tasks.values()]
+        return {
+            "tasks": len(statuses),
+            "queued": statuses.count("queued"),
+            "running": statuses.count("running"),
+            "coalesced": self.coalesced,
+        }
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    def _reusable(self, task: Dict[str, Any]) -> bool:
+        if task["status"] in ACTIVE_STATUSES:
+            return True
+        return (
+            task["status"] == "succeeded"
+            and task["finished_at"] is not None
+            and time.time() - task["finished_at"] <= self.coalesce_seconds
+        )
+
+    @staticmethod
+    def _public(task: Dict[str, Any]) -> Dict[str, Any]:
+        return json.loads(json.dumps(task))
+
+    def _persist(self, task: Dict[str, Any], force: bool = False) -> None:
+        # Caller holds self._lock. Progress updates are throttled.
+        now = time.time()
+        if not force and now - self._last_persist.get(task["id"], 0.0) < PERSIST_INTERVAL_S:
+            return
+        self._last_persist[task["id"]] = now
+        try:
+            self._store.set(task["id"], json.dumps(task))
+        except Exception as exc:
+            logger.warning("[JOB_INGEST] Persist failed for %s: %s", task["id"], exc)
+
+    def _prune(self) -> None:
+        # Caller holds self._lock. Drop the oldest finished tasks from memory;
+        # they stay readable from the store until TASK_RETENTION_S.
+        if len(self._tasks) <= MAX_TASKS_IN_MEMORY:
+            return
+        finished = sorted(
+            (t for t in self._tasks.values() if t["status"] not in ACTIVE_STATUSES),
+            key=lambda t: t["created_at"],
+        )
+        for task in finished[: len(self._tasks) - MAX_TASKS_IN_MEMORY]:
+            self._tasks.pop(task["id"], None)
+            self._last_persist.pop(task["id"], None)
+            if self._by_key.get(task["key"]) == task["id"]:
+                self._by_key.pop(task["key"], None)
+
+    def _progress(self, task_id: str) -> Callable[[str, int], None]:
+        def report(stage: str, count: int = 1) -> None:
+            with self._lock:
+                task = self._tasks.get(task_id)
+                if task is None:
+                    return
+                task["counts"][stage] = task["counts"].get(stage, 0) + count
+                self._persist(task)
+        return report
+
+    def _run(self, task_id: str) -> None:
+        with self._lock:
+            task = self._tasks[task_id]
+            task["status"] = "running"
+            task["started_at"] = time.time()
+            self._persist(task, force=True)
+            query, location = task["query"], task["location"]
+
+        runner = self._runner
+        if runner is None:
+            from app.services.job_search import ingest_jobs
+            # An explicit refresh should see new postings, not the page cache.
+            runner = partial(ingest_jobs, revalidate=True)
+
+        status, ingested, error = "succeeded", None, None
+        try:
+            ingested = runner(query, location, progress=self._progress(task_id))
+        except Exception as exc:
+            logger.error("[JOB_INGEST] Task %s (%s) failed: %s", task_id, query, exc)
+            status, error = "failed", str(exc)
+
+        with self._lock:
+            task["status"] = status
+            task["ingested"] = ingested
+            task["error"] = error
+            task["finished_at"] = time.time()
+            self._persist(task, force=True)
+        logger.info(
+            "[JOB_INGEST] Task %s %s in %.1fs: %s",
+            task_id, status, task["finished_at"] - task["started_at"], task["counts"],
+        )
+
+    def _recover(self) -> None:
+        requeue = []
+        for task_id, raw in self._store.items():
+            try:
+                task = json.loads(raw)
+            except (TypeError, ValueError):
+                continue
+            self._tasks[task_id] = task
+            current = self._tasks.get(self._by_key.get(task["key"], ""))
+            if current is None or current["created_at"] <= task["created_at"]:
+                self._by_key[task["key"]] = task_id
+            if task["status"] in ACTIVE_STATUSES:
+                task["status"] = "queued"
+                task["counts"] = {stage: 0 for stage in STAGES}
+                requeue.append(task_id)
+        with self._lock:
+            # Older finished tasks stay readable from the store via get().
+            self._prune()
+        for task_id in requeue:
+            logger.info("[JOB_INGEST] Re-queued interrupted task %s", task_id)
+            self._executor.submit(self._run, task_id)
+
+
+_queue: Optional[JobIngestionQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_ingestion_queue() -> JobIngestionQueue:
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobIngestionQueue()
+        return _queue
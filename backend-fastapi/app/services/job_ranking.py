@@ -0,0 +1,211 @@
+"""
+Vectorized re-ranking of match_jobs candidates.
+
+Skills are interned to integer ids (case-insensitive) and each job's skill
+set becomes a row of a uint64 bitset matrix, so overlap with the user's
+skills for every candidate is one AND + popcount:
+
+    coverage   = |job ∩ user| / |job|
+    similarity = min(vector similarity + title boost, 1)
+    rank score = (1 - w) * similarity + w * coverage     (w = JOB_RANK_COVERAGE_WEIGHT)
+
+Bitset rows are kept per job id (job skills don't change after ingest), so
+repeated searches over the same pool skip JSON parsing and interning and
+gather rows with one fancy index. Matching / missing skill lists are only
+built for the top ``match_count`` rows that are returned.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+JOB_RANK_COVERAGE_WEIGHT = float(os.getenv("JOB_RANK_COVERAGE_WEIGHT", "0.2"))
+JOB_RANK_MAX_JOBS = int(os.getenv("JOB_RANK_MAX_JOBS", "50000"))
+TITLE_BOOST = 0.15
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class SkillVocabulary:
+    """Thread-safe skill -> int id interning (lower-cased, whitespace-trimmed)."""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def intern(self, skill: str) -> int:
+        key = skill.strip().lower()
+        sid = self._ids.get(key)
+        if sid is None:
+            with self._lock:
+                sid = self._ids.setdefault(key, len(self._ids))
+        return sid
+
+    def lookup_all(self, skills: Sequence[str]) -> np.ndarray:
+        """Ids of already-interned skills; unknown skills are skipped."""
+        ids = (self._ids.get(s.strip().lower()) for s in skills if isinstance(s, str))
+        return np.unique(np.fromiter((i for i in ids if i is not None), dtype=np.int64))
+
+    def intern_all(self, skills: Sequence[str]) -> np.ndarray:
+        ids = {self.intern(s) for s in skills if isinstance(s, str) and s.strip()}
+        return np.array(sorted(ids), dtype=np.int64)
+
+
+def popcount(bits: np.ndarray) -> np.ndarray:
+    """Set bits per row of a 2-D uint64 array."""
+    return _POPCOUNT[bits.view(np.uint8)].reshape(bits.shape[0], -1).sum(axis=1, dtype=np.int64)
+
+
+def to_bitsets(id_rows: Sequence[np.ndarray], n_bits: int) -> np.ndarray:
+    """Pack rows of skill ids into an (n_rows, ceil(n_bits / 64)) uint64 matrix."""
+    words = max(1, (n_bits + 63) // 64)
+    bits = np.zeros((len(id_rows), words), dtype=np.uint64)
+    lengths = np.fromiter((len(r) for r in id_rows), dtype=np.int64, count=len(id_rows))
+    if lengths.sum() == 0:
+        return bits
+    ids = np.concatenate([r for r in id_rows if len(r)])
+    rows = np.repeat(np.arange(len(id_rows)), lengths)
+    flags = np.zeros((len(id_rows), words * 64), dtype=bool)
+    flags[rows, ids] = True
+    # Little-endian bit order so bit i of the row lands in word i // 64, bit i % 64.
+    packed = np.packbits(flags, axis=1, bitorder="little")
+    return np.ascontiguousarray(packed).view("<u8").astype(np.uint64, copy=False)
+
+
+def _parse_skills(raw: Any) -> List[str]:
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except json.JSONDecodeError:
+            return []
+    return [s for s in raw or [] if isinstance(s, str)]
+
+
+class JobRanker:
+    def __init__(self, coverage_weight: float = JOB_RANK_COVERAGE_WEIGHT, max_jobs: int = JOB_RANK_MAX_JOBS):
+        self.coverage_weight = coverage_weight
+        self.max_jobs = max_jobs
+        self.vocab = SkillVocabulary()
+        # One bitset row per job seen; job skills don't change after ingest.
+        self._row_of: Dict[Any, int] = {}
+        self._skills: List[List[str]] = []
+        self._titles: List[str] = []
+        self._bits = np.zeros((0, 1), dtype=np.uint64)
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._lock = threading.Lock()
+
+    def _reset(self) -> None:
+        # Caller holds self._lock. Rows and skill ids start over together, so
+        # skills that only old jobs had don't keep widening the bitsets.
+        self.vocab = SkillVocabulary()
+        self._row_of, self._skills, self._titles = {}, [], []
+        self._bits = np.zeros((0, 1), dtype=np.uint64)
+        self._counts = np.zeros(0, dtype=np.int64)
+
+    def _append(self, jobs: List[Dict[str, Any]]) -> None:
+        # Caller holds self._lock.
+        skills = [_parse_skills(job.get("required_skills")) for job in jobs]
+        id_rows = [self.vocab.intern_all(s) for s in skills]
+        new_bits = to_bitsets(id_rows, len(self.vocab))
+        old_bits = self._bits
+        if old_bits.shape[1] < new_bits.shape[1]:
+            old_bits = np.pad(old_bits, ((0, 0), (0, new_bits.shape[1] - old_bits.shape[1])))
+        for job, job_skills in zip(jobs, skills):
+            self._row_of[job["id"]] = len(self._skills)
+            self._skills.append(job_skills)
+            self._titles.append((job.get("title") or "").lower())
+        self._bits = np.vstack([old_bits, new_bits])
+        self._counts = np.concatenate([self._counts, [len(ids) for ids in id_rows]]).astype(np.int64)
+
+    def _rows_for(self, candidates: List[Dict[str, Any]]):
+        with self._lock:
+            new = {}
+            for job in candidates:
+                if job["id"] not in self._row_of:
+                    new.setdefault(job["id"], job)
+            if new and len(self._row_of) + len(new) > self.max_jobs:
+                # Full: start over with just this request's candidates.
+                self._reset()
+                new = {}
+                for job in candidates:
+                    new.setdefault(job["id"], job)
+            if new:
+                self._append(list(new.values()))
+            rows = np.fromiter((self._row_of[job["id"]] for job in candidates), dtype=np.int64, count=len(candidates))
+            return rows, self.vocab, self._bits, self._counts, self._skills, self._titles
+
+    def rank(
+        self,
+        candidates: List[Dict[str, Any]],
+        user_skills: Sequence[str],
+        role_query: str = "",
+        match_count: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Top ``match_count`` candidates, annotated like match_jobs_for_user."""
+        if not candidates:
+            return []
+
+        rows, vocab, all_bits, all_counts, all_skills, all_titles = self._rows_for(candidates)
+        # User skills no job has can't match; only look up known ids.
+        user_ids = vocab.lookup_all(user_skills)
+        user_ids = user_ids[user_ids < all_bits.shape[1] * 64]
+        user_bits = to_bitsets([user_ids], all_bits.shape[1] * 64)[0]
+
+        job_bits = all_bits[rows]
+        matched = popcount(job_bits & user_bits)
+        totals = all_counts[rows]
+        coverage = np.divide(matched, totals, out=np.zeros(len(rows)), where=totals > 0)
+
+        similarity = np.fromiter(
+            (float(job.get("similarity") or 0.0) for job in candidates), dtype=np.float64, count=len(candidates)
+        )
+        role = (role_query or "").lower().strip()
+        if role:
+            boosted = np.fromiter((role in all_titles[r] for r in rows), dtype=bool, count=len(rows))
+            similarity = similarity + TITLE_BOOST * boosted
+        similarity = np.minimum(similarity, 1.0)
+
+        score = (1 - self.coverage_weight) * similarity + self.coverage_weight * coverage
+        k = min(match_count, len(candidates))
+        top = np.argpartition(-score, k - 1)[:k]
+        top = top[np.argsort(-score[top], kind="stable")]
+
+        user_lower = {s.strip().lower() for s in user_skills if isinstance(s, str)}
+        results = []
+        for i in top:
+            job = candidates[i]
+            skills = all_skills[rows[i]]
+            results.append({
+                "id": job["id"],
+                "title": job["title"],
+                "company": job.get("company", ""),
+                "location": job.get("location", ""),
+                "description": (job.get("description") or "")[:500],
+                "salary_range": job.get("salary_range", ""),
+                "job_url": job.get("job_url", ""),
+                "source": job.get("source", ""),
+                "similarity": round(float(similarity[i]) * 100, 1),
+                "required_skills": skills,
+                "matching_skills": [s for s in skills if s.strip().lower() in user_lower],
+                "missing_skills": [s for s in skills if s.strip().lower() not in user_lower],
+                "match_percentage": round(float(coverage[i]) * 100, 1),
+            })
+        return results
+
+
+_ranker = JobRanker()
+
+
+def rank_jobs(
+    candidates: List[Dict[str, Any]],
+    user_skills: Sequence[str],
+    role_query: str = "",
+    match_count: int = 10,
+) -> List[Dict[str, Any]]:
+    return _ranker.rank(candidates, user_skills, role_query, match_count)
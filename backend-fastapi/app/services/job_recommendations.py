@@ -0,0 +1,244 @@
+"""
+Materialized job recommendations per (user, query bucket).
+
+/jobs/search used to load the latest resume version, embed the user's skills,
+call match_jobs and re-rank on every request. The answer only changes when
+the user's skills change or the job pool grows, so it is computed once and
+stored in the local SQLite cache:
+
+  - get_recommendations(): one keyed read. A missing entry is computed
+    inline; a stale one is served with ``stale: True`` while a background
+    recompute is scheduled
+  - on_resume_version_saved(): called after analyze_resume stores a version;
+    drops the user's entries and recomputes them, all in the background
+  - on_job_pool_changed(): called after ingestion stores postings; bumps the
+    pool version (which marks every entry stale) and recomputes entries that
+    were used recently
+  - Entries also go stale after JOB_RECS_MAX_AGE_S as a safety net
+  - A recompute requested while the same entry is already being computed
+    runs again once that one finishes, so a result built from old skills or
+    an old pool never has the last word
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from app.services.cache import SQLiteKV, normalize_text, register_metrics
+
+logger = logging.getLogger(__name__)
+
+JOB_RECS_MAX_AGE_S = float(os.getenv("JOB_RECS_MAX_AGE_S", str(24 * 3600)))
+JOB_RECS_RETENTION_S = 14 * 24 * 3600
+JOB_RECS_WORKERS = int(os.getenv("JOB_RECS_WORKERS", "2"))
+DEFAULT_BUCKET = "_all"
+
+_store = SQLiteKV("job_recommendations", version="1", ttl_seconds=JOB_RECS_RETENTION_S)
+_pool_state = SQLiteKV("job_pool_state", version="1")
+_executor = ThreadPoolExecutor(max_workers=JOB_RECS_WORKERS, thread_name_prefix="job-recs")
+_pending: set = set()
+# key -> user_skills for a recompute requested while ``key`` was pending.
+_rerun: Dict[str, Optional[List[str]]] = {}
+_pending_lock = threading.Lock()
+_counters = {"served_fresh": 0, "served_stale": 0, "computed_inline": 0, "recomputed": 0}
+# key -> last time this process served it; ingestion only eagerly recomputes
+# entries someone read recently (others are refreshed lazily on next read).
+_last_served: Dict[str, float] = {}
+
+
+def _count(name: str) -> None:
+    with _pending_lock:
+        _counters[name] += 1
+
+
+def _stats() -> Dict[str, Any]:
+    return {**_counters, "pool_version": pool_version(), "pending": len(_pending)}
+
+
+register_metrics("job_recommendations", _stats)
+
+
+def bucket_for(role_query: str) -> str:
+    return normalize_text(role_query) or DEFAULT_BUCKET
+
+
+def _key(user_id: str, bucket: str) -> str:
+    return f"{user_id}:{bucket}"
+
+
+def pool_version() -> int:
+    raw = _pool_state.get("version")
+    return int(raw) if raw else 0
+
+
+def load_user_skills(user_id: str) -> List[str]:
+    """
+    Skills from the skill_gap of the user's latest resume version.
+    Raises LookupError when there is no resume / version.
+    """
+    from supabase_client import supabase
+
+    resume_result = (
+        supabase.table("resumes")
+        .select("resume_id")
+        .eq("user_id", user_id)
+        .order("latest_update", desc=True)
+        .limit(1)
+        .execute()
+    )
+    if not resume_result.data:
+        raise LookupError("No resume found. Upload a resume first.")
+
+    version_result = (
+        supabase.table("resume_versions")
+        .select("skill_gap")
+        .eq("resume_id", resume_result.data[0]["resume_id"])
+        .order("version_number", desc=True)
+        .limit(1)
+        .execute()
+    )
+    if not version_result.data:
+        raise LookupError("No resume version found.")
+
+    skill_gap = version_result.data[0].get("skill_gap", {}) or {}
+    if isinstance(skill_gap, str):
+        skill_gap = json.loads(skill_gap)
+    return skill_gap.get("user_skills", []) or []
+
+
+def _is_stale(entry: Dict[str, Any]) -> bool:
+    return (
+        entry.get("pool_version") != pool_version()
+        or time.time() - entry.get("computed_at", 0) > JOB_RECS_MAX_AGE_S
+    )
+
+
+def _public(entry: Dict[str, Any], stale: bool) -> Dict[str, Any]:
+    return {
+        "user_skills": entry["user_skills"],
+        "matched_jobs": entry["matched_jobs"],
+        "computed_at": datetime.fromtimestamp(entry["computed_at"], tz=timezone.utc).isoformat(),
+        "stale": stale,
+    }
+
+
+def compute_recommendations(
+    user_id: str,
+    role_query: str = "",
+    user_skills: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Run the full match pipeline for one bucket and store the result."""
+    from app.services.job_search import match_jobs_for_user
+
+    version = pool_version()  # read first, so a concurrent ingest marks this stale
+    if user_skills is None:
+        user_skills = load_user_skills(user_id)
+    matched = match_jobs_for_user(user_skills, role_query=role_query) if user_skills else []
+    entry = {
+        "role_query": role_query,
+        "user_skills": user_skills,
+        "matched_jobs": matched,
+        "computed_at": time.time(),
+        "pool_version": version,
+    }
+    _store.set(_key(user_id, bucket_for(role_query)), json.dumps(entry))
+    return entry
+
+
+def _schedule(user_id: str, role_query: str, user_skills: Optional[List[str]] = None) -> None:
+    key = _key(user_id, bucket_for(role_query))
+    with _pending_lock:
+        if key in _pending:
+            # The running job may have read old skills / pool; run again after it.
+            _rerun[key] = user_skills if user_skills is not None else _rerun.get(key)
+            return
+        _pending.add(key)
+
+    def run():
+        skills = user_skills
+        while True:
+            try:
+                compute_recommendations(user_id, role_query, skills)
+                _count("recomputed")
+            except Exception as exc:
+                logger.warning("[JOB_RECS] Recompute failed for %s: %s", key, exc)
+            with _pending_lock:
+                if key not in _rerun:
+                    _pending.discard(key)
+                    return
+                skills = _rerun.pop(key)
+
+    _executor.submit(run)
+
+
+def get_recommendations(user_id: str, role_query: str = "") -> Dict[str, Any]:
+    """Materialized recommendations; computed inline only on first use."""
+    key = _key(user_id, bucket_for(role_query))
+    _last_served[key] = time.time()
+    raw = _store.get(key)
+    if raw:
+        entry = json.loads(raw)
+        if _is_stale(entry):
+            _count("served_stale")
+            _schedule(user_id, role_query)
+            return _public(entry, stale=True)
+        _count("served_fresh")
+        return _public(entry, stale=False)
+
+    _count("computed_inline")
+    return _public(compute_recommendations(user_id, role_query), stale=False)
+
+
+def on_resume_version_saved(user_id: str, user_skills: Optional[List[str]] = None) -> Future:
+    """
+    Invalidate and recompute every bucket the user has (at least the default
+    one). Runs on the worker pool so callers (the analyze SSE stream) never
+    wait on SQLite.
+    """
+    return _executor.submit(_invalidate_user, user_id, user_skills)
+
+
+def _invalidate_user(user_id: str, user_skills: Optional[List[str]]) -> None:
+    try:
+        _reschedule_user(user_id, user_skills)
+    except Exception as exc:
+        logger.warning("[JOB_RECS] Invalidation failed for %s: %s", user_id, exc)
+
+
+def _reschedule_user(user_id: str, user_skills: Optional[List[str]]) -> None:
+    prefix = f"{user_id}:"
+    queries = [""]
+    for key in _store.keys(prefix):
+        raw = _store.get(key)
+        if raw:
+            role_query = json.loads(raw).get("role_query") or ""
+            if role_query and role_query not in queries:
+                queries.append(role_query)
+    _store.delete_prefix(prefix)
+    for role_query in queries:
+        _schedule(user_id, role_query, user_skills)
+
+
+def on_job_pool_changed(added: int) -> None:
+    """New postings stored: mark everything stale and refresh recently used entries."""
+    if added <= 0:
+        return
+    _pool_state.set("version", str(pool_version() + 1))
+    cutoff = time.time() - JOB_RECS_MAX_AGE_S
+    refreshed = 0
+    for key, served_at in list(_last_served.items()):
+        if served_at < cutoff:
+            _last_served.pop(key, None)
+            continue
+        raw = _store.get(key)
+        if not raw:
+            continue
+        user_id = key.split(":", 1)[0]
+        _schedule(user_id, json.loads(raw).get("role_query") or "")
+        refreshed += 1
+    logger.info("[JOB_RECS] Job pool +%d postings; recomputing %d entries", added, refreshed)
@@ -1,8 +1,9 @@
 # app/services/job_search.py
 """
 Job Market service:
-  1. Fetch postings from JSearch (RapidAPI)
-  2. Extract required skills via LLM
+  1. Fetch postings from JSearch (RapidAPI), cached per page, and drop
+     exact / near-duplicate postings
+  2. Extract required skills (ontology matcher, LLM for low coverage)
   3. Embed skills with sentence-transformers
   4. Store in Supabase (pgvector)
   5. Match user skills against stored jobs
@@ -11,61 +12,76 @@ Job Market service:
 import json
 import logging
 import os
-from typing import Optional
-
-import requests
+from typing import Callable, Optional
 
 from app.agents.llm_config import GROQ_CLIENT, GROQ_DEFAULT_MODEL
-from app.services.embedding import embed_text
+from app.services.embedding import embed_text, skills_text
+from app.services.jd_skills import get_jd_skill_extractor
+from app.services.job_dedupe import (
+    disable_simhash_storage_if_missing,
+    get_job_dedupe_index,
+    simhash,
+    simhash_storage_enabled,
+    to_signed,
+)
+from app.services.job_ranking import rank_jobs
+from app.services.job_sources import get_job_client
 from supabase_client import supabase
 
 logger = logging.getLogger(__name__)
 
-JSEARCH_API_KEY = os.getenv("JSEARCH_API_KEY")
-JSEARCH_HOST = "jsearch.p.rapidapi.com"
+# Pages of 10 postings fetched per refresh (concurrently, cached per page).
+# Each page is a separate billed JSearch request.
+JOB_FETCH_PAGES = int(os.getenv("JOB_FETCH_PAGES", "1"))
+# Candidates fetched from match_jobs per returned result, for re-ranking.
+JOB_RANK_OVERFETCH = int(os.getenv("JOB_RANK_OVERFETCH", "3"))
+# Top up low-coverage descriptions with an LLM call (0 = ontology only).
+JD_SKILLS_LLM_FALLBACK = os.getenv("JD_SKILLS_LLM_FALLBACK", "1") != "0"
 
 
 # ------------------------------------------------------------------ #
 # 1.  Fetch from JSearch API                                          #
 # ------------------------------------------------------------------ #
 
+def ensure_job_source_configured() -> None:
+    """Raise ValueError if the configured job source can't be used."""
+    get_job_client().source.check_configured()
+
+
 def fetch_jobs_from_api(
     query: str,
     location: str = "",
-    num_pages: int = 1,
+    num_pages: int = JOB_FETCH_PAGES,
+    revalidate: bool = False,
 ) -> list[dict]:
-    """Call JSearch (RapidAPI) and return raw job dicts."""
-    if not JSEARCH_API_KEY:
-        raise ValueError(
-            "JSEARCH_API_KEY not configured. "
-            "Get a free key at https://rapidapi.com/letscrape-6bRBa3QguO5/api/jsearch "
-            "and add it to your .env file."
-        )
-
-    search_query = f"{query} in {location}" if location else query
-
-    resp = requests.get(
-        f"https://{JSEARCH_HOST}/search",
-        headers={
-            "x-rapidapi-key": JSEARCH_API_KEY,
-            "x-rapidapi-host": JSEARCH_HOST,
-        },
-        params={
-            "query": search_query,
-            "page": "1",
-            "num_pages": str(num_pages),
-        },
-        timeout=30,
-    )
-    resp.raise_for_status()
-    return resp.json().get("data", [])
+    """
+    Raw job dicts from the configured source (JSearch by default), pages
+    fetched concurrently and cached per (query, location, page).
+    ``revalidate`` re-checks cached pages with the source.
+    """
+    return get_job_client().fetch(query, location, num_pages=num_pages, revalidate=revalidate)
 
 
 # ------------------------------------------------------------------ #
-# 2.  Extract skills from a job description via LLM                    #
+# 2.  Extract skills from a job description                          #
 # ------------------------------------------------------------------ #
 
 def _extract_skills_from_description(description: str) -> list[str]:
+    """
+    Ontology-based extraction (see jd_skills.py); the LLM is only called
+    when the matcher finds too few skills in a substantial description.
+    """
+    extractor = get_jd_skill_extractor()
+    skills, used_llm = extractor.extract_with_fallback(
+        description,
+        _llm_extract_skills_from_description if JD_SKILLS_LLM_FALLBACK else None,
+    )
+    if used_llm:
+        logger.info(f"JD skill extraction used LLM fallback ({len(skills)} skills)")
+    return skills
+
+
+def _llm_extract_skills_from_description(description: str) -> list[str]:
     """Use Groq LLM to pull required skills out of a job description."""
     try:
         prompt = (
@@ -96,14 +112,30 @@ def _extract_skills_from_description(description: str) -> list[str]:
 # 3.  Ingest jobs (fetch → extract → embed → store)                   #
 # ------------------------------------------------------------------ #
 
-def ingest_jobs(query: str, location: str = "") -> int:
+def ingest_jobs(
+    query: str,
+    location: str = "",
+    progress: Optional[Callable[[str, int], None]] = None,
+    revalidate: bool = False,
+) -> int:
     """
     Full ingestion pipeline.
 
+    Args:
+        progress: Optional callback ``(stage, count)`` invoked as postings move
+            through the pipeline. Stages: fetched, duplicate (same
+            external id), near_duplicate (SimHash match, see job_dedupe.py),
+            extracted, embedded, stored, failed.
+        revalidate: Re-check cached API pages instead of serving them
+            (explicit user refreshes).
+
     Returns:
         Number of newly stored jobs.
     """
-    raw_jobs = fetch_jobs_from_api(query, location)
+    report = progress or (lambda stage, count: None)
+    raw_jobs = fetch_jobs_from_api(query, location, revalidate=revalidate)
+    report("fetched", len(raw_jobs))
+    dedupe_index = get_job_dedupe_index()
     ingested = 0
 
     for job in raw_jobs:
@@ -121,6 +153,7 @@ def ingest_jobs(query: str, location: str = "") -> int:
                 .execute()
             )
             if existing.data:
+                report("duplicate", 1)
                 continue
         except Exception:
             pass
@@ -141,6 +174,15 @@ def ingest_jobs(query: str, location: str = "") -> int:
         ]
         location_str = ", ".join(loc_parts)
 
+        # Skip near-duplicates (same posting from another publisher) before
+        # the expensive extract / embed stages.
+        signature = simhash(title, company, description, location_str)
+        duplicate_of = dedupe_index.find(signature, location_str) if signature else None
+        if duplicate_of is not None:
+            logger.debug(f"Job {external_id} is a near-duplicate of {duplicate_of}")
+            report("near_duplicate", 1)
+            continue
+
         # Salary
         min_sal = job.get("job_min_salary")
         max_sal = job.get("job_max_salary")
@@ -152,6 +194,7 @@ def ingest_jobs(query: str, location: str = "") -> int:
 
         # Skills extraction
         required_skills = _extract_skills_from_description(description)
+        report("extracted", 1)
 
         # Embedding (title + skills for best semantic match)
         embed_input = (
@@ -160,28 +203,48 @@ def ingest_jobs(query: str, location: str = "") -> int:
             else title
         )
         embedding = embed_text(embed_input)
+        report("embedded", 1)
 
         # Store
+        row = {
+            "title": title,
+            "company": company,
+            "location": location_str,
+            "description": description[:5000],
+            "required_skills": required_skills,
+            "salary_range": salary,
+            "job_url": job.get("job_apply_link", ""),
+            "source": "jsearch",
+            "external_id": external_id,
+            "embedding": embedding,
+        }
+        if signature and simhash_storage_enabled():
+            row["simhash"] = to_signed(signature)
         try:
-            supabase.table("job_postings").insert(
-                {
-                    "title": title,
-                    "company": company,
-                    "location": location_str,
-                    "description": description[:5000],
-                    "required_skills": required_skills,
-                    "salary_range": salary,
-                    "job_url": job.get("job_apply_link", ""),
-                    "source": "jsearch",
-                    "external_id": external_id,
-                    "embedding": embedding,
-                }
-            ).execute()
+            try:
+                result = supabase.table("job_postings").insert(row).execute()
+            except Exception as e:
+                if "simhash" not in row or not disable_simhash_storage_if_missing(e):
+                    raise
+                row.pop("simhash")
+                result = supabase.table("job_postings").insert(row).execute()
+            stored = (result.data or [{}])[0] if result else {}
+            if signature:
+                dedupe_index.add(stored.get("id", external_id), signature, location_str)
             ingested += 1
+            report("stored", 1)
         except Exception as e:
             logger.warning(f"Failed to store job {external_id}: {e}")
+            report("failed", 1)
 
     logger.info(f"Ingested {ingested}/{len(raw_jobs)} jobs for query '{query}'")
+    if ingested:
+        try:
+            from app.services.job_recommendations import on_job_pool_changed
+
+            on_job_pool_changed(ingested)
+        except Exception as e:
+            logger.warning(f"Could not refresh job recommendations: {e}")
     return ingested
 
 
@@ -204,14 +267,14 @@ def match_jobs_for_user(
         return []
 
     # Combine role query with skills for more targeted vector search
-    embed_input = ", ".join(user_skills)
+    embed_input = skills_text(user_skills)
     if role_query:
         embed_input = f"{role_query}. Skills: {embed_input}"
     query_embedding = embed_text(embed_input)
 
     try:
-        # Fetch extra results when role_query is given so we can re-rank
-        fetch_count = match_count * 3 if role_query else match_count
+        # Over-fetch so the coverage / title re-rank has candidates to promote
+        fetch_count = match_count * JOB_RANK_OVERFETCH
 
         result = supabase.rpc(
             "match_jobs",
@@ -225,51 +288,8 @@ def match_jobs_for_user(
         if not result.data:
             return []
 
-        user_skills_lower = {s.lower() for s in user_skills}
-        role_query_lower = role_query.lower().strip() if role_query else ""
-        matched_jobs: list[dict] = []
-
-        for job in result.data:
-            job_skills = job.get("required_skills", [])
-            if isinstance(job_skills, str):
-                job_skills = json.loads(job_skills)
-
-            matching = [s for s in job_skills if s.lower() in user_skills_lower]
-            missing = [s for s in job_skills if s.lower() not in user_skills_lower]
-            match_pct = (
-                (len(matching) / len(job_skills) * 100) if job_skills else 0
-            )
-
-            # Title relevance boost: if the job title contains the role query,
-            # boost the similarity score so it sorts higher
-            title_lower = (job.get("title") or "").lower()
-            title_boost = 0.0
-            if role_query_lower and role_query_lower in title_lower:
-                title_boost = 0.15
-
-            matched_jobs.append(
-                {
-                    "id": job["id"],
-                    "title": job["title"],
-                    "company": job.get("company", ""),
-                    "location": job.get("location", ""),
-                    "description": (job.get("description") or "")[:500],
-                    "salary_range": job.get("salary_range", ""),
-                    "job_url": job.get("job_url", ""),
-                    "source": job.get("source", ""),
-                    "similarity": round(
-                        min(job.get("similarity", 0) + title_boost, 1.0) * 100, 1
-                    ),
-                    "required_skills": job_skills,
-                    "matching_skills": matching,
-                    "missing_skills": missing,
-                    "match_percentage": round(match_pct, 1),
-                }
-            )
-
-        # Re-rank by boosted similarity and trim to requested count
-        matched_jobs.sort(key=lambda j: j["similarity"], reverse=True)
-        return matched_jobs[:match_count]
+        # Vectorized skill-coverage + title-boost re-rank (job_ranking.py)
+        return rank_jobs(result.data, user_skills, role_query, match_count)
 
     except Exception as e:
         logger.error(f"Job matching failed: {e}")
@@ -0,0 +1,319 @@
+"""
+Job-posting sources and a cached, multi-page client.
+
+  - JobSource: one page of postings for (query, location, page).
+    JSearchSource calls RapidAPI; FileJobSource serves a local JSON/JSONL
+    file (JOB_SOURCE=file, JOB_SOURCE_FILE=...) for tests, demos and
+    benchmarks without spending quota
+  - CachedJobClient fetches pages concurrently (JOB_FETCH_CONCURRENCY) and
+    caches each (source, query, location, page) in the local SQLite cache for
+    JOB_PAGE_TTL_S. Stale pages are revalidated with If-None-Match /
+    If-Modified-Since when the source returned validators, and served stale
+    if the refresh fails. Identical page requests in flight are shared.
+    Pages unused for JOB_PAGE_RETENTION_S are pruned from the store.
+"""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from app.services.cache import SQLiteKV, normalize_text, register_metrics
+
+logger = logging.getLogger(__name__)
+
+JSEARCH_API_KEY = os.getenv("JSEARCH_API_KEY")
+JSEARCH_HOST = "jsearch.p.rapidapi.com"
+JOB_SOURCE = os.getenv("JOB_SOURCE", "jsearch")
+JOB_SOURCE_FILE = os.getenv("JOB_SOURCE_FILE", "")
+JOB_PAGE_TTL_S = float(os.getenv("JOB_PAGE_TTL_S", str(6 * 3600)))
+JOB_PAGE_RETENTION_S = float(os.getenv("JOB_PAGE_RETENTION_S", str(7 * 24 * 3600)))
+JOB_PAGE_PRUNE_INTERVAL_S = 3600
+JOB_FETCH_CONCURRENCY = int(os.getenv("JOB_FETCH_CONCURRENCY", "4"))
+PAGE_SIZE = 10  # JSearch returns 10 postings per page
+
+
+class JobSource(ABC):
+    """One page of raw postings (JSearch job dict shape)."""
+
+    name = "base"
+
+    def check_configured(self) -> None:
+        """Raise ValueError if the source can't be used."""
+
+    @abstractmethod
+    def fetch_page(
+        self,
+        query: str,
+        location: str,
+        page: int,
+        validators: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Returns {"jobs": [...], "validators": {...}} or, when ``validators``
+        were sent and the page is unchanged, {"not_modified": True}.
+        """
+
+
+class JSearchSource(JobSource):
+    name = "jsearch"
+
+    def __init__(self, api_key: Optional[str] = JSEARCH_API_KEY, timeout: float = 30):
+        self.api_key = api_key
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def check_configured(self) -> None:
+        if not self.api_key:
+            raise ValueError(
+                "JSEARCH_API_KEY not configured. "
+                "Get a free key at https://rapidapi.com/letscrape-6bRBa3QguO5/api/jsearch "
+                "and add it to your .env file."
+            )
+
+    def fetch_page(self, query, location, page, validators=None):
+        self.check_configured()
+        headers = {
+            "x-rapidapi-key": self.api_key,
+            "x-rapidapi-host": JSEARCH_HOST,
+        }
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        resp = self._session.get(
+            f"https://{JSEARCH_HOST}/search",
+            headers=headers,
+            params={
+                "query": f"{query} in {location}" if location else query,
+                "page": str(page),
+                "num_pages": "1",
+            },
+            timeout=self.timeout,
+        )
+        if resp.status_code == 304:
+            return {"not_modified": True}
+        resp.raise_for_status()
+        return {
+            "jobs": resp.json().get("data", []),
+            "validators": {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+            },
+        }
+
+
+class FileJobSource(JobSource):
+    """
+    Postings from a local .json (list) or .jsonl file, filtered by query and
+    location words and paged like JSearch. ``latency_ms`` simulates API time.
+    """
+
+    name = "file"
+
+    def __init__(self, path: str, latency_ms: float = 0.0):
+        self.path = path
+        self.latency_ms = latency_ms
+        self._jobs: Optional[List[Dict[str, Any]]] = None
+
+    def check_configured(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            raise ValueError(f"JOB_SOURCE_FILE not found: {self.path or '(unset)'}")
+
+    def _load(self) -> List[Dict[str, Any]]:
+        if self._jobs is None:
+            with open(self.path, "r", encoding="utf-8") as f:
+                if self.path.endswith(".jsonl"):
+                    self._jobs = [json.loads(line) for line in f if line.strip()]
+                else:
+                    data = json.load(f)
+                    self._jobs = data.get("data", []) if isinstance(data, dict) else data
+        return self._jobs
+
+    @staticmethod
+    def _matches(job: Dict[str, Any], query: str, location: str) -> bool:
+        haystack = normalize_text(" ".join(
+            str(job.get(k) or "") for k in ("job_title", "job_description", "employer_name")
+        ))
+        place = normalize_text(" ".join(
+            str(job.get(k) or "") for k in ("job_city", "job_state", "job_country")
+        ))
+        return (
+            all(word in haystack for word in normalize_text(query).split())
+            and all(word in place for word in normalize_text(location).split())
+        )
+
+    def fetch_page(self, query, location, page, validators=None):
+        self.check_configured()
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+        matched = [j for j in self._load() if self._matches(j, query, location)]
+        start = (page - 1) * PAGE_SIZE
+        return {"jobs": matched[start:start + PAGE_SIZE], "validators": {}}
+
+
+class CachedJobClient:
+    """Concurrent, cached multi-page fetching over a JobSource."""
+
+    def __init__(
+        self,
+        source: JobSource,
+        store: Optional[SQLiteKV] = None,
+        ttl_seconds: float = JOB_PAGE_TTL_S,
+        max_concurrency: int = JOB_FETCH_CONCURRENCY,
+        retention_seconds: float = JOB_PAGE_RETENTION_S,
+    ):
+        self.source = source
+        # Versioned by source so a file stand-in never serves into JSearch results.
+        self._store = store if store is not None else SQLiteKV(
+            "job_pages", version=source.name, ttl_seconds=retention_seconds
+        )
+        self.ttl_seconds = ttl_seconds
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="job-fetch")
+        self._inflight: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+        self.counters = {"api_calls": 0, "cache_hits": 0, "not_modified": 0, "stale_served": 0, "shared": 0}
+        register_metrics(f"job_pages_{source.name}", self.stats)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.counters)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    @staticmethod
+    def page_key(query: str, location: str, page: int) -> str:
+        return f"{normalize_text(query)}|{normalize_text(location)}|{page}"
+
+    def fetch(
+        self,
+        query: str,
+        location: str = "",
+        num_pages: int = 1,
+        revalidate: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Postings from pages 1..num_pages, in page order, deduped by job_id.
+        ``revalidate`` treats cached pages as stale (conditional request when
+        the source supports it). A failure on page 1 raises; later pages
+        that fail just end the result early.
+        """
+        futures = [
+            self._page_future(query, location, page, revalidate)
+            for page in range(1, num_pages + 1)
+        ]
+        jobs: List[Dict[str, Any]] = []
+        seen = set()
+        exhausted = False
+        for page, future in enumerate(futures, start=1):
+            try:
+                page_jobs = future.result()
+            except Exception as exc:
+                if page == 1:
+                    raise
+                logger.warning("[JOB_FETCH] Page %d of '%s' failed: %s", page, query, exc)
+                exhausted = True
+                continue
+            if exhausted:
+                continue
+            for job in page_jobs:
+                job_id = job.get("job_id")
+                if job_id and job_id in seen:
+                    continue
+                seen.add(job_id)
+                jobs.append(job)
+            # A short page is the last one; later pages would only repeat or be empty.
+            exhausted = len(page_jobs) < PAGE_SIZE
+        return jobs
+
+    def _page_future(self, query: str, location: str, page: int, revalidate: bool) -> Future:
+        key = self.page_key(query, location, page)
+        # A revalidating fetch must not piggyback on one that may answer from cache.
+        inflight_key = (key, revalidate)
+        with self._lock:
+            future = self._inflight.get(inflight_key)
+            if future is not None:
+                self.counters["shared"] += 1  # lock already held
+                return future
+            future = self._executor.submit(self._fetch_page, key, query, location, page, revalidate)
+            self._inflight[inflight_key] = future
+        future.add_done_callback(lambda _f, k=inflight_key: self._forget(k))
+        return future
+
+    def _forget(self, inflight_key: tuple) -> None:
+        with self._lock:
+            self._inflight.pop(inflight_key, None)
+
+    def _save(self, key: str, entry: Dict[str, Any]) -> None:
+        self._store.set(key, json.dumps(entry))
+        now = time.time()
+        with self._lock:
+            if now - self._last_prune < JOB_PAGE_PRUNE_INTERVAL_S:
+                return
+            self._last_prune = now
+        try:
+            self._store.prune(self.retention_seconds)
+        except Exception as exc:
+            logger.warning("[JOB_FETCH] Page prune failed: %s", exc)
+
+    def _fetch_page(
+        self, key: str, query: str, location: str, page: int, revalidate: bool
+    ) -> List[Dict[str, Any]]:
+        cached = self._store.get_with_age(key)
+        # Past retention a page is neither served stale nor revalidated.
+        entry = json.loads(cached[0]) if cached and cached[1] <= self.retention_seconds else None
+        if entry is not None and not revalidate and cached[1] <= self.ttl_seconds:
+            self._count("cache_hits")
+            return entry["jobs"]
+
+        validators = entry.get("validators") if entry else None
+        has_validators = bool(validators and any(validators.values()))
+        try:
+            self._count("api_calls")
+            result = self.source.fetch_page(
+                query, location, page, validators=validators if has_validators else None
+            )
+        except Exception as exc:
+            if entry is None:
+                raise
+            logger.warning("[JOB_FETCH] Page %s refresh failed, serving stale: %s", key, exc)
+            self._count("stale_served")
+            return entry["jobs"]
+
+        if result.get("not_modified") and entry is not None:
+            self._count("not_modified")
+            self._save(key, entry)  # resets the TTL clock
+            return entry["jobs"]
+
+        jobs = result.get("jobs") or []
+        self._save(key, {"jobs": jobs, "validators": result.get("validators") or {}})
+        return jobs
+
+
+def make_job_source() -> JobSource:
+    if JOB_SOURCE == "file":
+        return FileJobSource(JOB_SOURCE_FILE)
+    return JSearchSource()
+
+
+_client: Optional[CachedJobClient] = None
+_client_lock = threading.Lock()
+
+
+def get_job_client() -> CachedJobClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = CachedJobClient(make_job_source())
+        return _client
@@ -0,0 +1,194 @@
+"""
+Token-budgeted prompt compaction.
+
+Prompts embed resume text, sections, references and RAG chunks whose size
+depends on the user. compact_slots() takes a token budget and a list of
+prioritized PromptSlots and returns each slot's text fitted to its share of
+the budget, deterministically (same input → same output, no LLM):
+
+  1. Every slot is line-deduplicated (normalize_text), so repeated bullets
+     and boilerplate don't cost twice.
+  2. If everything fits, nothing else changes.
+  3. Otherwise the budget is allocated in priority order (0 = most
+     important): each slot first gets its ``min_tokens`` floor, then slots
+     take what they need from the remainder, most important first.
+  4. A slot over its allocation is summarized extractively: lines (and,
+     inside long paragraphs, sentences) are ranked quantified bullets first
+     (a number, % or $), then bullets / action-verb lines, then lines
+     sharing words with ``focus``, then document order. The best units that
+     fit are kept and re-emitted in their original order; a single unit
+     that is still too long is cut at a word boundary.
+
+Tokens before/after are counted with chunking.estimate_tokens and
+accumulated per call site (``site``); compaction_stats() exposes them
+through the cache metrics registry as "prompt_compaction".
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from app.services.cache import normalize_text, register_metrics
+from app.services.chunking import estimate_tokens, split_sentences
+
+logger = logging.getLogger(__name__)
+
+_QUANTIFIED_RE = re.compile(r"\d|%|\$")
+_BULLET_RE = re.compile(r"^\s*(?:[-•–*▪]|\d+[.)])\s+")
+_ACTION_RE = re.compile(
+    r"^\s*(?:[-•–*▪]\s*)?(?:built|developed|designed|implemented|led|managed|created|improved|"
+    r"increased|reduced|delivered|architected|engineered|optimi[sz]ed|automated|launched|"
+    r"deployed|migrated|scaled|shipped|owned|drove)\b",
+    re.IGNORECASE,
+)
+_WORD_RE = re.compile(r"[a-z][a-z0-9+#.]{2,}")
+
+
+@dataclass
+class PromptSlot:
+    name: str
+    text: str
+    priority: int = 1
+    min_tokens: int = 0
+
+
+@dataclass
+class CompactionResult:
+    texts: Dict[str, str]
+    tokens_before: int
+    tokens_after: int
+    budget: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+    def __getitem__(self, name: str) -> str:
+        return self.texts[name]
+
+
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def compaction_stats() -> Dict[str, Dict[str, int]]:
+    with _stats_lock:
+        return {site: dict(values) for site, values in _stats.items()}
+
+
+register_metrics("prompt_compaction", compaction_stats)
+
+
+def _record(site: str, before: int, after: int) -> None:
+    with _stats_lock:
+        entry = _stats.setdefault(site, {"calls": 0, "compacted": 0, "tokens_before": 0, "tokens_after": 0})
+        entry["calls"] += 1
+        entry["compacted"] += int(after < before)
+        entry["tokens_before"] += before
+        entry["tokens_after"] += after
+    if after < before:
+        logger.info(f"[PROMPT_COMPACTION] {site}: {before} -> {after} tokens (saved {before - after})")
+
+
+def dedupe_lines(text: str) -> str:
+    """Drop repeated lines (by normalized text) and collapse blank-line runs."""
+    seen = set()
+    kept: List[str] = []
+    for line in (text or "").splitlines():
+        key = normalize_text(line)
+        if not key:
+            if kept and kept[-1]:
+                kept.append("")
+            continue
+        if key in seen:
+            continue
+        seen.add(key)
+        kept.append(line.rstrip())
+    return "\n".join(kept).strip()
+
+
+def _truncate_words(text: str, budget: int) -> str:
+    words, used = [], 0
+    for word in text.split():
+        cost = estimate_tokens(word) + 1
+        if used + cost > budget:
+            break
+        words.append(word)
+        used += cost
+    return " ".join(words) + ("..." if words else "")
+
+
+def _units(text: str, budget: int) -> List[str]:
+    """Lines, with paragraphs longer than the budget split into sentences."""
+    units: List[str] = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        if estimate_tokens(line) > budget:
+            units.extend(split_sentences(line) or [line])
+        else:
+            units.append(line)
+    return units
+
+
+def summarize_extractive(text: str, budget: int, focus: Iterable[str] = ()) -> str:
+    """Keep the highest-value lines of ``text`` that fit in ``budget`` tokens."""
+    if budget <= 0:
+        return ""
+    if estimate_tokens(text) <= budget:
+        return text
+    focus_words = {w for term in focus for w in _WORD_RE.findall((term or "").lower())}
+    units = _units(text, budget)
+
+    def rank(index: int) -> tuple:
+        unit = units[index]
+        quantified = bool(_QUANTIFIED_RE.search(unit))
+        structured = bool(_BULLET_RE.match(unit) or _ACTION_RE.match(unit))
+        overlap = len(focus_words & set(_WORD_RE.findall(unit.lower()))) if focus_words else 0
+        return (-int(quantified and structured), -int(quantified), -int(structured), -overlap, index)
+
+    chosen, used = [], 0
+    for index in sorted(range(len(units)), key=rank):
+        cost = estimate_tokens(units[index]) + 1
+        if used + cost <= budget:
+            chosen.append(index)
+            used += cost
+    if not chosen:
+        return _truncate_words(units[min(range(len(units)), key=rank)], budget) if units else ""
+    return "\n".join(units[i] for i in sorted(chosen))
+
+
+def compact_slots(
+    slots: Sequence[PromptSlot],
+    budget: int,
+    site: str,
+    focus: Iterable[str] = (),
+) -> CompactionResult:
+    """Fit ``slots`` into ``budget`` tokens; see the module docstring."""
+    focus = list(focus)
+    before = sum(estimate_tokens(slot.text or "") for slot in slots)
+    texts = {slot.name: dedupe_lines(slot.text or "") for slot in slots}
+    sizes = {name: estimate_tokens(text) for name, text in texts.items()}
+
+    if sum(sizes.values()) > budget:
+        floors = {slot.name: min(slot.min_tokens, sizes[slot.name]) for slot in slots}
+        remaining = max(0, budget - sum(floors.values()))
+        allocation = dict(floors)
+        for slot in sorted(slots, key=lambda s: s.priority):
+            extra = min(sizes[slot.name] - floors[slot.name], remaining)
+            allocation[slot.name] += extra
+            remaining -= extra
+        for name, text in texts.items():
+            if sizes[name] > allocation[name]:
+                texts[name] = summarize_extractive(text, allocation[name], focus)
+
+    after = sum(estimate_tokens(text) for text in texts.values())
+    _record(site, before, after)
+    return CompactionResult(texts=texts, tokens_before=before, tokens_after=after, budget=budget)
+
+
+def compact_text(text: str, budget: int, site: str, focus: Iterable[str] = ()) -> str:
+    """Single-slot shorthand for compact_slots."""
+    return compact_slots([PromptSlot("text", text)], budget, site, focus)["text"]
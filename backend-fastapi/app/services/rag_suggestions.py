@@ -1,19 +1,32 @@
 """
 RAG-backed suggestion helper.
 
-Uses Supabase pgvector to retrieve relevant chunks. If retrieval fails or
-returns nothing, falls back to LLM-based suggestions.
+Retrieves relevant chunks with hybrid BM25 + vector search over the local
+replica (falling back to the Supabase pgvector RPC), trimmed to a token
+budget. If retrieval fails or returns nothing, falls back to LLM-based
+suggestions.
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import os
 import re
-from typing import Any, Dict, List, Optional
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional, Tuple
 
 from supabase_client import supabase
-from app.agents.llm_config import GROQ_CLIENT, GROQ_DEFAULT_MODEL
+from app.agents.llm_config import GROQ_CLIENT, GROQ_DEFAULT_MODEL, LLM_SLOTS
+from app.services.cache import LRUCache, text_hash
+from app.services.embedding_batcher import MicroBatcher
+from app.services.embedding_cache import EmbeddingCache
+from app.services.hybrid_retrieval import hybrid_search
+from app.services.prompt_compaction import PromptSlot, compact_slots
+from app.services.vector_index import get_rag_index
 
 try:
     from sentence_transformers import SentenceTransformer
@@ -23,6 +36,39 @@ except Exception:  # pragma: no cover - optional import for environments without
 
 DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 
+# Independent LLM sub-requests (evaluation, bullet rewrites) share this pool.
+RAG_LLM_WORKERS = int(os.getenv("RAG_LLM_WORKERS", "8"))
+RAG_EVAL_TIMEOUT_S = float(os.getenv("RAG_EVAL_TIMEOUT_S", "20"))
+BULLET_REWRITE_TIMEOUT_S = float(os.getenv("BULLET_REWRITE_TIMEOUT_S", "6"))
+PENDING_REWRITE_TTL_S = 300
+
+# Knowledge-snippet budget per prompt (estimated tokens) and per-chunk cut.
+RAG_CONTEXT_TOKENS = int(os.getenv("RAG_CONTEXT_TOKENS", "1200"))
+RAG_HYBRID_CANDIDATES = int(os.getenv("RAG_HYBRID_CANDIDATES", "40"))
+EVAL_SNIPPET_CHARS = 700
+# Resume + snippets + JD budget for the evaluation prompt (estimated tokens).
+RAG_EVAL_PROMPT_TOKENS = int(os.getenv("RAG_EVAL_PROMPT_TOKENS", "2600"))
+# JD floor in that budget: the ~1500 characters the prompt kept before compaction.
+EVAL_JD_MIN_TOKENS = 375
+SUGGESTION_SNIPPET_CHARS = 500
+
+_LLM_EXECUTOR = ThreadPoolExecutor(max_workers=RAG_LLM_WORKERS, thread_name_prefix="rag-llm")
+
+# Rewrites that missed BULLET_REWRITE_TIMEOUT_S, keyed by pending id.
+# Collected by the SSE route and sent as a follow-up event.
+_PENDING_REWRITES: Dict[str, Tuple[float, Future]] = {}
+_PENDING_LOCK = threading.Lock()
+
+# JD excerpt included in the rewrite prompt (and therefore in the cache key).
+REWRITE_JD_CHARS = 1200
+
+# (normalized bullet hash, role bucket, JD excerpt hash) -> {"rewrite_text", "reason"}
+_REWRITE_CACHE = LRUCache(
+    "bullet_rewrites",
+    max_entries=int(os.getenv("BULLET_REWRITE_CACHE_SIZE", "20000")),
+    ttl_seconds=7 * 24 * 3600,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -54,22 +100,66 @@ def _extract_json_object(text: str) -> Dict[str, Any]:
         return {}
 
 
+_EMBEDDERS: Dict[str, Any] = {}
+_QUERY_BATCHERS: Dict[int, MicroBatcher] = {}
+_QUERY_CACHES: Dict[int, EmbeddingCache] = {}
+_EMBEDDER_LOCK = threading.Lock()
+
+
 def _load_embedder(model_name: Optional[str] = None):
     if SentenceTransformer is None:
         return None
-    return SentenceTransformer(model_name or DEFAULT_EMBEDDING_MODEL)
+    name = model_name or DEFAULT_EMBEDDING_MODEL
+    with _EMBEDDER_LOCK:
+        if name not in _EMBEDDERS:
+            _EMBEDDERS[name] = SentenceTransformer(name)
+        return _EMBEDDERS[name]
+
+
+def _query_batcher(embedder) -> MicroBatcher:
+    # One batcher per model so concurrent queries share a single encode().
+    with _EMBEDDER_LOCK:
+        batcher = _QUERY_BATCHERS.get(id(embedder))
+        if batcher is None:
+            batcher = MicroBatcher(
+                "rag_query",
+                lambda texts: [v.tolist() for v in embedder.encode(texts, normalize_embeddings=True)],
+                max_batch_size=int(os.getenv("RAG_EMBED_MAX_BATCH", "32")),
+                max_wait_ms=float(os.getenv("RAG_EMBED_MAX_WAIT_MS", "3")),
+            )
+            _QUERY_BATCHERS[id(embedder)] = batcher
+        return batcher
+
+
+def _query_cache(embedder) -> EmbeddingCache:
+    with _EMBEDDER_LOCK:
+        cache = _QUERY_CACHES.get(id(embedder))
+        if cache is None:
+            name = next((n for n, m in _EMBEDDERS.items() if m is embedder), DEFAULT_EMBEDDING_MODEL)
+            cache = EmbeddingCache("rag_query", name, embedder.get_sentence_embedding_dimension())
+            _QUERY_CACHES[id(embedder)] = cache
+        return cache
 
 
 def _embed_query(embedder, text: str) -> List[float]:
     if not embedder:
         return []
-    vec = embedder.encode([text], normalize_embeddings=True)[0]
-    return vec.tolist()
+    try:
+        return _query_cache(embedder).get_or_compute(text, _query_batcher(embedder).embed)
+    except Exception as exc:
+        logger.warning("Query embedding failed: %s", exc)
+        return []
 
 
 def _match_chunks(query_embedding: List[float], category: Optional[str], limit: int) -> List[Dict[str, Any]]:
     if not query_embedding:
         return []
+    # Local replica first; None means not loaded / stale, so use the RPC.
+    index = get_rag_index()
+    if index is not None:
+        local = index.search(query_embedding, category, limit)
+        if local is not None:
+            return local
     try:
         # Requires a Postgres function named match_rag_chunks (see README/notes).
         result = supabase.rpc(
@@ -86,6 +176,31 @@ def _match_chunks(query_embedding: List[float], category: Optional[str], limit:
         return []
 
 
+def _retrieve_chunks(
+    query_text: str,
+    query_embedding: List[float],
+    category: Optional[str],
+    limit: int,
+    snippet_chars: int,
+) -> List[Dict[str, Any]]:
+    """Hybrid retrieval when the replica is loaded, otherwise vector-only."""
+    index = get_rag_index()
+    if index is not None:
+        try:
+            chunks = hybrid_search(
+                index, query_text, query_embedding, category, limit,
+                token_budget=RAG_CONTEXT_TOKENS,
+                snippet_chars=snippet_chars,
+                candidate_k=max(RAG_HYBRID_CANDIDATES, limit),
+            )
+        except Exception as exc:
+            logger.warning("Hybrid retrieval failed: %s", exc)
+            chunks = None
+        if chunks is not None:
+            return chunks
+    return _match_chunks(query_embedding, category, limit)
+
+
 def _llm_rag_suggestions(
     chunks: List[Dict[str, Any]],
     resume_text: str,
@@ -100,7 +215,7 @@ def _llm_rag_suggestions(
         content = (chunk.get("content") or "").strip()
         if not content:
             continue
-        snippet = content[:500].rstrip()
+        snippet = content[:SUGGESTION_SNIPPET_CHARS].rstrip()
         context_lines.append(f"[{i}] {title}: {snippet}")
 
     context_block = "\n".join(context_lines)
@@ -121,12 +236,13 @@ Job Description (optional):
 {job_description[:1500] if job_description else "(none)"}
 """
     try:
-        response = GROQ_CLIENT.chat.completions.create(
-            model=GROQ_DEFAULT_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2,
-            max_tokens=700,
-        )
+        with LLM_SLOTS:
+            response = GROQ_CLIENT.chat.completions.create(
+                model=GROQ_DEFAULT_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.2,
+                max_tokens=700,
+            )
         content = response.choices[0].message.content.strip()
         suggestions = _extract_json(content)
         if suggestions:
@@ -151,12 +267,13 @@ Job Description (optional):
 {job_description[:2000] if job_description else "(none)"}
 """
     try:
-        response = GROQ_CLIENT.chat.completions.create(
-            model=GROQ_DEFAULT_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2,
-            max_tokens=600,
-        )
+        with LLM_SLOTS:
+            response = GROQ_CLIENT.chat.completions.create(
+                model=GROQ_DEFAULT_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.2,
+                max_tokens=600,
+            )
         content = response.choices[0].message.content.strip()
         return _extract_json(content)
     except Exception:
@@ -174,10 +291,20 @@ def _llm_rag_evaluation(
         content = (chunk.get("content") or "").strip()
         if not content:
             continue
-        snippet = content[:700].rstrip()
+        snippet = content[:EVAL_SNIPPET_CHARS].rstrip()
         context_lines.append(f"[{i}] {title}: {snippet}")
 
-    context_block = "\n".join(context_lines)
+    compacted = compact_slots(
+        [
+            PromptSlot("resume", resume_text or "", priority=0, min_tokens=600),
+            PromptSlot("context", "\n".join(context_lines), priority=1, min_tokens=400),
+            PromptSlot("job_description", job_description or "", priority=2, min_tokens=EVAL_JD_MIN_TOKENS),
+        ],
+        budget=RAG_EVAL_PROMPT_TOKENS,
+        site="rag_suggestions.evaluation",
+        focus=[job_description or ""],
+    )
+    context_block = compacted["context"]
 
     jd_instruction = (
         "Compare the resume against the JD and the knowledge rules to identify gaps and misalignments."
@@ -201,18 +328,19 @@ Knowledge snippets:
 {context_block}
 
 Resume:
-{resume_text[:4000]}
+{compacted["resume"]}
 
 Job Description (optional):
-{job_description[:1500] if job_description else "(none)"}
+{compacted["job_description"] or "(none)"}
 """
     try:
-        response = GROQ_CLIENT.chat.completions.create(
-            model=GROQ_DEFAULT_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2,
-            max_tokens=900,
-        )
+        with LLM_SLOTS:
+            response = GROQ_CLIENT.chat.completions.create(
+                model=GROQ_DEFAULT_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.2,
+                max_tokens=900,
+            )
         content = response.choices[0].message.content.strip()
         data = _extract_json_object(content)
         if data:
@@ -278,16 +406,70 @@ def _extract_section_bullets(sections: Dict[str, Any], keys: Optional[List[str]]
     return bullets
 
 
+def _role_bucket(role_type: Optional[str]) -> str:
+    bucket = (role_type or "").strip().lower().replace(" ", "_")
+    return bucket or "general"
+
+
 def _llm_bullet_rewrites(
     bullets: List[Dict[str, str]],
     job_description: str,
+    role_type: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
+    """
+    Rewrite up to 8 bullets. Rewrites are cached per (normalized bullet, role
+    bucket, JD excerpt), so unchanged bullets across versions/re-uploads skip
+    the LLM and only cache misses are sent in the prompt. Tailoring to a new
+    JD is a cache miss.
+    """
     if not bullets:
         return []
 
     # Cap to avoid token overflow / JSON truncation
     capped_bullets = bullets[:8]
-
+    bucket = _role_bucket(role_type)
+    jd_excerpt = (job_description or "")[:REWRITE_JD_CHARS]
+    jd_key = text_hash(jd_excerpt) if jd_excerpt.strip() else ""
+    keys = [(text_hash(b["original_text"]), bucket, jd_key) for b in capped_bullets]
+
+    resolved: Dict[int, Dict[str, str]] = {}
+    miss_positions: List[int] = []
+    for pos, key in enumerate(keys):
+        cached = _REWRITE_CACHE.get(key)
+        if cached:
+            resolved[pos] = cached
+        else:
+            miss_positions.append(pos)
+
+    if miss_positions:
+        fresh = _llm_rewrite_batch([capped_bullets[p] for p in miss_positions], job_description)
+        for item in fresh:
+            local_index = int(item["suggestion_id"].split("_", 1)[1]) - 1
+            pos = miss_positions[local_index]
+            entry = {"rewrite_text": item["rewrite_text"], "reason": item["reason"]}
+            _REWRITE_CACHE.set(keys[pos], entry)
+            resolved[pos] = entry
+
+    logger.info(
+        "[BULLET_REWRITE] %d/%d bullets served from cache (bucket=%s)",
+        len(capped_bullets) - len(miss_positions), len(capped_bullets), bucket,
+    )
+    return [
+        {
+            "suggestion_id": f"br_{pos + 1}",
+            "section_key": capped_bullets[pos]["section_key"],
+            "original_text": capped_bullets[pos]["original_text"],
+            **resolved[pos],
+        }
+        for pos in sorted(resolved)
+    ]
+
+
+def _llm_rewrite_batch(
+    capped_bullets: List[Dict[str, str]],
+    job_description: str,
+) -> List[Dict[str, Any]]:
+    """Single LLM call; suggestion_ids are br_<n> relative to capped_bullets."""
     bullet_block = "\n".join(
         f"[{i}] ({b['section_key']}) {b['original_text']}" for i, b in enumerate(capped_bullets, start=1)
     )
@@ -307,16 +489,17 @@ Bullets to rewrite:
 {bullet_block}
 
 Job Description (optional — use this to make rewrites more targeted):
-{job_description[:1200] if job_description else "(none)"}
+{job_description[:REWRITE_JD_CHARS] if job_description else "(none)"}
 
 Output (JSON array only):"""
     try:
-        response = GROQ_CLIENT.chat.completions.create(
-            model=GROQ_DEFAULT_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2,
-            max_tokens=1500,
-        )
+        with LLM_SLOTS:
+            response = GROQ_CLIENT.chat.completions.create(
+                model=GROQ_DEFAULT_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.2,
+                max_tokens=1500,
+            )
         content = response.choices[0].message.content.strip()
         logger.debug("[BULLET_REWRITE] LLM raw response: %s", content[:500])
         data = _extract_json(content)
@@ -359,6 +542,97 @@ Output (JSON array only):"""
         return []
 
 
+def _merge_suggestions(
+    improvements: List[Dict[str, Any]],
+    bullet_rewrites: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    merged: List[Dict[str, Any]] = []
+
+    for idx, item in enumerate(improvements or [], start=1):
+        merged.append({
+            "suggestion_id": f"impr_{idx}",
+            "section_key": "",
+            "original_text": "",
+            "rewrite_text": "",
+            "suggestion": item.get("suggestion") or "",
+            "explanation": item.get("explanation") or "",
+            "bullet_rewrite": "",
+        })
+
+    for item in bullet_rewrites or []:
+        merged.append({
+            "suggestion_id": item.get("suggestion_id") or "",
+            "section_key": item.get("section_key") or "",
+            "original_text": item.get("original_text") or "",
+            "rewrite_text": item.get("rewrite_text") or "",
+            "suggestion": "",
+            "explanation": item.get("reason") or "",
+            "bullet_rewrite": item.get("rewrite_text") or "",
+        })
+
+    return merged
+
+
+def _register_pending_rewrites(future: Future) -> str:
+    pending_id = uuid.uuid4().hex
+    now = time.monotonic()
+    with _PENDING_LOCK:
+        # Drop entries nobody collected (client disconnected, non-SSE caller).
+        for key, (created, _) in list(_PENDING_REWRITES.items()):
+            if now - created > PENDING_REWRITE_TTL_S:
+                _PENDING_REWRITES.pop(key, None)
+        _PENDING_REWRITES[pending_id] = (now, future)
+    return pending_id
+
+
+def collect_pending_bullet_rewrites(pending_id: Optional[str], timeout: float = 30.0) -> List[Dict[str, Any]]:
+    """
+    Wait for bullet rewrites that missed the inline deadline and return them
+    in the merged suggestion shape. Returns [] if unknown, failed or still late.
+    """
+    if not pending_id:
+        return []
+    with _PENDING_LOCK:
+        entry = _PENDING_REWRITES.pop(pending_id, None)
+    if entry is None:
+        return []
+    try:
+        rewrites = entry[1].result(timeout=timeout)
+    except FutureTimeoutError:
+        logger.warning("[BULLET_REWRITE] Late rewrites %s exceeded %.0fs; dropping", pending_id, timeout)
+        return []
+    except Exception as exc:
+        logger.warning("[BULLET_REWRITE] Late rewrites %s failed: %s", pending_id, exc)
+        return []
+    return _merge_suggestions([], rewrites)
+
+
+def _snippet_improvements(chunks: List[Dict[str, Any]], limit: int = 3) -> List[Dict[str, Any]]:
+    """Improvements taken straight from the top knowledge snippets (no LLM call)."""
+    improvements: List[Dict[str, Any]] = []
+    for chunk in chunks:
+        content = (chunk.get("content") or "").strip()
+        if not content:
+            continue
+        improvements.append({
+            "suggestion": (chunk.get("title") or "").strip() or content[:80],
+            "explanation": content[:SUGGESTION_SNIPPET_CHARS].rstrip(),
+        })
+        if len(improvements) >= limit:
+            break
+    return improvements
+
+
+def _await_with_timeout(future: Future, timeout: float, label: str, default: Any) -> Any:
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        logger.warning("[RAG] %s timed out after %.0fs", label, timeout)
+    except Exception as exc:
+        logger.warning("[RAG] %s failed: %s", label, exc)
+    return default
+
+
 def get_resume_rag_suggestions(
     resume_text: str,
     job_description: str = "",
@@ -373,7 +647,7 @@ def get_resume_rag_suggestions(
     embedder = _load_embedder()
     query_embedding = _embed_query(embedder, query_text) if embedder else []
 
-    chunks = _match_chunks(query_embedding, category, limit)
+    chunks = _retrieve_chunks(query_text, query_embedding, category, limit, SUGGESTION_SNIPPET_CHARS)
     if chunks:
         suggestions = _llm_rag_suggestions(chunks, resume_text, job_description)
         if suggestions:
@@ -392,68 +666,92 @@ def get_resume_rag_evaluation(
     category: Optional[str] = "resume",
     limit: int = 8,
     parsed_sections: Optional[Dict[str, Any]] = None,
-) -> Dict[str, List[Dict[str, Any]]]:
+    role_type: Optional[str] = None,
+    defer_rewrites: bool = False,
+) -> Dict[str, Any]:
+    """
+    Strengths/weaknesses/suggestions for a resume.
+
+    The evaluation and bullet-rewrite LLM calls run concurrently, each bounded
+    by a timeout. A timed-out evaluation falls back to the retrieved snippets
+    rather than a second LLM call. By default the bullet rewrites are merged
+    into ``suggestions`` if they finish within RAG_EVAL_TIMEOUT_S. With
+    ``defer_rewrites`` (callers that stream a follow-up event), rewrites that
+    miss BULLET_REWRITE_TIMEOUT_S are handed off instead and the result
+    carries a ``pending_rewrites_id`` for collect_pending_bullet_rewrites().
+    """
     if not resume_text:
         return {"strengths": [], "weaknesses": [], "suggestions": []}
 
-    def _merge_suggestions(
-        improvements: List[Dict[str, Any]],
-        bullet_rewrites: List[Dict[str, Any]],
-    ) -> List[Dict[str, Any]]:
-        merged: List[Dict[str, Any]] = []
-
-        for idx, item in enumerate(improvements or [], start=1):
-            merged.append({
-                "suggestion_id": f"impr_{idx}",
-                "section_key": "",
-                "original_text": "",
-                "rewrite_text": "",
-                "suggestion": item.get("suggestion") or "",
-                "explanation": item.get("explanation") or "",
-                "bullet_rewrite": "",
-            })
-
-        for item in bullet_rewrites or []:
-            merged.append({
-                "suggestion_id": item.get("suggestion_id") or "",
-                "section_key": item.get("section_key") or "",
-                "original_text": item.get("original_text") or "",
-                "rewrite_text": item.get("rewrite_text") or "",
-                "suggestion": "",
-                "explanation": item.get("reason") or "",
-                "bullet_rewrite": item.get("rewrite_text") or "",
-            })
-
-        return merged
+    # Bullet rewrites don't depend on retrieval, so start them first.
+    bullets = _extract_section_bullets(parsed_sections or {})
+    rewrite_future = (
+        _LLM_EXECUTOR.submit(_llm_bullet_rewrites, bullets, job_description, role_type)
+        if bullets else None
+    )
 
     query_text = job_description.strip() or resume_text[:2000]
 
     embedder = _load_embedder()
     query_embedding = _embed_query(embedder, query_text) if embedder else []
 
-    chunks = _match_chunks(query_embedding, category, limit)
-    if chunks:
-        evaluation = _llm_rag_evaluation(chunks, resume_text, job_description)
-        strengths = evaluation.get("strengths", []) if isinstance(evaluation, dict) else []
-        weaknesses = evaluation.get("weaknesses", []) if isinstance(evaluation, dict) else []
-        improvements = evaluation.get("improvements", []) if isinstance(evaluation, dict) else []
-        bullets = _extract_section_bullets(parsed_sections or {})
-        bullet_rewrites = _llm_bullet_rewrites(bullets, job_description)
-        if strengths or weaknesses or improvements or bullet_rewrites:
-            logger.info("RAG evaluation used: %d strengths, %d weaknesses", len(strengths), len(weaknesses))
-            return {
-                "strengths": strengths,
-                "weaknesses": weaknesses,
-                "suggestions": _merge_suggestions(improvements, bullet_rewrites),
-            }
-        logger.info("RAG chunks found but evaluation failed")
-
-    logger.info("RAG empty; falling back to LLM evaluation")
-    fallback = _llm_rag_evaluation([], resume_text, job_description)
-    bullets = _extract_section_bullets(parsed_sections or {})
-    bullet_rewrites = _llm_bullet_rewrites(bullets, job_description)
-    return {
-        "strengths": fallback.get("strengths", []),
-        "weaknesses": fallback.get("weaknesses", []),
-        "suggestions": _merge_suggestions(fallback.get("improvements", []), bullet_rewrites),
+    chunks = _retrieve_chunks(query_text, query_embedding, category, limit, EVAL_SNIPPET_CHARS)
+    eval_future = _LLM_EXECUTOR.submit(_llm_rag_evaluation, chunks, resume_text, job_description)
+    eval_timed_out = False
+    try:
+        evaluation = eval_future.result(timeout=RAG_EVAL_TIMEOUT_S)
+    except FutureTimeoutError:
+        logger.warning("[RAG] Evaluation timed out after %.0fs", RAG_EVAL_TIMEOUT_S)
+        evaluation, eval_timed_out = {}, True
+    except Exception as exc:
+        logger.warning("[RAG] Evaluation failed: %s", exc)
+        evaluation = {}
+    if not isinstance(evaluation, dict):
+        evaluation = {}
+
+    # The rewrite call has been running alongside retrieval + evaluation;
+    # deferring callers give it a short grace period, then hand it off.
+    # Other callers wait up to RAG_EVAL_TIMEOUT_S and then drop it.
+    bullet_rewrites: List[Dict[str, Any]] = []
+    pending_id: Optional[str] = None
+    if rewrite_future is not None:
+        try:
+            bullet_rewrites = rewrite_future.result(
+                timeout=BULLET_REWRITE_TIMEOUT_S if defer_rewrites else RAG_EVAL_TIMEOUT_S
+            )
+        except FutureTimeoutError:
+            if defer_rewrites:
+                pending_id = _register_pending_rewrites(rewrite_future)
+                logger.info("[BULLET_REWRITE] Deferred as follow-up (%s)", pending_id)
+            else:
+                logger.warning("[BULLET_REWRITE] Timed out after %.0fs", RAG_EVAL_TIMEOUT_S)
+        except Exception as exc:
+            logger.warning("[BULLET_REWRITE] Failed: %s", exc)
+
+    strengths = evaluation.get("strengths", [])
+    weaknesses = evaluation.get("weaknesses", [])
+    improvements = evaluation.get("improvements", [])
+    if chunks and (strengths or weaknesses or improvements):
+        logger.info("RAG evaluation used: %d strengths, %d weaknesses", len(strengths), len(weaknesses))
+    elif eval_timed_out:
+        # A second LLM call would double the worst-case latency.
+        logger.info("RAG evaluation timed out; using knowledge snippets as suggestions")
+        improvements = _snippet_improvements(chunks)
+    elif chunks:
+        logger.info("RAG chunks found but evaluation failed; falling back to LLM evaluation")
+        fallback_future = _LLM_EXECUTOR.submit(_llm_rag_evaluation, [], resume_text, job_description)
+        fallback = _await_with_timeout(fallback_future, RAG_EVAL_TIMEOUT_S, "Fallback evaluation", {}) or {}
+        strengths = fallback.get("strengths", [])
+        weaknesses = fallback.get("weaknesses", [])
+        improvements = fallback.get("improvements", [])
+    else:
+        logger.info("RAG empty; used LLM evaluation without knowledge snippets")
+
+    result: Dict[str, Any] = {
+        "strengths": strengths,
+        "weaknesses": weaknesses,
+        "suggestions": _merge_suggestions(improvements, bullet_rewrites),
     }
+    if pending_id:
+        result["pending_rewrites_id"] = pending_id
+    return result
@@ -2,7 +2,7 @@
 """
 Resume optimization service using the 3-agent resume workflow.
 """
-from app.agents.resume import resume_workflow
+from app.agents.resume import run_resume_workflow
 from app.agents.resume.state import ResumeState
 from app.services.resume_parser import ResumeParser
 from app.services.rag_suggestions import get_resume_rag_evaluation
@@ -114,13 +114,14 @@ def optimize_resume_logic(
     # is required even when requests are anonymous (e.g., tests/local scripts).
     thread_id = str(user_id).strip() if user_id else "resume-opt-anon"
     invoke_config = {"configurable": {"thread_id": thread_id}}
-    final_state = resume_workflow.invoke(initial_state, config=invoke_config)
+    final_state = run_resume_workflow(initial_state, config=invoke_config)
 
     rag_eval = get_resume_rag_evaluation(
         resume_text=resume_text,
         job_description=job_description or "",
         category="resume",
         parsed_sections=sections,
+        role_type=role_type,
     )
 
     return {
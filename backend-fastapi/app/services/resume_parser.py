@@ -21,7 +21,7 @@ import json
 import fitz
 from typing import Any, Dict, List, Optional, Tuple
 
-from app.agents.llm_config import GROQ_CLIENT, GROQ_DEFAULT_MODEL
+from app.agents.llm_config import GROQ_CLIENT, GROQ_DEFAULT_MODEL, LLM_SLOTS
 
 
 class ResumeParser:
@@ -107,6 +107,10 @@ class ResumeParser:
     }
 
     def __init__(self):
+        # Context manager wrapped around every LLM call: the process-wide Groq
+        # budget by default. Batch callers swap in a cross-process semaphore so
+        # parallel workers cannot exceed the provider rate limit.
+        self.llm_gate = LLM_SLOTS
         self._compiled_patterns = {}
         for section, patterns in self.SECTION_PATTERNS.items():
             combined_pattern = "|".join(f"({p})" for p in patterns)
@@ -396,12 +400,13 @@ Return format (JSON only):
 {{"0": "experience", "1": "education", "2": "skills", ...}}
 """
         try:
-            response = GROQ_CLIENT.chat.completions.create(
-                model=GROQ_DEFAULT_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                max_tokens=1000
-            )
+            with self.llm_gate:
+                response = GROQ_CLIENT.chat.completions.create(
+                    model=GROQ_DEFAULT_MODEL,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.1,
+                    max_tokens=1000
+                )
             response_text = response.choices[0].message.content.strip()
             json_match = re.search(r'\{[^{}]*\}|\{(?:[^{}]|(?:\{[^{}]*\}))*\}', response_text, re.DOTALL)
             if json_match:
@@ -416,7 +421,11 @@ Return format (JSON only):
 
     # ── Main parse ────────────────────────────────────────────────────────────
 
-    def parse_sections(self, resume_text: str) -> Dict[str, str]:
+    def parse_sections(self, resume_text: str, use_llm: bool = True) -> Dict[str, str]:
+        """
+        Map resume text to sections. With ``use_llm=False`` unidentified chunks
+        go to "other" instead of being classified by the LLM (keyword-only mode).
+        """
         sections = {
             "contact": "", "summary": "", "experience": "", "education": "",
             "skills": "", "projects": "", "coursework": "", "certifications": "",
@@ -446,7 +455,12 @@ Return format (JSON only):
         unidentified_ratio = len(unidentified_chunks) / max(1, len(chunks))
         use_llm_for_all = unidentified_ratio > 0.3
 
-        if use_llm_for_all:
+        if not use_llm:
+            for idx, header, content in unidentified_chunks:
+                full_content = f"{header}\n{content}".strip() if header and content else (header or content)
+                section_to_chunks["other"].append(full_content)
+
+        elif use_llm_for_all:
             print(f"Resume structure unclear — using LLM for all {len(chunks)} chunks")
             llm_results = self._identify_sections_with_llm(
                 [(i, h, c) for i, (h, c) in enumerate(chunks)]
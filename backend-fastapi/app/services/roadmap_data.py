@@ -0,0 +1,239 @@
+"""
+Roadmap.sh data layer for the study planner.
+
+Study plans used to pay network and LLM latency for roadmap.sh on every
+request: a Groq call for each skill missing from SKILL_TO_ROADMAP_ID, and a
+live GET for roadmap JSON. This module replaces both with local data:
+
+  - A bundled, versioned snapshot of roadmap.sh metadata
+    (data/roadmap_snapshot.json: id → title, url, description, topics). It is
+    refreshed in bulk by ``python -m scripts.refresh_roadmap_snapshot``; its
+    ``version`` is a hash of the roadmap entries.
+  - A persistent skill → roadmap-id cache (memory LRU → SQLite namespace
+    ``roadmap_ids``, versioned by the snapshot) for ids resolved by the
+    fallback resolver. Negative results are stored too ("" = no roadmap) with
+    a shorter TTL, so unmappable skills don't hit the LLM on every plan.
+    Resolver *errors* are not persisted; they are only remembered in memory
+    for ROADMAP_ERROR_TTL_S, so one plan doesn't retry a failing lookup for
+    every place that needs the skill's roadmap.
+  - resolve_many() answers static / cached skills immediately and resolves
+    the remaining misses concurrently.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import requests
+
+from app.services.cache import LRUCache, SQLiteKV, normalize_text
+
+logger = logging.getLogger(__name__)
+
+ROADMAP_SH_API = "https://roadmap.sh/api/v1"
+ROADMAP_SH_BASE = "https://roadmap.sh"
+ROADMAP_API_TIMEOUT = 10
+
+ROADMAP_SNAPSHOT_PATH = os.getenv(
+    "ROADMAP_SNAPSHOT_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "roadmap_snapshot.json"),
+)
+ROADMAP_ID_TTL_S = float(os.getenv("ROADMAP_ID_TTL_S", str(90 * 24 * 3600)))
+ROADMAP_NEGATIVE_TTL_S = float(os.getenv("ROADMAP_NEGATIVE_TTL_S", str(7 * 24 * 3600)))
+ROADMAP_ERROR_TTL_S = float(os.getenv("ROADMAP_ERROR_TTL_S", "60"))
+ROADMAP_LOOKUP_WORKERS = int(os.getenv("ROADMAP_LOOKUP_WORKERS", "4"))
+MAX_SNAPSHOT_TOPICS = 40
+
+_NO_ROADMAP = ""
+
+
+def snapshot_version(roadmaps: Dict[str, dict]) -> str:
+    payload = json.dumps(roadmaps, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def load_snapshot(path: str = ROADMAP_SNAPSHOT_PATH) -> Dict[str, Any]:
+    """The snapshot at ``path``; an empty one (version "empty") if unreadable."""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            snapshot = json.load(fh)
+        roadmaps = snapshot.get("roadmaps")
+        if not isinstance(roadmaps, dict):
+            raise ValueError("missing 'roadmaps' mapping")
+        snapshot.setdefault("version", snapshot_version(roadmaps))
+        return snapshot
+    except Exception as exc:
+        logger.warning(f"[Roadmap.sh] Snapshot unavailable at {path}: {exc}")
+        return {"version": "empty", "generated_at": None, "roadmaps": {}}
+
+
+def write_snapshot(roadmaps: Dict[str, dict], path: str = ROADMAP_SNAPSHOT_PATH) -> Dict[str, Any]:
+    snapshot = {
+        "version": snapshot_version(roadmaps),
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "source": ROADMAP_SH_API,
+        "roadmaps": {key: roadmaps[key] for key in sorted(roadmaps)},
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(snapshot, fh, indent=2, ensure_ascii=False)
+        fh.write("\n")
+    os.replace(tmp_path, path)
+    return snapshot
+
+
+def fetch_roadmap_metadata(roadmap_id: str, timeout: float = ROADMAP_API_TIMEOUT) -> Optional[dict]:
+    """Live roadmap.sh JSON reduced to snapshot metadata; None if unavailable."""
+    response = requests.get(f"{ROADMAP_SH_API}/roadmaps/{roadmap_id}.json", timeout=timeout)
+    if response.status_code != 200:
+        return None
+    data = response.json()
+    topics: List[str] = []
+    for node in data.get("nodes", []) if isinstance(data, dict) else []:
+        label = ((node or {}).get("data") or {}).get("label")
+        if (node or {}).get("type") in ("topic", "subtopic") and isinstance(label, str) and label.strip():
+            if label.strip() not in topics:
+                topics.append(label.strip())
+    return {
+        "title": str(data.get("title") or "").strip() if isinstance(data, dict) else "",
+        "description": str(data.get("description") or "").strip() if isinstance(data, dict) else "",
+        "url": f"{ROADMAP_SH_BASE}/{roadmap_id}",
+        "topics": topics[:MAX_SNAPSHOT_TOPICS],
+    }
+
+
+class RoadmapDirectory:
+    """Snapshot-backed roadmap metadata plus a persistent skill → id cache."""
+
+    def __init__(
+        self,
+        static_lookup: Callable[[str], Optional[str]],
+        resolver: Optional[Callable[[str, List[str]], Optional[str]]] = None,
+        snapshot_path: str = ROADMAP_SNAPSHOT_PATH,
+        store: Optional[SQLiteKV] = None,
+        negative_ttl_s: float = ROADMAP_NEGATIVE_TTL_S,
+        max_workers: int = ROADMAP_LOOKUP_WORKERS,
+        error_ttl_s: float = ROADMAP_ERROR_TTL_S,
+    ):
+        self._static_lookup = static_lookup
+        self._resolver = resolver
+        self._negative_ttl_s = negative_ttl_s
+        self._max_workers = max(1, max_workers)
+        self.snapshot = load_snapshot(snapshot_path)
+        self.version = self.snapshot["version"]
+        self._roadmaps: Dict[str, dict] = self.snapshot["roadmaps"]
+        self._memory = LRUCache("roadmap_ids", max_entries=4096, ttl_seconds=negative_ttl_s)
+        self._failed = LRUCache("roadmap_id_errors", max_entries=1024, ttl_seconds=error_ttl_s)
+        self._store = store
+        if store is None:
+            try:
+                self._store = SQLiteKV("roadmap_ids", version=self.version, ttl_seconds=ROADMAP_ID_TTL_S)
+            except Exception as exc:
+                logger.warning(f"[Roadmap.sh] SQLite id cache disabled: {exc}")
+
+    @property
+    def ids(self) -> List[str]:
+        return sorted(self._roadmaps)
+
+    def get(self, roadmap_id: Optional[str]) -> Optional[dict]:
+        """Snapshot metadata for ``roadmap_id`` (a copy), or None."""
+        entry = self._roadmaps.get(roadmap_id or "")
+        return {"id": roadmap_id, **copy.deepcopy(entry)} if entry is not None else None
+
+    def url_for(self, roadmap_id: str) -> str:
+        entry = self._roadmaps.get(roadmap_id) or {}
+        return entry.get("url") or f"{ROADMAP_SH_BASE}/{roadmap_id}"
+
+    @property
+    def _can_resolve(self) -> bool:
+        # Without a snapshot there are no valid ids to resolve to.
+        return self._resolver is not None and bool(self._roadmaps)
+
+    def _cached(self, key: str) -> Optional[str]:
+        """Cached id, _NO_ROADMAP for a cached negative, None on a miss."""
+        value = self._memory.get(key)
+        if value is not None:
+            return value
+        if self._store is None:
+            return None
+        try:
+            row = self._store.get_with_age(key)
+        except Exception as exc:
+            logger.warning(f"[Roadmap.sh] SQLite read failed: {exc}")
+            return None
+        if row is None:
+            return None
+        value, age = row
+        value = value.decode("utf-8") if isinstance(value, bytes) else value
+        ttl = self._negative_ttl_s if value == _NO_ROADMAP else ROADMAP_ID_TTL_S
+        if age > ttl:
+            return None
+        self._memory.set(key, value)
+        return value
+
+    def _remember(self, key: str, roadmap_id: Optional[str]) -> None:
+        value = roadmap_id or _NO_ROADMAP
+        self._memory.set(key, value)
+        if self._store is not None:
+            try:
+                self._store.set(key, value)
+            except Exception as exc:
+                logger.warning(f"[Roadmap.sh] SQLite write failed: {exc}")
+
+    def _lookup(self, skill: str) -> tuple:
+        """(resolved, roadmap_id) without calling the resolver."""
+        static = self._static_lookup(skill)
+        if static:
+            return True, static
+        cached = self._cached(normalize_text(skill))
+        if cached is not None:
+            return True, cached or None
+        return False, None
+
+    def resolve_id(self, skill: str) -> Optional[str]:
+        """Static map → cache → resolver; the resolver's answer (even "none") is cached.
+
+        A resolver error returns None and is not retried for ROADMAP_ERROR_TTL_S.
+        """
+        if not skill or not skill.strip():
+            return None
+        resolved, roadmap_id = self._lookup(skill)
+        if resolved or not self._can_resolve:
+            return roadmap_id
+        key = normalize_text(skill)
+        if self._failed.get(key) is not None:
+            return None
+        try:
+            roadmap_id = self._resolver(skill, self.ids)
+        except Exception as exc:
+            logger.warning(f"[Roadmap.sh] Resolver failed for '{skill}': {exc}")
+            self._failed.set(key, True)
+            return None
+        if roadmap_id not in self._roadmaps:
+            roadmap_id = None
+        self._remember(key, roadmap_id)
+        return roadmap_id
+
+    def resolve_many(self, skills: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Resolve every skill; cache misses go to the resolver concurrently."""
+        results: Dict[str, Optional[str]] = {}
+        misses: List[str] = []
+        for skill in dict.fromkeys(s for s in skills if isinstance(s, str) and s.strip()):
+            resolved, roadmap_id = self._lookup(skill)
+            if resolved or not self._can_resolve:
+                results[skill] = roadmap_id
+            else:
+                misses.append(skill)
+        if misses:
+            with ThreadPoolExecutor(max_workers=min(self._max_workers, len(misses))) as executor:
+                futures = {executor.submit(self.resolve_id, skill): skill for skill in misses}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+            logger.info(f"[Roadmap.sh] Resolved {len(misses)} uncached skills concurrently")
+        return results
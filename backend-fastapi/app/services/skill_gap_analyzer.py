@@ -10,6 +10,7 @@ from dotenv import load_dotenv
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from app.agents.llm_config import GROQ_CLIENT as client, GROQ_DEFAULT_MODEL
+from app.agents.skill_gap.career_matching import CareerMatcher
 
 load_dotenv()
 
@@ -153,6 +154,8 @@ _SHORT_SKILL_CONTEXT = {
     ],
 }
 
+_career_matcher = CareerMatcher(CAREER_CLUSTERS)
+
 
 def extract_skills_from_resume(resume_text: str) -> list:
     """
@@ -228,35 +231,13 @@ def calculate_career_probabilities(resume_text: str, user_skills: list) -> list:
     Returns:
         List of career match dictionaries sorted by probability.
     """
-    career_matches = []
-    
-    for career_name, cluster_data in CAREER_CLUSTERS.items():
-        # Calculate skill-based match
-        skill_match = calculate_skill_match_percentage(user_skills, cluster_data["skills"])
-        
-        # Find matched and missing skills
-        user_skills_lower = set(skill.lower() for skill in user_skills)
-        
-        matched_skills = [
-            skill for skill in cluster_data["skills"] 
-            if skill.lower() in user_skills_lower
-        ]
-        
-        missing_skills = [
-            skill for skill in cluster_data["skills"] 
-            if skill.lower() not in user_skills_lower
-        ][:10]  # Limit to top 10 missing skills
-        
-        career_matches.append({
-            "career": career_name,
-            "probability": round(skill_match, 2),
-            "skill_match_percentage": skill_match,
-            "matched_skills": matched_skills,
-            "missing_skills": missing_skills,
-            "total_required_skills": len(cluster_data["skills"]),
-            "matched_skills_count": len(matched_skills)
-        })
-    
+    # Uniform weights: probability stays the plain matched / required percentage.
+    career_matches = _career_matcher.score(user_skills, max_missing=10)
+    for match in career_matches:
+        match["probability"] = match["skill_match_percentage"]
+        # No proficiency data on this path; keep the original result shape.
+        match.pop("needs_improvement_skills", None)
+
     # Sort by probability (descending)
     career_matches.sort(key=lambda x: x["probability"], reverse=True)
     
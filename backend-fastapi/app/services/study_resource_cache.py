@@ -0,0 +1,437 @@
+"""
+Shared, cross-user cache of study-plan building blocks.
+
+fetch_live_resources_node used to rebuild every skill's learning path per
+plan (curated lookup, a Gemini search-grounded call for uncovered skills),
+and validate_urls_node HEAD-checked every URL again. The learning path for
+("Docker", a backend career, "video_tutorials") is the same for every user,
+so it is built once per key:
+
+    (normalized skill, career bucket, learning style, skill level)
+
+The career bucket is the normalized target career with seniority words
+removed ("Senior Backend Developer" → "backend developer"). It only shapes
+the key; the builder gets the career as the user wrote it.
+
+  - StudyResourceCache.get(): memory LRU → SQLite (``study_resources``).
+    Entries younger than their TTL are served as-is; older ones (up to
+    STUDY_RESOURCE_MAX_AGE_S) are served while a background rebuild is
+    scheduled; misses are built inline. One build per key runs at a time:
+    concurrent misses, and misses during a refresh or pre-warm of the same
+    key, wait for it. Docs-only fallback paths get a shorter TTL so Gemini /
+    curated data is retried sooner.
+  - Every lookup bumps a popularity counter in memory; the counts are
+    flushed to SQLite (``study_resources_popularity``) in the background, in
+    one atomic batch. Keys not seen for STUDY_RESOURCE_POPULARITY_TTL_S are
+    pruned, and only the STUDY_RESOURCE_POPULARITY_MAX_KEYS most popular
+    are kept.
+  - prewarm() rebuilds the most-requested keys that are missing or stale,
+    in the background. A lease in ``study_resources_leases`` lets only one
+    worker process pre-warm per STUDY_RESOURCE_PREWARM_LEASE_S.
+  - UrlStatusCache remembers HEAD-check results per URL (dead links for a
+    shorter time), so cached paths are validated without network calls.
+"""
+
+import copy
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.services.cache import LRUCache, SQLiteKV, normalize_text, register_metrics
+
+logger = logging.getLogger(__name__)
+
+STUDY_RESOURCE_TTL_S = float(os.getenv("STUDY_RESOURCE_TTL_S", str(7 * 24 * 3600)))
+STUDY_RESOURCE_FALLBACK_TTL_S = float(os.getenv("STUDY_RESOURCE_FALLBACK_TTL_S", str(12 * 3600)))
+STUDY_RESOURCE_MAX_AGE_S = float(os.getenv("STUDY_RESOURCE_MAX_AGE_S", str(30 * 24 * 3600)))
+STUDY_RESOURCE_WORKERS = int(os.getenv("STUDY_RESOURCE_WORKERS", "2"))
+STUDY_RESOURCE_PREWARM_TOP_N = int(os.getenv("STUDY_RESOURCE_PREWARM_TOP_N", "50"))
+STUDY_RESOURCE_PREWARM_LEASE_S = float(os.getenv("STUDY_RESOURCE_PREWARM_LEASE_S", "600"))
+STUDY_RESOURCE_POPULARITY_TTL_S = float(os.getenv("STUDY_RESOURCE_POPULARITY_TTL_S", str(30 * 24 * 3600)))
+STUDY_RESOURCE_POPULARITY_MAX_KEYS = int(os.getenv("STUDY_RESOURCE_POPULARITY_MAX_KEYS", "5000"))
+URL_ALIVE_TTL_S = float(os.getenv("STUDY_URL_ALIVE_TTL_S", str(3 * 24 * 3600)))
+URL_DEAD_TTL_S = float(os.getenv("STUDY_URL_DEAD_TTL_S", str(6 * 3600)))
+
+# Paths built only from documentation fallbacks; refreshed on the shorter TTL.
+FALLBACK_SOURCE = "docs"
+ANY_CAREER = "_any"
+
+_SENIORITY_RE = re.compile(
+    r"\b(?:senior|sr|junior|jr|lead|principal|staff|chief|head of|associate|intern|internship|"
+    r"trainee|graduate|entry[\s-]level|entry|mid[\s-]level|mid|i{1,3}|iv|[1-4])\b\.?"
+)
+
+# builder(skill, target_career, learning_style, skill_level) -> (learning_path, source)
+PathBuilder = Callable[[str, str, str, str], Tuple[List[dict], str]]
+
+
+def career_bucket(target_career: str) -> str:
+    """Normalized career with seniority qualifiers stripped; "_any" if empty."""
+    text = _SENIORITY_RE.sub(" ", normalize_text(target_career).replace("/", " "))
+    return " ".join(text.split()) or ANY_CAREER
+
+
+@dataclass
+class ResourcePlan:
+    learning_path: List[dict]
+    source: str
+    cached: bool
+    stale: bool = False
+
+
+class StudyResourceCache:
+    """Learning paths shared across users, with stale-while-revalidate refresh."""
+
+    def __init__(
+        self,
+        builder: PathBuilder,
+        store: Optional[SQLiteKV] = None,
+        popularity: Optional[SQLiteKV] = None,
+        leases: Optional[SQLiteKV] = None,
+        ttl_s: float = STUDY_RESOURCE_TTL_S,
+        fallback_ttl_s: float = STUDY_RESOURCE_FALLBACK_TTL_S,
+        max_age_s: float = STUDY_RESOURCE_MAX_AGE_S,
+        max_workers: int = STUDY_RESOURCE_WORKERS,
+        popularity_ttl_s: float = STUDY_RESOURCE_POPULARITY_TTL_S,
+        popularity_max_keys: int = STUDY_RESOURCE_POPULARITY_MAX_KEYS,
+        lease_s: float = STUDY_RESOURCE_PREWARM_LEASE_S,
+        name: str = "study_resources",
+    ):
+        self._builder = builder
+        self._ttl_s = ttl_s
+        self._fallback_ttl_s = fallback_ttl_s
+        self._max_age_s = max_age_s
+        self._popularity_ttl_s = popularity_ttl_s
+        self._popularity_max_keys = popularity_max_keys
+        self._lease_s = lease_s
+        self._owner = f"{os.getpid()}:{id(self)}"
+        self._memory = LRUCache(name, max_entries=2048, ttl_seconds=max_age_s)
+        self._store = store
+        self._popularity = popularity
+        self._leases = leases
+        if store is None:
+            try:
+                self._store = SQLiteKV(name, version="1", ttl_seconds=max_age_s)
+                self._popularity = popularity or SQLiteKV(
+                    f"{name}_popularity", version="1", ttl_seconds=popularity_ttl_s
+                )
+                self._leases = leases or SQLiteKV(f"{name}_leases", version="1")
+            except Exception as exc:
+                logger.warning(f"[Study Resources] SQLite cache disabled: {exc}")
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="study-resources")
+        self._pending: Dict[str, Future] = {}
+        # Popularity increments not yet flushed to SQLite, by key.
+        self._hits: Dict[str, Dict[str, Any]] = {}
+        self._flush_scheduled = False
+        self._lock = threading.Lock()
+        self._counters = {
+            "served_fresh": 0, "served_stale": 0, "built_inline": 0, "shared_build": 0,
+            "refreshed": 0, "refresh_failed": 0,
+        }
+        register_metrics(f"{name}_plans", self.stats)
+
+    @staticmethod
+    def key_for(skill: str, target_career: str, learning_style: str, skill_level: str = "beginner") -> str:
+        return "|".join((normalize_text(skill), career_bucket(target_career), learning_style, skill_level))
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._counters, "pending": len(self._pending)}
+
+    def _ttl_for(self, entry: Dict[str, Any]) -> float:
+        return self._fallback_ttl_s if entry.get("source") == FALLBACK_SOURCE else self._ttl_s
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._memory.get(key)
+        if entry is not None or self._store is None:
+            return entry
+        try:
+            raw = self._store.get(key)
+        except Exception as exc:
+            logger.warning(f"[Study Resources] SQLite read failed: {exc}")
+            return None
+        if not raw:
+            return None
+        entry = json.loads(raw)
+        self._memory.set(key, entry)
+        return entry
+
+    def _save(self, key: str, entry: Dict[str, Any]) -> None:
+        self._memory.set(key, entry)
+        if self._store is not None:
+            try:
+                self._store.set(key, json.dumps(entry))
+            except Exception as exc:
+                logger.warning(f"[Study Resources] SQLite write failed: {exc}")
+
+    def _touch(self, key: str, params: Dict[str, str]) -> None:
+        """Count a lookup in memory; the SQLite write happens in the background."""
+        if self._popularity is None:
+            return
+        with self._lock:
+            pending = self._hits.setdefault(key, {**params, "hits": 0})
+            pending["hits"] += 1
+            pending["last_seen"] = time.time()
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self._executor.submit(self.flush_popularity)
+
+    def flush_popularity(self) -> None:
+        """Add the buffered lookup counts to the persistent counters in one transaction."""
+        with self._lock:
+            pending, self._hits = self._hits, {}
+            self._flush_scheduled = False
+        if not pending or self._popularity is None:
+            return
+
+        def merge(delta: Dict[str, Any]) -> Callable[[Optional[str]], str]:
+            def apply(raw: Optional[str]) -> str:
+                record = json.loads(raw) if raw else {**delta, "hits": 0}
+                record["hits"] += delta["hits"]
+                record["last_seen"] = delta["last_seen"]
+                return json.dumps(record)
+            return apply
+
+        try:
+            self._popularity.update_many({key: merge(delta) for key, delta in pending.items()})
+        except Exception as exc:
+            logger.warning(f"[Study Resources] Popularity update failed: {exc}")
+
+    def _age(self, entry: Dict[str, Any]) -> float:
+        return time.time() - entry.get("built_at", 0)
+
+    def contains(self, skill: str, target_career: str, learning_style: str, skill_level: str = "beginner") -> bool:
+        """True if get() would serve the key from cache (fresh or stale) instead of building."""
+        return self._load(self.key_for(skill, target_career, learning_style, skill_level)) is not None
+
+    def is_fresh(self, key: str) -> bool:
+        entry = self._load(key)
+        return entry is not None and self._age(entry) <= self._ttl_for(entry)
+
+    def build(self, skill: str, target_career: str, learning_style: str, skill_level: str = "beginner") -> Dict[str, Any]:
+        """Run the builder for one key and store the result."""
+        learning_path, source = self._builder(skill, target_career, learning_style, skill_level)
+        entry = {
+            "skill": skill,
+            "target_career": target_career,
+            "learning_style": learning_style,
+            "skill_level": skill_level,
+            "learning_path": learning_path,
+            "source": source,
+            "built_at": time.time(),
+        }
+        self._save(self.key_for(skill, target_career, learning_style, skill_level), entry)
+        return entry
+
+    def _forget(self, key: str, future: Future) -> None:
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def _schedule(self, skill: str, target_career: str, learning_style: str, skill_level: str) -> Future:
+        """Background (re)build of the key; joins a build already in progress."""
+        key = self.key_for(skill, target_career, learning_style, skill_level)
+
+        def run() -> Dict[str, Any]:
+            try:
+                entry = self.build(skill, target_career, learning_style, skill_level)
+            except Exception as exc:
+                self._count("refresh_failed")
+                logger.warning(f"[Study Resources] Refresh failed for {key}: {exc}")
+                raise
+            self._count("refreshed")
+            return entry
+
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(run)
+            self._pending[key] = future
+        # Outside the lock: the callback runs at once if the build already finished.
+        future.add_done_callback(lambda f, k=key: self._forget(k, f))
+        return future
+
+    def _build_shared(self, skill: str, target_career: str, learning_style: str, skill_level: str) -> Dict[str, Any]:
+        """Build the key on this thread, or wait for the build already running."""
+        key = self.key_for(skill, target_career, learning_style, skill_level)
+        with self._lock:
+            future = self._pending.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._pending[key] = future
+        if not owner:
+            self._count("shared_build")
+            return future.result()
+
+        self._count("built_inline")
+        try:
+            entry = self.build(skill, target_career, learning_style, skill_level)
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(entry)
+            return entry
+        finally:
+            self._forget(key, future)
+
+    def get(self, skill: str, target_career: str, learning_style: str, skill_level: str = "beginner") -> ResourcePlan:
+        """Cached learning path for the key; built inline only on a miss."""
+        key = self.key_for(skill, target_career, learning_style, skill_level)
+        self._touch(key, {
+            "skill": skill,
+            "target_career": target_career,
+            "learning_style": learning_style,
+            "skill_level": skill_level,
+        })
+        entry = self._load(key)
+        if entry is not None:
+            stale = self._age(entry) > self._ttl_for(entry)
+            if stale:
+                self._count("served_stale")
+                self._schedule(skill, target_career, learning_style, skill_level)
+            else:
+                self._count("served_fresh")
+            return ResourcePlan(copy.deepcopy(entry["learning_path"]), entry["source"], cached=True, stale=stale)
+
+        entry = self._build_shared(skill, target_career, learning_style, skill_level)
+        return ResourcePlan(copy.deepcopy(entry["learning_path"]), entry["source"], cached=False)
+
+    def popular(self, top_n: int = STUDY_RESOURCE_PREWARM_TOP_N) -> List[Dict[str, Any]]:
+        """Most-requested keys, by hit count. Prunes old and unpopular keys."""
+        if self._popularity is None:
+            return []
+        self.flush_popularity()
+        try:
+            self._popularity.prune(self._popularity_ttl_s)
+            rows = self._popularity.items()
+        except Exception as exc:
+            logger.warning(f"[Study Resources] Popularity read failed: {exc}")
+            return []
+        records = []
+        for key, raw in rows:
+            try:
+                records.append({"key": key, **json.loads(raw)})
+            except (TypeError, ValueError):
+                continue
+        records.sort(key=lambda record: (-record.get("hits", 0), record["key"]))
+        records, dropped = records[:self._popularity_max_keys], records[self._popularity_max_keys:]
+        try:
+            for record in dropped:
+                self._popularity.delete(record["key"])
+        except Exception as exc:
+            logger.warning(f"[Study Resources] Popularity prune failed: {exc}")
+        return records[:top_n]
+
+    def prewarm(self, top_n: int = STUDY_RESOURCE_PREWARM_TOP_N, wait: bool = False) -> int:
+        """
+        Schedule rebuilds of popular keys that are missing or stale; returns how
+        many. Skipped (0) while another process holds the pre-warm lease.
+        """
+        if self._leases is not None:
+            try:
+                if not self._leases.claim("prewarm", self._owner, self._lease_s):
+                    logger.info("[Study Resources] Another worker is pre-warming resource plans; skipping")
+                    return 0
+            except Exception as exc:
+                logger.warning(f"[Study Resources] Pre-warm lease unavailable: {exc}")
+        futures = [
+            self._schedule(record["skill"], record["target_career"], record["learning_style"], record["skill_level"])
+            for record in self.popular(top_n)
+            if not self.is_fresh(record["key"])
+        ]
+        if futures:
+            logger.info(f"[Study Resources] Pre-warming {len(futures)} popular resource plans")
+        if wait:
+            for future in futures:
+                future.exception()  # waits; failures are already counted and logged
+        return len(futures)
+
+    def clear(self) -> None:
+        self._memory.clear()
+        if self._store is not None:
+            self._store.clear()
+
+
+class UrlStatusCache:
+    """HEAD-check results per URL; dead links are re-checked sooner."""
+
+    def __init__(
+        self,
+        store: Optional[SQLiteKV] = None,
+        alive_ttl_s: float = URL_ALIVE_TTL_S,
+        dead_ttl_s: float = URL_DEAD_TTL_S,
+        name: str = "study_url_status",
+    ):
+        self._alive_ttl_s = alive_ttl_s
+        self._dead_ttl_s = dead_ttl_s
+        self._memory = LRUCache(name, max_entries=8192, ttl_seconds=dead_ttl_s)
+        self._store = store
+        if store is None:
+            try:
+                self._store = SQLiteKV(name, version="1", ttl_seconds=max(alive_ttl_s, dead_ttl_s))
+            except Exception as exc:
+                logger.warning(f"[Study Resources] URL status cache disabled: {exc}")
+
+    def _cached(self, url: str) -> Optional[bool]:
+        alive = self._memory.get(url)
+        if alive is not None or self._store is None:
+            return alive
+        try:
+            row = self._store.get_with_age(url)
+        except Exception as exc:
+            logger.warning(f"[Study Resources] SQLite read failed: {exc}")
+            return None
+        if row is None:
+            return None
+        value, age = row
+        alive = (value.decode("utf-8") if isinstance(value, bytes) else value) == "1"
+        if age > (self._alive_ttl_s if alive else self._dead_ttl_s):
+            return None
+        self._memory.set(url, alive)
+        return alive
+
+    def _remember(self, url: str, alive: bool) -> None:
+        self._memory.set(url, alive)
+        if self._store is not None:
+            try:
+                self._store.set(url, "1" if alive else "0")
+            except Exception as exc:
+                logger.warning(f"[Study Resources] SQLite write failed: {exc}")
+
+    def check_many(self, urls: Iterable[str], checker: Callable[[str], bool], max_workers: int = 10) -> Dict[str, bool]:
+        """Status of every URL; only unknown or expired ones go to ``checker``, concurrently."""
+        status: Dict[str, bool] = {}
+        misses: List[str] = []
+        for url in dict.fromkeys(u for u in urls if u):
+            cached = self._cached(url)
+            if cached is None:
+                misses.append(url)
+            else:
+                status[url] = cached
+        if misses:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(misses)))) as executor:
+                futures = {executor.submit(checker, url): url for url in misses}
+                for future in as_completed(futures):
+                    url = futures[future]
+                    try:
+                        alive = bool(future.result())
+                    except Exception:
+                        alive = False
+                    status[url] = alive
+                    self._remember(url, alive)
+        logger.info(f"[Study Resources] URL status: {len(status) - len(misses)} cached, {len(misses)} checked")
+        return status
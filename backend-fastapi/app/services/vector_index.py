@@ -0,0 +1,385 @@
+"""
+In-process replica of the rag_chunks vector table.
+
+The RAG corpus is small and read-mostly, so instead of a match_rag_chunks RPC
+per query we keep every chunk embedding in a float32 matrix and do an exact
+dot-product search (embeddings are L2-normalized at ingest, so dot == cosine).
+
+  - Full load from rag_chunks on startup (paged), in a background thread
+  - Incremental refresh by version column (RAG_INDEX_VERSION_COLUMN,
+    default updated_at): one query for rows changed since the newest version
+    seen, plus an id-only scan to detect deletions. Without a watermark
+    (after a snapshot load) or without the column, it falls back to
+    comparing per-row content hashes (id + content, no embeddings). Rows
+    without an embedding are remembered too, so they aren't re-fetched on
+    every refresh
+  - Optional on-disk snapshot (RAG_INDEX_DIR) loaded with mmap so restarts and
+    sibling workers share pages instead of re-downloading
+  - search() returns None when the replica is not loaded or too stale, and
+    callers fall back to the RPC
+  - A BM25 inverted index over chunk content is rebuilt on every swap for
+    hybrid retrieval (see hybrid_retrieval.py)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from supabase_client import supabase
+from app.services.hybrid_retrieval import BM25Index
+
+logger = logging.getLogger(__name__)
+
+RAG_LOCAL_INDEX = os.getenv("RAG_LOCAL_INDEX", "1") != "0"
+RAG_INDEX_DIR = os.getenv("RAG_INDEX_DIR", "")
+RAG_INDEX_REFRESH_S = float(os.getenv("RAG_INDEX_REFRESH_S", "300"))
+RAG_INDEX_MAX_STALENESS_S = float(os.getenv("RAG_INDEX_MAX_STALENESS_S", "3600"))
+# Column bumped on every insert/update; "" compares content hashes instead.
+RAG_INDEX_VERSION_COLUMN = os.getenv("RAG_INDEX_VERSION_COLUMN", "updated_at")
+PAGE_SIZE = 1000
+ID_BATCH_SIZE = 200
+
+_META_FIELDS = ("id", "parent_id", "chunk_index", "category", "title", "content")
+_ROW_FIELDS = ",".join(_META_FIELDS) + ",embedding"
+
+
+def _content_hash(content: Optional[str]) -> str:
+    return hashlib.sha1((content or "").encode("utf-8")).hexdigest()
+
+
+def _parse_embedding(raw: Any) -> Optional[List[float]]:
+    # PostgREST returns pgvector columns as "[0.1,0.2,...]" strings.
+    if raw is None:
+        return None
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+    return raw if isinstance(raw, list) and raw else None
+
+
+class RagChunkIndex:
+    """Exact dot-product index over rag_chunks with category filtering."""
+
+    def __init__(self, snapshot_dir: str = RAG_INDEX_DIR, version_column: str = RAG_INDEX_VERSION_COLUMN):
+        self.snapshot_dir = snapshot_dir
+        self.version_column = version_column
+        self.matrix: Optional[np.ndarray] = None
+        self.meta: List[Dict[str, Any]] = []
+        self.by_category: Dict[str, np.ndarray] = {}
+        self.bm25: Optional[BM25Index] = None
+        # id -> content hash for every known row, including ones without an embedding.
+        self.hashes: Dict[int, str] = {}
+        self._skipped: Dict[int, str] = {}
+        # Newest version_column value applied so far.
+        self.watermark: Optional[str] = None
+        self.loaded_at: float = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    # ── Loading ───────────────────────────────────────────────────────────────
+
+    def _fields(self, fields: str) -> str:
+        return f"{fields},{self.version_column}" if self.version_column else fields
+
+    def _fetch_rows(self, fields: str, after_id: int = 0, newer_than: Optional[str] = None) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        cursor = after_id
+        while True:
+            query = supabase.table("rag_chunks").select(fields).gt("id", cursor)
+            if newer_than is not None:
+                query = query.gt(self.version_column, newer_than)
+            result = query.order("id").limit(PAGE_SIZE).execute()
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                return rows
+            cursor = page[-1]["id"]
+
+    def _fetch_by_ids(self, ids: List[int]) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        for start in range(0, len(ids), ID_BATCH_SIZE):
+            result = (
+                supabase.table("rag_chunks")
+                .select(self._fields(_ROW_FIELDS))
+                .in_("id", ids[start:start + ID_BATCH_SIZE])
+                .order("id")
+                .execute()
+            )
+            rows.extend(result.data or [])
+        return rows
+
+    def _newest(self, rows: List[Dict[str, Any]], current: Optional[str]) -> Optional[str]:
+        if not self.version_column:
+            return None
+        versions = [str(v) for v in (row.get(self.version_column) for row in rows) if v is not None]
+        if current is not None:
+            versions.append(current)
+        return max(versions, default=None)
+
+    def _disable_version_column(self, exc: Exception) -> bool:
+        """Fall back to content hashes when ``exc`` says the column doesn't exist."""
+        if not self.version_column or self.version_column not in str(exc):
+            return False
+        logger.warning(
+            "[RAG_INDEX] rag_chunks.%s is missing; comparing content hashes instead: %s",
+            self.version_column, exc,
+        )
+        self.version_column = ""
+        self.watermark = None
+        return True
+
+    def _changes(self, full: bool) -> Tuple[List[Dict[str, Any]], Set[int], Optional[str]]:
+        """(rows to (re)load, local ids to drop, new watermark)."""
+        if full:
+            rows = self._fetch_rows(self._fields(_ROW_FIELDS))
+            return rows, set(), self._newest(rows, None)
+
+        with self._lock:
+            local = dict(self.hashes)
+            watermark = self.watermark
+        if watermark is not None:
+            # Changed rows come with their embeddings in one query; deletions
+            # and rows inserted with an older version need the id list.
+            changed = self._fetch_rows(self._fields(_ROW_FIELDS), newer_than=watermark)
+            remote_ids = {int(row["id"]) for row in self._fetch_rows("id")}
+            changed_ids = {int(row["id"]) for row in changed}
+            missing = sorted(remote_ids - set(local) - changed_ids)
+            rows = changed + self._fetch_by_ids(missing)
+            dropped = (set(local) - remote_ids) | (changed_ids & set(local))
+            return rows, dropped, self._newest(rows, watermark)
+
+        scanned = self._fetch_rows(self._fields("id,content"))
+        remote = {int(row["id"]): _content_hash(row.get("content")) for row in scanned}
+        dropped = {i for i, h in local.items() if remote.get(i) != h}
+        rows = self._fetch_by_ids(sorted(i for i, h in remote.items() if local.get(i) != h))
+        return rows, dropped, self._newest(scanned, None)
+
+    def _apply(self, rows: List[Dict[str, Any]], replace: bool, drop: Set[int] = frozenset()) -> int:
+        vectors, meta = [], []
+        skipped: Dict[int, str] = {}
+        for row in rows:
+            emb = _parse_embedding(row.get("embedding"))
+            if emb is None:
+                if row.get("id") is not None:
+                    skipped[int(row["id"])] = _content_hash(row.get("content"))
+                continue
+            vectors.append(emb)
+            meta.append({k: row.get(k) for k in _META_FIELDS})
+
+        if not vectors and not drop and not replace and self.matrix is not None:
+            with self._lock:
+                # Nothing to index; remember embedding-less rows so they aren't re-fetched.
+                self._skipped.update(skipped)
+                self.hashes.update(skipped)
+                self.loaded_at = time.time()
+            return 0
+
+        with self._lock:
+            if replace or self.matrix is None:
+                base_matrix = np.zeros((0, len(vectors[0]) if vectors else 0), dtype=np.float32)
+                base_meta: List[Dict[str, Any]] = []
+                base_skipped: Dict[int, str] = {}
+            else:
+                base_matrix, base_meta = self.matrix, self.meta
+                base_skipped = {i: h for i, h in self._skipped.items() if i not in drop}
+        if drop and base_meta:
+            # Deleted and edited rows; edited ones come back in ``rows``.
+            keep = [i for i, m in enumerate(base_meta) if int(m["id"]) not in drop]
+            base_matrix = np.asarray(base_matrix[keep], dtype=np.float32)
+            base_meta = [base_meta[i] for i in keep]
+        if vectors:
+            new_block = np.asarray(vectors, dtype=np.float32)
+            matrix = np.vstack([base_matrix, new_block]) if len(base_meta) else new_block
+        else:
+            matrix = base_matrix
+        self._swap(matrix, base_meta + meta, {**base_skipped, **skipped})
+        return len(vectors)
+
+    def _swap(self, matrix: np.ndarray, meta: List[Dict[str, Any]], skipped: Optional[Dict[int, str]] = None) -> None:
+        # Derived structures are built outside the lock so searches keep
+        # using the previous generation until the swap.
+        by_category: Dict[str, List[int]] = {}
+        for i, m in enumerate(meta):
+            by_category.setdefault(m.get("category") or "", []).append(i)
+        bm25 = BM25Index([m.get("content") or "" for m in meta])
+        hashes = {int(m["id"]): _content_hash(m.get("content")) for m in meta if m.get("id") is not None}
+        hashes.update(skipped or {})
+        with self._lock:
+            self.matrix = matrix
+            self.meta = meta
+            self.by_category = {k: np.asarray(v, dtype=np.int64) for k, v in by_category.items()}
+            self.bm25 = bm25
+            self.hashes = hashes
+            self._skipped = dict(skipped or {})
+            self.loaded_at = time.time()
+
+    def refresh(self) -> None:
+        """
+        Sync with rag_chunks. The first load pulls everything; later refreshes
+        only download new or edited rows (see _changes) and drop deleted ones.
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            return  # a refresh is already running
+        try:
+            started = time.perf_counter()
+            full = self.matrix is None
+            try:
+                rows, dropped, watermark = self._changes(full)
+            except Exception as exc:
+                if not self._disable_version_column(exc):
+                    raise
+                rows, dropped, watermark = self._changes(full)
+            added = self._apply(rows, replace=full, drop=dropped)
+            self.watermark = watermark
+            if added or dropped or full:
+                self._save_snapshot()
+            logger.info(
+                "[RAG_INDEX] %s refresh: +%d/-%d rows, %d total, %.0fms",
+                "Full" if full else "Incremental", added, len(dropped), len(self.meta),
+                (time.perf_counter() - started) * 1000,
+            )
+        except Exception as exc:
+            logger.warning("[RAG_INDEX] Refresh failed: %s", exc)
+        finally:
+            self._refresh_lock.release()
+
+    # ── Snapshot ──────────────────────────────────────────────────────────────
+
+    def _snapshot_paths(self):
+        return (
+            os.path.join(self.snapshot_dir, "rag_chunks.npy"),
+            os.path.join(self.snapshot_dir, "rag_chunks.meta.json"),
+        )
+
+    def _save_snapshot(self) -> None:
+        if not self.snapshot_dir or self.matrix is None:
+            return
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        matrix_path, meta_path = self._snapshot_paths()
+        with self._lock:
+            matrix, meta = self.matrix, self.meta
+        np.save(matrix_path + ".tmp.npy", matrix)
+        os.replace(matrix_path + ".tmp.npy", matrix_path)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def load_snapshot(self) -> bool:
+        if not self.snapshot_dir:
+            return False
+        matrix_path, meta_path = self._snapshot_paths()
+        if not (os.path.exists(matrix_path) and os.path.exists(meta_path)):
+            return False
+        try:
+            matrix = np.load(matrix_path, mmap_mode="r")
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if matrix.shape[0] != len(meta):
+                return False
+            self._swap(matrix, meta)
+            # Edits since the snapshot are found by one content-hash comparison.
+            self.watermark = None
+            # Snapshot age counts toward staleness until the first refresh.
+            self.loaded_at = os.path.getmtime(meta_path)
+            logger.info("[RAG_INDEX] Loaded snapshot with %d rows", len(meta))
+            return True
+        except Exception as exc:
+            logger.warning("[RAG_INDEX] Snapshot load failed: %s", exc)
+            return False
+
+    # ── Background refresh ────────────────────────────────────────────────────
+
+    def start_background_refresh(self, interval: float = RAG_INDEX_REFRESH_S) -> None:
+        if self._thread is not None:
+            return
+
+        def _loop():
+            self.load_snapshot()
+            while True:
+                self.refresh()
+                time.sleep(interval)
+
+        self._thread = threading.Thread(target=_loop, name="rag-index-refresh", daemon=True)
+        self._thread.start()
+
+    # ── Query ─────────────────────────────────────────────────────────────────
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.matrix is not None and time.time() - self.loaded_at <= RAG_INDEX_MAX_STALENESS_S
+
+    def snapshot(self):
+        """(matrix, meta, bm25, by_category) of the current generation, or Nones if stale."""
+        with self._lock:
+            state = (self.matrix, self.meta, self.bm25, self.by_category)
+        if state[0] is None or not state[1] or not self.is_fresh:
+            return None, [], None, {}
+        return state
+
+    def search(
+        self,
+        query_embedding: List[float],
+        category: Optional[str],
+        limit: int,
+        with_rows: bool = False,
+        state=None,
+    ) -> Optional[List[Any]]:
+        """
+        Top-`limit` chunks by dot product, optionally within one category.
+        Returns None if the replica can't answer (caller should use the RPC).
+        With ``with_rows`` the result is [(row, score)] against ``state`` (a
+        snapshot() taken by the caller, so row numbers stay consistent).
+        """
+        matrix, meta, _, by_category = state or self.snapshot()
+        if matrix is None:
+            return None
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if query.shape[0] != matrix.shape[1]:
+            return None
+
+        if category:
+            rows = by_category.get(category)
+            if rows is None:
+                return []
+            scores = matrix[rows] @ query
+        else:
+            rows = None
+            scores = matrix @ query
+
+        k = min(limit, scores.shape[0])
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for i in top:
+            row = int(rows[i]) if rows is not None else int(i)
+            if with_rows:
+                results.append((row, float(scores[i])))
+            else:
+                results.append({**meta[row], "similarity": float(scores[i])})
+        return results
+
+
+_rag_index: Optional[RagChunkIndex] = None
+
+
+def get_rag_index() -> Optional[RagChunkIndex]:
+    """Process-wide replica, or None when RAG_LOCAL_INDEX=0."""
+    global _rag_index
+    if not RAG_LOCAL_INDEX:
+        return None
+    if _rag_index is None:
+        _rag_index = RagChunkIndex()
+    return _rag_index
@@ -0,0 +1,97 @@
+# bench_embedding_batcher.py
+# Run from your backend root:
+#   python -m scripts.bench_embedding_batcher                 # simulated model, no deps
+#   python -m scripts.bench_embedding_batcher --backend local  # SentenceTransformer
+#   python -m scripts.bench_embedding_batcher --backend gemini --requests 4
+#
+# Compares direct per-call embedding with MicroBatcher at 1, 8 and 64
+# concurrent callers and prints embeddings/second for each.
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.services.embedding_batcher import MicroBatcher
+
+CONCURRENCY_LEVELS = (1, 8, 64)
+
+
+def _simulated_backend(call_overhead_ms: float, per_item_ms: float) -> Callable[[List[str]], List[List[float]]]:
+    # Fixed cost per call (tokenizer/forward-pass setup, round trip) plus a small
+    # per-item cost. The lock models one shared model instance: calls don't overlap.
+    lock = threading.Lock()
+
+    def encode(texts: List[str]) -> List[List[float]]:
+        with lock:
+            time.sleep((call_overhead_ms + per_item_ms * len(texts)) / 1000.0)
+        return [[float(len(t))] * 8 for t in texts]
+    return encode
+
+
+def _local_backend() -> Callable[[List[str]], List[List[float]]]:
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+    return lambda texts: [v.tolist() for v in model.encode(texts, normalize_embeddings=True)]
+
+
+def _gemini_backend() -> Callable[[List[str]], List[List[float]]]:
+    from app.services.embedding import embed_texts
+
+    return embed_texts
+
+
+def _run(callers: int, requests_per_caller: int, embed_one: Callable[[str], List[float]]) -> float:
+    def caller(idx: int) -> None:
+        for j in range(requests_per_caller):
+            embed_one(f"caller {idx} query {j}: python sql machine learning resume bullet")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        list(pool.map(caller, range(callers)))
+    elapsed = time.perf_counter() - started
+    return callers * requests_per_caller / elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Embedding micro-batching throughput benchmark.")
+    parser.add_argument("--backend", choices=["simulated", "local", "gemini"], default="simulated")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per caller")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--call-overhead-ms", type=float, default=8.0, help="Simulated backend only")
+    parser.add_argument("--per-item-ms", type=float, default=0.3, help="Simulated backend only")
+    args = parser.parse_args()
+
+    if args.backend == "local":
+        batch_fn = _local_backend()
+    elif args.backend == "gemini":
+        batch_fn = _gemini_backend()
+    else:
+        batch_fn = _simulated_backend(args.call_overhead_ms, args.per_item_ms)
+
+    batch_fn(["warmup"])
+
+    print(f"backend={args.backend} max_batch={args.max_batch} max_wait_ms={args.max_wait_ms}")
+    print(f"{'callers':>8} {'direct/s':>12} {'batched/s':>12} {'speedup':>8} {'avg batch':>10}")
+    for callers in CONCURRENCY_LEVELS:
+        direct = _run(callers, args.requests, lambda text: batch_fn([text])[0])
+
+        batcher = MicroBatcher("bench", batch_fn, args.max_batch, args.max_wait_ms)
+        batched = _run(callers, args.requests, batcher.embed)
+
+        print(
+            f"{callers:>8} {direct:>12.1f} {batched:>12.1f} "
+            f"{batched / direct:>7.2f}x {batcher.stats()['avg_batch_size']:>10}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+# bench_job_fetch.py
+# Run from your backend root:
+#   python -m scripts.bench_job_fetch                          # synthetic postings
+#   python -m scripts.bench_job_fetch --file jobs.jsonl --requests 200 --latency-ms 400
+#
+# Simulates users refreshing popular job searches against a FileJobSource
+# with artificial API latency, and compares:
+#   - baseline: pages fetched one after another, no cache (old behaviour
+#     with num_pages > 1)
+#   - client:   CachedJobClient (concurrent pages, per-page TTL cache,
+#     shared in-flight requests)
+# Reports API calls (quota) and wall time for the same request mix.
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.cache import SQLiteKV
+from app.services.job_sources import CachedJobClient, FileJobSource
+
+ROLES = ["Data Engineer", "Frontend Developer", "Backend Developer", "ML Engineer",
+         "DevOps Engineer", "Product Designer", "Data Analyst", "Mobile Developer"]
+CITIES = ["Berlin", "London", "Bangalore", "Toronto"]
+
+
+def _synthetic_file(path: str, per_pair: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        i = 0
+        for role in ROLES:
+            for city in CITIES:
+                for _ in range(per_pair):
+                    f.write(json.dumps({
+                        "job_id": f"job-{i}", "job_title": role, "job_city": city,
+                        "employer_name": f"Company {i % 97}", "job_description": f"{role} role",
+                    }) + "\n")
+                    i += 1
+
+
+def _request_mix(n: int, seed: int):
+    # Zipf-like popularity: a few searches dominate.
+    rng = random.Random(seed)
+    pairs = [(r, c) for r in ROLES for c in CITIES]
+    weights = [1.0 / (rank + 1) for rank in range(len(pairs))]
+    return rng.choices(pairs, weights=weights, k=n)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Job fetching benchmark.")
+    parser.add_argument("--file", default=None, help="JSON/JSONL postings (default: synthetic)")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--users", type=int, default=16, help="Concurrent callers")
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if path is None:
+            path = os.path.join(tmp, "jobs.jsonl")
+            _synthetic_file(path, per_pair=35)
+        mix = _request_mix(args.requests, args.seed)
+
+        baseline_source = FileJobSource(path, latency_ms=args.latency_ms)
+        baseline_calls = 0
+
+        def baseline(pair):
+            nonlocal baseline_calls
+            for page in range(1, args.pages + 1):
+                baseline_calls += 1
+                if len(baseline_source.fetch_page(pair[0], pair[1], page)["jobs"]) < 10:
+                    break
+
+        client = CachedJobClient(
+            FileJobSource(path, latency_ms=args.latency_ms),
+            store=SQLiteKV("bench_job_pages", path=os.path.join(tmp, "cache.sqlite")),
+        )
+
+        results = {}
+        for name, fn in (("baseline", baseline), ("client", lambda p: client.fetch(p[0], p[1], args.pages))):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.users) as pool:
+                list(pool.map(fn, mix))
+            results[name] = time.perf_counter() - started
+
+    stats = client.stats()
+    print(f"requests={args.requests} users={args.users} pages={args.pages} latency_ms={args.latency_ms}")
+    print(f"{'mode':>10} {'api calls':>10} {'wall s':>8}")
+    print(f"{'baseline':>10} {baseline_calls:>10} {results['baseline']:>8.2f}")
+    print(f"{'client':>10} {stats['api_calls']:>10} {results['client']:>8.2f}")
+    print(f"client cache hits={stats['cache_hits']} shared in-flight={stats['shared']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+# bench_job_ranking.py
+# Run from your backend root:
+#   python -m scripts.bench_job_ranking
+#   python -m scripts.bench_job_ranking --repeats 50 --vocab 800
+#
+# Re-ranking cost for 100, 1k and 10k match_jobs candidates:
+#   - legacy: the previous per-job Python loop (json.loads, set lookups,
+#     substring title boost, full sort)
+#   - cold:   JobRanker with an empty per-job skill cache
+#   - warm:   JobRanker on a repeated pool (skill ids cached per job id)
+
+import argparse
+import json
+import random
+import time
+from typing import Dict, List
+
+from app.services.job_ranking import JobRanker
+
+CANDIDATE_COUNTS = (100, 1_000, 10_000)
+
+
+def _legacy_rank(candidates: List[Dict], user_skills: List[str], role_query: str, match_count: int) -> List[Dict]:
+    user_skills_lower = {s.lower() for s in user_skills}
+    role_query_lower = role_query.lower().strip()
+    matched = []
+    for job in candidates:
+        job_skills = job.get("required_skills", [])
+        if isinstance(job_skills, str):
+            job_skills = json.loads(job_skills)
+        matching = [s for s in job_skills if s.lower() in user_skills_lower]
+        missing = [s for s in job_skills if s.lower() not in user_skills_lower]
+        match_pct = (len(matching) / len(job_skills) * 100) if job_skills else 0
+        title_boost = 0.15 if role_query_lower and role_query_lower in (job.get("title") or "").lower() else 0.0
+        matched.append({
+            "id": job["id"],
+            "similarity": round(min(job.get("similarity", 0) + title_boost, 1.0) * 100, 1),
+            "matching_skills": matching,
+            "missing_skills": missing,
+            "match_percentage": round(match_pct, 1),
+        })
+    matched.sort(key=lambda j: j["similarity"], reverse=True)
+    return matched[:match_count]
+
+
+def _candidates(n: int, vocab: List[str], rng: random.Random) -> List[Dict]:
+    titles = ["Data Engineer", "Backend Developer", "ML Engineer", "Frontend Developer"]
+    return [
+        {
+            "id": i,
+            "title": rng.choice(titles),
+            # PostgREST returns jsonb arrays as strings in some setups
+            "required_skills": json.dumps(rng.sample(vocab, rng.randint(4, 15))),
+            "similarity": rng.random(),
+        }
+        for i in range(n)
+    ]
+
+
+def _time(fn, repeats: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - started) / repeats * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Job re-ranking benchmark.")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--vocab", type=int, default=500, help="Distinct skills in the pool")
+    parser.add_argument("--match-count", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocab = [f"Skill {i}" for i in range(args.vocab)]
+    user_skills = rng.sample(vocab, 20)
+    role = "data engineer"
+
+    print(f"{'candidates':>10} {'legacy ms':>10} {'cold ms':>9} {'warm ms':>9} {'speedup':>8}")
+    for n in CANDIDATE_COUNTS:
+        pool = _candidates(n, vocab, rng)
+        legacy = _time(lambda: _legacy_rank(pool, user_skills, role, args.match_count), args.repeats)
+        cold = _time(lambda: JobRanker().rank(pool, user_skills, role, args.match_count), max(1, args.repeats // 4))
+        ranker = JobRanker()
+        ranker.rank(pool, user_skills, role, args.match_count)
+        warm = _time(lambda: ranker.rank(pool, user_skills, role, args.match_count), args.repeats)
+        print(f"{n:>10} {legacy:>10.2f} {cold:>9.2f} {warm:>9.2f} {legacy / warm:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
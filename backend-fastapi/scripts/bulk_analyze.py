@@ -0,0 +1,64 @@
+# bulk_analyze.py
+# Run from your backend root:
+#   python -m scripts.bulk_analyze resumes/ --role "Software Engineer" > results.ndjson
+#   python -m scripts.bulk_analyze cohort.zip --role "Data Scientist" --jd jd.txt --workers 8
+
+import argparse
+import json
+import sys
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.services.bulk_analysis import (
+    DEFAULT_LLM_CONCURRENCY,
+    DEFAULT_WORKERS,
+    iter_resume_files,
+    run_bulk_analysis,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Score a cohort of resumes against one target role.")
+    parser.add_argument("source", help="Directory or .zip archive of PDF/TXT resumes")
+    parser.add_argument("--role", default="", help="Target role, e.g. 'Software Engineer'")
+    parser.add_argument("--jd", default=None, help="Optional path to a job description text file")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=DEFAULT_LLM_CONCURRENCY,
+        help="Max concurrent section-classification LLM calls across all workers",
+    )
+    parser.add_argument("--no-llm", action="store_true", help="Keyword-only section parsing")
+    args = parser.parse_args()
+
+    job_description = ""
+    if args.jd:
+        with open(args.jd, "r", encoding="utf-8") as f:
+            job_description = f.read()
+
+    try:
+        files = iter_resume_files(args.source)
+        records = run_bulk_analysis(
+            files,
+            target_role=args.role,
+            job_description=job_description,
+            workers=args.workers,
+            llm_concurrency=0 if args.no_llm else args.llm_concurrency,
+        )
+        for record in records:
+            line = json.dumps(record, ensure_ascii=False)
+            print(line, flush=True)
+            if record.get("event") == "summary":
+                print(line, file=sys.stderr)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,133 @@
+# compare_chunkers.py
+# Run from your backend root:
+#   python -m scripts.compare_chunkers corpus.jsonl
+#   python -m scripts.compare_chunkers corpus.jsonl --queries queries.jsonl --top-k 8
+#
+# Compares the fixed 1800-char splitter with the sentence-aware token chunker:
+#   - chunk count and tokens per chunk (index size)
+#   - retrieval quality, if --queries is given: JSONL of {"query", "parent_id"}
+#     where parent_id is the post that should be retrieved (hit@1, hit@k, MRR)
+#   - downstream prompt tokens: the knowledge block built the same way as
+#     _llm_rag_evaluation (top-k chunks, 700-char snippets) vs. whole chunks
+
+import argparse
+import json
+import statistics
+from typing import Dict, List
+
+import numpy as np
+
+from app.services.chunking import estimate_tokens
+from scripts.ingest_rag import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_OVERLAP,
+    EMBEDDING_MODEL,
+    make_chunker,
+    read_csv,
+    read_jsonl,
+    validate_posts,
+)
+
+SNIPPET_CHARS = 700  # _llm_rag_evaluation truncation
+
+
+def _build_chunks(posts, chunker) -> List[Dict]:
+    rows = []
+    for post in posts:
+        for chunk in chunker(post.content):
+            rows.append({"parent_id": post.parent_id, "title": post.title, "content": chunk})
+    return rows
+
+
+def _size_stats(rows: List[Dict]) -> Dict:
+    tokens = sorted(estimate_tokens(r["content"]) for r in rows)
+    return {
+        "chunks": len(rows),
+        "mean_tokens": round(statistics.mean(tokens), 1) if tokens else 0,
+        "p95_tokens": tokens[int(len(tokens) * 0.95) - 1] if tokens else 0,
+        "total_tokens": sum(tokens),
+    }
+
+
+def _prompt_tokens(chunks: List[Dict], truncate: bool) -> int:
+    lines = []
+    for i, chunk in enumerate(chunks, start=1):
+        content = chunk["content"][:SNIPPET_CHARS] if truncate else chunk["content"]
+        lines.append(f"[{i}] {chunk['title'] or 'Untitled'}: {content}")
+    return estimate_tokens("\n".join(lines))
+
+
+def _retrieval_stats(model, rows: List[Dict], queries: List[Dict], top_k: int) -> Dict:
+    matrix = model.encode([r["content"] for r in rows], batch_size=256, normalize_embeddings=True)
+    q_vecs = model.encode([q["query"] for q in queries], normalize_embeddings=True)
+    hit1 = hitk = 0
+    rr = []
+    prompt_snip, prompt_full = [], []
+    for q, vec in zip(queries, q_vecs):
+        order = np.argsort(-(matrix @ vec))[:top_k]
+        top = [rows[i] for i in order]
+        ranks = [i for i, r in enumerate(top, start=1) if r["parent_id"] == q["parent_id"]]
+        if ranks:
+            hitk += 1
+            hit1 += ranks[0] == 1
+            rr.append(1.0 / ranks[0])
+        else:
+            rr.append(0.0)
+        prompt_snip.append(_prompt_tokens(top, truncate=True))
+        prompt_full.append(_prompt_tokens(top, truncate=False))
+    n = len(queries)
+    return {
+        "hit@1": round(hit1 / n, 3),
+        f"hit@{top_k}": round(hitk / n, 3),
+        "mrr": round(sum(rr) / n, 3),
+        "prompt_tokens_snippets": round(statistics.mean(prompt_snip)),
+        "prompt_tokens_full": round(statistics.mean(prompt_full)),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare RAG chunkers.")
+    parser.add_argument("corpus", help=".csv or .jsonl posts (same format as ingest_rag)")
+    parser.add_argument("--queries", default=None, help="JSONL of {query, parent_id}")
+    parser.add_argument("--top-k", type=int, default=8)
+    parser.add_argument("--max-tokens", type=int, default=None)
+    parser.add_argument("--overlap-tokens", type=int, default=None)
+    args = parser.parse_args()
+
+    reader = read_csv if args.corpus.lower().endswith(".csv") else read_jsonl
+    posts = list(validate_posts(reader(args.corpus)))
+
+    token_params = {}
+    if args.max_tokens:
+        token_params["max_tokens"] = args.max_tokens
+    if args.overlap_tokens is not None:
+        token_params["overlap_tokens"] = args.overlap_tokens
+
+    chunkers = {
+        f"chars ({DEFAULT_CHUNK_SIZE}/{DEFAULT_OVERLAP})": make_chunker("chars"),
+        "tokens": make_chunker("tokens", **token_params),
+    }
+    results = {name: {"rows": _build_chunks(posts, fn)} for name, fn in chunkers.items()}
+    for res in results.values():
+        res.update(_size_stats(res["rows"]))
+
+    if args.queries:
+        from sentence_transformers import SentenceTransformer
+
+        with open(args.queries, "r", encoding="utf-8") as f:
+            queries = [json.loads(line) for line in f if line.strip()]
+        model = SentenceTransformer(EMBEDDING_MODEL)
+        for res in results.values():
+            res.update(_retrieval_stats(model, res["rows"], queries, args.top_k))
+
+    columns = [c for c in next(iter(results.values())) if c != "rows"]
+    print(f"# Chunker comparison ({len(posts)} posts)\n")
+    print("| chunker | " + " | ".join(columns) + " |")
+    print("|---" * (len(columns) + 1) + "|")
+    for name, res in results.items():
+        print(f"| {name} | " + " | ".join(str(res[c]) for c in columns) + " |")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+# eval_jd_skills.py
+# Run from your backend root:
+#   python -m scripts.eval_jd_skills --from-db 200           # stored LLM skills as reference
+#   python -m scripts.eval_jd_skills --jsonl postings.jsonl  # {"description", "skills"?}
+#   python -m scripts.eval_jd_skills --jsonl postings.jsonl --llm   # re-run the LLM for reference
+#
+# Precision/recall of the ontology extractor (jd_skills.py) against LLM
+# extraction, compared on canonical skill names:
+#   - overall recall, and recall on reference skills the ontology knows
+#     (the ceiling the matcher can reach without the fallback)
+#   - how often the low-coverage LLM fallback would fire
+#   - extraction latency per posting
+#   - the most common false positives / negatives, for tuning aliases
+
+import argparse
+import json
+import statistics
+import time
+from collections import Counter
+from typing import Dict, List
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.services.jd_skills import get_jd_skill_extractor
+
+
+def _load_jsonl(path: str) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _load_db(limit: int) -> List[Dict]:
+    from supabase_client import supabase
+
+    result = (
+        supabase.table("job_postings")
+        .select("description,required_skills")
+        .limit(limit)
+        .execute()
+    )
+    return [
+        {"description": r.get("description") or "", "skills": r.get("required_skills") or []}
+        for r in result.data or []
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Evaluate JD skill extraction against LLM output.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--jsonl", help="JSONL of {description, skills?}")
+    source.add_argument("--from-db", type=int, metavar="N", help="Sample N rows from job_postings")
+    parser.add_argument("--llm", action="store_true", help="Recompute reference skills with the LLM")
+    parser.add_argument("--top", type=int, default=15, help="Show N most common FP/FN")
+    args = parser.parse_args()
+
+    postings = _load_jsonl(args.jsonl) if args.jsonl else _load_db(args.from_db)
+    if args.llm:
+        from app.services.job_search import _llm_extract_skills_from_description
+
+        for p in postings:
+            p["skills"] = _llm_extract_skills_from_description(p["description"])
+    postings = [p for p in postings if p.get("skills")]
+    if not postings:
+        print("No postings with reference skills.")
+        return 1
+
+    extractor = get_jd_skill_extractor()
+    known = extractor.known_skills()
+
+    tp = fp = fn = fn_known = 0
+    fallback = 0
+    latencies = []
+    false_pos: Counter = Counter()
+    false_neg: Counter = Counter()
+    for p in postings:
+        started = time.perf_counter()
+        predicted = extractor.extract(p["description"])
+        latencies.append((time.perf_counter() - started) * 1000)
+        fallback += extractor.is_low_coverage(p["description"], predicted)
+
+        pred = {s.lower() for s in predicted}
+        ref = {extractor.to_canonical(s).lower() for s in p["skills"]}
+        tp += len(pred & ref)
+        fp += len(pred - ref)
+        fn += len(ref - pred)
+        fn_known += len((ref - pred) & known)
+        false_pos.update(pred - ref)
+        false_neg.update(ref - pred)
+
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    known_recall = tp / (tp + fn_known) if tp + fn_known else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    latencies.sort()
+
+    print(f"# JD skill extraction vs LLM ({len(postings)} postings)\n")
+    print("| metric | value |")
+    print("|---|---|")
+    print(f"| precision | {precision:.3f} |")
+    print(f"| recall | {recall:.3f} |")
+    print(f"| recall (ontology skills) | {known_recall:.3f} |")
+    print(f"| f1 | {f1:.3f} |")
+    print(f"| llm fallback rate | {fallback / len(postings):.3f} |")
+    print(f"| mean ms / posting | {statistics.mean(latencies):.3f} |")
+    print(f"| p95 ms / posting | {latencies[max(0, int(len(latencies) * 0.95) - 1)]:.3f} |")
+    print(f"\nTop false positives: {false_pos.most_common(args.top)}")
+    print(f"Top false negatives: {false_neg.most_common(args.top)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,13 @@
+import argparse
 import csv
+import hashlib
 import json
 import os
 import sys
+import time
 from dataclasses import dataclass
-from typing import Iterable, List, Optional
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
 
 from sentence_transformers import SentenceTransformer
 from supabase import create_client
@@ -12,11 +16,22 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.chunking import (
+    DEFAULT_MAX_TOKENS,
+    DEFAULT_OVERLAP_TOKENS,
+    chunk_by_tokens,
+)
+
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL") or "sentence-transformers/all-MiniLM-L6-v2"
-EMBEDDING_DIM = 384
 DEFAULT_CATEGORY = "general"
-DEFAULT_CHUNK_SIZE = 1800  # chars
-DEFAULT_OVERLAP = 200      # chars
+DEFAULT_CHUNKER = "tokens"  # "tokens" (sentence-aware) | "chars" (fixed windows)
+DEFAULT_CHUNK_SIZE = 1800  # chars, --chunker chars only
+DEFAULT_OVERLAP = 200      # chars, --chunker chars only
+DEFAULT_ENCODE_BATCH = 256  # chunks per model.encode call
+DEFAULT_INSERT_BATCH = 500  # rows per supabase insert
+INSERT_RETRIES = 3
 
 
 @dataclass
@@ -27,6 +42,20 @@ class Post:
     content: str
 
 
+def make_chunker(kind: str, **params) -> Callable[[str], List[str]]:
+    if kind == "chars":
+        return lambda text: chunk_text(
+            text,
+            params.get("chunk_size", DEFAULT_CHUNK_SIZE),
+            params.get("overlap", DEFAULT_OVERLAP),
+        )
+    return lambda text: chunk_by_tokens(
+        text,
+        params.get("max_tokens", DEFAULT_MAX_TOKENS),
+        params.get("overlap_tokens", DEFAULT_OVERLAP_TOKENS),
+    )
+
+
 def chunk_text(text: str, chunk_size: int, overlap: int) -> List[str]:
     if not text:
         return []
@@ -41,51 +70,48 @@ def chunk_text(text: str, chunk_size: int, overlap: int) -> List[str]:
     return [c for c in chunks if c]
 
 
-def embed_texts(model: SentenceTransformer, texts: List[str]) -> List[List[float]]:
-    if not texts:
-        return []
-    vectors = model.encode(texts, normalize_embeddings=True)
-    return [v.tolist() for v in vectors]
-
-
 def insert_chunks(sb, chunks: List[dict]) -> None:
     if not chunks:
         return
-    sb.table("rag_chunks").insert(chunks).execute()
+    for attempt in range(1, INSERT_RETRIES + 1):
+        try:
+            sb.table("rag_chunks").insert(chunks).execute()
+            return
+        except Exception as e:
+            if attempt == INSERT_RETRIES:
+                raise
+            print(f"Insert of {len(chunks)} rows failed ({e}); retrying in {2 ** attempt}s")
+            time.sleep(2 ** attempt)
 
 
-def read_csv(path: str) -> List[Post]:
-    posts: List[Post] = []
-    with open(path, "r", encoding="utf-8") as f:
+def content_hash(text: str) -> str:
+    return hashlib.sha1(" ".join(text.split()).lower().encode("utf-8")).hexdigest()
+
+
+def read_csv(path: str) -> Iterator[Post]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
         reader = csv.DictReader(f)
         for row in reader:
-            posts.append(
-                Post(
-                    parent_id=row.get("parent_id", "").strip(),
-                    category=row.get("category", DEFAULT_CATEGORY).strip() or DEFAULT_CATEGORY,
-                    title=(row.get("title") or "").strip(),
-                    content=(row.get("content") or "").strip(),
-                )
+            yield Post(
+                parent_id=(row.get("parent_id") or "").strip(),
+                category=(row.get("category") or DEFAULT_CATEGORY).strip() or DEFAULT_CATEGORY,
+                title=(row.get("title") or "").strip(),
+                content=(row.get("content") or "").strip(),
             )
-    return posts
 
 
-def read_jsonl(path: str) -> List[Post]:
-    posts: List[Post] = []
+def read_jsonl(path: str) -> Iterator[Post]:
     with open(path, "r", encoding="utf-8") as f:
         for line in f:
             if not line.strip():
                 continue
             obj = json.loads(line)
-            posts.append(
-                Post(
-                    parent_id=str(obj.get("parent_id", "")).strip(),
-                    category=str(obj.get("category", DEFAULT_CATEGORY)).strip() or DEFAULT_CATEGORY,
-                    title=str(obj.get("title", "")).strip(),
-                    content=str(obj.get("content", "")).strip(),
-                )
+            yield Post(
+                parent_id=str(obj.get("parent_id", "")).strip(),
+                category=str(obj.get("category", DEFAULT_CATEGORY)).strip() or DEFAULT_CATEGORY,
+                title=str(obj.get("title", "")).strip(),
+                content=str(obj.get("content", "")).strip(),
             )
-    return posts
 
 
 def read_interactive() -> List[Post]:
@@ -110,8 +136,7 @@ def read_interactive() -> List[Post]:
     return posts
 
 
-def validate_posts(posts: Iterable[Post]) -> List[Post]:
-    valid: List[Post] = []
+def validate_posts(posts: Iterable[Post]) -> Iterator[Post]:
     for p in posts:
         if not p.parent_id:
             print("Skipping post with empty parent_id")
@@ -119,61 +144,206 @@ def validate_posts(posts: Iterable[Post]) -> List[Post]:
         if not p.content:
             print(f"Skipping {p.parent_id} (empty content)")
             continue
-        valid.append(p)
-    return valid
+        yield p
+
+
+class Checkpoint:
+    """
+    Append-only log of content hashes that are safely in rag_chunks.
+    Re-running with the same checkpoint skips every chunk already inserted,
+    so a crash mid-corpus resumes where it stopped and re-runs are idempotent.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.hashes: Set[str] = set()
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.hashes.update(line.strip() for line in f if line.strip())
+            print(f"Resuming from {path}: {len(self.hashes)} chunks already ingested")
+
+    def commit(self, hashes: List[str]) -> None:
+        self.hashes.update(hashes)
+        if not self.path:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(h + "\n" for h in hashes))
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def load_remote_hashes(sb, page_size: int = 1000) -> Set[str]:
+    """Hash content already in rag_chunks (for runs without a checkpoint)."""
+    hashes: Set[str] = set()
+    start = 0
+    while True:
+        result = (
+            sb.table("rag_chunks")
+            .select("content")
+            .order("id")
+            .range(start, start + page_size - 1)
+            .execute()
+        )
+        rows = result.data or []
+        hashes.update(content_hash(r.get("content") or "") for r in rows)
+        if len(rows) < page_size:
+            return hashes
+        start += page_size
+
+
+class Ingestor:
+    """Chunk → dedupe → batched encode → bulk insert, with throughput reporting."""
+
+    def __init__(
+        self,
+        model: SentenceTransformer,
+        sb,
+        checkpoint: Checkpoint,
+        chunker: Callable[[str], List[str]],
+        encode_batch: int,
+        insert_batch: int,
+    ):
+        self.model = model
+        self.sb = sb
+        self.checkpoint = checkpoint
+        self.chunker = chunker
+        self.encode_batch = encode_batch
+        self.insert_batch = insert_batch
+        self.pending: List[Dict] = []
+        self.pending_hashes: Set[str] = set()
+        self.posts = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.started = time.perf_counter()
+
+    def add(self, post: Post) -> None:
+        self.posts += 1
+        for i, chunk in enumerate(self.chunker(post.content)):
+            h = content_hash(chunk)
+            if h in self.checkpoint.hashes or h in self.pending_hashes:
+                self.duplicates += 1
+                continue
+            self.pending_hashes.add(h)
+            self.pending.append(
+                {
+                    "parent_id": post.parent_id,
+                    "chunk_index": i,
+                    "category": post.category,
+                    "title": post.title,
+                    "content": chunk,
+                    "_hash": h,
+                }
+            )
+        if len(self.pending) >= max(self.encode_batch, self.insert_batch):
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        rows, self.pending = self.pending, []
+        vectors = self.model.encode(
+            [r["content"] for r in rows],
+            batch_size=self.encode_batch,
+            normalize_embeddings=True,
+        )
+        for row, vec in zip(rows, vectors):
+            row["embedding"] = vec.tolist()
+
+        for start in range(0, len(rows), self.insert_batch):
+            batch = rows[start:start + self.insert_batch]
+            hashes = [r.pop("_hash") for r in batch]
+            insert_chunks(self.sb, batch)
+            self.checkpoint.commit(hashes)
+            self.pending_hashes.difference_update(hashes)
+            self.inserted += len(batch)
+        self.report()
+
+    def report(self) -> None:
+        elapsed = time.perf_counter() - self.started
+        rate = self.inserted / elapsed if elapsed > 0 else 0.0
+        print(
+            f"posts={self.posts} inserted={self.inserted} duplicates={self.duplicates} "
+            f"elapsed={elapsed:.1f}s rate={rate:.1f} rows/s"
+        )
 
 
 def main() -> int:
+    parser = argparse.ArgumentParser(description="Ingest posts into rag_chunks.")
+    parser.add_argument("path", nargs="?", help=".csv or .jsonl file (omit for interactive mode)")
+    parser.add_argument("--chunker", choices=["tokens", "chars"], default=DEFAULT_CHUNKER)
+    parser.add_argument("--max-tokens", type=int, default=DEFAULT_MAX_TOKENS)
+    parser.add_argument("--overlap-tokens", type=int, default=DEFAULT_OVERLAP_TOKENS)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--overlap", type=int, default=DEFAULT_OVERLAP)
+    parser.add_argument("--encode-batch", type=int, default=DEFAULT_ENCODE_BATCH)
+    parser.add_argument("--insert-batch", type=int, default=DEFAULT_INSERT_BATCH)
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="Checkpoint file of ingested content hashes (default: <path>.ingest.ckpt)",
+    )
+    parser.add_argument("--reset", action="store_true", help="Ignore and overwrite an existing checkpoint")
+    parser.add_argument(
+        "--dedupe-remote",
+        action="store_true",
+        help="Also skip chunks whose content already exists in rag_chunks",
+    )
+    args = parser.parse_args()
+
     supabase_url = os.getenv("REACT_APP_SUPABASE_URL")
     supabase_key = os.getenv("REACT_APP_SUPABASE_ANON_KEY")
     if not supabase_url or not supabase_key:
         print("Missing SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY env vars")
         return 1
 
-    if len(sys.argv) >= 2:
-        path = sys.argv[1]
-        if path.lower().endswith(".csv"):
-            posts = read_csv(path)
-        elif path.lower().endswith(".jsonl"):
-            posts = read_jsonl(path)
+    if args.path:
+        if args.path.lower().endswith(".csv"):
+            posts: Iterable[Post] = read_csv(args.path)
+        elif args.path.lower().endswith(".jsonl"):
+            posts = read_jsonl(args.path)
         else:
             print("Unsupported file format. Use .csv or .jsonl")
             return 1
     else:
         posts = read_interactive()
 
-    posts = validate_posts(posts)
-    if not posts:
-        print("No valid posts to ingest.")
-        return 0
+    checkpoint_path = args.checkpoint or (f"{args.path}.ingest.ckpt" if args.path else None)
+    if args.reset and checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
 
     model = SentenceTransformer(EMBEDDING_MODEL)
     sb = create_client(supabase_url, supabase_key)
 
-    chunk_size = DEFAULT_CHUNK_SIZE
-    overlap = DEFAULT_OVERLAP
+    checkpoint = Checkpoint(checkpoint_path)
+    if args.dedupe_remote:
+        remote = load_remote_hashes(sb)
+        print(f"Found {len(remote)} existing chunks in rag_chunks")
+        checkpoint.hashes.update(remote)
 
-    total_chunks = 0
-    for p in posts:
-        chunks = chunk_text(p.content, chunk_size, overlap)
-        embeddings = embed_texts(model, chunks)
-        payload = []
-        for i, (chunk, emb) in enumerate(zip(chunks, embeddings)):
-            payload.append(
-                {
-                    "parent_id": p.parent_id,
-                    "chunk_index": i,
-                    "category": p.category,
-                    "title": p.title,
-                    "content": chunk,
-                    "embedding": emb,
-                }
-            )
-        insert_chunks(sb, payload)
-        total_chunks += len(payload)
-        print(f"Inserted {len(payload)} chunks for {p.parent_id}")
+    ingestor = Ingestor(
+        model,
+        sb,
+        checkpoint,
+        chunker=make_chunker(
+            args.chunker,
+            max_tokens=args.max_tokens,
+            overlap_tokens=args.overlap_tokens,
+            chunk_size=args.chunk_size,
+            overlap=args.overlap,
+        ),
+        encode_batch=args.encode_batch,
+        insert_batch=args.insert_batch,
+    )
+    for post in validate_posts(posts):
+        ingestor.add(post)
+    ingestor.flush()
+
+    if ingestor.posts == 0:
+        print("No valid posts to ingest.")
+        return 0
 
-    print(f"Done. Total chunks inserted: {total_chunks}")
+    print(f"Done. Total chunks inserted: {ingestor.inserted} (skipped {ingestor.duplicates} duplicates)")
+    ingestor.report()
     return 0
 
 
@@ -0,0 +1,75 @@
+# refresh_roadmap_snapshot.py
+# Run from your backend root:
+#   python -m scripts.refresh_roadmap_snapshot
+#   python -m scripts.refresh_roadmap_snapshot --ids rust golang --workers 8 --dry-run
+#
+# Re-fetches roadmap.sh metadata (title, description, topic labels) for every
+# roadmap in the bundled snapshot plus every SKILL_TO_ROADMAP_ID target and
+# any --ids, concurrently, and rewrites app/services/data/roadmap_snapshot.json
+# with a new version hash. Roadmaps that fail to fetch keep their previous
+# entry. A new version also invalidates the persistent skill → roadmap-id
+# cache on the next startup.
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from app.agents.study_planner.nodes import SKILL_TO_ROADMAP_ID
+from app.services.roadmap_data import (
+    ROADMAP_SH_BASE,
+    ROADMAP_SNAPSHOT_PATH,
+    fetch_roadmap_metadata,
+    load_snapshot,
+    snapshot_version,
+    write_snapshot,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Refresh the bundled roadmap.sh snapshot.")
+    parser.add_argument("--ids", nargs="*", default=[], help="extra roadmap ids to add")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=15.0)
+    parser.add_argument("--output", default=ROADMAP_SNAPSHOT_PATH)
+    parser.add_argument("--dry-run", action="store_true", help="report changes without writing")
+    args = parser.parse_args()
+
+    current = load_snapshot(args.output)
+    roadmaps = dict(current["roadmaps"])
+    ids = sorted(set(roadmaps) | set(SKILL_TO_ROADMAP_ID.values()) | set(args.ids))
+
+    updated, failed = 0, []
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {executor.submit(fetch_roadmap_metadata, rid, args.timeout): rid for rid in ids}
+        for future in as_completed(futures):
+            rid = futures[future]
+            previous = roadmaps.get(rid) or {"title": "", "description": "", "url": f"{ROADMAP_SH_BASE}/{rid}", "topics": []}
+            try:
+                fetched = future.result()
+            except Exception as exc:
+                fetched = None
+                print(f"  {rid}: {exc}")
+            if not fetched:
+                failed.append(rid)
+                roadmaps[rid] = previous
+                continue
+            # Keep curated fields the API leaves empty.
+            merged = {key: fetched.get(key) or previous.get(key) for key in ("title", "description", "url", "topics")}
+            merged["topics"] = merged["topics"] or []
+            if merged != previous:
+                updated += 1
+            roadmaps[rid] = merged
+
+    version = snapshot_version(roadmaps)
+    print(f"roadmaps: {len(roadmaps)} ({updated} updated, {len(failed)} failed)")
+    print(f"version:  {current['version']} -> {version}")
+    if failed:
+        print(f"failed:   {', '.join(sorted(failed))}")
+    if args.dry_run or version == current["version"]:
+        return 0
+    write_snapshot(roadmaps, args.output)
+    print(f"wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
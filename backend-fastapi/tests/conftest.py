@@ -0,0 +1,37 @@
+"""
+Shared pytest fixtures.
+
+Puts the backend root on sys.path so test modules import ``app`` directly,
+and gives every test its own SQLite cache file.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.cache import SQLiteKV  # noqa: E402
+
+
+@pytest.fixture
+def kv_path(tmp_path):
+    return str(tmp_path / "cache.sqlite")
+
+
+@pytest.fixture
+def make_kv(kv_path):
+    """Factory for SQLiteKV namespaces stored in this test's cache file."""
+    def make(namespace, version="1", **kwargs):
+        return SQLiteKV(namespace, version=version, path=kv_path, **kwargs)
+    return make
+
+
+@pytest.fixture
+def kv(request, tmp_path, kv_path, make_kv):
+    """For unittest classes: ``self.tmp_dir``, ``self.kv_path`` and ``self.make_kv``."""
+    request.instance.tmp_dir = str(tmp_path)
+    request.instance.kv_path = kv_path
+    request.instance.make_kv = make_kv
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import routes_orchestrator
+
+
+class FakeSupabase:
+    """Records inserts; every query returns ``rows[table]``."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.inserts = []
+
+    def table(self, name):
+        return _Query(self, name)
+
+
+class _Query:
+    def __init__(self, db, name):
+        self.db, self.name = db, name
+
+    def __getattr__(self, _method):
+        return lambda *args, **kwargs: self
+
+    def insert(self, row):
+        self.db.inserts.append((self.name, row))
+        return self
+
+    def execute(self):
+        return SimpleNamespace(data=self.db.rows.get(self.name, []))
+
+
+class FakeGraph:
+    def __init__(self, before_done=None):
+        self.before_done = before_done
+
+    async def astream(self, state, config=None, stream_mode=None):
+        yield {**state, "current_phase": "resume_analysis", "messages": ["[RESUME] scoring"]}
+        if self.before_done is not None:
+            await asyncio.to_thread(self.before_done)
+        yield {
+            **state,
+            "current_phase": "idle",
+            "messages": ["[SUPERVISOR] done"],
+            "resume_analysis": {**state["resume_analysis"], "overall_score": 72, "suggestions": []},
+        }
+
+
+def _events(response):
+    return [json.loads(line[len("data: "):]) for line in response.text.split("\n\n") if line.startswith("data: ")]
+
+
+class TestAnalyzeResumeStream(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeSupabase({
+            "resumes": [{"resume_id": 1, "current_version": 2}],
+            "resume_versions": [{"version_id": 9}],
+        })
+        self.skill_gap_started = threading.Event()
+        parser = mock.Mock()
+        parser.extract_text.return_value = "Jane Doe\nSkills: Python"
+        parser.parse_sections.return_value = {"skills": "Python"}
+        parser.normalize_for_storage.side_effect = lambda text: text
+        parser.scrub_contact_pii.side_effect = lambda text: text
+        parser.sanitize_sections_for_storage.side_effect = lambda sections: sections
+        patches = [
+            mock.patch.object(routes_orchestrator, "supabase", self.db),
+            mock.patch.object(routes_orchestrator, "get_parser", return_value=parser),
+            mock.patch.object(routes_orchestrator, "ensure_user_row"),
+            mock.patch.object(routes_orchestrator, "_update_user_profile_from_sections"),
+            mock.patch.object(routes_orchestrator, "on_resume_version_saved"),
+            mock.patch.object(routes_orchestrator, "_load_skill_gap_preferences", return_value=None),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        app = FastAPI()
+        app.include_router(routes_orchestrator.router)
+        self.client = TestClient(app)
+
+    def _post(self, graph, analyze_skill_gap):
+        with mock.patch.object(routes_orchestrator, "orchestrator_graph", graph), \
+                mock.patch("app.agents.skill_gap.analyze_skill_gap", side_effect=analyze_skill_gap):
+            response = self.client.post(
+                "/analyze-resume",
+                data={"user_id": "u1"},
+                files={"resume": ("resume.txt", b"Jane Doe\nSkills: Python", "text/plain")},
+            )
+        self.assertEqual(response.status_code, 200)
+        return _events(response)
+
+    def test_skill_gap_runs_while_the_graph_is_scoring(self):
+        def analyze_skill_gap(resume_text, **kwargs):
+            self.skill_gap_started.set()
+            return {"career_matches": [{"career": "Data Engineer", "probability": 80}], "user_skills": ["Python"]}
+
+        # The graph only finishes once skill-gap analysis has started, so a
+        # sequential pipeline would time out here.
+        graph = FakeGraph(before_done=lambda: self.assertTrue(self.skill_gap_started.wait(5)))
+        events = self._post(graph, analyze_skill_gap)
+        kinds = [e["event"] for e in events]
+
+        self.assertEqual(kinds[0], "started")
+        self.assertLess(kinds.index("skill_gap"), kinds.index("complete"))
+        self.assertLess(kinds.index("resume_scored"), kinds.index("complete"))
+        self.assertEqual(events[kinds.index("resume_scored")]["resume_score"], 72)
+        self.assertEqual(events[-1]["result"]["resume_score"], 72)
+
+        stored = dict(self.db.inserts)["resume_versions"]
+        self.assertEqual(json.loads(stored["skill_gap"])["user_skills"], ["Python"])
+        self.assertEqual(json.loads(stored["resume_analysis"])["ats_score"], 72)
+        self.assertNotIn("pending_rewrites_id", json.loads(stored["resume_analysis"]))
+
+    def test_slow_skill_gap_is_streamed_after_the_score(self):
+        def analyze_skill_gap(resume_text, **kwargs):
+            time.sleep(0.3)
+            return {"career_matches": [], "user_skills": []}
+
+        kinds = [e["event"] for e in self._post(FakeGraph(), analyze_skill_gap)]
+        self.assertLess(kinds.index("resume_scored"), kinds.index("skill_gap"))
+        self.assertEqual(kinds[-1], "complete")
+
+    def test_skill_gap_failure_still_completes(self):
+        def analyze_skill_gap(resume_text, **kwargs):
+            raise RuntimeError("groq down")
+
+        events = self._post(FakeGraph(), analyze_skill_gap)
+        skill_gap = next(e for e in events if e["event"] == "skill_gap")
+        self.assertIn("groq down", skill_gap["result"]["error"])
+        self.assertEqual(events[-1]["event"], "complete")
+
+
+class TestSharedLLMSlots(unittest.TestCase):
+    def test_skill_gap_and_resume_scoring_calls_share_one_budget(self):
+        from app.agents import llm_config
+        from app.agents.resume import nodes as resume_nodes
+        from app.agents.skill_gap import nodes as skill_gap_nodes
+
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def create(**kwargs):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            message = SimpleNamespace(content='["Python"]')
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+        calls = [lambda: resume_nodes._llm_json("score")] * 4 + [
+            lambda i=i: skill_gap_nodes.extract_skills_from_resume(skills_text=f"Python {i}") for i in range(4)
+        ]
+        with mock.patch.object(llm_config.GROQ_CLIENT.chat.completions, "create", side_effect=create):
+            threads = [threading.Thread(target=call) for call in calls]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(peak[0], llm_config.GROQ_CONCURRENCY)
@@ -0,0 +1,207 @@
+import asyncio
+import io
+import json
+import os
+import threading
+import time
+import unittest
+import zipfile
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.agents.resume.nodes import score_resume_deterministic
+from app.api import routes_orchestrator
+from app.services import bulk_analysis, resume_parser
+from app.services.bulk_analysis import (
+    DEFAULT_WORKERS,
+    clamp_llm_concurrency,
+    clamp_workers,
+    count_zip_resumes,
+    iter_spooled_zip,
+    run_bulk_analysis,
+    spool_upload,
+)
+from app.services.resume_parser import ResumeParser
+
+
+RESUME = """Jane Doe
+jane@example.com | Berlin
+
+EXPERIENCE
+Data Engineer, Acme (2021-2024)
+- Built Airflow pipelines in Python processing 2M events/day
+- Reduced warehouse costs by 30% by partitioning Spark jobs on AWS
+
+EDUCATION
+B.Sc. Computer Science, TU Berlin
+
+SKILLS
+Python, SQL, Spark, Airflow, AWS, Docker
+"""
+JD = (
+    "We are hiring a data engineer to build batch and streaming pipelines with Python, "
+    "Spark, Kafka and Airflow on AWS, and to model data in Snowflake."
+)
+
+
+async def _chunks(parts):
+    for part in parts:
+        yield part
+
+
+@pytest.mark.usefixtures("kv")
+class TestBulkAnalysis(unittest.TestCase):
+    def _zip(self, members):
+        path = os.path.join(self.tmp_dir, "resumes.zip")
+        with zipfile.ZipFile(path, "w") as archive:
+            for name, text in members.items():
+                archive.writestr(name, text)
+        return path
+
+    def test_worker_and_concurrency_requests_are_clamped(self):
+        self.assertEqual(clamp_workers(None), DEFAULT_WORKERS)
+        self.assertEqual(clamp_workers(10_000), DEFAULT_WORKERS)
+        self.assertEqual(clamp_workers(-3), 1)
+        self.assertEqual(clamp_llm_concurrency(None), bulk_analysis.DEFAULT_LLM_CONCURRENCY)
+        self.assertEqual(clamp_llm_concurrency(500), bulk_analysis.MAX_LLM_CONCURRENCY)
+        self.assertEqual(clamp_llm_concurrency(-1), 0)
+
+    def test_spooled_upload_is_capped_and_cleaned_up(self):
+        path = asyncio.run(spool_upload(_chunks([b"ab", b"cd"]), max_bytes=4))
+        with open(path, "rb") as fh:
+            self.assertEqual(fh.read(), b"abcd")
+        os.unlink(path)
+
+        created = []
+        mkstemp = bulk_analysis.tempfile.mkstemp
+
+        def tracking_mkstemp(**kwargs):
+            fd, path = mkstemp(dir=self.tmp_dir, **kwargs)
+            created.append(path)
+            return fd, path
+
+        with mock.patch.object(bulk_analysis.tempfile, "mkstemp", side_effect=tracking_mkstemp):
+            with self.assertRaises(ValueError):
+                asyncio.run(spool_upload(_chunks([b"abc", b"def"]), max_bytes=4))
+        self.assertFalse(os.path.exists(created[0]))
+
+    def test_zip_members_are_counted_and_streamed_then_deleted(self):
+        path = self._zip({"a.txt": RESUME, "b.txt": RESUME, "notes.md": "x", "__MACOSX/a.txt": "x", "dir/": ""})
+        self.assertEqual(count_zip_resumes(path), 2)
+        self.assertEqual([name for name, _ in iter_spooled_zip(path)], ["a.txt", "b.txt"])
+        self.assertFalse(os.path.exists(path))
+
+        bad = os.path.join(self.tmp_dir, "bad.zip")
+        with open(bad, "wb") as fh:
+            fh.write(b"not a zip")
+        with self.assertRaises(ValueError):
+            count_zip_resumes(bad)
+
+    def test_inline_run_scores_every_file_and_summarizes(self):
+        files = [("a.txt", RESUME.encode()), ("b.txt", RESUME.encode()), ("empty.txt", b"")]
+        records = list(run_bulk_analysis(iter(files), target_role="Data Engineer", workers=1, llm_concurrency=0))
+
+        results, summary = records[:-1], records[-1]
+        self.assertEqual([r["filename"] for r in results], ["a.txt", "b.txt", "empty.txt"])
+        self.assertEqual(results[0]["ats_score"], results[1]["ats_score"])
+        self.assertFalse(results[2]["success"])
+        self.assertEqual(summary["event"], "summary")
+        self.assertEqual((summary["total"], summary["succeeded"], summary["failed"]), (3, 2, 1))
+        self.assertEqual(summary["mean_score"], results[0]["ats_score"])
+
+
+class TestBulkAnalyzeRoute(unittest.TestCase):
+    def setUp(self):
+        app = FastAPI()
+        app.include_router(routes_orchestrator.router)
+        self.client = TestClient(app)
+
+    def _post(self, archive: bytes, **form):
+        return self.client.post(
+            "/bulk-analyze",
+            files={"resumes": ("cohort.zip", archive, "application/zip")},
+            data={"target_role": "Data Engineer", **form},
+        )
+
+    def _zip_bytes(self, members):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            for name, text in members.items():
+                archive.writestr(name, text)
+        return buffer.getvalue()
+
+    def test_rejects_invalid_empty_and_oversized_archives(self):
+        self.assertEqual(self._post(b"not a zip").status_code, 400)
+        self.assertEqual(self._post(self._zip_bytes({"notes.md": "x"})).status_code, 400)
+        with mock.patch.object(bulk_analysis, "MAX_ARCHIVE_BYTES", 10):
+            self.assertEqual(self._post(self._zip_bytes({"a.txt": RESUME})).status_code, 413)
+
+    def test_streams_ndjson_with_clamped_workers(self):
+        seen = {}
+
+        def fake_run(files, **kwargs):
+            seen.update(kwargs)
+            for name, _ in files:
+                yield {"event": "result", "filename": name}
+            yield {"event": "summary"}
+
+        with mock.patch.object(bulk_analysis, "run_bulk_analysis", side_effect=fake_run):
+            response = self._post(self._zip_bytes({"a.txt": RESUME, "b.txt": RESUME}), workers="4096", llm_concurrency="999")
+
+        self.assertEqual(response.status_code, 200)
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual([line.get("filename") for line in lines], ["a.txt", "b.txt", None])
+        self.assertEqual(seen["workers"], DEFAULT_WORKERS)
+        self.assertEqual(seen["llm_concurrency"], bulk_analysis.MAX_LLM_CONCURRENCY)
+
+
+class TestScoreResumeDeterministic(unittest.TestCase):
+    def test_scores_are_deterministic_and_switch_to_jd_mode(self):
+        sections = {"experience": "Data Engineer, Acme", "education": "B.Sc.", "skills": "Python, SQL"}
+        archetype = score_resume_deterministic(RESUME, sections, role_type="data_engineer")
+        self.assertEqual(archetype, score_resume_deterministic(RESUME, sections, role_type="data_engineer"))
+        self.assertFalse(archetype["has_job_description"])
+
+        tailored = score_resume_deterministic(RESUME, sections, role_type="data_engineer", job_description=JD)
+        self.assertTrue(tailored["has_job_description"])
+        self.assertTrue(all(gap.lower() in JD.lower() for gap in tailored["critical_gaps"]))
+        for key in ("structure_score", "completeness_score", "relevance_score", "impact_score", "ats_score"):
+            self.assertTrue(0 <= tailored[key] <= 100, key)
+
+
+class TestLLMGate(unittest.TestCase):
+    def test_shared_gate_bounds_concurrent_llm_calls(self):
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def create(**kwargs):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='{"0": "skills"}'))])
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        gate = threading.BoundedSemaphore(2)
+        parsers = [ResumeParser() for _ in range(6)]
+        for parser in parsers:
+            parser.llm_gate = gate
+
+        results = []
+        with mock.patch.object(resume_parser, "GROQ_CLIENT", client):
+            threads = [
+                threading.Thread(target=lambda p=p: results.append(p._identify_sections_with_llm([(0, "SKILLS", "Python")])))
+                for p in parsers
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(results, [{0: "skills"}] * 6)
+        self.assertEqual(peak[0], 2)
@@ -0,0 +1,76 @@
+import unittest
+
+import pytest
+
+from app.services.cache import LRUCache, cache_metrics, normalize_text, text_hash
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used_and_counts_hits(self):
+        cache = LRUCache("test_lru", max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # "a" becomes most recent
+        cache.set("c", 3)                   # evicts "b"
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        stats = cache_metrics()["test_lru"]
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["entries"], 2)
+
+    def test_expired_entries_are_misses(self):
+        cache = LRUCache("test_ttl", max_entries=4, ttl_seconds=-1)
+        cache.set("a", 1)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_text_hash_ignores_bullets_case_and_whitespace(self):
+        self.assertEqual(normalize_text("•  Built   REST APIs "), "built rest apis")
+        self.assertEqual(
+            text_hash("- Built REST APIs in FastAPI"),
+            text_hash("built rest  apis in fastapi"),
+        )
+
+
+@pytest.mark.usefixtures("kv")
+class TestSQLiteKV(unittest.TestCase):
+    def test_values_persist_across_instances(self):
+        self.make_kv("test_ns", version="m1").set("k", b"\x00\x01")
+        store = self.make_kv("test_ns", version="m1")
+        self.assertEqual(store.get("k"), b"\x00\x01")
+
+    def test_version_change_drops_old_rows(self):
+        self.make_kv("test_ns", version="model-a:768").set("k", "v")
+        store = self.make_kv("test_ns", version="model-b:768")
+        self.assertIsNone(store.get("k"))
+        self.assertEqual(len(store), 0)
+
+    def test_delete_prefix_only_removes_matching_keys(self):
+        store = self.make_kv("test_ns")
+        store.set("user1:a", "1")
+        store.set("user1:b", "2")
+        store.set("user2:a", "3")
+        self.assertEqual(store.delete_prefix("user1:"), 2)
+        self.assertEqual(store.get("user2:a"), "3")
+
+    def test_update_many_is_a_read_modify_write(self):
+        store = self.make_kv("test_ns")
+        store.set("a", "1")
+        store.update_many({"a": lambda v: str(int(v) + 1), "b": lambda v: "new" if v is None else v})
+        self.assertEqual((store.get("a"), store.get("b")), ("2", "new"))
+
+    def test_claim_is_exclusive_until_it_expires(self):
+        store = self.make_kv("test_ns")
+        self.assertTrue(store.claim("job", "worker-1", ttl_seconds=60))
+        self.assertTrue(store.claim("job", "worker-1", ttl_seconds=60))
+        self.assertFalse(self.make_kv("test_ns").claim("job", "worker-2", ttl_seconds=60))
+        self.assertTrue(store.claim("job", "worker-2", ttl_seconds=-1))
+
+    def test_prune_drops_rows_older_than_max_age(self):
+        store = self.make_kv("test_ns")
+        store.set("k", "v")
+        self.assertEqual(store.prune(60), 0)
+        self.assertEqual(store.prune(-1), 1)
+        self.assertEqual(len(store), 0)
@@ -0,0 +1,96 @@
+import unittest
+
+from app.agents.skill_gap.career_matching import CareerMatcher
+from app.agents.skill_gap.nodes import deterministic_career_probabilities
+from app.services.skill_gap_analyzer import calculate_career_probabilities
+
+
+CLUSTERS = {
+    "Data Engineer": {"skills": ["Python", "SQL", "Spark", "Airflow", "Git"]},
+    "Frontend Developer": {"skills": ["JavaScript", "React", "CSS", "Git"]},
+    "Mobile Developer": {"skills": ["Swift", "Kotlin", "Git"]},
+}
+DAYS = {"Git": 3, "Spark": 60, "Airflow": 30, "Python": 60, "SQL": 30}
+
+
+def _by_career(results):
+    return {r["career"]: r for r in results}
+
+
+class TestCareerMatcher(unittest.TestCase):
+    def test_ranks_by_weighted_coverage_and_lists_gaps(self):
+        matcher = CareerMatcher(CLUSTERS, learning_days=DAYS)
+        results = matcher.score(["python", "SQL", "Git"])
+        self.assertEqual(results[0]["career"], "Data Engineer")
+        de = results[0]
+        self.assertEqual(de["matched_skills"], ["Python", "SQL", "Git"])
+        self.assertEqual(de["matched_skills_count"], 3)
+        self.assertEqual(de["total_required_skills"], 5)
+        self.assertEqual(de["skill_match_percentage"], 60.0)
+        # Missing skills come hardest-to-learn first.
+        self.assertEqual(de["missing_skills"], ["Spark", "Airflow"])
+        probabilities = [r["probability"] for r in results]
+        self.assertEqual(probabilities, sorted(probabilities, reverse=True))
+
+    def test_learning_time_weights_hard_skills_above_quick_fixes(self):
+        matcher = CareerMatcher(CLUSTERS, learning_days=DAYS)
+        only_git = _by_career(matcher.score(["Git"]))["Data Engineer"]["probability"]
+        only_spark = _by_career(matcher.score(["Spark"]))["Data Engineer"]["probability"]
+        self.assertGreater(only_spark, only_git)
+
+    def test_confidence_weights_scale_probability(self):
+        matcher = CareerMatcher(CLUSTERS, learning_days=DAYS)
+        skills = ["Python", "SQL", "Spark"]
+        strong = _by_career(matcher.score(skills, proficiency={s: 3 for s in skills}))["Data Engineer"]
+        weak = _by_career(matcher.score(skills, proficiency={s: 1 for s in skills}))["Data Engineer"]
+        self.assertGreater(strong["probability"], weak["probability"])
+        self.assertEqual(weak["needs_improvement_skills"], ["Python", "SQL", "Spark"])
+        self.assertEqual(strong["needs_improvement_skills"], [])
+
+    def test_calibrated_probabilities_stay_in_range(self):
+        matcher = CareerMatcher(CLUSTERS, learning_days=DAYS)
+        nothing = _by_career(matcher.score([]))
+        everything = _by_career(matcher.score(
+            ["Python", "SQL", "Spark", "Airflow", "Git"], proficiency={"Python": 3, "SQL": 3, "Spark": 3, "Airflow": 3, "Git": 3}
+        ))
+        self.assertLess(nothing["Data Engineer"]["probability"], 10)
+        self.assertGreater(everything["Data Engineer"]["probability"], 99)
+
+    def test_stack_filter_uses_stack_specific_skill_lists(self):
+        def stack_skills(career, stack):
+            return ["Swift", "Git"] if (career, stack) == ("Mobile Developer", "iOS") else []
+
+        matcher = CareerMatcher(CLUSTERS, learning_days=DAYS, stack_skills=stack_skills)
+        mobile = _by_career(matcher.score(["Swift"], stack="iOS"))["Mobile Developer"]
+        self.assertEqual(mobile["total_required_skills"], 2)
+        self.assertEqual(mobile["missing_skills"], ["Git"])
+        # The unfiltered matrix is unchanged.
+        self.assertEqual(_by_career(matcher.score(["Swift"]))["Mobile Developer"]["total_required_skills"], 3)
+
+    def test_uniform_weights_match_plain_overlap(self):
+        matcher = CareerMatcher(CLUSTERS)
+        fe = _by_career(matcher.score(["React", "Git"]))["Frontend Developer"]
+        self.assertEqual(fe["skill_match_percentage"], 50.0)
+
+
+class TestCareerMatcherCallers(unittest.TestCase):
+    SKILLS = ["Python", "SQL", "Pandas", "Machine Learning"]
+
+    def _deterministic(self, answers):
+        return deterministic_career_probabilities({"user_skills": self.SKILLS, "questionnaire_answers": answers})
+
+    def test_known_target_role_selects_its_cluster(self):
+        result = self._deterministic({"target_role": "data_analyst"})
+        self.assertEqual(result["target_role"], "Data Analyst")
+        self.assertEqual(result["selected_target_career_match"]["career"], "Data Analyst")
+
+    def test_unknown_target_role_reports_the_selected_match(self):
+        for answers in ({}, {"target_role": "Astronaut"}):
+            result = self._deterministic(answers)
+            self.assertEqual(result["selected_target_career_match"], result["career_matches"][0])
+            self.assertEqual(result["target_role"], result["career_matches"][0]["career"])
+
+    def test_legacy_probabilities_keep_their_shape(self):
+        results = calculate_career_probabilities("", self.SKILLS)
+        self.assertTrue(all("needs_improvement_skills" not in r for r in results))
+        self.assertTrue(all(r["probability"] == r["skill_match_percentage"] for r in results))
@@ -0,0 +1,74 @@
+import unittest
+
+from app.agents.skill_gap.career_reference import CareerReferenceStore
+
+
+CLUSTERS = {
+    "Data Engineer": {"skills": ["Python", "SQL", "Spark", "Git"]},
+    "Frontend Developer": {"skills": ["JavaScript", "React", "CSS", "Git"]},
+    "Backend Developer": {"skills": ["Python", "Java", "SQL", "Docker", "Git"]},
+    "Mobile Developer": {"skills": ["Swift", "Kotlin", "Git"]},
+    "Product Manager": {"skills": ["Roadmapping", "Stakeholder Management"]},
+    "Designer": {"skills": ["Figma", "CSS", "Prototyping"]},
+}
+STACKS = {"Python": ["Python"], "JavaScript": ["JavaScript", "React"], "Swift": ["Swift"]}
+OVERRIDES = {"Mobile Developer": {"Swift": ["Swift", "Git", "Testing"]}}
+
+
+def stack_skills(career, stack):
+    if stack in OVERRIDES.get(career, {}):
+        return OVERRIDES[career][stack]
+    other = {t for name, techs in STACKS.items() if name != stack for t in techs}
+    return [s for s in CLUSTERS[career]["skills"] if s not in other]
+
+
+class TestCareerReferenceStore(unittest.TestCase):
+    def setUp(self):
+        self.store = CareerReferenceStore(
+            CLUSTERS, STACKS, stack_skills=stack_skills, overrides=OVERRIDES, name="test_career_reference"
+        )
+
+    def test_full_reference_lists_every_cluster_with_stack_filtered_skills(self):
+        reference = self.store.get("Python")
+        self.assertEqual(reference.careers, tuple(CLUSTERS))
+        self.assertFalse(reference.compact)
+        self.assertIn("- Frontend Developer: CSS, Git", reference.text)
+        self.assertIn("- Mobile Developer: Kotlin, Git", reference.text)
+        self.assertGreater(reference.tokens, 0)
+        self.assertEqual(self.store.get("no_preference").text, self.store.get(None).text)
+
+    def test_compact_keeps_stack_relevant_clusters_and_target(self):
+        full = self.store.get("Python")
+        compact = self.store.get(
+            "Python", detected_stacks=["Python", "JavaScript"], compact=True, target_career="Product Manager"
+        )
+        self.assertTrue(compact.compact)
+        self.assertEqual(
+            compact.careers, ("Data Engineer", "Frontend Developer", "Backend Developer", "Product Manager")
+        )
+        self.assertLess(compact.tokens, full.tokens)
+
+    def test_override_marks_cluster_relevant_and_narrow_stacks_are_padded(self):
+        compact = self.store.get("Swift", detected_stacks=["Swift"], compact=True)
+        self.assertIn("Mobile Developer", compact.careers)
+        self.assertIn("- Mobile Developer: Swift, Git, Testing", compact.text)
+        self.assertEqual(len(compact.careers), 4)
+        self.assertNotIn("Product Manager", compact.careers)
+
+    def test_no_detected_stacks_falls_back_to_full(self):
+        reference = self.store.get(None, detected_stacks=[], compact=True)
+        self.assertFalse(reference.compact)
+        self.assertEqual(reference.careers, tuple(CLUSTERS))
+
+    def test_renderings_are_memoized_per_key(self):
+        first = self.store.get("Python", detected_stacks=["Python"], compact=True)
+        self.assertIs(self.store.get("Python", detected_stacks=("Python",), compact=True), first)
+        # Stack order doesn't matter; the full rendering ignores detected stacks.
+        both = self.store.get(None, detected_stacks=["Swift", "Python"], compact=True)
+        self.assertIs(self.store.get(None, detected_stacks=["Python", "Swift"], compact=True), both)
+        self.assertIs(self.store.get("Python", detected_stacks=["Swift"]), self.store.get("Python"))
+
+    def test_version_tracks_table_contents(self):
+        edited = dict(CLUSTERS, Designer={"skills": ["Figma"]})
+        other = CareerReferenceStore(edited, STACKS, stack_skills=stack_skills, name="test_career_reference_2")
+        self.assertNotEqual(other.version, self.store.version)
@@ -0,0 +1,35 @@
+import unittest
+
+from app.services.chunking import chunk_by_tokens, estimate_tokens, split_sentences
+
+
+class TestChunking(unittest.TestCase):
+    def test_estimate_tokens_counts_words_digits_and_punctuation(self):
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("Led team."), 3)
+        self.assertGreater(estimate_tokens("internationalization"), 1)
+
+    def test_split_sentences_keeps_closing_quotes_and_decimals(self):
+        self.assertEqual(
+            split_sentences('He said "Hi." Then left. Cost was 3.5 dollars!'),
+            ['He said "Hi."', "Then left.", "Cost was 3.5 dollars!"],
+        )
+
+    def test_small_paragraphs_are_packed_without_overlap(self):
+        text = "First tip about resumes.\n\nSecond tip about cover letters.\n\nThird tip."
+        self.assertEqual(
+            chunk_by_tokens(text, max_tokens=400),
+            ["First tip about resumes.\n\nSecond tip about cover letters.\n\nThird tip."],
+        )
+
+    def test_long_paragraph_splits_on_sentences_with_overlap_and_budget(self):
+        sentence = "Quantify impact with metrics such as revenue, latency or users."
+        text = " ".join([sentence] * 40)
+        chunks = chunk_by_tokens(text, max_tokens=80, overlap_tokens=20)
+
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            self.assertLessEqual(estimate_tokens(chunk), 80)
+            self.assertTrue(chunk.endswith("."))
+        # Each later chunk starts with the previous chunk's last sentence.
+        self.assertTrue(chunks[1].startswith(sentence))
@@ -0,0 +1,35 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.embedding_batcher import MicroBatcher
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_concurrent_callers_share_batches_and_get_their_own_vectors(self):
+        calls = []
+        gate = threading.Event()
+
+        def batch_fn(texts):
+            gate.wait(1)  # hold the first call so the rest queue up
+            calls.append(len(texts))
+            return [[float(len(t))] for t in texts]
+
+        batcher = MicroBatcher("test", batch_fn, max_batch_size=16, max_wait_ms=20)
+        texts = ["a" * i for i in range(1, 17)]
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            futures = [pool.submit(batcher.embed, t) for t in texts]
+            gate.set()
+            results = [f.result() for f in futures]
+
+        self.assertEqual(results, [[float(len(t))] for t in texts])
+        self.assertEqual(sum(calls), 16)
+        self.assertLess(len(calls), 16)
+
+    def test_batch_errors_propagate_to_every_caller(self):
+        def batch_fn(texts):
+            raise RuntimeError("model unavailable")
+
+        batcher = MicroBatcher("test_err", batch_fn, max_batch_size=4, max_wait_ms=1)
+        with self.assertRaises(RuntimeError):
+            batcher.embed("query")
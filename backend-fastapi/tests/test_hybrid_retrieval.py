@@ -0,0 +1,86 @@
+import unittest
+
+import numpy as np
+
+from app.services.hybrid_retrieval import BM25Index, hybrid_search, reciprocal_rank_fusion, tokenize
+from app.services.vector_index import RagChunkIndex
+
+
+def _index(chunks):
+    """RagChunkIndex loaded from (category, content, embedding) tuples."""
+    vectors = np.asarray([emb for _, _, emb in chunks], dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    meta = [
+        {"id": i, "category": category, "title": f"t{i}", "content": content}
+        for i, (category, content, _) in enumerate(chunks, start=1)
+    ]
+    index = RagChunkIndex(snapshot_dir="")
+    index._swap(vectors, meta)
+    return index
+
+
+class TestHybridRetrieval(unittest.TestCase):
+    def test_tokenize_keeps_tech_terms_and_drops_stopwords(self):
+        self.assertEqual(
+            tokenize("Experience with C++, Node.js and C# for the team."),
+            ["experience", "c++", "node.js", "c#", "team"],
+        )
+
+    def test_bm25_ranks_exact_term_matches_first(self):
+        docs = [
+            "Quantify impact with metrics in every bullet.",
+            "List Kubernetes and Docker under a dedicated skills section.",
+            "Keep the resume to one page for early-career roles.",
+        ]
+        index = BM25Index(docs)
+        hits = index.search("kubernetes deployment experience", limit=3)
+        self.assertEqual(hits[0][0], 1)
+        self.assertEqual(len(hits), 1)
+
+    def test_bm25_respects_allowed_ids(self):
+        index = BM25Index(["python tips", "python resume", "java tips"])
+        self.assertEqual([doc for doc, _ in index.search("python", 5, allowed=[1, 2])], [1])
+
+    def test_rrf_rewards_documents_ranked_by_both_lists(self):
+        fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1, 4]])
+        self.assertEqual([doc for doc, _ in fused][:2], [1, 3])
+        self.assertEqual(len(fused), 4)
+
+
+class TestHybridSearch(unittest.TestCase):
+    CHUNKS = [
+        ("resume", "List Kubernetes and Docker under a dedicated skills section.", [1, 0, 0]),
+        ("resume", "List Kubernetes and Docker in a dedicated skills section.", [0.99, 0.05, 0]),
+        ("resume", "Quantify impact with metrics in every bullet.", [0, 1, 0]),
+        ("interview", "Practice Kubernetes troubleshooting questions.", [0.9, 0, 0.1]),
+    ]
+
+    def _search(self, query, embedding, category="resume", limit=5, token_budget=1000, index=None):
+        return hybrid_search(
+            index or _index(self.CHUNKS), query, embedding, category, limit,
+            token_budget=token_budget, snippet_chars=500,
+        )
+
+    def test_near_duplicates_are_dropped(self):
+        ids = [r["id"] for r in self._search("kubernetes docker skills", [1, 0, 0])]
+        self.assertEqual(ids, [1, 3])
+
+    def test_token_budget_stops_adding_chunks(self):
+        results = self._search("kubernetes metrics", [1, 0.5, 0], token_budget=1)
+        # The first chunk is always kept; nothing else fits.
+        self.assertEqual(len(results), 1)
+
+    def test_either_retriever_alone_still_returns_results(self):
+        # No lexical overlap: dense candidates only.
+        dense_only = self._search("zzz", [0, 1, 0])
+        self.assertEqual(dense_only[0]["id"], 3)
+        self.assertIsNone(dense_only[0]["bm25"])
+        # No query embedding: BM25 candidates only.
+        lexical_only = self._search("metrics bullet", [])
+        self.assertEqual([r["id"] for r in lexical_only], [3])
+        self.assertIsNone(lexical_only[0]["similarity"])
+
+    def test_category_filter_and_unloaded_replica(self):
+        self.assertEqual([r["id"] for r in self._search("kubernetes", [1, 0, 0], category="interview")], [4])
+        self.assertEqual(self._search("kubernetes", [1, 0, 0], category="cover_letter"), [])
+        self.assertIsNone(self._search("kubernetes", [1, 0, 0], index=RagChunkIndex(snapshot_dir="")))
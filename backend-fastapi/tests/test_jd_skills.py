@@ -0,0 +1,81 @@
+import unittest
+
+from app.services.jd_skills import JDSkillExtractor
+
+
+ONTOLOGY = {
+    "python": "Python",
+    "go": "Go",
+    "nodejs": "Node.js",
+    "spring": "Spring",
+    "spring boot": "Spring Boot",
+    "kubernetes": "Kubernetes",
+    "kafka": "Kafka",
+    "slack": "Slack",
+    "communication": "Communication",
+    "ci cd": "CI/CD",
+}
+
+JD = """About us
+We move fast and chat on Slack. Go above and beyond!
+
+Requirements:
+- Python and Node.js services, deployed with k8s
+- Strong communication skills
+- CI-CD pipelines
+
+Nice to have:
+- Kafka, Spring Boot
+"""
+
+
+class TestJDSkillExtractor(unittest.TestCase):
+    def setUp(self):
+        self.extractor = JDSkillExtractor(ONTOLOGY, aliases={"nodejs": "nodejs"})
+
+    def test_extracts_aliases_and_skips_soft_skills_and_common_words(self):
+        skills = self.extractor.extract(JD)
+        self.assertEqual(skills[:4], ["Python", "Node.js", "Kubernetes", "CI/CD"])
+        self.assertNotIn("Communication", skills)
+        self.assertNotIn("Go", skills)
+        self.assertNotIn("Spring", skills)  # only as part of "Spring Boot"
+
+    def test_section_weights_demote_optional_and_company_mentions(self):
+        scores = self.extractor.score(JD)
+        self.assertEqual(scores["Python"], 1.0)
+        self.assertEqual(scores["Kafka"], 0.5)
+        self.assertLess(scores["Slack"], 0.5)
+        self.assertNotIn("Slack", self.extractor.extract(JD))
+
+    def test_requirement_lines_with_section_words_are_not_headings(self):
+        extractor = JDSkillExtractor({**ONTOLOGY, "aws": "AWS", "java": "Java"})
+        scores = extractor.score(
+            "Experience with AWS\nStrong Python skills\nKafka experience preferred\nJava"
+        )
+        self.assertEqual(set(scores), {"AWS", "Python", "Kafka", "Java"})
+        self.assertEqual(scores["Kafka"], 0.5)
+        self.assertGreater(scores["Java"], 0.5)
+
+    def test_heading_lines_keep_their_skills(self):
+        scores = self.extractor.score("REQUIREMENTS\nPreferred Qualifications: Kafka\n- Python")
+        self.assertEqual(scores["Kafka"], 0.5)
+        self.assertEqual(scores["Python"], 0.5)
+
+    def test_go_needs_language_context(self):
+        self.assertIn("Go", self.extractor.extract("Requirements: Python/Go microservices"))
+
+    def test_llm_fallback_only_for_low_coverage(self):
+        calls = []
+
+        def fake_llm(description):
+            calls.append(description)
+            return ["python", "Terraform"]
+
+        skills, used = self.extractor.extract_with_fallback(JD, fake_llm)
+        self.assertFalse(used)
+        self.assertEqual(calls, [])
+
+        sparse = "We are hiring a backend engineer with Python. " * 20
+        skills, used = self.extractor.extract_with_fallback(sparse, fake_llm)
+        self.assertTrue(used)
+        self.assertEqual(skills, ["Python", "Terraform"])
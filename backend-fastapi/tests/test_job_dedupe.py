@@ -0,0 +1,117 @@
+import random
+import unittest
+from unittest import mock
+
+from app.services import job_dedupe, job_search
+from app.services.job_dedupe import SimHashIndex, from_signed, hamming, simhash, to_signed
+
+
+DESCRIPTION = (
+    "We are looking for a Data Engineer to design and maintain batch and streaming "
+    "pipelines on AWS. You will work with Python, Spark, Airflow and dbt, model data "
+    "in Snowflake, and partner with analysts to deliver reliable datasets. "
+    "Requirements: 3+ years of experience with SQL and Python, familiarity with Kafka, "
+    "Terraform and CI/CD, strong communication skills. Benefits include remote work, "
+    "learning budget, health insurance and a yearly team offsite."
+)
+
+
+class TestSimHash(unittest.TestCase):
+    def test_republished_posting_is_within_distance(self):
+        original = simhash("Data Engineer", "Acme Corp", DESCRIPTION)
+        republished = simhash(
+            "Data Engineer ",
+            "ACME Corp",
+            DESCRIPTION + " Apply on LinkedIn today!",
+        )
+        self.assertLessEqual(hamming(original, republished), 3)
+
+    def test_different_role_or_company_is_far(self):
+        original = simhash("Data Engineer", "Acme Corp", DESCRIPTION)
+        other_company = simhash("Data Engineer", "Globex", DESCRIPTION.replace("AWS", "GCP"))
+        other_role = simhash(
+            "Frontend Developer",
+            "Acme Corp",
+            "Build accessible React interfaces with TypeScript, Storybook and Jest; "
+            "collaborate with designers on a component library.",
+        )
+        self.assertGreater(hamming(original, other_company), 3)
+        self.assertGreater(hamming(original, other_role), 3)
+
+    def test_location_is_part_of_the_signature(self):
+        berlin = simhash("Data Engineer", "Acme Corp", DESCRIPTION, "Berlin, BE, DE")
+        self.assertLessEqual(hamming(berlin, simhash("Data Engineer", "ACME Corp", DESCRIPTION, "berlin, BE, DE")), 3)
+        self.assertGreater(hamming(berlin, simhash("Data Engineer", "Acme Corp", DESCRIPTION, "Munich, BY, DE")), 3)
+
+    def test_signed_round_trip(self):
+        for sig in (0, 1, (1 << 63) - 1, 1 << 63, (1 << 64) - 1):
+            stored = to_signed(sig)
+            self.assertTrue(-(1 << 63) <= stored < (1 << 63))
+            self.assertEqual(from_signed(stored), sig)
+
+
+class TestSimHashIndex(unittest.TestCase):
+    def test_finds_any_signature_within_max_distance(self):
+        rng = random.Random(3)
+        index = SimHashIndex(max_distance=3)
+        stored = [rng.getrandbits(64) for _ in range(500)]
+        for i, sig in enumerate(stored):
+            index.add(i, sig)
+
+        for i, sig in enumerate(stored[:100]):
+            flipped = sig
+            for bit in rng.sample(range(64), 3):
+                flipped ^= 1 << bit
+            self.assertEqual(index.find(flipped), i)
+
+        # Random signatures are ~32 bits apart; none should match.
+        misses = sum(index.find(rng.getrandbits(64)) is None for _ in range(200))
+        self.assertEqual(misses, 200)
+
+    def test_same_posting_in_another_location_is_not_a_duplicate(self):
+        index = SimHashIndex(max_distance=3)
+        sig = simhash("Data Engineer", "Acme Corp", DESCRIPTION, "Berlin, DE")
+        index.add("berlin", sig, "Berlin, DE")
+        self.assertEqual(index.find(sig, "berlin,  de"), "berlin")
+        self.assertIsNone(index.find(sig, "Munich, DE"))
+
+
+class TestSimHashStorage(unittest.TestCase):
+    def setUp(self):
+        self.inserted = []
+        table = mock.Mock()
+        table.select.return_value.eq.return_value.limit.return_value.execute.return_value = mock.Mock(data=[])
+        table.insert.side_effect = self._insert
+        self.supabase = mock.Mock()
+        self.supabase.table.return_value = table
+
+        jobs = [
+            {"job_id": f"j{i}", "job_title": f"Role {i}", "employer_name": "Acme",
+             "job_description": f"{DESCRIPTION} Team {i}.", "job_city": city}
+            for i, city in enumerate(["Berlin", "Munich"])
+        ]
+        patches = [
+            mock.patch.object(job_search, "supabase", self.supabase),
+            mock.patch.object(job_search, "fetch_jobs_from_api", return_value=jobs),
+            mock.patch.object(job_search, "_extract_skills_from_description", return_value=["Python"]),
+            mock.patch.object(job_search, "embed_text", return_value=[0.0]),
+            mock.patch.object(job_search, "get_job_dedupe_index", return_value=SimHashIndex()),
+            mock.patch.object(job_dedupe, "_store_simhash", True),
+            mock.patch("app.services.job_recommendations.on_job_pool_changed"),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _insert(self, row):
+        if "simhash" in row:
+            raise Exception("Could not find the 'simhash' column of 'job_postings' in the schema cache")
+        self.inserted.append(row)
+        return mock.Mock(execute=mock.Mock(return_value=mock.Mock(data=[{"id": len(self.inserted)}])))
+
+    def test_missing_column_falls_back_to_inserting_without_simhash(self):
+        self.assertEqual(job_search.ingest_jobs("Data Engineer"), 2)
+        self.assertEqual([row["external_id"] for row in self.inserted], ["j0", "j1"])
+        self.assertFalse(job_dedupe.simhash_storage_enabled())
+        # Only the first insert hit the error; later rows skip the column.
+        self.assertEqual(self.supabase.table.return_value.insert.call_count, 3)
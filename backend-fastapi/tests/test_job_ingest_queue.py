@@ -0,0 +1,113 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import pytest
+
+from app.services import job_ingest_queue
+from app.services.job_ingest_queue import JobIngestionQueue
+
+
+def _wait_for(queue, task_id, statuses=("succeeded", "failed"), timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        task = queue.get(task_id)
+        if task and task["status"] in statuses:
+            return task
+        time.sleep(0.01)
+    raise AssertionError(f"task {task_id} did not reach {statuses}")
+
+
+@pytest.mark.usefixtures("kv")
+class TestJobIngestionQueue(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.calls = []
+
+    def tearDown(self):
+        self.release.set()
+
+    def _runner(self, query, location, progress):
+        self.calls.append((query, location))
+        progress("fetched", 3)
+        self.release.wait(5)
+        progress("stored", 2)
+        progress("duplicate", 1)
+        return 2
+
+    def _queue(self, **kwargs):
+        store = self.make_kv("test_job_ingest")
+        return JobIngestionQueue(runner=self._runner, workers=2, store=store, **kwargs)
+
+    def test_identical_refreshes_coalesce_and_report_stage_counts(self):
+        queue = self._queue()
+        first, coalesced_first = queue.submit("Data Engineer", "Berlin", user_id="u1")
+        second, coalesced_second = queue.submit("  data engineer ", "berlin", user_id="u2")
+
+        self.assertFalse(coalesced_first)
+        self.assertTrue(coalesced_second)
+        self.assertEqual(first["id"], second["id"])
+
+        self.release.set()
+        task = _wait_for(queue, first["id"])
+        self.assertEqual(task["status"], "succeeded")
+        self.assertEqual(task["ingested"], 2)
+        self.assertEqual(task["counts"]["fetched"], 3)
+        self.assertEqual(task["counts"]["stored"], 2)
+        self.assertEqual(task["requested_by"], ["u1", "u2"])
+        self.assertEqual(len(self.calls), 1)
+
+        # A recent successful run is reused, an old one is not.
+        _, coalesced = queue.submit("Data Engineer", "Berlin")
+        self.assertTrue(coalesced)
+        queue.coalesce_seconds = -1
+        _, coalesced = queue.submit("Data Engineer", "Berlin")
+        self.assertFalse(coalesced)
+
+    def test_interrupted_tasks_are_requeued_after_restart(self):
+        queue = self._queue()
+        task, _ = queue.submit("Backend Developer")
+        _wait_for(queue, task["id"], statuses=("running",))
+
+        # A new queue over the same store simulates a restart mid-run.
+        restarted = self._queue()
+        self.release.set()
+        recovered = _wait_for(restarted, task["id"])
+        self.assertEqual(recovered["status"], "succeeded")
+        self.assertEqual(self.calls.count(("Backend Developer", "")), 2)
+
+    def test_recovery_keeps_memory_bounded(self):
+        self.release.set()
+        queue = self._queue()
+        ids = []
+        for i in range(5):
+            task, _ = queue.submit(f"Role {i}")
+            ids.append(_wait_for(queue, task["id"])["id"])
+
+        with mock.patch.object(job_ingest_queue, "MAX_TASKS_IN_MEMORY", 2):
+            restarted = self._queue()
+        self.assertEqual(restarted.stats()["tasks"], 2)
+        # Pruned tasks are still served from the store.
+        self.assertEqual([restarted.get(task_id)["status"] for task_id in ids], ["succeeded"] * 5)
+
+    def test_default_runner_revalidates_cached_pages(self):
+        from app.services import job_search
+
+        with mock.patch.object(job_search, "ingest_jobs", return_value=4) as ingest:
+            queue = JobIngestionQueue(store=self.make_kv("test_job_ingest"))
+            task, _ = queue.submit("Data Engineer", "Berlin")
+            self.assertEqual(_wait_for(queue, task["id"])["ingested"], 4)
+        self.assertEqual(ingest.call_args.args, ("Data Engineer", "Berlin"))
+        self.assertTrue(ingest.call_args.kwargs["revalidate"])
+
+    def test_runner_errors_mark_task_failed(self):
+        def failing(query, location, progress):
+            raise ValueError("JSEARCH_API_KEY not configured")
+
+        store = self.make_kv("test_job_ingest")
+        queue = JobIngestionQueue(runner=failing, store=store)
+        task, _ = queue.submit("Designer")
+        task = _wait_for(queue, task["id"])
+        self.assertEqual(task["status"], "failed")
+        self.assertIn("JSEARCH_API_KEY", task["error"])
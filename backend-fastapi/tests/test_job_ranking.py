@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+
+
+from app.services.job_ranking import JobRanker, SkillVocabulary, popcount, to_bitsets
+
+
+def _job(job_id, title, skills, similarity):
+    return {"id": job_id, "title": title, "required_skills": skills, "similarity": similarity}
+
+
+class TestJobRanking(unittest.TestCase):
+    def test_bitsets_and_popcount_across_word_boundaries(self):
+        bits = to_bitsets([np.array([0, 63, 64, 130]), np.array([], dtype=np.int64)], n_bits=131)
+        self.assertEqual(bits.shape, (2, 3))
+        self.assertEqual(popcount(bits).tolist(), [4, 0])
+
+    def test_vocabulary_is_case_insensitive(self):
+        vocab = SkillVocabulary()
+        self.assertEqual(vocab.intern("Python"), vocab.intern(" python "))
+        self.assertEqual(len(vocab), 1)
+
+    def test_rank_mixes_similarity_title_boost_and_coverage(self):
+        ranker = JobRanker(coverage_weight=0.5)
+        jobs = [
+            _job(1, "Frontend Developer", ["React", "CSS", "TypeScript", "Figma"], 0.70),
+            _job(2, "Data Engineer", '["Python", "SQL", "Spark"]', 0.60),
+            _job(3, "Senior Data Engineer", ["Python", "Airflow"], 0.55),
+        ]
+        ranked = ranker.rank(jobs, ["python", "SQL"], role_query="data engineer", match_count=2)
+
+        self.assertEqual([j["id"] for j in ranked], [2, 3])
+        top = ranked[0]
+        self.assertEqual(top["similarity"], 75.0)
+        self.assertEqual(top["matching_skills"], ["Python", "SQL"])
+        self.assertEqual(top["missing_skills"], ["Spark"])
+        self.assertEqual(top["match_percentage"], 66.7)
+
+    def test_zero_coverage_weight_keeps_similarity_order(self):
+        ranker = JobRanker(coverage_weight=0.0)
+        jobs = [_job(1, "A", ["Go"], 0.9), _job(2, "B", ["Python"], 0.5)]
+        self.assertEqual([j["id"] for j in ranker.rank(jobs, ["Python"])], [1, 2])
+
+    def test_overflow_resets_rows_and_vocabulary(self):
+        ranker = JobRanker(max_jobs=3)
+        first = [_job(1, "A", ["Go"], 0.5), _job(2, "B", ["Rust"], 0.4)]
+        self.assertEqual([j["id"] for j in ranker.rank(first, ["Go"])], [1, 2])
+
+        second = first + [_job(3, "C", ["Python"], 0.3), _job(4, "D", ["SQL"], 0.2)]
+        ranked = ranker.rank(second, ["Python", "Go"], match_count=4)
+        self.assertEqual([j["id"] for j in ranked], [1, 3, 2, 4])
+        self.assertEqual(ranked[1]["matching_skills"], ["Python"])
+        self.assertEqual(len(ranker._row_of), 4)
+        self.assertEqual(len(ranker.vocab), 4)
+
+        # Next request over the cap starts over again, vocabulary included.
+        ranked = ranker.rank([_job(5, "E", ["Java"], 0.9)], ["Java"])
+        self.assertEqual(ranked[0]["match_percentage"], 100.0)
+        self.assertEqual(len(ranker.vocab), 1)
@@ -0,0 +1,99 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import pytest
+
+from app.services import job_recommendations as recs
+
+
+def _wait_idle(timeout=5.0):
+    deadline = time.time() + timeout
+    while recs._pending and time.time() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.mark.usefixtures("kv")
+class TestJobRecommendations(unittest.TestCase):
+    def setUp(self):
+        self.skills = {"u1": ["Python", "SQL"]}
+        self.match_calls = []
+
+        def match(user_skills, role_query=""):
+            self.match_calls.append((tuple(user_skills), role_query))
+            return [{"id": len(self.match_calls), "title": role_query or "any"}]
+
+        patches = [
+            mock.patch.object(recs, "_store", self.make_kv("test_recs")),
+            mock.patch.object(recs, "_pool_state", self.make_kv("test_pool")),
+            mock.patch.object(recs, "_last_served", {}),
+            mock.patch.object(recs, "load_user_skills", side_effect=lambda uid: self.skills[uid]),
+            mock.patch("app.services.job_search.match_jobs_for_user", side_effect=match),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        _wait_idle()
+
+    def test_second_read_is_served_from_store(self):
+        first = recs.get_recommendations("u1", "Data Engineer")
+        second = recs.get_recommendations("u1", "  data engineer ")
+        self.assertEqual(len(self.match_calls), 1)
+        self.assertEqual(first["matched_jobs"], second["matched_jobs"])
+        self.assertFalse(second["stale"])
+        self.assertEqual(second["user_skills"], ["Python", "SQL"])
+
+    def test_new_resume_version_recomputes_with_new_skills(self):
+        recs.get_recommendations("u1")
+        recs.get_recommendations("u1", "Designer")
+        recs.on_resume_version_saved("u1", ["Figma"]).result(timeout=5)
+        _wait_idle()
+
+        self.assertIn((("Figma",), ""), self.match_calls)
+        self.assertIn((("Figma",), "Designer"), self.match_calls)
+        calls = len(self.match_calls)
+        result = recs.get_recommendations("u1", "Designer")
+        self.assertEqual(result["user_skills"], ["Figma"])
+        self.assertEqual(len(self.match_calls), calls)
+
+    def test_request_during_a_recompute_runs_again_with_the_newest_skills(self):
+        release = threading.Event()
+        real_compute = recs.compute_recommendations
+
+        def slow_compute(user_id, role_query="", user_skills=None):
+            if user_skills == ["Old"]:
+                release.wait(5)
+            return real_compute(user_id, role_query, user_skills)
+
+        with mock.patch.object(recs, "compute_recommendations", side_effect=slow_compute):
+            recs._schedule("u1", "", ["Old"])
+            recs._schedule("u1", "", ["Newer"])
+            recs._schedule("u1", "", ["Newest"])
+            release.set()
+            _wait_idle()
+
+        self.assertEqual([c[0] for c in self.match_calls], [("Old",), ("Newest",)])
+        self.assertEqual(recs.get_recommendations("u1")["user_skills"], ["Newest"])
+
+    def test_job_pool_change_marks_entries_stale_and_refreshes(self):
+        recs.get_recommendations("u1")
+        with mock.patch.object(recs, "_schedule") as schedule:
+            recs.on_job_pool_changed(5)
+            schedule.assert_called_once_with("u1", "")
+            stale = recs.get_recommendations("u1")
+        self.assertTrue(stale["stale"])
+
+        recs.compute_recommendations("u1")
+        self.assertFalse(recs.get_recommendations("u1")["stale"])
+
+    def test_no_new_postings_keeps_entries_fresh(self):
+        recs.get_recommendations("u1")
+        recs.on_job_pool_changed(0)
+        self.assertFalse(recs.get_recommendations("u1")["stale"])
+
+    def test_missing_resume_propagates_lookup_error(self):
+        with self.assertRaises(LookupError):
+            recs.get_recommendations("nobody")
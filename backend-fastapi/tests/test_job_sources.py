@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import pytest
+
+from app.services.job_sources import CachedJobClient, FileJobSource, JobSource
+
+
+def _job(i, title="Data Engineer", city="Berlin"):
+    return {"job_id": f"j{i}", "job_title": title, "job_city": city, "job_description": "Python, SQL"}
+
+
+class CountingSource(JobSource):
+    name = "counting"
+
+    def __init__(self, pages, latency=0.0, etag=None):
+        self.pages = pages
+        self.latency = latency
+        self.etag = etag
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def fetch_page(self, query, location, page, validators=None):
+        with self._lock:
+            self.calls.append((page, validators))
+        time.sleep(self.latency)
+        if validators and validators.get("etag") == self.etag:
+            return {"not_modified": True}
+        return {"jobs": self.pages.get(page, []), "validators": {"etag": self.etag}}
+
+
+@pytest.mark.usefixtures("kv")
+class TestCachedJobClient(unittest.TestCase):
+    def _client(self, source, **kwargs):
+        store = self.make_kv("test_job_pages", version=source.name)
+        return CachedJobClient(source, store=store, **kwargs)
+
+    def test_pages_fetch_concurrently_and_cache(self):
+        pages = {p: [_job(p * 100 + i) for i in range(10)] for p in (1, 2, 3)}
+        source = CountingSource(pages, latency=0.1)
+        client = self._client(source, max_concurrency=3)
+
+        started = time.perf_counter()
+        jobs = client.fetch("Data Engineer", "Berlin", num_pages=3)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(jobs), 30)
+        self.assertEqual(jobs[0]["job_id"], "j100")
+        self.assertLess(elapsed, 0.25)  # ~one page of latency, not three
+
+        client.fetch(" data engineer", "berlin", num_pages=3)
+        self.assertEqual(len(source.calls), 3)
+        self.assertEqual(client.stats()["cache_hits"], 3)
+
+    def test_short_page_ends_results(self):
+        pages = {1: [_job(i) for i in range(10)], 2: [_job(20), _job(21)], 3: [_job(1)]}
+        jobs = self._client(CountingSource(pages)).fetch("Data Engineer", num_pages=3)
+        self.assertEqual([j["job_id"] for j in jobs][-2:], ["j20", "j21"])
+
+    def test_stale_pages_revalidate_with_etag(self):
+        source = CountingSource({1: [_job(1)]}, etag='"v1"')
+        client = self._client(source, ttl_seconds=-1)
+        client.fetch("Data Engineer")
+        jobs = client.fetch("Data Engineer")
+
+        self.assertEqual(jobs[0]["job_id"], "j1")
+        self.assertEqual(source.calls[1], (1, {"etag": '"v1"'}))
+        self.assertEqual(client.stats()["not_modified"], 1)
+
+    def test_revalidate_does_not_share_a_cached_fetch_in_flight(self):
+        source = CountingSource({1: [_job(1)]}, latency=0.1)
+        client = self._client(source)
+        plain = threading.Thread(target=client.fetch, args=("Data Engineer",))
+        plain.start()
+        time.sleep(0.02)
+        client.fetch("Data Engineer", revalidate=True)
+        plain.join()
+
+        self.assertEqual(len(source.calls), 2)
+        self.assertEqual(client.stats()["shared"], 0)
+
+    def test_pages_past_retention_are_refetched_and_pruned(self):
+        source = CountingSource({1: [_job(1)]}, etag='"v1"')
+        client = self._client(source, retention_seconds=3600)
+        client.fetch("Data Engineer")
+        client.fetch("Data Analyst")
+        with client._store._conn:
+            client._store._conn.execute(
+                "UPDATE kv_test_job_pages SET updated_at = ?", (time.time() - 7200,)
+            )
+
+        client._last_prune = 0.0
+        client.fetch("Data Engineer")
+        self.assertEqual(source.calls[-1], (1, None))  # no stale validators sent
+        self.assertEqual([k.split("|")[0] for k in client._store.keys()], ["data engineer"])
+
+    def test_sources_must_implement_fetch_page(self):
+        class Incomplete(JobSource):
+            name = "incomplete"
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+class TestFileJobSource(unittest.TestCase):
+    def test_filters_by_query_and_location_and_pages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "jobs.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                for i in range(12):
+                    f.write(json.dumps(_job(i)) + "\n")
+                f.write(json.dumps(_job(99, title="Designer")) + "\n")
+                f.write(json.dumps(_job(98, city="Paris")) + "\n")
+
+            source = FileJobSource(path)
+            self.assertEqual(len(source.fetch_page("data engineer", "berlin", 1)["jobs"]), 10)
+            self.assertEqual(len(source.fetch_page("data engineer", "berlin", 2)["jobs"]), 2)
+            self.assertEqual(source.fetch_page("designer", "", 1)["jobs"][0]["job_id"], "j99")
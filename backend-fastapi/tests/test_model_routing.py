@@ -0,0 +1,125 @@
+import json
+import os
+import unittest
+
+import pytest
+
+from app.agents.skill_gap import nodes
+from app.agents.skill_gap.model_routing import Difficulty, ModelRouter, estimate_difficulty
+
+
+EASY = Difficulty(score=0.1, input_tokens=400, spread=0.1, ambiguity=0.0)
+HARD = Difficulty(score=0.8, input_tokens=2400, spread=0.9, ambiguity=0.9)
+
+
+def _validate(raw):
+    if raw == "bad":
+        raise ValueError("schema")
+    return raw, 0.2 if raw == "unsure" else 1.0
+
+
+class TestEstimateDifficulty(unittest.TestCase):
+    def test_short_consistent_single_stack_input_is_easy(self):
+        difficulty = estimate_difficulty(
+            300,
+            confidence_details=[{"score": 6}, {"score": 7}, {"score": 6}],
+            detected_stacks=[{"stack": "Python", "confidence": 0.5}],
+        )
+        self.assertLess(difficulty.score, 0.2)
+        self.assertEqual(difficulty.ambiguity, 0.0)
+
+    def test_large_mixed_ambiguous_input_is_hard(self):
+        difficulty = estimate_difficulty(
+            3000,
+            confidence_details=[{"score": 0}, {"score": 9}, {"score": 1}, {"score": 8}],
+            detected_stacks=[{"confidence": 0.4}, {"confidence": 0.4}],
+        )
+        self.assertGreater(difficulty.score, 0.9)
+        # No detected stack is as ambiguous as two tied ones.
+        self.assertEqual(estimate_difficulty(0).ambiguity, 1.0)
+
+
+@pytest.mark.usefixtures("kv")
+class TestModelRouter(unittest.TestCase):
+    def setUp(self):
+        self.log_path = os.path.join(self.tmp_dir, "routing.jsonl")
+        self.router = ModelRouter("small", "large", threshold=0.45, min_confidence=0.5, log_path=self.log_path)
+        self.calls = []
+
+    def _call(self, outputs):
+        def call(model):
+            self.calls.append(model)
+            return outputs[model]
+        return call
+
+    def _log(self):
+        with open(self.log_path, encoding="utf-8") as fh:
+            return [json.loads(line) for line in fh]
+
+    def test_easy_input_stays_on_small_model(self):
+        result = self.router.run("t", EASY, self._call({"small": "ok"}), _validate)
+        self.assertEqual(result, "ok")
+        self.assertEqual(self.calls, ["small"])
+        entry = self._log()[0]
+        self.assertEqual((entry["first_model"], entry["final_model"], entry["escalation"]), ("small", "small", None))
+        self.assertEqual(entry["score"], EASY.score)
+
+    def test_hard_input_goes_straight_to_large_model(self):
+        self.router.run("t", HARD, self._call({"large": "ok"}), _validate)
+        self.assertEqual(self.calls, ["large"])
+
+    def test_invalid_or_unsure_small_output_escalates(self):
+        result = self.router.run("t", EASY, self._call({"small": "bad", "large": "fixed"}), _validate)
+        self.assertEqual(result, "fixed")
+        self.router.run("t", EASY, self._call({"small": "unsure", "large": "fixed"}), _validate)
+        self.assertEqual(self.calls, ["small", "large", "small", "large"])
+        escalations = [e["escalation"] for e in self._log()]
+        self.assertEqual(escalations, ["invalid: schema", "low_confidence"])
+
+    def test_large_model_failure_propagates(self):
+        with self.assertRaises(ValueError):
+            self.router.run("t", HARD, self._call({"large": "bad"}), _validate)
+        self.assertIsNone(self._log()[0]["final_model"])
+
+    def test_log_is_rotated_at_the_size_limit(self):
+        router = ModelRouter("small", "large", log_path=self.log_path, log_max_bytes=1)
+        router.run("first", EASY, self._call({"small": "ok"}), _validate)
+        router.run("second", EASY, self._call({"small": "ok"}), _validate)
+        self.assertEqual([e["task"] for e in self._log()], ["second"])
+        with open(self.log_path + ".1", encoding="utf-8") as fh:
+            self.assertEqual(json.loads(fh.read())["task"], "first")
+
+    def test_disabled_router_always_uses_large_model(self):
+        router = ModelRouter("small", "large", log_path=None, enabled=False)
+        self.assertEqual(router.choose(EASY), "large")
+
+
+class TestSkillGapValidators(unittest.TestCase):
+    def _payload(self, careers):
+        return json.dumps([
+            {"career": c, "probability": p, "matched_skills": [], "missing_skills": [], "needs_improvement_skills": []}
+            for c, p in careers
+        ])
+
+    def test_career_payload_confidence_tracks_deterministic_agreement(self):
+        expected = ["Data Scientist", "Data Analyst", "Machine Learning Engineer"]
+        raw = self._payload([("Data Scientist", 80), ("Data Analyst", 70), ("Machine Learning Engineer", 60)])
+        _, confidence = nodes._validate_career_payload(raw, expected)
+        self.assertEqual(confidence, 1.0)
+
+        raw = self._payload([("UI/UX Designer", 80), ("Product Manager", 70), ("Data Scientist", 10)])
+        _, confidence = nodes._validate_career_payload(raw, expected)
+        self.assertLess(confidence, 0.5)
+
+    def test_career_payload_schema_violations_raise(self):
+        with self.assertRaises(ValueError):
+            nodes._validate_career_payload("not json", [])
+        with self.assertRaises(ValueError):
+            nodes._validate_career_payload(json.dumps([{"career": "X"}, {"probability": 5}, "y"]), [])
+
+    def test_recommendations_validation(self):
+        with self.assertRaises(ValueError):
+            nodes._validate_ai_recommendations("Learn Spark.", "Data Engineer")
+        text = "As a Data Engineer candidate you should " + "practice pipelines. " * 20
+        self.assertEqual(nodes._validate_ai_recommendations(text, "Data Engineer")[1], 1.0)
+        self.assertLess(nodes._validate_ai_recommendations(text, "Cloud Architect")[1], 0.5)
@@ -0,0 +1,78 @@
+import unittest
+
+from app.services.chunking import estimate_tokens
+from app.services.prompt_compaction import (
+    PromptSlot,
+    compact_slots,
+    compact_text,
+    compaction_stats,
+    dedupe_lines,
+    summarize_extractive,
+)
+
+
+EXPERIENCE = "\n".join([
+    "Software Engineer, Acme Corp (2021-2023)",
+    "- Worked on the payments team alongside product and design partners",
+    "- Reduced checkout latency by 40% by moving pricing to a Redis cache",
+    "- Participated in code reviews and sprint planning every week",
+    "- Built an ingestion service processing 2M events/day on Kafka",
+    "- Mentored interns and wrote onboarding documentation for the team",
+])
+
+
+class TestPromptCompaction(unittest.TestCase):
+    def test_dedupe_ignores_bullet_glyphs_and_collapses_blank_runs(self):
+        text = "- Built APIs\n• Built APIs\n\n\n\nShipped v2\n  built apis  "
+        self.assertEqual(dedupe_lines(text), "- Built APIs\n\nShipped v2")
+
+    def test_quantified_bullets_survive_first_in_original_order(self):
+        summary = summarize_extractive(EXPERIENCE, budget=45)
+        self.assertEqual(
+            summary.splitlines(),
+            [
+                "- Reduced checkout latency by 40% by moving pricing to a Redis cache",
+                "- Built an ingestion service processing 2M events/day on Kafka",
+            ],
+        )
+        self.assertLessEqual(estimate_tokens(summary), 45)
+
+    def test_focus_breaks_ties_between_unquantified_lines(self):
+        text = "- Led design reviews\n- Wrote Terraform modules for AWS"
+        self.assertEqual(summarize_extractive(text, 12, focus=["AWS Terraform"]), "- Wrote Terraform modules for AWS")
+
+    def test_slots_fit_budget_with_priority_order_and_floors(self):
+        filler = "\n".join(f"- General note number {word} about the role" for word in "abcdefghijklmnop")
+        result = compact_slots(
+            [
+                PromptSlot("resume", filler, priority=2, min_tokens=30),
+                PromptSlot("experience", EXPERIENCE, priority=0),
+            ],
+            budget=140,
+            site="test.slots",
+        )
+        self.assertEqual(result["experience"], EXPERIENCE)
+        self.assertTrue(result["resume"])
+        self.assertLessEqual(result.tokens_after, 140)
+        self.assertGreater(result.tokens_saved, 0)
+
+    def test_within_budget_only_dedupes_and_is_deterministic(self):
+        text = EXPERIENCE + "\n" + EXPERIENCE
+        self.assertEqual(compact_text(text, 1000, site="test.dedupe"), EXPERIENCE)
+        first = compact_slots([PromptSlot("a", EXPERIENCE)], 30, site="test.dedupe")
+        second = compact_slots([PromptSlot("a", EXPERIENCE)], 30, site="test.dedupe")
+        self.assertEqual(first.texts, second.texts)
+
+    def test_single_oversized_unit_is_cut_at_a_word_boundary(self):
+        skills = ", ".join(f"Skill{i}" for i in range(200))
+        cut = compact_text(skills, 20, site="test.cut")
+        self.assertTrue(cut.endswith("..."))
+        self.assertLessEqual(estimate_tokens(cut), 24)
+
+    def test_stats_are_reported_per_site(self):
+        compact_text(EXPERIENCE, 30, site="test.stats")
+        compact_text("short", 30, site="test.stats")
+        stats = compaction_stats()["test.stats"]
+        self.assertEqual(stats["calls"], 2)
+        self.assertEqual(stats["compacted"], 1)
+        self.assertGreater(stats["tokens_before"], stats["tokens_after"])
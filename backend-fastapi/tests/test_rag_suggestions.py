@@ -0,0 +1,217 @@
+import json
+import re
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from app.agents.resume import orchestrator_wrapper
+from app.services import rag_suggestions
+from app.services.cache import LRUCache
+from app.services.chunking import estimate_tokens
+from app.services.rag_suggestions import collect_pending_bullet_rewrites, get_resume_rag_evaluation
+
+
+SECTIONS = {
+    "experience": "- Built Airflow pipelines in Python for the data team\n- Worked on various data tasks",
+}
+REWRITE = {
+    "suggestion_id": "br_1",
+    "section_key": "experience",
+    "original_text": "Built Airflow pipelines in Python for the data team",
+    "rewrite_text": "Built 12 Airflow pipelines processing 2M events/day",
+    "reason": "Quantified scope",
+}
+EVALUATION = {
+    "strengths": [{"title": "Clear stack"}],
+    "weaknesses": [],
+    "improvements": [{"suggestion": "Add a summary", "explanation": "Sets context"}],
+}
+
+
+class TestBulletRewriteDeferral(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+
+        def slow_rewrites(bullets, job_description, role_type=None):
+            self.release.wait(5)
+            return [REWRITE]
+
+        patches = [
+            mock.patch.object(rag_suggestions, "_load_embedder", return_value=None),
+            mock.patch.object(rag_suggestions, "_retrieve_chunks", return_value=[]),
+            mock.patch.object(rag_suggestions, "_llm_rag_evaluation", return_value=EVALUATION),
+            mock.patch.object(rag_suggestions, "_llm_bullet_rewrites", side_effect=slow_rewrites),
+            mock.patch.object(rag_suggestions, "BULLET_REWRITE_TIMEOUT_S", 0.05),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(self.release.set)
+
+    def _evaluate(self, **kwargs):
+        return get_resume_rag_evaluation("resume text", parsed_sections=SECTIONS, role_type="data_engineer", **kwargs)
+
+    def test_default_callers_wait_for_rewrites(self):
+        threading.Timer(0.2, self.release.set).start()
+        result = self._evaluate()
+        self.assertNotIn("pending_rewrites_id", result)
+        self.assertEqual([s["suggestion_id"] for s in result["suggestions"]], ["impr_1", "br_1"])
+        self.assertEqual(result["suggestions"][1]["bullet_rewrite"], REWRITE["rewrite_text"])
+
+    def test_default_callers_stop_waiting_after_the_eval_timeout(self):
+        with mock.patch.object(rag_suggestions, "RAG_EVAL_TIMEOUT_S", 0.05):
+            result = self._evaluate()
+        self.assertNotIn("pending_rewrites_id", result)
+        self.assertEqual([s["suggestion_id"] for s in result["suggestions"]], ["impr_1"])
+
+    def test_deferred_rewrites_are_collected_once(self):
+        result = self._evaluate(defer_rewrites=True)
+        self.assertEqual([s["suggestion_id"] for s in result["suggestions"]], ["impr_1"])
+        pending_id = result["pending_rewrites_id"]
+
+        self.release.set()
+        late = collect_pending_bullet_rewrites(pending_id, timeout=5)
+        self.assertEqual([s["suggestion_id"] for s in late], ["br_1"])
+        self.assertEqual(collect_pending_bullet_rewrites(pending_id), [])
+        self.assertEqual(collect_pending_bullet_rewrites(None), [])
+
+
+class TestEvaluationTimeout(unittest.TestCase):
+    CHUNKS = [
+        {"title": "Quantify impact", "content": "Lead bullets with a number: users, latency, cost."},
+        {"title": "Tailor to the JD", "content": "Mirror the posting's core skills in the summary."},
+    ]
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.evaluations = []
+
+        def slow_evaluation(chunks, resume_text, job_description):
+            self.evaluations.append(chunks)
+            self.release.wait(5)
+            return EVALUATION
+
+        patches = [
+            mock.patch.object(rag_suggestions, "_load_embedder", return_value=None),
+            mock.patch.object(rag_suggestions, "_retrieve_chunks", return_value=self.CHUNKS),
+            mock.patch.object(rag_suggestions, "_llm_rag_evaluation", side_effect=slow_evaluation),
+            mock.patch.object(rag_suggestions, "RAG_EVAL_TIMEOUT_S", 0.05),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(self.release.set)
+
+    def test_timed_out_evaluation_uses_snippets_without_a_second_llm_call(self):
+        result = get_resume_rag_evaluation("resume text", job_description="Data engineer")
+        self.assertEqual(len(self.evaluations), 1)
+        self.assertEqual(
+            [(s["suggestion"], s["explanation"]) for s in result["suggestions"]],
+            [(c["title"], c["content"]) for c in self.CHUNKS],
+        )
+        self.assertEqual((result["strengths"], result["weaknesses"]), ([], []))
+
+
+class TestEvaluationPromptBudget(unittest.TestCase):
+    def test_long_resume_and_snippets_leave_the_job_description_its_floor(self):
+        prompts = []
+
+        def create(**kwargs):
+            prompts.append(kwargs["messages"][0]["content"])
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(EVALUATION)))])
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        resume = "\n".join(f"- Built pipeline {i} moving {i}M rows a day with Spark and Airflow" for i in range(400))
+        chunks = [{"title": f"Rule {i}", "content": "Quantify impact. " * 60} for i in range(8)]
+        jd = "\n".join(f"- Requirement {i}: operate Kafka and Snowflake pipelines" for i in range(120))
+
+        with mock.patch.object(rag_suggestions, "GROQ_CLIENT", client):
+            rag_suggestions._llm_rag_evaluation(chunks, resume, jd)
+
+        kept = prompts[0].split("Job Description (optional):", 1)[1]
+        self.assertGreater(estimate_tokens(kept), 0.9 * rag_suggestions.EVAL_JD_MIN_TOKENS)
+        self.assertIn("Requirement 0:", kept)
+
+
+class TestBulletRewriteCache(unittest.TestCase):
+    BULLETS = [
+        {"section_key": "experience", "original_text": "Built Airflow pipelines in Python"},
+        {"section_key": "experience", "original_text": "Migrated the warehouse to Snowflake"},
+        {"section_key": "projects", "original_text": "Wrote a Kafka consumer for clickstream data"},
+    ]
+
+    def setUp(self):
+        self.prompts = []
+
+        def create(**kwargs):
+            prompt = kwargs["messages"][0]["content"]
+            self.prompts.append(prompt)
+            items = [
+                {"suggestion_id": f"br_{n}", "section_key": key, "original_text": text,
+                 "rewrite_text": f"R: {text}", "reason": "stronger"}
+                for n, key, text in re.findall(r"^\[(\d+)\] \((\w+)\) (.+)$", prompt, re.M)
+            ]
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(items)))])
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        for p in (
+            mock.patch.object(rag_suggestions, "GROQ_CLIENT", client),
+            mock.patch.object(rag_suggestions, "_REWRITE_CACHE", LRUCache("test_bullet_rewrites", 100)),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _rewrite(self, bullets, job_description=""):
+        return rag_suggestions._llm_bullet_rewrites(bullets, job_description, "data_engineer")
+
+    def test_partial_hits_merge_cached_and_fresh_rewrites_in_order(self):
+        self._rewrite([self.BULLETS[0], self.BULLETS[2]])
+        result = self._rewrite(self.BULLETS)
+
+        # Only the cache miss is sent, renumbered within the batch.
+        self.assertEqual(len(self.prompts), 2)
+        self.assertIn("[1] (experience) Migrated the warehouse to Snowflake", self.prompts[1])
+        self.assertNotIn("Airflow", self.prompts[1])
+        self.assertEqual([r["suggestion_id"] for r in result], ["br_1", "br_2", "br_3"])
+        self.assertEqual(
+            [(r["section_key"], r["original_text"], r["rewrite_text"]) for r in result],
+            [(b["section_key"], b["original_text"], f"R: {b['original_text']}") for b in self.BULLETS],
+        )
+
+        self._rewrite(self.BULLETS)
+        self.assertEqual(len(self.prompts), 2)
+
+    def test_job_description_is_part_of_the_key(self):
+        self._rewrite(self.BULLETS[:1])
+        self._rewrite(self.BULLETS[:1], "Senior data engineer, Kafka and Flink")
+        self._rewrite(self.BULLETS[:1], "Senior  data engineer, kafka and Flink ")
+        self.assertEqual(len(self.prompts), 2)
+        self.assertIn("Kafka and Flink", self.prompts[1])
+
+
+class TestResumeWrapperRewrites(unittest.TestCase):
+    def _run(self, **state):
+        rag_eval = mock.Mock(return_value={"strengths": [], "weaknesses": [], "suggestions": [], "pending_rewrites_id": "abc"})
+        with mock.patch.object(orchestrator_wrapper, "run_resume_workflow", return_value={"ats_score": 70}), \
+                mock.patch.object(orchestrator_wrapper, "get_resume_rag_evaluation", rag_eval):
+            result = orchestrator_wrapper.resume_analysis_wrapper_node({
+                "resume_analysis": {"resume_text": "resume text", "parsed_sections": SECTIONS},
+                "active_job": {},
+                "profile": {},
+                "messages": [],
+                **state,
+            })
+        return result, rag_eval.call_args.kwargs["defer_rewrites"]
+
+    def test_pending_id_is_kept_out_of_resume_analysis(self):
+        result, deferred = self._run(defer_bullet_rewrites=True)
+        self.assertTrue(deferred)
+        self.assertEqual(result["pending_rewrites_id"], "abc")
+        self.assertNotIn("pending_rewrites_id", result["resume_analysis"])
+        # One-shot: a later run from the checkpointed state waits inline.
+        self.assertFalse(result["defer_bullet_rewrites"])
+
+    def test_rewrites_are_inline_unless_requested(self):
+        _, deferred = self._run()
+        self.assertFalse(deferred)
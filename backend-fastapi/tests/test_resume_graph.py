@@ -0,0 +1,91 @@
+import unittest
+from unittest import mock
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.agents.orchestrator import checkpointer
+from app.agents.resume import graph, nodes
+from app.agents.resume.nodes import score_resume_deterministic
+
+
+RESUME = """Jane Doe
+jane@example.com | Berlin
+
+EXPERIENCE
+Data Engineer, Acme (2021-2024)
+- Built Airflow pipelines in Python processing 2M events/day
+- Reduced warehouse costs by 30% by partitioning Spark jobs on AWS
+- Worked on various data tasks
+
+EDUCATION
+B.Sc. Computer Science, TU Berlin
+
+SKILLS
+Python, SQL, Spark, Airflow, AWS
+"""
+SECTIONS = {
+    "experience": "Data Engineer, Acme (2021-2024)",
+    "education": "B.Sc. Computer Science, TU Berlin",
+    "skills": "Python, SQL, Spark, Airflow, AWS",
+}
+JD = (
+    "We are hiring a data engineer to build batch and streaming pipelines with Python, "
+    "Spark, Kafka and Airflow on AWS, and to model data in Snowflake."
+)
+SCORE_KEYS = (
+    "structure_score", "completeness_score", "relevance_score", "impact_score",
+    "ats_score", "score_zone", "has_job_description", "critical_gaps", "structure_suggestions",
+)
+
+
+def _input(job_description=""):
+    return {
+        "resume_text": RESUME,
+        "resume_sections": SECTIONS,
+        "job_description": job_description,
+        "role_type": "data_engineer",
+        "messages": [],
+        "completed_steps": [],
+    }
+
+
+class TestResumeGraphModes(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            # In-memory checkpoints instead of Supabase.
+            mock.patch.object(checkpointer, "SupabaseCheckpointer", side_effect=MemorySaver),
+            mock.patch.object(nodes, "_llm_json", return_value={"issues": ["Summary is missing"]}),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.thread = 0
+        self.workflows = {mode: graph.create_resume_workflow(mode) for mode in ("parallel", "linear")}
+
+    def _run(self, mode, job_description="", durability=True):
+        with mock.patch.object(graph, "resume_workflow", self.workflows[mode]), \
+                mock.patch.object(graph, "RESUME_GRAPH_MODE", mode), \
+                mock.patch.object(graph, "_SUPPORTS_DURABILITY", durability):
+            self.thread += 1
+            config = {"configurable": {"thread_id": f"{mode}-{self.thread}"}}
+            return graph.run_resume_workflow(_input(job_description), config=config)
+
+    def test_parallel_and_linear_modes_produce_identical_scores(self):
+        for job_description in ("", JD):
+            parallel = self._run("parallel", job_description)
+            linear = self._run("linear", job_description)
+            self.assertEqual(
+                {key: parallel.get(key) for key in SCORE_KEYS},
+                {key: linear.get(key) for key in SCORE_KEYS},
+            )
+            self.assertEqual(sorted(parallel["completed_steps"]), sorted(linear["completed_steps"]))
+
+            deterministic = score_resume_deterministic(RESUME, SECTIONS, "data_engineer", job_description)
+            for key in ("structure_score", "completeness_score", "relevance_score", "impact_score", "ats_score"):
+                self.assertEqual(parallel[key], deterministic[key], key)
+
+    def test_parallel_mode_without_durability_support_matches(self):
+        self.assertEqual(
+            {key: self._run("parallel", JD, durability=False).get(key) for key in SCORE_KEYS},
+            {key: self._run("parallel", JD).get(key) for key in SCORE_KEYS},
+        )
@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+import pytest
+
+from app.services import roadmap_data
+from app.services.roadmap_data import RoadmapDirectory, load_snapshot, write_snapshot
+
+
+ROADMAPS = {
+    "python": {"title": "Python", "description": "", "url": "https://roadmap.sh/python", "topics": ["Basics"]},
+    "docker": {"title": "Docker", "description": "", "url": "https://roadmap.sh/docker", "topics": []},
+    "devops": {"title": "DevOps", "description": "", "url": "https://roadmap.sh/devops", "topics": []},
+}
+STATIC = {"python": "python"}
+
+
+@pytest.mark.usefixtures("kv")
+class TestRoadmapDirectory(unittest.TestCase):
+    def setUp(self):
+        self.snapshot_path = os.path.join(self.tmp_dir, "snapshot.json")
+        self.snapshot = write_snapshot(ROADMAPS, self.snapshot_path)
+        self.calls = []
+        self.lock = threading.Lock()
+        self.answers = {"containers": "docker", "ci pipelines": "devops", "basket weaving": None}
+
+    def _resolver(self, skill, slugs):
+        with self.lock:
+            self.calls.append(skill)
+        time.sleep(0.1)
+        answer = self.answers[skill.lower()]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    def _directory(self, version=None):
+        store = self.make_kv("test_roadmap_ids", version=version or self.snapshot["version"])
+        return RoadmapDirectory(
+            static_lookup=lambda skill: STATIC.get(skill.lower()),
+            resolver=self._resolver,
+            snapshot_path=self.snapshot_path,
+            store=store,
+        )
+
+    def test_snapshot_metadata_and_urls(self):
+        directory = self._directory()
+        self.assertEqual(directory.version, self.snapshot["version"])
+        self.assertEqual(directory.get("python")["topics"], ["Basics"])
+        self.assertIsNone(directory.get(None))
+        self.assertEqual(directory.url_for("docker"), "https://roadmap.sh/docker")
+        directory.get("python")["topics"].append("mutated")
+        self.assertEqual(directory.get("python")["topics"], ["Basics"])
+
+    def test_static_hits_skip_the_resolver(self):
+        self.assertEqual(self._directory().resolve_id("Python"), "python")
+        self.assertEqual(self.calls, [])
+
+    def test_positive_and_negative_results_persist(self):
+        directory = self._directory()
+        self.assertEqual(directory.resolve_id("Containers"), "docker")
+        self.assertIsNone(directory.resolve_id("Basket Weaving"))
+
+        # A fresh process (new memory tier) reads both from SQLite.
+        again = self._directory()
+        self.assertEqual(again.resolve_id("containers"), "docker")
+        self.assertIsNone(again.resolve_id("basket weaving"))
+        self.assertEqual(self.calls, ["Containers", "Basket Weaving"])
+
+    def test_negative_results_expire_sooner(self):
+        directory = self._directory()
+        directory.resolve_id("Basket Weaving")
+        directory._memory.clear()
+        with mock.patch.object(directory, "_negative_ttl_s", -1):
+            directory.resolve_id("Basket Weaving")
+        self.assertEqual(len(self.calls), 2)
+
+    def test_resolver_errors_and_unknown_slugs_are_handled(self):
+        self.answers["containers"] = RuntimeError("rate limited")
+        self.answers["ci pipelines"] = "not-a-roadmap"
+        directory = self._directory()
+        self.assertIsNone(directory.resolve_id("Containers"))
+        self.assertIsNone(directory.resolve_id("CI Pipelines"))
+
+        # An error is remembered briefly, so the same plan doesn't retry it...
+        self.answers["containers"] = "docker"
+        self.assertIsNone(directory.resolve_id("containers"))
+        self.assertEqual(self.calls, ["Containers", "CI Pipelines"])
+
+        # ...but it isn't persisted; an invalid slug is cached as "no roadmap".
+        directory._failed.clear()
+        self.assertEqual(directory.resolve_id("Containers"), "docker")
+        self.assertIsNone(directory.resolve_id("CI Pipelines"))
+        self.assertEqual(self.calls, ["Containers", "CI Pipelines", "Containers"])
+
+    def test_resolve_many_resolves_misses_concurrently(self):
+        directory = self._directory()
+        started = time.perf_counter()
+        results = directory.resolve_many(["Python", "Containers", "CI Pipelines", "Basket Weaving", "Containers"])
+        elapsed = time.perf_counter() - started
+        self.assertEqual(
+            results,
+            {"Python": "python", "Containers": "docker", "CI Pipelines": "devops", "Basket Weaving": None},
+        )
+        self.assertLess(elapsed, 0.25)
+        self.assertEqual(sorted(self.calls), ["Basket Weaving", "CI Pipelines", "Containers"])
+
+    def test_new_snapshot_version_drops_cached_ids(self):
+        self._directory().resolve_id("Containers")
+        self._directory(version="next").resolve_id("Containers")
+        self.assertEqual(self.calls, ["Containers", "Containers"])
+
+    def test_missing_snapshot_disables_resolution(self):
+        self.assertEqual(load_snapshot(os.path.join(self.tmp_dir, "missing.json"))["roadmaps"], {})
+        with mock.patch.object(roadmap_data.logger, "warning"):
+            directory = RoadmapDirectory(
+                static_lookup=lambda skill: None,
+                resolver=self._resolver,
+                snapshot_path=os.path.join(self.tmp_dir, "missing.json"),
+                store=self.make_kv("test_roadmap_ids_missing"),
+            )
+        self.assertIsNone(directory.resolve_id("Containers"))
+        self.assertEqual(self.calls, [])
@@ -0,0 +1,85 @@
+import time
+import unittest
+from unittest import mock
+
+import pytest
+
+from app.agents.skill_gap import cache, graph
+from app.agents.skill_gap import analyze_skill_gap, invalidate_skill_gap_cache, skill_gap_fingerprint
+from app.services.cache import LRUCache
+
+
+RESUME = "Jane Doe\nSkills: Python, SQL, Airflow\nProjects: ETL pipeline on AWS"
+SECTIONS = {"skills": "Python, SQL, Airflow", "projects": "ETL pipeline on AWS"}
+QA = {"target_role": "Data Engineer", "timeline_weeks": 12, "unrelated_field": "x"}
+
+
+@pytest.mark.usefixtures("kv")
+class TestSkillGapCache(unittest.TestCase):
+    def setUp(self):
+        self.invocations = 0
+        self.ai_text = "Learn Spark."
+
+        def invoke(state):
+            self.invocations += 1
+            return {
+                "user_skills": ["Python", "SQL"],
+                "career_matches": [{"career": "Data Engineer", "probability": 80, "missing_skills": []}],
+                "ai_recommendations": self.ai_text,
+            }
+
+        self.store = self.make_kv("test_skill_gap", version=cache.ONTOLOGY_VERSION)
+        patches = [
+            mock.patch.object(cache, "_store", self.store),
+            mock.patch.object(cache, "_memory", LRUCache("test_skill_gap_memory")),
+            mock.patch.object(cache, "SKILL_GAP_CACHE_ENABLED", True),
+            mock.patch.object(graph.skill_gap_workflow, "invoke", side_effect=invoke),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_unchanged_inputs_are_served_from_cache(self):
+        first = analyze_skill_gap(RESUME, sections=SECTIONS, questionnaire_answers=QA)
+        started = time.perf_counter()
+        second = analyze_skill_gap(
+            RESUME + "  ", sections=SECTIONS, questionnaire_answers={**QA, "unrelated_field": "y"}
+        )
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(self.invocations, 1)
+        self.assertEqual(first, second)
+        self.assertLess(elapsed, 0.05)
+
+        # Callers mutate results; the cached copy must not change.
+        second["career_matches"].clear()
+        self.assertTrue(analyze_skill_gap(RESUME, sections=SECTIONS, questionnaire_answers=QA)["career_matches"])
+
+    def test_scoring_fields_and_sections_change_the_fingerprint(self):
+        base = skill_gap_fingerprint(RESUME, SECTIONS, QA)
+        self.assertNotEqual(base, skill_gap_fingerprint(RESUME, SECTIONS, {**QA, "timeline_weeks": 8}))
+        self.assertNotEqual(base, skill_gap_fingerprint(RESUME, {**SECTIONS, "skills": "Go"}, QA))
+        self.assertEqual(base, skill_gap_fingerprint(RESUME, SECTIONS, {**QA, "unrelated_field": "z"}))
+
+    def test_persistent_tier_survives_memory_loss(self):
+        analyze_skill_gap(RESUME, sections=SECTIONS, questionnaire_answers=QA)
+        cache._memory.clear()
+        analyze_skill_gap(RESUME, sections=SECTIONS, questionnaire_answers=QA)
+        self.assertEqual(self.invocations, 1)
+
+    def test_invalidation_and_refresh_rerun_the_workflow(self):
+        analyze_skill_gap(RESUME, sections=SECTIONS, questionnaire_answers=QA)
+        analyze_skill_gap(RESUME, sections=SECTIONS, questionnaire_answers=QA, use_cache=False)
+        self.assertEqual(self.invocations, 2)
+
+        invalidate_skill_gap_cache(skill_gap_fingerprint(RESUME, SECTIONS, QA))
+        analyze_skill_gap(RESUME, sections=SECTIONS, questionnaire_answers=QA)
+        invalidate_skill_gap_cache()
+        analyze_skill_gap(RESUME, sections=SECTIONS, questionnaire_answers=QA)
+        self.assertEqual(self.invocations, 4)
+
+    def test_degraded_llm_results_are_not_cached(self):
+        self.ai_text = "AI recommendations unavailable: rate limited"
+        analyze_skill_gap(RESUME, sections=SECTIONS, questionnaire_answers=QA)
+        analyze_skill_gap(RESUME, sections=SECTIONS, questionnaire_answers=QA)
+        self.assertEqual(self.invocations, 2)
@@ -0,0 +1,126 @@
+import time
+import unittest
+from unittest import mock
+
+import pytest
+
+from app.agents.skill_gap import cache, graph
+from app.agents.skill_gap import stream_skill_gap
+from app.services.cache import LRUCache
+
+
+RESUME = "Jane Doe\nSkills: Python, SQL\nProjects: ETL pipeline"
+SECTIONS = {"skills": "Python, SQL", "projects": "ETL pipeline"}
+QA = {"target_role": "Data Engineer"}
+
+
+def _extract(state):
+    return {**state, "user_skills": ["Python", "SQL"], "total_skills_found": 2}
+
+
+def _match(state):
+    time.sleep(0.3)  # the 70B matching call
+    match = {"career": "Data Engineer", "probability": 82, "missing_skills": ["Spark"]}
+    return {
+        **state,
+        "career_matches": [match],
+        "top_3_careers": [match],
+        "target_role": "Data Engineer",
+        "gap_buckets": {"critical_blocker": [{"skill": "Spark"}]},
+    }
+
+
+def _recommend(state):
+    for token in ("Learn ", "Spark ", "next."):
+        yield token
+
+
+@pytest.mark.usefixtures("kv")
+class TestStreamSkillGap(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            mock.patch.object(cache, "_store", self.make_kv("test_skill_gap_stream")),
+            mock.patch.object(cache, "_memory", LRUCache("test_skill_gap_stream_memory")),
+            mock.patch.object(cache, "SKILL_GAP_CACHE_ENABLED", True),
+            mock.patch.object(graph, "extract_skills_node", side_effect=_extract),
+            mock.patch.object(graph, "calculate_career_probabilities_node", side_effect=_match),
+            mock.patch.object(graph, "stream_ai_recommendations", side_effect=_recommend),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _collect(self, **kwargs):
+        started = time.perf_counter()
+        events = []
+        for event, payload in stream_skill_gap(RESUME, sections=SECTIONS, questionnaire_answers=QA, **kwargs):
+            events.append((event, payload, time.perf_counter() - started))
+        return events
+
+    def test_events_arrive_in_order_with_provisional_careers_first(self):
+        events = self._collect()
+        names = [e[0] for e in events]
+        self.assertEqual(
+            names,
+            ["skills", "career_probabilities", "skills", "career_probabilities", "career_probabilities",
+             "gap_buckets", "recommendations_token", "recommendations_token", "recommendations_token", "complete"],
+        )
+        # The regex pass and the deterministic estimates don't wait for the LLM.
+        self.assertTrue(events[0][1]["provisional"])
+        self.assertIn("Python", events[0][1]["user_skills"])
+        self.assertTrue(events[1][1]["provisional"])
+        self.assertFalse(events[2][1]["provisional"])
+        self.assertLess(events[3][2], 0.1)
+        self.assertTrue(events[3][1]["provisional"])
+        # "Data Engineer" is not a cluster, so the estimate targets its best match.
+        provisional = events[3][1]
+        self.assertEqual(provisional["target_role"], provisional["selected_target_career_match"]["career"])
+        self.assertFalse(events[4][1]["provisional"])
+        self.assertEqual(events[4][1]["career_matches"][0]["probability"], 82)
+
+        complete = events[-1][1]
+        self.assertEqual(complete["ai_recommendations"], "Learn Spark next.")
+        self.assertEqual(complete["analysis_summary"]["best_match"], "Data Engineer")
+
+    def test_provisional_events_come_before_deferred_section_parsing(self):
+        seen = []
+
+        def load_sections():
+            seen.append([event for event, _ in events])
+            return SECTIONS
+
+        events = []
+        for event, payload in stream_skill_gap(RESUME, questionnaire_answers=QA, load_sections=load_sections):
+            events.append((event, payload))
+
+        self.assertEqual(seen, [["skills", "career_probabilities"]])
+        self.assertTrue(all(payload["provisional"] for _, payload in events[:2]))
+        graph.extract_skills_node.assert_called_once()
+        self.assertEqual(graph.extract_skills_node.call_args[0][0]["skills_text"], "Python, SQL")
+        self.assertEqual(events[-1][0], "complete")
+
+    def test_cached_result_is_replayed_immediately(self):
+        first = self._collect()[-1][1]
+        events = self._collect()
+        self.assertEqual(events[-1][1], first)
+        self.assertLess(events[-1][2], 0.1)
+        self.assertEqual(graph.calculate_career_probabilities_node.call_count, 1)
+
+        self._collect(use_cache=False)
+        self.assertEqual(graph.calculate_career_probabilities_node.call_count, 2)
+
+    def test_cached_recommendations_are_replayed_in_chunks(self):
+        text = " ".join(f"Step {i}: practise Spark joins." for i in range(40))
+        with mock.patch.object(graph, "stream_ai_recommendations", side_effect=lambda state: iter([text])):
+            self._collect()
+        tokens = [p["token"] for e, p, _ in self._collect() if e == "recommendations_token"]
+
+        self.assertGreater(len(tokens), 1)
+        self.assertEqual("".join(tokens), text)
+        self.assertTrue(all(len(t) < graph.REPLAY_CHUNK_CHARS + 40 for t in tokens))
+
+    def test_failure_ends_stream_with_error_event(self):
+        with mock.patch.object(graph, "extract_skills_node", side_effect=RuntimeError("boom")):
+            events = self._collect()
+        self.assertEqual([e[0] for e in events], ["skills", "career_probabilities", "error"])
+        self.assertIn("boom", events[-1][1]["error"])
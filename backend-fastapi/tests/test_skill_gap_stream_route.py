@@ -0,0 +1,125 @@
+import json
+import unittest
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import routes_resume
+
+
+MATCHES = [
+    {"career": "Frontend Developer", "probability": 81},
+    {"career": "Data Engineer", "probability": 64},
+    {"career": "Data Engineering Manager", "probability": 40},
+]
+
+
+def _matches():
+    return [dict(m) for m in MATCHES]
+
+
+def fake_stream(resume_text, **kwargs):
+    yield "skills", {"user_skills": ["Python", "SQL"], "total_skills_found": 2}
+    yield "career_probabilities", {"career_matches": _matches(), "provisional": True}
+    yield "recommendations_token", {"token": "Learn Spark"}
+    yield "complete", {
+        "career_matches": _matches(),
+        "top_3_careers": _matches(),
+        "analysis_summary": {"best_match": "Frontend Developer", "best_match_probability": 81},
+        "use_cache": kwargs["use_cache"],
+    }
+
+
+class TestSkillGapAnalysisStreamRoute(unittest.TestCase):
+    def setUp(self):
+        self.parser = mock.Mock()
+        self.parser.extract_text_from_pdf.return_value = "Jane Doe, data engineer. Skills: Python, SQL"
+        self.parser.parse_sections.return_value = {"skills": "Python, SQL"}
+        self.answers = {"target_roles": ["data_engineer"]}
+        patches = [
+            mock.patch.object(routes_resume, "get_parser", return_value=self.parser),
+            mock.patch.object(routes_resume, "_load_questionnaire_answers", side_effect=lambda _: self.answers),
+            mock.patch("app.agents.skill_gap.stream_skill_gap", side_effect=fake_stream),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        app = FastAPI()
+        app.include_router(routes_resume.router)
+        self.client = TestClient(app)
+
+    def _post(self, content=b"%PDF-1.4 resume", **data):
+        return self.client.post(
+            "/skill-gap-analysis/stream",
+            files={"resume": ("resume.pdf", content, "application/pdf")},
+            data={"user_id": "u1", **data},
+        )
+
+    def _events(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        frames = response.text.split("\n\n")
+        self.assertEqual(frames[-1], "")
+        for frame in frames[:-1]:
+            self.assertTrue(frame.startswith("data: ") and "\n" not in frame, frame)
+        return [json.loads(frame[len("data: "):]) for frame in frames[:-1]]
+
+    def test_events_are_framed_in_order(self):
+        events = self._events(self._post())
+        self.assertEqual(
+            [e["event"] for e in events],
+            ["skills", "career_probabilities", "recommendations_token", "complete"],
+        )
+        self.assertEqual(events[0]["user_skills"], ["Python", "SQL"])
+        self.assertEqual(events[2]["token"], "Learn Spark")
+
+    def test_probabilities_and_complete_are_filtered_to_interested_roles(self):
+        events = {e["event"]: e for e in self._events(self._post())}
+        interested = ["Data Engineer", "Data Engineering Manager"]
+
+        self.assertEqual([m["career"] for m in events["career_probabilities"]["career_matches"]], interested)
+        complete = events["complete"]
+        self.assertEqual([m["career"] for m in complete["career_matches"]], interested)
+        self.assertEqual([m["career"] for m in complete["top_3_careers"]], interested)
+        self.assertEqual(complete["analysis_summary"]["best_match"], "Data Engineer")
+        self.assertEqual(complete["analysis_summary"]["best_match_probability"], 64)
+        self.assertTrue(complete["success"])
+        self.assertEqual(complete["filename"], "resume.pdf")
+        self.assertEqual(complete["interested_roles"], ["data_engineer"])
+
+    def test_unmatched_or_missing_roles_keep_every_career(self):
+        for answers in (None, {"target_role": "Astronaut"}):
+            self.answers = answers
+            complete = self._events(self._post())[-1]
+            self.assertEqual([m["career"] for m in complete["career_matches"]], [m["career"] for m in MATCHES])
+
+    def test_sections_are_parsed_lazily_inside_the_stream(self):
+        loaders = []
+
+        def stream(resume_text, **kwargs):
+            self.assertIsNone(kwargs.get("sections"))
+            self.assertFalse(self.parser.parse_sections.called)
+            yield "skills", {"user_skills": [], "provisional": True}
+            loaders.append(kwargs["load_sections"]())
+
+        with mock.patch("app.agents.skill_gap.stream_skill_gap", side_effect=stream):
+            events = self._events(self._post())
+
+        self.assertEqual([e["event"] for e in events], ["skills"])
+        self.assertEqual(loaders, [{"skills": "Python, SQL"}])
+
+    def test_refresh_bypasses_the_cache(self):
+        self.assertTrue(self._events(self._post())[-1]["use_cache"])
+        self.assertFalse(self._events(self._post(refresh="true"))[-1]["use_cache"])
+
+    def test_rejects_empty_and_unreadable_resumes(self):
+        response = self._post(content=b"")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "Resume file is empty")
+
+        self.parser.extract_text_from_pdf.return_value = "   "
+        response = self._post()
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()["success"])
+        self.assertIn("Could not extract text", response.json()["error"])
@@ -0,0 +1,242 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import pytest
+
+from app.services.study_resource_cache import StudyResourceCache, UrlStatusCache, career_bucket
+
+
+@pytest.mark.usefixtures("kv")
+class TestStudyResourceCache(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.lock = threading.Lock()
+        self.source = "curated"
+
+    def _builder(self, skill, career, style, level):
+        with self.lock:
+            self.calls.append((skill, career, style, level))
+        return [{"step": 1, "title": f"{skill} for {career}", "url": f"https://example.com/{style}"}], self.source
+
+    def _cache(self, **kwargs):
+        return StudyResourceCache(
+            builder=self._builder,
+            store=self.make_kv("test_study_resources"),
+            popularity=self.make_kv("test_study_resources_popularity"),
+            leases=self.make_kv("test_study_resources_leases"),
+            name="test_study_resources",
+            **kwargs,
+        )
+
+    def test_career_bucket_drops_seniority(self):
+        self.assertEqual(career_bucket("Senior Backend Developer"), "backend developer")
+        self.assertEqual(career_bucket("Jr. Data Engineer II"), "data engineer")
+        self.assertEqual(career_bucket("Entry-Level AI Engineer"), "ai engineer")
+        self.assertEqual(career_bucket(""), "_any")
+
+    def test_key_is_shared_across_users_and_seniority(self):
+        cache = self._cache()
+        first = cache.get("Docker", "Senior Backend Developer", "video_tutorials")
+        second = cache.get("docker ", "backend developer", "video_tutorials")
+        self.assertFalse(first.cached)
+        self.assertTrue(second.cached)
+        self.assertEqual(first.learning_path, second.learning_path)
+        # The bucket only shapes the key; the builder sees the first caller's career.
+        self.assertEqual(self.calls, [("Docker", "Senior Backend Developer", "video_tutorials", "beginner")])
+
+        cache.get("Docker", "Backend Developer", "reading")
+        self.assertEqual(len(self.calls), 2)
+
+    def test_entries_persist_and_are_copied(self):
+        plan = self._cache().get("Docker", "DevOps Engineer", "mixed")
+        plan.learning_path[0]["title"] = "mutated"
+        again = self._cache().get("Docker", "DevOps Engineer", "mixed")
+        self.assertTrue(again.cached)
+        self.assertEqual(again.learning_path[0]["title"], "Docker for DevOps Engineer")
+        self.assertEqual(len(self.calls), 1)
+
+    def test_stale_entries_are_served_and_refreshed_in_background(self):
+        cache = self._cache(ttl_s=-1)
+        cache.get("Docker", "DevOps Engineer", "mixed")
+        plan = cache.get("Docker", "DevOps Engineer", "mixed")
+        self.assertTrue(plan.cached)
+        self.assertTrue(plan.stale)
+        deadline = time.time() + 2
+        while cache.stats()["refreshed"] < 1 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(cache.stats()["refreshed"], 1)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_concurrent_misses_share_one_build(self):
+        release = threading.Event()
+        builder = self._builder
+
+        def slow_builder(*args):
+            release.wait(2)
+            return builder(*args)
+
+        cache = self._cache()
+        with mock.patch.object(cache, "_builder", side_effect=slow_builder):
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(cache.get("Docker", "DevOps Engineer", "mixed")))
+                for _ in range(5)
+            ]
+            for t in threads:
+                t.start()
+            time.sleep(0.1)
+            release.set()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(cache.stats()["shared_build"], 4)
+        self.assertEqual(cache.stats()["pending"], 0)
+
+    def test_miss_during_prewarm_waits_for_it(self):
+        cache = self._cache()
+        cache.get("Docker", "DevOps Engineer", "mixed")
+        cache.clear()
+        release = threading.Event()
+        builder = self._builder
+
+        def slow_builder(*args):
+            release.wait(2)
+            return builder(*args)
+
+        with mock.patch.object(cache, "_builder", side_effect=slow_builder):
+            self.assertEqual(cache.prewarm(top_n=1), 1)
+            threading.Timer(0.1, release.set).start()
+            plan = cache.get("Docker", "DevOps Engineer", "mixed")
+
+        self.assertFalse(plan.cached)
+        self.assertEqual(plan.learning_path[0]["title"], "Docker for DevOps Engineer")
+        self.assertEqual(len(self.calls), 2)  # the first get and the pre-warm, not a third
+
+    def test_docs_fallbacks_expire_sooner(self):
+        self.source = "docs"
+        cache = self._cache(fallback_ttl_s=-1)
+        cache.get("Zig", "Systems Engineer", "reading")
+        self.assertTrue(cache.get("Zig", "Systems Engineer", "reading").stale)
+
+        self.source = "curated"
+        cache = self._cache(fallback_ttl_s=-1)
+        cache.get("Git", "Systems Engineer", "reading")
+        self.assertFalse(cache.get("Git", "Systems Engineer", "reading").stale)
+
+    def test_prewarm_rebuilds_popular_missing_entries(self):
+        cache = self._cache()
+        for _ in range(3):
+            cache.get("Docker", "DevOps Engineer", "mixed")
+        cache.get("Rust", "Systems Engineer", "reading")
+        self.assertEqual([r["skill"] for r in cache.popular(2)], ["Docker", "Rust"])
+        self.assertEqual(cache.popular(1)[0]["hits"], 3)
+
+        cache.clear()
+        self.assertEqual(cache.prewarm(top_n=1, wait=True), 1)
+        self.assertEqual(self.calls[-1], ("Docker", "DevOps Engineer", "mixed", "beginner"))
+        self.assertTrue(cache.is_fresh(cache.key_for("Docker", "DevOps Engineer", "mixed")))
+        self.assertEqual(cache.prewarm(top_n=1, wait=True), 0)
+
+    def test_popularity_is_buffered_and_merged_across_processes(self):
+        first, second = self._cache(), self._cache()
+        with mock.patch.object(first, "_executor") as executor:
+            for _ in range(3):
+                first.get("Docker", "DevOps Engineer", "mixed")
+        # One deferred flush for the whole burst, nothing written yet.
+        self.assertEqual(executor.submit.call_count, 1)
+        self.assertEqual(second.popular(), [])
+
+        second.get("Docker", "DevOps Engineer", "mixed")
+        first.flush_popularity()
+        self.assertEqual(second.popular()[0]["hits"], 4)
+
+    def test_popularity_prunes_old_and_unpopular_keys(self):
+        cache = self._cache(popularity_max_keys=1)
+        cache.get("Docker", "DevOps Engineer", "mixed")
+        cache.get("Docker", "DevOps Engineer", "mixed")
+        cache.get("Rust", "Systems Engineer", "reading")
+        self.assertEqual([r["skill"] for r in cache.popular()], ["Docker"])
+        self.assertEqual(len(cache._popularity), 1)
+
+        cache = self._cache(popularity_ttl_s=-1)
+        self.assertEqual(cache.popular(), [])
+        self.assertEqual(len(cache._popularity), 0)
+
+    def test_only_one_process_prewarms_per_lease(self):
+        cache = self._cache()
+        cache.get("Docker", "DevOps Engineer", "mixed")
+        cache.clear()
+        other = self._cache()
+        self.assertEqual(cache.prewarm(wait=True), 1)
+        self.assertEqual(other.prewarm(wait=True), 0)
+
+        cache.clear()
+        self.assertEqual(self._cache(lease_s=-1).prewarm(wait=True), 1)
+
+    def test_failed_refresh_keeps_the_old_entry(self):
+        cache = self._cache(ttl_s=-1)
+        cache.get("Docker", "DevOps Engineer", "mixed")
+        with mock.patch.object(cache, "_builder", side_effect=RuntimeError("quota")):
+            cache.prewarm(wait=True)
+        self.assertEqual(cache.stats()["refresh_failed"], 1)
+        self.assertTrue(cache.get("Docker", "DevOps Engineer", "mixed").cached)
+
+    def test_planner_resolves_roadmaps_only_for_skills_it_builds(self):
+        from app.agents.study_planner import nodes
+
+        resolved = []
+        patches = [
+            mock.patch.object(nodes, "_study_resources", self._cache()),
+            mock.patch.object(nodes, "STUDY_RESOURCE_CACHE_ENABLED", True),
+            mock.patch.object(nodes, "GEMINI_CLIENT", object()),
+            mock.patch.object(
+                nodes._roadmaps, "resolve_many",
+                side_effect=lambda skills: resolved.append((list(skills), len(self.calls))),
+            ),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+        def run(skills):
+            return nodes.fetch_live_resources_node(
+                {"missing_skills": skills, "target_career": "Backend Developer", "questionnaire_answers": {}}
+            )
+
+        run(["Docker", "Kubernetes"])
+        report = run(["Docker", "Kubernetes", "Terraform"])["skill_gap_report"]
+
+        self.assertEqual([entry["skill"] for entry in report], ["Docker", "Kubernetes", "Terraform"])
+        # One batch per plan, before any builder ran, covering only cache misses.
+        self.assertEqual(resolved, [(["Docker", "Kubernetes"], 0), (["Terraform"], 2)])
+
+
+@pytest.mark.usefixtures("kv")
+class TestUrlStatusCache(unittest.TestCase):
+    def setUp(self):
+        self.checked = []
+
+    def _checker(self, url):
+        self.checked.append(url)
+        if "boom" in url:
+            raise RuntimeError("connection reset")
+        return "dead" not in url
+
+    def _cache(self, **kwargs):
+        return UrlStatusCache(store=self.make_kv("test_url_status"), name="test_url_status", **kwargs)
+
+    def test_results_are_cached_across_instances(self):
+        urls = ["https://a.dev", "https://dead.dev", "https://boom.dev", "https://a.dev", ""]
+        status = self._cache().check_many(urls, self._checker)
+        self.assertEqual(status, {"https://a.dev": True, "https://dead.dev": False, "https://boom.dev": False})
+        self.assertEqual(self._cache().check_many(urls, self._checker), status)
+        self.assertEqual(len(self.checked), 3)
+
+    def test_dead_links_are_rechecked_sooner(self):
+        self._cache().check_many(["https://a.dev", "https://dead.dev"], self._checker)
+        self._cache(dead_ttl_s=-1).check_many(["https://a.dev", "https://dead.dev"], self._checker)
+        self.assertEqual(sorted(self.checked), ["https://a.dev", "https://dead.dev", "https://dead.dev"])
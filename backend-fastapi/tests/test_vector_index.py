@@ -0,0 +1,187 @@
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from app.services import vector_index
+from app.services.vector_index import RagChunkIndex
+
+
+def _row(row_id, category, content, embedding, updated_at="2026-01-01T00:00:00"):
+    vec = None if embedding is None else np.asarray(embedding, dtype=np.float32)
+    return {
+        "id": row_id,
+        "parent_id": f"p{row_id}",
+        "chunk_index": 0,
+        "category": category,
+        "title": f"t{row_id}",
+        "content": content,
+        # PostgREST returns pgvector columns as strings.
+        "embedding": None if vec is None else str((vec / np.linalg.norm(vec)).tolist()),
+        "updated_at": updated_at,
+    }
+
+
+class FakeRagChunks:
+    """Just enough of the supabase query builder for RagChunkIndex."""
+
+    def __init__(self, rows, missing_columns=()):
+        self.rows = {row["id"]: row for row in rows}
+        self.missing_columns = missing_columns
+        self.queries = []
+        self.contents_sent = 0
+
+    def table(self, name):
+        assert name == "rag_chunks"
+        return _Query(self)
+
+
+class _Query:
+    def __init__(self, store):
+        self.store = store
+        self.fields = []
+        self.filters = []
+        self.ids = None
+        self.limit_n = None
+
+    def select(self, fields):
+        self.fields = fields.split(",")
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: row[column] > value)
+        return self
+
+    def in_(self, column, values):
+        self.ids = list(values)
+        self.filters.append(lambda row: row[column] in self.ids)
+        return self
+
+    def order(self, column):
+        return self
+
+    def limit(self, n):
+        self.limit_n = n
+        return self
+
+    def execute(self):
+        missing = [f for f in self.fields if f in self.store.missing_columns]
+        if missing:
+            raise RuntimeError(f"column rag_chunks.{missing[0]} does not exist")
+        self.store.queries.append((tuple(self.fields), self.ids))
+        rows = [r for _, r in sorted(self.store.rows.items()) if all(f(r) for f in self.filters)]
+        rows = rows[: self.limit_n] if self.limit_n else rows
+        if "content" in self.fields:
+            self.store.contents_sent += len(rows)
+        return mock.Mock(data=[{k: r[k] for k in self.fields} for r in rows])
+
+
+@pytest.mark.usefixtures("kv")
+class TestRagChunkIndex(unittest.TestCase):
+    def setUp(self):
+        self.remote = FakeRagChunks([
+            _row(1, "resume", "quantify impact", [1, 0, 0]),
+            _row(2, "resume", "lead with verbs", [0.8, 0.2, 0]),
+            _row(3, "interview", "use STAR answers", [0, 1, 0]),
+        ])
+        patcher = mock.patch.object(vector_index, "supabase", self.remote)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _index(self, **kwargs):
+        index = RagChunkIndex(snapshot_dir=kwargs.get("snapshot_dir", ""))
+        index.refresh()
+        return index
+
+    def test_search_ranks_by_dot_product_within_category(self):
+        index = self._index()
+        self.assertEqual([r["id"] for r in index.search([1, 0, 0], None, 3)], [1, 2, 3])
+        self.assertEqual([r["id"] for r in index.search([0, 1, 0], "resume", 5)], [2, 1])
+        self.assertAlmostEqual(index.search([1, 0, 0], None, 1)[0]["similarity"], 1.0, places=5)
+        self.assertEqual(index.search([1, 0, 0], "cover_letter", 3), [])
+        self.assertIsNone(index.search([1, 0], None, 3))
+
+    def test_stale_or_empty_replica_defers_to_the_rpc(self):
+        self.assertIsNone(RagChunkIndex(snapshot_dir="").search([1, 0, 0], None, 3))
+        index = self._index()
+        index.loaded_at = time.time() - vector_index.RAG_INDEX_MAX_STALENESS_S - 1
+        self.assertIsNone(index.search([1, 0, 0], None, 3))
+        index.refresh()
+        self.assertIsNotNone(index.search([1, 0, 0], None, 3))
+
+    def _edit_remote(self):
+        self.remote.rows[4] = _row(4, "interview", "research the company", [0, 0, 1], "2026-02-01T00:00:00")
+        self.remote.rows[2] = _row(2, "resume", "lead with action verbs", [0, 0.9, 0.1], "2026-02-02T00:00:00")
+        del self.remote.rows[3]
+
+    def _assert_edits_applied(self, index):
+        self.assertEqual(sorted(m["id"] for m in index.meta), [1, 2, 4])
+        self.assertEqual(index.search([0, 1, 0], None, 1)[0]["content"], "lead with action verbs")
+        self.assertEqual([r["id"] for r in index.search([0, 0, 1], "interview", 5)], [4])
+
+    def test_incremental_refresh_downloads_only_rows_newer_than_the_watermark(self):
+        index = self._index()
+        self.assertEqual(index.watermark, "2026-01-01T00:00:00")
+        self._edit_remote()
+        self.remote.contents_sent = 0
+
+        index.refresh()
+
+        # The changed rows plus an id-only scan for deletions; no content scan.
+        self.assertEqual(self.remote.contents_sent, 2)
+        self.assertNotIn(("id", "content", "updated_at"), [fields for fields, _ in self.remote.queries])
+        self._assert_edits_applied(index)
+        self.assertEqual(index.watermark, "2026-02-02T00:00:00")
+
+        self.remote.contents_sent = 0
+        index.refresh()
+        self.assertEqual(self.remote.contents_sent, 0)
+
+    def test_without_a_version_column_content_hashes_are_compared(self):
+        self.remote.missing_columns = ("updated_at",)
+        index = self._index()
+        self.assertEqual(index.version_column, "")
+        self._edit_remote()
+        self.remote.queries.clear()
+
+        index.refresh()
+
+        # Only ids/content are scanned; embeddings are fetched for new + edited rows.
+        scans = [fields for fields, ids in self.remote.queries if ids is None]
+        fetched = [ids for fields, ids in self.remote.queries if ids is not None]
+        self.assertEqual(scans, [("id", "content")])
+        self.assertEqual(fetched, [[2, 4]])
+        self._assert_edits_applied(index)
+
+        # Nothing changed: one scan, no embedding downloads.
+        self.remote.queries.clear()
+        index.refresh()
+        self.assertEqual(self.remote.queries, [(("id", "content"), None)])
+
+    def test_rows_without_embeddings_are_not_refetched(self):
+        self.remote.missing_columns = ("updated_at",)
+        self.remote.rows[5] = _row(5, "resume", "embedding pending", None)
+        index = self._index()
+        self.assertIn(5, index.hashes)
+        self.assertNotIn(5, [m["id"] for m in index.meta])
+
+        self.remote.queries.clear()
+        index.refresh()
+        self.assertEqual([ids for _, ids in self.remote.queries if ids is not None], [])
+
+        # Once it has an embedding (and a new version), it is indexed.
+        self.remote.missing_columns = ()
+        index.version_column = "updated_at"
+        index.watermark = "2026-01-01T00:00:00"
+        self.remote.rows[5] = _row(5, "resume", "embedding pending", [0, 0, 1], "2026-03-01T00:00:00")
+        index.refresh()
+        self.assertEqual([r["id"] for r in index.search([0, 0, 1], "resume", 1)], [5])
+
+    def test_snapshot_round_trip(self):
+        self._index(snapshot_dir=self.tmp_dir)
+        restored = RagChunkIndex(snapshot_dir=self.tmp_dir)
+        self.assertTrue(restored.load_snapshot())
+        self.assertEqual([r["id"] for r in restored.search([0, 1, 0], None, 1)], [3])
+        self.assertEqual(set(restored.hashes), {1, 2, 3})
@@ -17,6 +17,9 @@ import {
 } from "lucide-react";
 import { supabase } from "../api/supabaseClient";
 
+const REFRESH_POLL_INTERVAL_MS = 1500;
+const REFRESH_POLL_TIMEOUT_MS = 3 * 60 * 1000;
+
 function JobMatcher({ resumeData, setCurrentPage }) {
   const [matchedJobs, setMatchedJobs] = useState([]);
   const [userSkills, setUserSkills] = useState([]);
@@ -93,6 +96,25 @@ function JobMatcher({ resumeData, setCurrentPage }) {
       const data = await res.json();
       if (!res.ok) throw new Error(data.detail || "Refresh failed");
 
+      // Refresh runs in the background; poll until it finishes (or we give up waiting)
+      let status = data.status;
+      const pollDeadline = Date.now() + REFRESH_POLL_TIMEOUT_MS;
+      while (status === "queued" || status === "running") {
+        if (Date.now() > pollDeadline) {
+          setError("Job refresh is taking longer than expected. It will keep running in the background — search again in a few minutes.");
+          return;
+        }
+        await new Promise((resolve) => setTimeout(resolve, REFRESH_POLL_INTERVAL_MS));
+        const statusRes = await fetch(
+          `http://localhost:8000/api/v1/jobs/refresh/${data.task_id}`,
+          { headers: { Authorization: `Bearer ${token}` } },
+        );
+        const statusData = await statusRes.json();
+        if (!statusRes.ok) throw new Error(statusData.detail || "Refresh failed");
+        status = statusData.status;
+        if (status === "failed") throw new Error(statusData.error || "Refresh failed");
+      }
+
       // Re-run search to pick up new jobs
       await searchJobs();
     } catch (err) {
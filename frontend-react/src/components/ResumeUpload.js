@@ -224,9 +224,53 @@ function ResumeUpload({
       const reader = orchestratorResponse.body.getReader();
       const decoder = new TextDecoder("utf-8");
       let _completeResult = null;
+      let _skillGap = null;
       let buffer = "";
       let streamError = null;
 
+      const publishResult = (result) => {
+        if (userId) {
+          localStorage.setItem(`resume_analysis_${userId}`, JSON.stringify(result));
+          setHasExistingResults(true);
+        }
+        if (onResult) onResult(result);
+      };
+
+      const handleStreamData = (data) => {
+        if (data.event === "update" && data.phase) {
+          if (data.phase_label) setStatusText(data.phase_label);
+          else {
+            const humanReadablePhase = data.phase.split("_").map((w) => w.charAt(0).toUpperCase() + w.slice(1)).join(" ");
+            setStatusText(humanReadablePhase + "...");
+          }
+        } else if (data.event === "started") {
+          setStatusText("Parsing Resume...");
+        } else if (data.event === "skill_gap") {
+          // Skill-gap analysis runs alongside resume scoring and may finish first.
+          if (data.result && !data.result.error) _skillGap = data.result;
+          setStatusText("Skill gaps mapped. Finishing resume analysis...");
+        } else if (data.event === "resume_scored") {
+          if (data.resume_score != null) setStatusText(`Resume scored ${data.resume_score}/100. Saving results...`);
+        } else if (data.event === "error") {
+          streamError = data.error || "Analysis failed";
+        } else if (data.event === "complete") {
+          // Render as soon as the analysis is done; late bullet rewrites may still follow.
+          _completeResult = buildResumeDataFromOrchestrator(data.result, resumeFile, jobDescription, roleType);
+          // Same shape SkillGapAnalyzer reads from stored versions.
+          if (_skillGap?.career_matches?.length) _completeResult.careerAnalysis = _skillGap;
+          publishResult(_completeResult);
+          setLoading(false);
+          // Signal GlobalFloatingHelper to invalidate its recommendations cache
+          window.dispatchEvent(new CustomEvent("careerlm:resume_analyzed"));
+        } else if (data.event === "bullet_rewrites" && _completeResult) {
+          _completeResult = {
+            ..._completeResult,
+            suggestions: [...(_completeResult.suggestions || []), ...(data.suggestions || [])],
+          };
+          publishResult(_completeResult);
+        }
+      };
+
       while (true) {
         const { done, value } = await reader.read();
         if (done) break;
@@ -236,21 +280,9 @@ function ResumeUpload({
         for (const payload of payloads) {
           try {
             if (!payload) continue;
-            const data = JSON.parse(payload);
-            if (data.event === "update" && data.phase) {
-              if (data.phase_label) setStatusText(data.phase_label);
-              else {
-                const humanReadablePhase = data.phase.split("_").map((w) => w.charAt(0).toUpperCase() + w.slice(1)).join(" ");
-                setStatusText(humanReadablePhase + "...");
-              }
-            } else if (data.event === "started") {
-              setStatusText("Parsing Resume...");
-            } else if (data.event === "error") {
-              streamError = data.error || "Analysis failed"; break;
-            } else if (data.event === "complete") {
-              _completeResult = buildResumeDataFromOrchestrator(data.result, resumeFile, jobDescription, roleType);
-            }
+            handleStreamData(JSON.parse(payload));
           } catch (err) { console.error("Error parsing SSE chunk:", err); }
+          if (streamError) break;
         }
         if (streamError) break;
       }
@@ -260,24 +292,16 @@ function ResumeUpload({
         for (const payload of payloads) {
           try {
             if (!payload) continue;
-            const data = JSON.parse(payload);
-            if (data.event === "complete") {
-              _completeResult = buildResumeDataFromOrchestrator(data.result, resumeFile, jobDescription, roleType);
-            } else if (data.event === "error") { streamError = data.error || "Analysis failed"; break; }
+            handleStreamData(JSON.parse(payload));
           } catch (err) { console.error("Error parsing final SSE chunk:", err); }
+          if (streamError) break;
         }
       }
 
-      if (streamError) throw new Error(streamError);
+      // An error after the result was shown (e.g. while waiting for late rewrites)
+      // leaves the rendered analysis in place.
+      if (streamError && !_completeResult) throw new Error(streamError);
       if (!_completeResult) throw new Error("Stream closed before completion.");
-
-      if (userId && _completeResult) {
-        localStorage.setItem(`resume_analysis_${userId}`, JSON.stringify(_completeResult));
-        setHasExistingResults(true);
-      }
-      if (onResult) onResult(_completeResult);
-      // Signal GlobalFloatingHelper to invalidate its recommendations cache
-      window.dispatchEvent(new CustomEvent("careerlm:resume_analyzed"));
     } catch (err) {
       if (err.name === "AbortError") { setError(""); }
       else { setError(err?.message || "Failed to complete analysis. Please try again."); }